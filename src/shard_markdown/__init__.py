@@ -1,11 +1,31 @@
 """Shard Markdown - Intelligent document chunking for ChromaDB collections."""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+
 __version__ = "0.1.0"
 __author__ = "Shard Markdown Contributors"
 __email__ = "shard-md@example.com"
 __description__ = "Intelligent markdown document chunking for ChromaDB collections"
 
-from .core.models import DocumentChunk, MarkdownAST, ProcessingResult
+if TYPE_CHECKING:
+    from .core.models import DocumentChunk, MarkdownAST, ProcessingResult
 
 
 __all__ = ["DocumentChunk", "MarkdownAST", "ProcessingResult", "__version__"]
+
+# Models are imported on first access so that the CLI starts without pydantic
+_LAZY_ATTRIBUTES = {
+    "DocumentChunk": ".core.models",
+    "MarkdownAST": ".core.models",
+    "ProcessingResult": ".core.models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public models on demand."""
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,15 @@
 """ChromaDB integration with mock fallback."""
 
-from typing import Optional
+import importlib
+from typing import TYPE_CHECKING, Any
 
 
-# Try to import real ChromaDB client, fallback to mock if not available
-try:
-    from .client import ChromaDBClient
+if TYPE_CHECKING:
+    from .collections import CollectionManager
+    from .factory import create_chromadb_client
 
-    CHROMADB_AVAILABLE = True
-    CHROMADB_CLIENT_CLASS: type | None = ChromaDBClient
-except ImportError:
-    CHROMADB_AVAILABLE = False
-    CHROMADB_CLIENT_CLASS = None
-
-from .collections import CollectionManager
-from .factory import create_chromadb_client
+    CHROMADB_AVAILABLE: bool
+    CHROMADB_CLIENT_CLASS: type | None
 
 
 __all__ = [
@@ -23,3 +18,32 @@ __all__ = [
     "create_chromadb_client",
     "CHROMADB_AVAILABLE",
 ]
+
+# The client pulls in chromadb and httpx, so nothing is imported until one
+# of these names is first used
+_LAZY_ATTRIBUTES = {
+    "CollectionManager": ".collections",
+    "create_chromadb_client": ".factory",
+}
+
+
+def _load_client() -> None:
+    """Try to import the real ChromaDB client and record the outcome."""
+    try:
+        from .client import ChromaDBClient
+
+        available, client_class = True, ChromaDBClient
+    except ImportError:
+        available, client_class = False, None
+    globals().update(CHROMADB_AVAILABLE=available, CHROMADB_CLIENT_CLASS=client_class)
+
+
+def __getattr__(name: str) -> Any:
+    """Import ChromaDB integration components on demand."""
+    if name in ("CHROMADB_AVAILABLE", "CHROMADB_CLIENT_CLASS"):
+        _load_client()
+        return globals()[name]
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, cast
 
 from shard_markdown.config import Settings
 from shard_markdown.core.models import DocumentChunk, InsertResult
+from shard_markdown.utils import metrics, tracing
 
 
 if TYPE_CHECKING:
@@ -232,7 +233,12 @@ class AsyncChromaDBClient:
             # Process batches concurrently using asyncio.gather
             async def process_batch(batch_chunks: list[DocumentChunk]) -> int:
                 """Process a batch of chunks."""
-                async with self._semaphore:
+                with tracing.async_span(
+                    "semaphore.wait", category="queue", chunks=len(batch_chunks)
+                ):
+                    await self._semaphore.acquire()
+                try:
+                    sanitize_start = time.perf_counter_ns()
                     # Prepare data for insertion
                     ids = [
                         chunk.id or f"chunk_{hash(chunk.content)}"
@@ -266,13 +272,25 @@ class AsyncChromaDBClient:
 
                     # Validate data before insertion
                     self._validate_insertion_data(ids, documents, metadatas)
+                    tracing.add_span("sanitize", sanitize_start)
 
                     # Insert batch using ChromaDB's native async add method
-                    await collection.add(
-                        ids=ids, documents=documents, metadatas=cast(Any, metadatas)
-                    )
+                    metrics.CHROMADB_BATCH_SIZE.observe(len(ids))
+                    with tracing.async_span(
+                        "collection.add",
+                        category="chromadb",
+                        collection=collection_name,
+                        chunks=len(ids),
+                    ):
+                        await collection.add(
+                            ids=ids,
+                            documents=documents,
+                            metadatas=cast(Any, metadatas),
+                        )
 
                     return len(batch_chunks)
+                finally:
+                    self._semaphore.release()
 
             # Execute all batches concurrently
             batch_results = await asyncio.gather(
@@ -6,6 +6,8 @@ from typing import Any, cast
 from ..config import Settings
 from ..core.metadata import MetadataExtractor
 from ..core.models import DocumentChunk, InsertResult
+from ..core.timing import StageTimer
+from ..utils import metrics, tracing
 from ..utils.errors import ChromaDBError, NetworkError
 from ..utils.logging import get_logger
 from .utils import check_socket_connectivity
@@ -286,6 +288,9 @@ class ChromaDBClient:
                             break  # Success, exit retry loop
                         except Exception as retry_error:
                             if attempt < max_retries - 1:
+                                metrics.CHROMADB_RETRIES.inc(
+                                    operation="create_collection"
+                                )
                                 logger.warning(
                                     f"Collection creation attempt {attempt + 1} "
                                     f"failed: {retry_error}. Retrying in "
@@ -388,12 +393,14 @@ class ChromaDBClient:
         self,
         collection: Any,
         chunks: list[DocumentChunk],  # chromadb.Collection
+        timer: StageTimer | None = None,
     ) -> InsertResult:
         """Bulk insert chunks into collection.
 
         Args:
             collection: Target ChromaDB collection
             chunks: List of document chunks to insert
+            timer: Records the sanitize and insert stages
 
         Returns:
             InsertResult with operation details
@@ -419,6 +426,7 @@ class ChromaDBClient:
             for batch_start in range(0, len(chunks), batch_size):
                 batch_end = min(batch_start + batch_size, len(chunks))
                 batch_chunks = chunks[batch_start:batch_end]
+                stage_start = time.perf_counter_ns()
 
                 # Prepare data for insertion
                 ids = [
@@ -448,11 +456,22 @@ class ChromaDBClient:
 
                 # Validate data before insertion
                 self._validate_insertion_data(ids, documents, metadatas)
+                if timer is not None:
+                    stage_start = timer.record("sanitize", stage_start)
 
                 # Insert batch into collection
-                collection.add(
-                    ids=ids, documents=documents, metadatas=cast(Any, metadatas)
-                )
+                metrics.CHROMADB_BATCH_SIZE.observe(len(ids))
+                with tracing.span(
+                    "collection.add",
+                    category="chromadb",
+                    collection=collection_name,
+                    chunks=len(ids),
+                ):
+                    collection.add(
+                        ids=ids, documents=documents, metadatas=cast(Any, metadatas)
+                    )
+                if timer is not None:
+                    timer.record("insert", stage_start)
 
                 total_inserted += len(batch_chunks)
 
@@ -6,6 +6,7 @@ from urllib.parse import urljoin
 import httpx
 from pydantic import BaseModel
 
+from shard_markdown.utils import metrics
 from shard_markdown.utils.errors import ChromaDBConnectionError
 from shard_markdown.utils.logging import get_logger
 
@@ -82,6 +83,7 @@ class ChromaDBVersionDetector:
                     return True, response.text
             except Exception as e:
                 if attempt < self.max_retries - 1:
+                    metrics.CHROMADB_RETRIES.inc(operation="version_detection")
                     logger.debug(
                         f"Request to {url} failed "
                         f"(attempt {attempt + 1}/{self.max_retries}): {e}"
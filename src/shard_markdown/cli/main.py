@@ -1,16 +1,106 @@
 """Shard Markdown - Intelligent markdown document chunking."""
 
+import importlib
+import signal
 import sys
+import threading
+from collections.abc import Iterable
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
 
 import click
 
-from ..config import load_config
-from ..core.chunking.engine import ChunkingEngine
-from ..core.metadata import MetadataExtractor
-from ..core.parser import MarkdownParser
-from ..utils.logging import setup_logging
-from .processor import display_results, process_file
+from ..core.chunking.strategies import BUILTIN_STRATEGIES
+
+
+if TYPE_CHECKING:
+    from ..config import load_config
+    from ..config.settings import Settings
+    from ..core.boilerplate import BoilerplateFilter
+    from ..core.cache import ChunkCache
+    from ..core.chunking.engine import ChunkingEngine
+    from ..core.dedup import ChunkDeduplicator
+    from ..core.metadata import MetadataExtractor
+    from ..core.models import StrategyEvaluation
+    from ..core.parser import MarkdownParser
+    from ..core.processor import DocumentProcessor
+    from ..core.timing import (
+        SlowFileReport,
+        TimingAggregator,
+        start_memory_tracking,
+        stop_memory_tracking,
+    )
+    from ..daemon.protocol import default_socket_path
+    from ..daemon.server import DaemonServer
+    from ..utils.errors import ShardMarkdownError
+    from ..utils.logging import setup_logging
+    from ..utils.scanner import ScannedFile
+    from .output import ChunkWriter
+    from .parallel import ParallelProcessor
+    from .processor import (
+        compare_file,
+        display_comparison,
+        display_file_report,
+        display_profile,
+        display_results,
+        display_timings,
+        learn_boilerplate,
+        process_file,
+        stream_file,
+    )
+
+
+# Processing pulls in pydantic, rich and the markdown extensions, so it is
+# imported when a command runs rather than at startup; ``--help`` and
+# ``--version`` never load it. The names stay module attributes, so they
+# can be patched as usual.
+_LAZY_IMPORTS = {
+    "load_config": "..config",
+    "BoilerplateFilter": "..core.boilerplate",
+    "ChunkCache": "..core.cache",
+    "ChunkingEngine": "..core.chunking.engine",
+    "ChunkDeduplicator": "..core.dedup",
+    "MetadataExtractor": "..core.metadata",
+    "StrategyEvaluation": "..core.models",
+    "MarkdownParser": "..core.parser",
+    "DocumentProcessor": "..core.processor",
+    "SlowFileReport": "..core.timing",
+    "TimingAggregator": "..core.timing",
+    "start_memory_tracking": "..core.timing",
+    "stop_memory_tracking": "..core.timing",
+    "default_socket_path": "..daemon.protocol",
+    "DaemonServer": "..daemon.server",
+    "ShardMarkdownError": "..utils.errors",
+    "setup_logging": "..utils.logging",
+    "ChunkWriter": ".output",
+    "ParallelProcessor": ".parallel",
+    "compare_file": ".processor",
+    "display_comparison": ".processor",
+    "display_file_report": ".processor",
+    "display_profile": ".processor",
+    "display_results": ".processor",
+    "display_timings": ".processor",
+    "learn_boilerplate": ".processor",
+    "process_file": ".processor",
+    "stream_file": ".processor",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a processing dependency on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def _import_dependencies() -> None:
+    """Bind every lazy dependency not already set, e.g. by a test patch."""
+    for name in _LAZY_IMPORTS:
+        if name not in globals():
+            __getattr__(name)
 
 
 def validate_size(ctx: click.Context, param: click.Parameter, value: int) -> int:
@@ -37,7 +127,7 @@ def validate_size_overlap_relationship(
 
 
 @click.command()
-@click.argument("input", type=click.Path(exists=True), required=True)
+@click.argument("input", type=click.Path(exists=True, allow_dash=True), required=False)
 @click.option(
     "--size",
     "-s",
@@ -56,13 +146,42 @@ def validate_size_overlap_relationship(
 )
 @click.option(
     "--strategy",
-    type=click.Choice(
-        ["token", "sentence", "paragraph", "section", "semantic", "structure", "fixed"]
-    ),
+    type=str,
     default="token",
-    help="Chunking strategy",
+    help=(
+        f"Chunking strategy: {', '.join(BUILTIN_STRATEGIES)} "
+        "or the name of an installed chunker plugin"
+    ),
+)
+@click.option(
+    "--compare",
+    "compare_strategies",
+    type=str,
+    default=None,
+    help="Comma-separated strategies to compare in one pass (nothing is stored)",
 )
 @click.option("--recursive", "-r", is_flag=True, help="Process directories recursively")
+@click.option(
+    "--ignore",
+    "ignore_patterns",
+    multiple=True,
+    help="Skip paths matching this .gitignore-style pattern (repeatable); "
+    ".gitignore files, .git and node_modules are always honoured",
+)
+@click.option(
+    "--files-from",
+    type=click.File("rb"),
+    default=None,
+    help="Process the markdown files listed in this file instead of INPUT, one "
+    "per line or NUL-separated; - reads the list from stdin",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Chunk files in this many worker processes, largest files first",
+)
 @click.option(
     "--store",
     is_flag=True,
@@ -79,31 +198,146 @@ def validate_size_overlap_relationship(
 @click.option("--metadata", "-m", is_flag=True, help="Include metadata in chunks")
 @click.option("--preserve-structure", is_flag=True, help="Maintain markdown structure")
 @click.option("--dry-run", is_flag=True, help="Preview without storing")
+@click.option(
+    "--dedup",
+    type=click.Choice(["skip", "link"]),
+    default=None,
+    help="Skip duplicate chunks across the input, or keep them linked to the "
+    "first copy via duplicate_of",
+)
+@click.option(
+    "--strip-boilerplate",
+    is_flag=True,
+    help="Drop navigation, banners and footers repeated across the input "
+    "files before chunking",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Reuse chunks of unchanged files from this cache directory",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Stream files through a bounded window (for very large documents)",
+)
+@click.option(
+    "--output",
+    "output_format",
+    type=click.Choice(["table", "jsonl"]),
+    default="table",
+    help="Show a results table, or write every chunk as one JSON line as it "
+    "is produced",
+)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=Path),
+    default=None,
+    help="Write JSON lines to this file instead of stdout (implies --output "
+    "jsonl); .gz and .zst files are compressed",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Print the time spent in each processing stage (read, parse, chunk, "
+    "metadata, insert, ...) with percentiles across files",
+)
+@click.option(
+    "--file-report",
+    type=click.IntRange(min=1),
+    is_flag=False,
+    flag_value=10,
+    default=None,
+    help="Track each file's peak memory (tracemalloc, slower) and time, and "
+    "list the N slowest and most memory-hungry files (default: 10)",
+)
+@click.option(
+    "--trace-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Record a timeline of files, stages, worker waits and ChromaDB calls "
+    "as Chrome trace-event JSON (open it in Perfetto)",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(["cpu", "sample"]),
+    is_flag=False,
+    flag_value="cpu",
+    default=None,
+    help="Profile the run, workers included, and print the hottest functions: "
+    "with cProfile, or by sampling stacks with --profile=sample",
+)
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Profile file: pstats, or collapsed stacks when sampling (default: "
+    "shard-md.prof or shard-md.collapsed)",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write Prometheus metrics to this node-exporter textfile (*.prom) "
+    "during and at the end of the run",
+)
+@click.option(
+    "--metrics-interval",
+    type=click.FloatRange(min=0.1),
+    default=15.0,
+    help="Seconds between metrics file writes during the run (default: 15)",
+)
 @click.option(
     "--config-path", type=click.Path(exists=True), help="Use alternate config file"
 )
+@click.option(
+    "--daemon/--no-daemon",
+    default=True,
+    help="Forward to a running 'shard-md serve' daemon (default: when one is "
+    "listening)",
+)
 @click.option("--quiet", "-q", is_flag=True, help="Suppress output (when storing)")
 @click.option("--verbose", "-v", count=True, help="Verbose output")
 @click.version_option(version="0.2.0", prog_name="shard-md")
 def shard_md(
-    input: str,
+    input: str | None,
     size: int,
     overlap: int,
     strategy: str,
+    compare_strategies: str | None,
     recursive: bool,
+    ignore_patterns: tuple[str, ...],
+    files_from: BinaryIO | None,
+    jobs: int,
     store: str | None,
     collection: str | None,
     metadata: bool,
     preserve_structure: bool,
     dry_run: bool,
+    dedup: str | None,
+    strip_boilerplate: bool,
+    cache_dir: Path | None,
+    stream: bool,
+    output_format: str,
+    output_file: Path | None,
+    timings: bool,
+    file_report: int | None,
+    trace_out: Path | None,
+    profile: str | None,
+    profile_out: Path | None,
+    metrics_file: Path | None,
+    metrics_interval: float,
     config_path: str | None,
+    daemon: bool,
     quiet: bool,
     verbose: int,
 ) -> None:
     """Intelligently chunk markdown documents.
 
     Process markdown files or directories into semantic chunks optimized
-    for retrieval and analysis.
+    for retrieval and analysis. An INPUT of - reads one document from
+    stdin.
 
     Examples:
       # Simple usage - display chunks
@@ -118,6 +352,53 @@ def shard_md(
       # Or explicitly specify vectordb
       shard-md manual.md --store vectordb --collection documentation
 
+      # Stream a multi-GB export without loading it into memory
+      shard-md wiki-export.md --stream --store --collection wiki
+
+      # Compare strategies on a corpus, parsing each document once
+      shard-md docs/ -r --compare structure,semantic,section,token
+
+      # Store a docs tree once, skipping repeated boilerplate chunks
+      shard-md docs/ -r --dedup skip --store --collection docs
+
+      # Remove site navigation and footers shared by exported pages
+      shard-md site-export/ -r --strip-boilerplate
+
+      # Export every chunk to a compressed JSON-lines file
+      shard-md docs/ -r --output-file chunks.jsonl.gz
+
+      # Chunk a large tree on eight cores, skipping generated docs
+      shard-md docs/ -r -j 8 --ignore "_build/"
+
+      # Process exactly the files that changed, in one process
+      git diff -z --name-only HEAD~1 | shard-md --files-from - -j 8
+
+      # Chunk a document piped from another tool
+      pandoc -t gfm report.docx | shard-md - --output jsonl
+
+      # Re-run quickly on a mostly unchanged tree
+      shard-md docs/ -r --cache-dir ~/.cache/shard-md
+
+      # See where a slow run spends its time
+      shard-md docs/ -r --timings --quiet
+
+      # Find the files that take longest or need the most memory
+      shard-md docs/ -r --file-report=20 --quiet
+
+      # Record a parallel run's timeline for https://ui.perfetto.dev
+      shard-md docs/ -r -j 8 --trace-out trace.json
+
+      # Profile a run and its workers into a flamegraph-ready file
+      shard-md docs/ -r -j 8 --profile=sample --profile-out run.collapsed
+
+      # Report a cron job's throughput to node-exporter
+      shard-md docs/ -r -q --metrics-file "$TEXTFILE_DIR/shard_md.prom"
+
+      # Keep a warm daemon for editor and pre-commit hooks; later runs
+      # forward to it while it is listening
+      shard-md serve &
+      shard-md notes.md --store --collection notes --quiet
+
       # Dry run with verbose output
       shard-md large-doc.md --dry-run --verbose
 
@@ -127,6 +408,13 @@ def shard_md(
       # Process and store quietly
       shard-md *.md --store --collection my-docs --quiet
     """
+    if (input is None) == (files_from is None):
+        raise click.UsageError("Pass an INPUT path or --files-from, but not both")
+
+    from ..utils import tracing
+
+    exporter = None
+    slow_files = None
     try:
         # Validate parameter relationships
         if store and not collection:
@@ -142,85 +430,535 @@ def shard_md(
             )
             overlap = max(0, size - 1)
 
+        if output_file is not None:
+            output_format = "jsonl"
+        if output_format == "jsonl" and compare_strategies:
+            raise click.ClickException("--output jsonl cannot be used with --compare")
+
+        # Standard input holds a single document, chunked from memory
+        stdin_content: str | None = None
+        if input == "-":
+            if stream:
+                raise click.ClickException("--stream needs a file, not stdin")
+            stdin_content = sys.stdin.buffer.read().decode("utf-8")
+
+        scanned = _collect_files(input, recursive, ignore_patterns, files_from, quiet)
+        files = [f.path for f in scanned]
+
+        # Runs that keep state across the whole input or use their own
+        # configuration are processed locally
+        local_only = (
+            compare_strategies
+            or stream
+            or dedup
+            or strip_boilerplate
+            or cache_dir
+            or config_path
+            or file_report
+            or trace_out
+            or profile
+            or metrics_file
+            or output_format == "jsonl"
+        )
+        if daemon and not local_only:
+            forwarded = _forward_to_daemon(
+                scanned,
+                _load_run_config(config_path, size, overlap, strategy),
+                store,
+                collection,
+                metadata,
+                dry_run,
+                quiet,
+                stdin_content,
+            )
+            if forwarded is not None:
+                if forwarded and (timings or not quiet):
+                    _import_dependencies()
+                if not quiet and forwarded:
+                    display_results(forwarded)
+                if timings:
+                    forwarded_timings = TimingAggregator()
+                    for result in forwarded:
+                        forwarded_timings.add(result.get("timings", {}))
+                    display_timings(
+                        forwarded_timings.summary(), forwarded_timings.files
+                    )
+                return
+
+        _import_dependencies()
+        if trace_out is not None:
+            tracing.start()
+        if profile is not None:
+            from ..utils import profiling
+
+            profiling.start(profile)
+        from ..utils import metrics
+
+        metrics.RUN_START.set_to_current_time()
+        metrics.INPUT_FILES.set(len(scanned))
+        if metrics_file is not None:
+            exporter = metrics.TextfileExporter(
+                metrics.REGISTRY, metrics_file, metrics_interval
+            )
+            exporter.start()
+
         # Setup logging
         log_level = 40 if quiet else max(10, 30 - (verbose * 10))
         setup_logging(level=log_level)
 
-        # Load configuration
-        if config_path:
-            config = load_config(Path(config_path))
-        else:
-            config = load_config()
-
-        # Override config with CLI options
-        if size != 1000:
-            config.chunk_size = size
-        if overlap != 200:
-            config.chunk_overlap = overlap
-        if strategy:
-            # Map strategy to method for backward compatibility
-            if strategy in ["structure", "fixed"]:
-                config.chunk_method = strategy
-            else:
-                config.chunk_method = strategy  # Will be handled by new strategies
+        config = _load_run_config(config_path, size, overlap, strategy)
+        if dedup:
+            config.process_dedup = dedup
+        if strip_boilerplate:
+            config.process_strip_boilerplate = True
+        if cache_dir:
+            config.process_cache_dir = cache_dir
 
         # Initialize components
         parser = MarkdownParser()
         chunker = ChunkingEngine(config)
+        # Plugin names can only be checked once configured plugins are known
+        if strategy not in BUILTIN_STRATEGIES and strategy not in chunker.strategies:
+            raise click.ClickException(
+                f"Unknown chunking strategy: {strategy}. "
+                f"Available: {', '.join(chunker.strategies)}"
+            )
         metadata_extractor = MetadataExtractor()
-
-        # Process input
-        input_path = Path(input)
-        all_results = []
-
-        if input_path.is_file():
-            if input_path.suffix.lower() in [".md", ".markdown"]:
-                results = process_file(
-                    input_path,
-                    parser,
-                    chunker,
-                    metadata_extractor,
-                    store,
-                    collection,
-                    metadata,
-                    preserve_structure,
-                    dry_run,
-                    quiet,
+        processor = DocumentProcessor(config) if stream else None
+        writer = ChunkWriter(output_file) if output_format == "jsonl" else None
+        # Progress messages must not end up among JSON lines on stdout
+        file_quiet = quiet or (writer is not None and writer.to_stdout)
+        deduplicator = None if processor else ChunkDeduplicator.from_settings(config)
+        boilerplate = None if processor else BoilerplateFilter.from_settings(config)
+        cache = None if processor else ChunkCache.from_settings(config)
+
+        strategies_to_compare = []
+        if compare_strategies:
+            strategies_to_compare = [
+                name.strip() for name in compare_strategies.split(",") if name.strip()
+            ]
+            unknown = [n for n in strategies_to_compare if n not in chunker.strategies]
+            if unknown:
+                raise click.ClickException(
+                    f"Unknown strategies for --compare: {', '.join(unknown)}"
                 )
-                if results:
-                    all_results.append(results)
-        elif input_path.is_dir():
-            pattern = "**/*.md" if recursive else "*.md"
-            for md_file in input_path.glob(pattern):
-                results = process_file(
+        comparison: dict[str, StrategyEvaluation] = {}
+        stage_timings = TimingAggregator() if timings else None
+        if file_report is not None:
+            start_memory_tracking()
+            slow_files = SlowFileReport(file_report)
+
+        def handle(md_file: Path) -> dict | None:
+            with tracing.span("file", category="file", path=str(md_file)):
+                return process(md_file)
+
+        def process(md_file: Path) -> dict | None:
+            if strategies_to_compare:
+                evaluations = compare_file(
+                    md_file, parser, chunker, strategies_to_compare, stdin_content
+                )
+                for name, evaluation in (evaluations or {}).items():
+                    if name in comparison:
+                        comparison[name].merge(evaluation)
+                    else:
+                        comparison[name] = evaluation
+                return None
+            if processor is not None:
+                return stream_file(
                     md_file,
-                    parser,
-                    chunker,
-                    metadata_extractor,
+                    processor,
                     store,
                     collection,
-                    metadata,
-                    preserve_structure,
                     dry_run,
-                    quiet,
+                    file_quiet,
+                    writer=writer,
                 )
-                if results:
+            result = process_file(
+                md_file,
+                parser,
+                chunker,
+                metadata_extractor,
+                store,
+                collection,
+                metadata,
+                preserve_structure,
+                dry_run,
+                file_quiet,
+                deduplicator,
+                boilerplate,
+                cache,
+                stdin_content,
+            )
+            if writer is not None and result is not None:
+                writer.write_all(result["chunks"])
+            return result
+
+        # Process input
+        all_results = []
+
+        # Boilerplate is learned from the whole input before chunking; a
+        # single document from stdin has nothing repeated across files
+        if not strategies_to_compare and stdin_content is None:
+            if processor is not None:
+                processor.learn_boilerplate(files)
+            elif boilerplate is not None:
+                learn_boilerplate(files, parser, boilerplate)
+
+        # Streaming, comparison and stdin runs stay in this process
+        parallel = (
+            ParallelProcessor(config, jobs, metadata, boilerplate)
+            if jobs > 1
+            and processor is None
+            and not strategies_to_compare
+            and stdin_content is None
+            else None
+        )
+        outcomes: Iterable[dict | None]
+        if parallel is not None:
+            outcomes = parallel.process(
+                scanned, store, collection, dry_run, file_quiet, deduplicator
+            )
+        else:
+            outcomes = (handle(md_file) for md_file in files)
+
+        written_files = 0
+        try:
+            for results in outcomes:
+                if writer is not None and parallel is not None and results:
+                    writer.write_all(results["chunks"])
+                if not results:
+                    continue
+                metrics.observe_file(results)
+                if stage_timings is not None:
+                    stage_timings.add(results.get("timings", {}))
+                if slow_files is not None:
+                    slow_files.add(
+                        results.get("path", results["file"]),
+                        results.get("timings", {}),
+                        results["count"],
+                        results.get("peak_memory"),
+                        results.get("elements"),
+                    )
+                # Written chunks are not kept, so memory stays flat
+                if writer is not None:
+                    written_files += 1
+                else:
                     all_results.append(results)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if deduplicator is not None:
+            deduplicator.close()
+
+        if writer is not None and not quiet:
+            click.echo(
+                f"Wrote {writer.chunks_written} chunks from {written_files} files "
+                f"to {writer.path or 'stdout'}",
+                err=True,
+            )
 
         # Display results
         if not quiet and all_results:
             display_results(all_results)
+        if not quiet and comparison:
+            display_comparison(comparison)
+        if stage_timings is not None and stage_timings.files:
+            display_timings(
+                stage_timings.summary(),
+                stage_timings.files,
+                err=writer is not None and writer.to_stdout,
+            )
+        if slow_files is not None:
+            display_file_report(slow_files, err=writer is not None and writer.to_stdout)
+
+        metrics.LAST_SUCCESS.set_to_current_time()
 
     except Exception as e:
+        if exporter is not None:
+            metrics.observe_error(e)
         from rich.console import Console
 
         Console().print(f"[red]Error:[/red] {str(e)}")
         sys.exit(1)
+    finally:
+        if profile is not None:
+            _save_profile(profile_out, quiet)
+        if exporter is not None:
+            exporter.close()
+        if slow_files is not None:
+            stop_memory_tracking()
+        # A partial timeline still shows where a failed run was
+        recorder = tracing.stop()
+        if recorder is not None and trace_out is not None:
+            recorder.write(trace_out)
+            if not quiet:
+                click.echo(
+                    f"Wrote {len(recorder.events)} trace events to {trace_out}",
+                    err=True,
+                )
+
+
+def _save_profile(output: Path | None, quiet: bool) -> None:
+    """Stop profiling, then write and summarize the merged profile."""
+    from ..utils import profiling
+
+    profiler = profiling.stop()
+    if profiler is None:
+        return
+    output = output or Path(profiling.DEFAULT_OUTPUT[profiler.mode])
+    profiler.save(output)
+    display_profile(profiler.top(), profiler.mode, profiler.processes, err=True)
+    if not quiet:
+        click.echo(
+            f"Wrote profile of {profiler.processes} processes to {output}", err=True
+        )
+
+
+def _collect_files(
+    input: str | None,
+    recursive: bool,
+    ignore_patterns: tuple[str, ...] = (),
+    files_from: BinaryIO | None = None,
+    quiet: bool = False,
+) -> list["ScannedFile"]:
+    """List the markdown files to process, with their sizes.
+
+    Standard input is listed as a single document labelled ``-``.
+    """
+    from ..utils.scanner import (
+        DEFAULT_IGNORE_PATTERNS,
+        STDIN_PATH,
+        FileScanner,
+        ScannedFile,
+        read_file_list,
+    )
+
+    if input == "-":
+        return [ScannedFile(STDIN_PATH, 0)]
+
+    scanner = FileScanner(
+        recursive=recursive,
+        ignore_patterns=(*DEFAULT_IGNORE_PATTERNS, *ignore_patterns),
+    )
+    if files_from is None:
+        return scanner.scan(Path(str(input)))
+
+    scanned = scanner.scan_paths(read_file_list(files_from))
+    if scanner.missing and not quiet:
+        click.echo(
+            f"Warning: skipped {len(scanner.missing)} listed paths that do not "
+            f"exist, e.g. {scanner.missing[0]}",
+            err=True,
+        )
+    return scanned
+
+
+def _load_run_config(
+    config_path: str | None, size: int, overlap: int, strategy: str
+) -> "Settings":
+    """Load the configuration a run chunks with, CLI options applied."""
+    # Forwarded runs need it before the processing stack is imported
+    if "load_config" not in globals():
+        __getattr__("load_config")
+    config = load_config(Path(config_path)) if config_path else load_config()
+
+    # Override config with CLI options
+    if size != 1000:
+        config.chunk_size = size
+    if overlap != 200:
+        config.chunk_overlap = overlap
+    if strategy:
+        config.chunk_method = strategy
+    return config
+
+
+def _forward_to_daemon(
+    scanned: list["ScannedFile"],
+    config: "Settings",
+    store: str | None,
+    collection: str | None,
+    metadata: bool,
+    dry_run: bool,
+    quiet: bool,
+    stdin_content: str | None = None,
+) -> list[dict] | None:
+    """Process files in a running daemon instead of this process.
+
+    A document read from stdin is sent along with its request. Requests
+    carry the chunk size, overlap and strategy of ``config``; other settings
+    cannot be forwarded, so runs stay local unless the daemon's chunking
+    settings then match ``config`` exactly.
+
+    Returns:
+        Per-file results as ``process_file`` reports them, or None when no
+        daemon is listening, its socket belongs to another user or it would
+        chunk differently
+    """
+    from ..core.cache import settings_fingerprint
+    from ..daemon.protocol import DaemonClient
+    from ..utils.errors import NetworkError
+    from ..utils.scanner import largest_first
+
+    try:
+        client = DaemonClient.connect_if_running()
+    except NetworkError as e:
+        if not quiet:
+            click.echo(f"Warning: {e.message}; processing locally", err=True)
+        return None
+    if client is None:
+        return None
+
+    options = {
+        "chunk_method": config.chunk_method,
+        "chunk_size": config.chunk_size,
+        "chunk_overlap": config.chunk_overlap,
+    }
+    ingest = bool(store and not dry_run)
+    requests: list[dict[str, Any]] = []
+    for md_file, _ in largest_first(scanned):
+        request = {
+            "op": "ingest" if ingest else "chunk",
+            "path": str(md_file.resolve()),
+            "source": str(md_file),
+            "options": options,
+            "metadata": metadata,
+            "collection": collection,
+            "include_chunks": False,
+        }
+        if stdin_content is not None:
+            request.update(path=str(md_file), content=stdin_content)
+        requests.append(request)
+
+    with client:
+        ping = client.request("ping", options=options)
+        if not ping.get("ok"):
+            raise click.ClickException(f"Daemon error: {ping.get('error')}")
+        strategies = ping["result"]["strategies"]
+        if options["chunk_method"] not in strategies:
+            raise click.ClickException(
+                f"Unknown chunking strategy: {options['chunk_method']}. "
+                f"Available: {', '.join(strategies)}"
+            )
+        if ping["result"].get("settings_fingerprint") != settings_fingerprint(config):
+            return None
+        responses = client.request_many(requests)
+
+    # The daemon gets the largest files first; results are reported in order
+    by_path = {
+        md_file: response
+        for (md_file, _), response in zip(
+            largest_first(scanned), responses, strict=True
+        )
+    }
+    results = []
+    for md_file, _ in scanned:
+        response = by_path[md_file]
+        if not response.get("ok"):
+            click.echo(
+                f"Failed to process {md_file}: {response.get('error')}", err=True
+            )
+            continue
+        result = response["result"]
+        if not result["count"]:
+            continue
+        if ingest and not quiet:
+            click.echo(
+                f"✓ Stored {result['count']} chunks from {md_file.name} "
+                f"to collection '{collection}'"
+            )
+        results.append(result)
+    return results
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Unix socket to listen on (default: $SHARD_MD_SOCKET or a per-user "
+    "socket in the runtime directory)",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=4,
+    help="Requests processed concurrently (default: 4)",
+)
+@click.option(
+    "--config-path", type=click.Path(exists=True), help="Use alternate config file"
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(min=0, max=65535),
+    default=None,
+    help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics",
+)
+@click.option("--verbose", "-v", count=True, help="Verbose output (-vv per request)")
+def serve(
+    socket_path: Path | None,
+    workers: int,
+    config_path: str | None,
+    metrics_port: int | None,
+    verbose: int,
+) -> None:
+    """Serve chunk and ingest requests from a warm daemon.
+
+    The daemon keeps parsers, chunkers and the vector database connection
+    alive between requests. While it is listening, shard-md runs forward
+    their files to it; pass --no-daemon to process locally. Requests are
+    JSON lines on a Unix socket, so editors can also talk to it directly.
+
+    Examples:
+      # Start a daemon with eight workers
+      shard-md serve --workers 8
+
+      # Expose its metrics to Prometheus
+      shard-md serve --metrics-port 9464
+
+      # Stop it with Ctrl-C or SIGTERM
+    """
+    _import_dependencies()
+    setup_logging(level=max(10, 30 - (verbose * 10)))
+    config = load_config(Path(config_path)) if config_path else load_config()
+    server = DaemonServer(config, socket_path or default_socket_path(), workers)
+
+    # shutdown() waits for the serving loop, so it cannot run in this thread
+    signal.signal(
+        signal.SIGTERM,
+        lambda *_: threading.Thread(target=server.shutdown, daemon=True).start(),
+    )
+    click.echo(f"shard-md daemon listening on {server.socket_path}")
+    metrics_server = None
+    try:
+        if metrics_port is not None:
+            from ..utils import metrics
+
+            metrics_server = metrics.serve_metrics(metrics.REGISTRY, metrics_port)
+            click.echo(
+                "Serving metrics on "
+                f"http://127.0.0.1:{metrics_server.server_port}/metrics"
+            )
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except ShardMarkdownError as e:
+        raise click.ClickException(e.message) from e
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
 
 def main() -> None:
     """Entry point for the CLI application."""
-    shard_md()
+    # The main command takes a path argument, so subcommands are dispatched
+    # here rather than through a click group
+    if sys.argv[1:2] == ["serve"]:
+        serve(args=sys.argv[2:], prog_name="shard-md serve")
+    else:
+        shard_md()
 
 
 if __name__ == "__main__":
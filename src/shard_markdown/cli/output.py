@@ -0,0 +1,172 @@
+"""Streaming JSON-lines output of chunks."""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+from typing import IO, Any
+
+from ..utils.errors import ConfigurationError, FileSystemError
+
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+COMPRESSIONS = ("gzip", "zstd")
+
+# Lines are collected and written in blocks of about this many bytes
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+_SUFFIX_COMPRESSION = {".gz": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+def compression_for(path: Path | None) -> str | None:
+    """Infer the compression of an output file from its suffix.
+
+    Args:
+        path: Output file, or None for standard output
+
+    Returns:
+        ``gzip``, ``zstd`` or None
+    """
+    if path is None:
+        return None
+    return _SUFFIX_COMPRESSION.get(path.suffix.lower())
+
+
+class ChunkWriter:
+    """Write chunks as JSON lines while they are produced.
+
+    Each chunk becomes one line with its ID, content, metadata and offsets.
+    Lines are buffered and written in blocks, optionally through gzip or
+    zstd compression, and nothing is kept once written, so memory use does
+    not grow with the number of chunks.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        compression: str | None = None,
+        buffer_size: int = WRITE_BUFFER_SIZE,
+    ) -> None:
+        """Open the output.
+
+        Args:
+            path: Output file; None or ``-`` writes to standard output
+            compression: ``gzip`` or ``zstd``; inferred from the file suffix
+                when not given
+            buffer_size: Bytes collected before each write
+
+        Raises:
+            ConfigurationError: If the compression is unknown or unavailable
+            FileSystemError: If the file cannot be opened
+        """
+        if path is not None and str(path) == "-":
+            path = None
+        self.path = path
+        self.compression = compression or compression_for(path)
+        self.buffer_size = buffer_size
+        self.chunks_written = 0
+        self.bytes_written = 0
+        self._buffer = bytearray()
+
+        if self.compression not in (None, *COMPRESSIONS):
+            raise ConfigurationError(
+                f"Unknown output compression: {self.compression}",
+                error_code=1110,
+                context={"compression": self.compression, "supported": COMPRESSIONS},
+            )
+        if self.compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ConfigurationError(
+                "zstd output requires the zstandard package",
+                error_code=1110,
+                context={"compression": "zstd", "install": "shard-markdown[zstd]"},
+            )
+
+        # Lines are buffered here, so files are opened unbuffered
+        try:
+            self._file: IO[bytes] = (
+                path.open("wb", buffering=0) if path is not None else sys.stdout.buffer
+            )
+        except OSError as e:
+            raise FileSystemError(
+                f"Cannot open output file: {path}",
+                error_code=1208,
+                context={"output_file": str(path)},
+                cause=e,
+            ) from e
+
+        # Compressors wrap the file and are closed before it
+        self._stream: Any = self._file
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._file, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(
+                self._file, closefd=False
+            )
+
+    @property
+    def to_stdout(self) -> bool:
+        """Check whether lines go to standard output."""
+        return self.path is None
+
+    def write(self, chunk: Any) -> None:
+        """Write one chunk.
+
+        Args:
+            chunk: Document chunk
+        """
+        record = {
+            "id": chunk.id,
+            "content": chunk.content,
+            "metadata": chunk.metadata,
+            "start_position": chunk.start_position,
+            "end_position": chunk.end_position,
+        }
+        line = json.dumps(
+            record, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+        self._buffer += line
+        self._buffer += b"\n"
+        self.chunks_written += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, chunks: list[Any]) -> None:
+        """Write several chunks.
+
+        Args:
+            chunks: Document chunks
+        """
+        for chunk in chunks:
+            self.write(chunk)
+
+    def flush(self) -> None:
+        """Write out buffered lines."""
+        if self._buffer:
+            self._stream.write(self._buffer)
+            self.bytes_written += len(self._buffer)
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush everything and close the output, leaving stdout open."""
+        self.flush()
+        if self._stream is not self._file:
+            self._stream.close()
+        if self.to_stdout:
+            self._file.flush()
+        else:
+            self._file.close()
+
+    def __enter__(self) -> "ChunkWriter":
+        """Use the writer as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the output on exit."""
+        self.close()
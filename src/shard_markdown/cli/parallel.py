@@ -0,0 +1,281 @@
+"""Chunking of files in worker processes."""
+
+import tracemalloc
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+from ..config.settings import Settings
+from ..core.boilerplate import BoilerplateFilter
+from ..core.cache import ChunkCache
+from ..core.chunking.engine import ChunkingEngine
+from ..core.dedup import ChunkDeduplicator
+from ..core.metadata import MetadataExtractor
+from ..core.parser import MarkdownParser
+from ..core.timing import PeakMemory, StageTimer, start_memory_tracking
+from ..utils import metrics, profiling, tracing
+from ..utils.logging import get_logger
+from ..utils.scanner import ScannedFile, largest_first
+from .processor import chunk_content, deduplicate_result, store_chunks
+
+
+logger = get_logger(__name__)
+
+# Small files are sent to workers in batches of about this many bytes, so
+# inter-process overhead does not dominate their chunking time
+BATCH_BYTES = 256 * 1024
+BATCH_MAX_FILES = 64
+
+# Components of the current worker process, built once by its initializer
+_worker: dict[str, Any] = {}
+
+# Results of a batch of files and the worker's trace events
+_BatchResult = tuple[list[dict | None], list[dict[str, Any]]]
+
+
+def _init_worker(
+    config: Settings,
+    include_metadata: bool,
+    boilerplate: BoilerplateFilter | None,
+    trace: bool = False,
+    profile: tuple[str, str] | None = None,
+    track_memory: bool = False,
+) -> None:
+    """Build the parser and chunkers of a worker process."""
+    if track_memory:
+        start_memory_tracking()
+    if profile is not None:
+        profiling.start_worker(*profile)
+    # A forked worker inherits the parent's recorder, whose events are not
+    # its own
+    if trace:
+        tracing.start("shard-md worker")
+    else:
+        tracing.stop()
+    _worker.update(
+        parser=MarkdownParser(),
+        chunker=ChunkingEngine(config),
+        metadata_extractor=MetadataExtractor(),
+        include_metadata=include_metadata,
+        boilerplate=boilerplate,
+        cache=ChunkCache.from_settings(config),
+    )
+
+
+def _chunk_files(file_paths: list[Path]) -> _BatchResult:
+    """Read and chunk a batch of files in a worker process.
+
+    Returns:
+        Per-file results and the trace events recorded meanwhile
+    """
+    with tracing.span("batch", category="worker", files=len(file_paths)):
+        results = [_chunk_file(file_path) for file_path in file_paths]
+    recorder = tracing.active()
+    return results, recorder.drain() if recorder is not None else []
+
+
+def _chunk_file(file_path: Path) -> dict | None:
+    """Read and chunk one file in a worker process.
+
+    Failures are returned rather than raised, since not every exception
+    survives the trip back to the parent process.
+    """
+    try:
+        with (
+            tracing.span("file", category="file", path=str(file_path)),
+            PeakMemory() as memory,
+        ):
+            timer = StageTimer()
+            start = perf_counter_ns()
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+            timer.record("read", start)
+            if not content.strip():
+                return None
+            result = chunk_content(
+                content,
+                file_path,
+                _worker["parser"],
+                _worker["chunker"],
+                _worker["metadata_extractor"],
+                _worker["include_metadata"],
+                boilerplate=_worker["boilerplate"],
+                cache=_worker["cache"],
+                timer=timer,
+            )
+        if result is not None:
+            result["peak_memory"] = memory.peak
+        return result
+    except Exception as e:
+        return {"error": str(e), "error_code": getattr(e, "error_code", "other")}
+
+
+class ParallelProcessor:
+    """Chunk files in worker processes, largest first.
+
+    Files are submitted in decreasing size (longest processing time first),
+    so the biggest documents do not start last and leave one worker running
+    alone at the end; small files travel in batches. At most ``window``
+    batches are in flight, and results are consumed in submission order,
+    which keeps memory bounded and output deterministic.
+
+    Workers only parse and chunk. Deduplication and storage keep state or
+    connections, so they run in this process as results arrive. While
+    tracing, workers record their own spans, which arrive with their
+    results, and time spent waiting for a batch is recorded here. While
+    profiling, each worker writes its own profile as it exits.
+    """
+
+    def __init__(
+        self,
+        config: Settings,
+        jobs: int,
+        include_metadata: bool,
+        boilerplate: BoilerplateFilter | None = None,
+        window: int | None = None,
+    ) -> None:
+        """Initialize processor.
+
+        Args:
+            config: Configuration settings
+            jobs: Number of worker processes
+            include_metadata: Whether to add file and document metadata
+            boilerplate: Filter learned from the whole input, if stripping
+            window: Most batches in flight, by default four per worker
+        """
+        self.config = config
+        self.jobs = jobs
+        self.include_metadata = include_metadata
+        self.boilerplate = boilerplate
+        self.window = window or jobs * 4
+
+    def process(
+        self,
+        files: list[ScannedFile],
+        store: str | None,
+        collection: str | None,
+        dry_run: bool,
+        quiet: bool,
+        deduplicator: ChunkDeduplicator | None = None,
+    ) -> Iterator[dict | None]:
+        """Process files and yield their results.
+
+        Args:
+            files: Files to process
+            store: Storage backend, if storing
+            collection: Target collection
+            dry_run: Whether to skip storing
+            quiet: Whether to suppress per-file messages
+            deduplicator: Deduplicator shared by the whole input
+
+        Yields:
+            Per-file results as ``process_file`` returns them, largest
+            file first
+        """
+        pending: deque[tuple[list[Path], Future[_BatchResult]]] = deque()
+        with ProcessPoolExecutor(
+            self.jobs,
+            initializer=_init_worker,
+            initargs=(
+                self.config,
+                self.include_metadata,
+                self.boilerplate,
+                tracing.active() is not None,
+                profiling.worker_options(),
+                tracemalloc.is_tracing(),
+            ),
+        ) as pool:
+            for batch in _batches(largest_first(files)):
+                pending.append((batch, pool.submit(_chunk_files, batch)))
+                if len(pending) < self.window:
+                    continue
+                batch, future = pending.popleft()
+                for file_path, result in self._collect(batch, future):
+                    yield self._finish(
+                        file_path,
+                        result,
+                        store,
+                        collection,
+                        dry_run,
+                        quiet,
+                        deduplicator,
+                    )
+            while pending:
+                for file_path, result in self._collect(*pending.popleft()):
+                    yield self._finish(
+                        file_path,
+                        result,
+                        store,
+                        collection,
+                        dry_run,
+                        quiet,
+                        deduplicator,
+                    )
+
+    @staticmethod
+    def _collect(
+        batch: list[Path], future: "Future[_BatchResult]"
+    ) -> list[tuple[Path, dict | None]]:
+        """Wait for a batch, turning a failed worker into per-file errors."""
+        try:
+            with tracing.span("wait", category="queue", files=len(batch)):
+                results, events = future.result()
+        except Exception as e:
+            return [(file_path, {"error": str(e)}) for file_path in batch]
+        recorder = tracing.active()
+        if recorder is not None:
+            recorder.events += events
+        return list(zip(batch, results, strict=True))
+
+    @staticmethod
+    def _finish(
+        file_path: Path,
+        result: dict | None,
+        store: str | None,
+        collection: str | None,
+        dry_run: bool,
+        quiet: bool,
+        deduplicator: ChunkDeduplicator | None,
+    ) -> dict | None:
+        """Deduplicate and store a worker's result."""
+        if result is not None and "error" in result:
+            metrics.ERRORS.inc(error_code=result.get("error_code", "other"))
+            logger.error(f"Failed to process {file_path}: {result['error']}")
+            return None
+        try:
+            if result is not None:
+                result = deduplicate_result(result, deduplicator)
+            if result is None or not store_chunks(
+                result["chunks"],
+                file_path,
+                store,
+                collection,
+                dry_run,
+                quiet,
+                StageTimer(result["timings"]),
+            ):
+                return None
+            return result
+        except Exception as e:
+            metrics.observe_error(e)
+            logger.error(f"Failed to process {file_path}: {e}")
+            return None
+
+
+def _batches(files: list[ScannedFile]) -> Iterator[list[Path]]:
+    """Group consecutive files into batches bounded by size and count."""
+    batch: list[Path] = []
+    size = 0
+    for scanned in files:
+        if batch and (
+            size + scanned.size > BATCH_BYTES or len(batch) >= BATCH_MAX_FILES
+        ):
+            yield batch
+            batch, size = [], 0
+        batch.append(scanned.path)
+        size += scanned.size
+    if batch:
+        yield batch
@@ -1,16 +1,30 @@
 """File processing utilities for the CLI."""
 
 from pathlib import Path
+from time import perf_counter_ns
+from typing import TYPE_CHECKING
 
 from rich.console import Console
 from rich.table import Table
 
-from ..core.chunking.engine import ChunkingEngine
+from ..core.boilerplate import BoilerplateFilter
+from ..core.cache import ChunkCache
+from ..core.chunking.engine import ChunkingEngine, link_parent_ids
+from ..core.dedup import ChunkDeduplicator
 from ..core.metadata import MetadataExtractor
+from ..core.models import DocumentChunk, StageTimingSummary, StrategyEvaluation
 from ..core.parser import MarkdownParser
+from ..core.processor import DocumentProcessor, generate_chunk_id
+from ..core.timing import FileCost, PeakMemory, SlowFileReport, StageTimer
+from ..utils import metrics
 from ..utils.logging import get_logger
+from ..utils.scanner import STDIN_PATH
+from .output import ChunkWriter
 
 
+if TYPE_CHECKING:
+    from ..utils.profiling import ProfileEntry
+
 console = Console()
 logger = get_logger(__name__)
 
@@ -26,88 +40,534 @@ def process_file(
     preserve_structure: bool,
     dry_run: bool,
     quiet: bool,
+    deduplicator: ChunkDeduplicator | None = None,
+    boilerplate: BoilerplateFilter | None = None,
+    cache: ChunkCache | None = None,
+    content: str | None = None,
 ) -> dict | None:
-    """Process a single markdown file."""
+    """Process a single markdown file.
+
+    ``content`` is the text of a document already read, e.g. from standard
+    input, which ``file_path`` then only labels. The result's ``timings``
+    hold the nanoseconds spent in each stage, and ``peak_memory`` the bytes
+    allocated at most while reading and chunking, if memory is tracked.
+    """
     try:
-        # Read file
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
+        timer = StageTimer()
+        start = perf_counter_ns()
+        with PeakMemory() as memory:
+            # Read file
+            if content is None:
+                with open(file_path, encoding="utf-8") as f:
+                    content = f.read()
+            timer.record("read", start)
 
-        if not content.strip():
+            if not content.strip():
+                return None
+
+            result = chunk_content(
+                content,
+                file_path,
+                parser,
+                chunker,
+                metadata_extractor,
+                include_metadata,
+                deduplicator,
+                boilerplate,
+                cache,
+                timer,
+            )
+        if result is None:
+            return None
+        result["peak_memory"] = memory.peak
+        if not store_chunks(
+            result["chunks"], file_path, store, collection, dry_run, quiet, timer
+        ):
             return None
 
+        return result
+
+    except Exception as e:
+        metrics.observe_error(e)
+        logger.error(f"Failed to process {file_path}: {e}")
+        return None
+
+
+def store_chunks(
+    chunks: list[DocumentChunk],
+    file_path: Path,
+    store: str | None,
+    collection: str | None,
+    dry_run: bool,
+    quiet: bool,
+    timer: StageTimer | None = None,
+) -> bool:
+    """Store a file's chunks if requested, timing the insert stage.
+
+    Returns False when the storage options are invalid.
+    """
+    # Store if requested (and not a dry run)
+    if store and not dry_run:
+        # Determine storage type
+        storage_type = "vectordb" if store in [True, "True", "true", ""] else store
+
+        # Validate collection name for vectordb
+        if storage_type == "vectordb" and not collection:
+            if not quiet:
+                console.print("[red]Error:[/red] --collection is required with --store")
+            return False
+
+    if store and not dry_run and storage_type == "vectordb":
+        try:
+            from ..storage.vectordb import VectorDBStorage
+
+            storage = VectorDBStorage()
+            if storage.is_available():
+                # Collection must be non-None here due to validation above
+                if collection is None:
+                    raise ValueError("Collection name is required for vectordb storage")
+                # Convert chunks to dictionaries for storage
+                chunk_dicts = [
+                    {
+                        "id": chunk.id,
+                        "content": chunk.content,
+                        "metadata": chunk.metadata,
+                    }
+                    for chunk in chunks
+                ]
+                start = perf_counter_ns()
+                storage.store(chunk_dicts, collection)
+                if timer is not None:
+                    timer.record("insert", start)
+                if not quiet:
+                    console.print(
+                        f"[green]✓[/green] Stored {len(chunks)} chunks "
+                        f"from {file_path.name} to collection '{collection}'"
+                    )
+            else:
+                if not quiet:
+                    console.print(
+                        "[yellow]Warning:[/yellow] Vector database not available"
+                    )
+        except ImportError:
+            if not quiet:
+                console.print("[yellow]Storage backend not available[/yellow]")
+
+    return True
+
+
+def chunk_content(
+    content: str,
+    file_path: Path,
+    parser: MarkdownParser,
+    chunker: ChunkingEngine,
+    metadata_extractor: MetadataExtractor,
+    include_metadata: bool,
+    deduplicator: ChunkDeduplicator | None = None,
+    boilerplate: BoilerplateFilter | None = None,
+    cache: ChunkCache | None = None,
+    timer: StageTimer | None = None,
+) -> dict | None:
+    """Chunk the text of a markdown file without storing the chunks.
+
+    Errors propagate to the caller; None means no chunks were produced.
+    Stage durations are added to ``timer`` and returned as ``timings``.
+    """
+    timer = timer if timer is not None else StageTimer()
+    start = perf_counter_ns()
+    # Boilerplate makes chunks depend on the rest of the input, so only
+    # standalone results are cached
+    if boilerplate is not None:
+        cache = None
+    cache_key = cache.key(content) if cache is not None else None
+    cached = cache.get(cache_key) if cache is not None and cache_key else None
+    if cache is not None:
+        start = timer.record("cache", start)
+
+    stripped = 0
+    elements = None
+    if cached is not None:
+        chunks, doc_metadata = cached
+    else:
         # Parse and chunk
-        ast = parser.parse(content)
+        ast = parser.parse(content, timer)
+        elements = len(ast.elements)
+        start = perf_counter_ns()
+        doc_metadata = (
+            metadata_extractor.extract_document_metadata(ast)
+            if include_metadata or cache is not None
+            else {}
+        )
+        start = timer.record("metadata", start)
+        if boilerplate is not None:
+            found = boilerplate.removed_blocks
+            ast = boilerplate.strip(ast)
+            stripped = boilerplate.removed_blocks - found
+            start = timer.record("boilerplate", start)
         chunks = chunker.chunk_document(ast)
+        start = timer.record("chunk", start)
+        if cache is not None and cache_key and chunks:
+            cache.put(cache_key, chunks, doc_metadata)
+            start = timer.record("cache", start)
 
-        if not chunks:
-            return None
+    if not chunks:
+        return None
+    assign_chunk_ids(chunks, file_path)
 
-        # Add metadata if requested
-        if include_metadata:
-            file_metadata = metadata_extractor.extract_file_metadata(file_path)
-            doc_metadata = metadata_extractor.extract_document_metadata(ast)
+    # Add metadata if requested
+    if include_metadata:
+        # Standard input has no file to describe
+        file_metadata = (
+            metadata_extractor.extract_file_metadata(file_path)
+            if file_path != STDIN_PATH
+            else {}
+        )
 
-            for chunk in chunks:
-                chunk.metadata.update(file_metadata)
-                chunk.metadata.update(doc_metadata)
-                chunk.metadata["source_file"] = str(file_path)
-        else:
-            # Always include source file at minimum
-            for chunk in chunks:
-                chunk.metadata["source_file"] = str(file_path)
+        for chunk in chunks:
+            chunk.metadata.update(file_metadata)
+            chunk.metadata.update(doc_metadata)
+            chunk.metadata["source_file"] = str(file_path)
+    else:
+        # Always include source file at minimum
+        for chunk in chunks:
+            chunk.metadata["source_file"] = str(file_path)
+    timer.record("metadata", start)
+
+    result = {
+        "file": file_path.name,
+        "path": str(file_path),
+        "chunks": chunks,
+        "count": len(chunks),
+        "bytes": len(content.encode("utf-8")),
+        "duplicates": 0,
+        "boilerplate": stripped,
+        "cached": cached is not None,
+        "elements": elements,
+        "timings": timer.timings,
+    }
+    return deduplicate_result(result, deduplicator)
+
+
+def assign_chunk_ids(chunks: list[DocumentChunk], file_path: Path) -> None:
+    """Give a file's chunks IDs unique across files, as DocumentProcessor does.
+
+    Chunks fresh from the engine are numbered per document and cached ones
+    have no ID, so IDs are assigned before duplicates are linked to them.
+    """
+    for i, chunk in enumerate(chunks):
+        chunk.id = generate_chunk_id(file_path, i)
+    link_parent_ids(chunks)
+
+
+def deduplicate_result(
+    result: dict, deduplicator: ChunkDeduplicator | None
+) -> dict | None:
+    """Drop or link duplicate chunks of a file's result.
+
+    Returns None when every chunk was a skipped duplicate.
+    """
+    if deduplicator is None:
+        return result
+    start = perf_counter_ns()
+    found = deduplicator.duplicates
+    chunks = deduplicator.apply(result["chunks"])
+    deduplicator.flush()
+    if "timings" in result:
+        StageTimer(result["timings"]).record("dedup", start)
+    if not chunks:
+        return None
+    return {
+        **result,
+        "chunks": chunks,
+        "count": len(chunks),
+        "duplicates": deduplicator.duplicates - found,
+    }
+
+
+def learn_boilerplate(
+    files: list[Path], parser: MarkdownParser, boilerplate: BoilerplateFilter
+) -> None:
+    """Count repeated elements across the input before processing it."""
+    for file_path in files:
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Skipping {file_path} while learning boilerplate: {e}")
+            continue
+        if content.strip():
+            boilerplate.learn(parser.parse(content).elements)
+
+
+def stream_file(
+    file_path: Path,
+    processor: DocumentProcessor,
+    store: str | None,
+    collection: str | None,
+    dry_run: bool,
+    quiet: bool,
+    batch_size: int = 100,
+    writer: ChunkWriter | None = None,
+) -> dict | None:
+    """Process a single markdown file in streaming mode.
 
-        # Store if requested (and not a dry run)
-        if store and not dry_run:
-            # Determine storage type
-            storage_type = "vectordb" if store in [True, "True", "true", ""] else store
+    Chunks are stored in batches and written to ``writer`` as they are
+    produced and are not kept in memory, so the result only carries chunk
+    counts and sizes.
+    """
+    storage = None
+    if store and not dry_run and collection:
+        try:
+            from ..storage.vectordb import VectorDBStorage
 
-            # Validate collection name for vectordb
-            if storage_type == "vectordb" and not collection:
+            storage = VectorDBStorage()
+            if not storage.is_available():
                 if not quiet:
                     console.print(
-                        "[red]Error:[/red] --collection is required with --store"
+                        "[yellow]Warning:[/yellow] Vector database not available"
                     )
-                return None
+                storage = None
+        except ImportError:
+            if not quiet:
+                console.print("[yellow]Storage backend not available[/yellow]")
 
-        if store and not dry_run and storage_type == "vectordb":
-            try:
-                from ..storage.vectordb import VectorDBStorage
-
-                storage = VectorDBStorage()
-                if storage.is_available():
-                    # Collection must be non-None here due to validation above
-                    if collection is None:
-                        raise ValueError(
-                            "Collection name is required for vectordb storage"
-                        )
-                    # Convert chunks to dictionaries for storage
-                    chunk_dicts = [
-                        {"content": chunk.content, "metadata": chunk.metadata}
-                        for chunk in chunks
-                    ]
-                    storage.store(chunk_dicts, collection)
-                    if not quiet:
-                        console.print(
-                            f"[green]✓[/green] Stored {len(chunks)} chunks "
-                            f"from {file_path.name} to collection '{collection}'"
-                        )
-                else:
-                    if not quiet:
-                        console.print(
-                            "[yellow]Warning:[/yellow] Vector database not available"
-                        )
-            except ImportError:
-                if not quiet:
-                    console.print("[yellow]Storage backend not available[/yellow]")
+    count = 0
+    total_size = 0
+    batch: list[dict] = []
+    found = processor.deduplicator.duplicates if processor.deduplicator else 0
+    stripped = processor.boilerplate.removed_blocks if processor.boilerplate else 0
+    timer = StageTimer()
+    start = perf_counter_ns()
+    memory = PeakMemory()
+
+    try:
+        # Stored batches count towards the peak, as they are held meanwhile
+        with memory:
+            for chunk in processor.stream_document(file_path):
+                chunk.metadata["source_file"] = str(file_path)
+                count += 1
+                total_size += len(chunk.content)
+                if writer is not None:
+                    writer.write(chunk)
+
+                if storage and collection:
+                    batch.append(
+                        {
+                            "id": chunk.id,
+                            "content": chunk.content,
+                            "metadata": chunk.metadata,
+                        }
+                    )
+                    if len(batch) >= batch_size:
+                        insert_start = perf_counter_ns()
+                        storage.store(batch, collection)
+                        timer.record("insert", insert_start)
+                        batch = []
+
+        if storage and collection and batch:
+            insert_start = perf_counter_ns()
+            storage.store(batch, collection)
+            timer.record("insert", insert_start)
 
-        return {"file": file_path.name, "chunks": chunks, "count": len(chunks)}
+        # Reading, parsing and chunking interleave, so they are one stage
+        timer.record("stream", start)
+        timer.timings["stream"] -= timer.timings.get("insert", 0)
 
     except Exception as e:
-        logger.error(f"Failed to process {file_path}: {e}")
+        metrics.observe_error(e)
+        logger.error(f"Failed to stream {file_path}: {e}")
+        return None
+
+    if not count:
+        return None
+
+    if storage and not quiet:
+        console.print(
+            f"[green]✓[/green] Stored {count} chunks "
+            f"from {file_path.name} to collection '{collection}'"
+        )
+
+    return {
+        "file": file_path.name,
+        "path": str(file_path),
+        "chunks": [],
+        "count": count,
+        "total_size": total_size,
+        "bytes": file_path.stat().st_size,
+        "duplicates": (
+            processor.deduplicator.duplicates - found if processor.deduplicator else 0
+        ),
+        "boilerplate": (
+            processor.boilerplate.removed_blocks - stripped
+            if processor.boilerplate
+            else 0
+        ),
+        "timings": timer.timings,
+        "peak_memory": memory.peak,
+    }
+
+
+def compare_file(
+    file_path: Path,
+    parser: MarkdownParser,
+    chunker: ChunkingEngine,
+    strategies: list[str],
+    content: str | None = None,
+) -> dict[str, StrategyEvaluation] | None:
+    """Parse a markdown file once and evaluate several strategies on it."""
+    try:
+        if content is None:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+
+        if not content.strip():
+            return None
+
+        ast = parser.parse(content)
+        return chunker.evaluate_strategies(ast, strategies)
+
+    except Exception as e:
+        logger.error(f"Failed to evaluate {file_path}: {e}")
         return None
 
 
+def display_comparison(evaluations: dict[str, StrategyEvaluation]) -> None:
+    """Display per-strategy chunking statistics in a table."""
+    table = Table(title="Strategy Comparison")
+    table.add_column("Strategy", style="cyan")
+    table.add_column("Docs", justify="right")
+    table.add_column("Chunks", justify="right", style="green")
+    table.add_column("Avg Size", justify="right")
+    table.add_column("P50", justify="right")
+    table.add_column("P95", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Chunks/s", justify="right")
+
+    for name, evaluation in evaluations.items():
+        docs = str(evaluation.documents)
+        if evaluation.failures:
+            docs += f" ({evaluation.failures} failed)"
+        table.add_row(
+            name,
+            docs,
+            str(evaluation.chunk_count),
+            f"{evaluation.average_size:.0f}",
+            str(evaluation.size_percentile(50)),
+            str(evaluation.size_percentile(95)),
+            str(evaluation.size_percentile(100)),
+            f"{evaluation.processing_time:.3f}",
+            f"{evaluation.chunks_per_second:.0f}",
+        )
+
+    console.print(table)
+
+
+def display_timings(
+    summaries: dict[str, StageTimingSummary], files: int, err: bool = False
+) -> None:
+    """Display time per processing stage in a table.
+
+    Args:
+        summaries: Stage summaries in pipeline order
+        files: Number of files timed
+        err: Whether to print to stderr, e.g. when stdout carries chunks
+    """
+    table = Table(title=f"Stage Timings ({files} files)")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Files", justify="right")
+    table.add_column("Total s", justify="right", style="green")
+    table.add_column("Share", justify="right")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("P50 ms", justify="right")
+    table.add_column("P95 ms", justify="right")
+    table.add_column("Max ms", justify="right")
+
+    total_ns = sum(s.total_ns for s in summaries.values()) or 1
+    for name, summary in summaries.items():
+        table.add_row(
+            name,
+            str(summary.files),
+            f"{summary.total_seconds:.3f}",
+            f"{summary.total_ns / total_ns:.1%}",
+            f"{summary.mean_ns / 1e6:.2f}",
+            f"{summary.p50_ns / 1e6:.2f}",
+            f"{summary.p95_ns / 1e6:.2f}",
+            f"{summary.max_ns / 1e6:.2f}",
+        )
+
+    (Console(stderr=True) if err else console).print(table)
+
+
+def display_file_report(report: SlowFileReport, err: bool = False) -> None:
+    """Display the slowest and the most memory-hungry files.
+
+    Args:
+        report: Files kept by the run
+        err: Whether to print to stderr, e.g. when stdout carries chunks
+    """
+    out = Console(stderr=True) if err else console
+    tables = [("Slowest Files", report.slowest())]
+    if report.hungriest():
+        tables.append(("Most Memory-Hungry Files", report.hungriest()))
+    for title, costs in tables:
+        if costs:
+            out.print(_file_cost_table(title, costs))
+
+
+def _file_cost_table(title: str, costs: list[FileCost]) -> Table:
+    """Tabulate files with their time, slowest stage, memory and size."""
+    table = Table(title=title)
+    table.add_column("File", style="cyan", overflow="fold")
+    table.add_column("Total ms", justify="right", style="green")
+    table.add_column("Slowest stage", no_wrap=True)
+    table.add_column("Peak MiB", justify="right")
+    table.add_column("Elements", justify="right")
+    table.add_column("Chunks", justify="right")
+
+    for cost in costs:
+        table.add_row(
+            cost.path,
+            f"{cost.total_ns / 1e6:.2f}",
+            f"{cost.slowest_stage} {cost.slowest_ns / 1e6:.2f} ms"
+            if cost.slowest_stage
+            else "-",
+            "-" if cost.peak_memory is None else f"{cost.peak_memory / 2**20:.2f}",
+            "-" if cost.elements is None else str(cost.elements),
+            str(cost.chunks),
+        )
+    return table
+
+
+def display_profile(
+    entries: list["ProfileEntry"], mode: str, processes: int, err: bool = False
+) -> None:
+    """Display the functions a profile spent most time in.
+
+    Args:
+        entries: Functions by decreasing self time
+        mode: ``cpu`` or ``sample``, for the title
+        processes: Number of processes merged into the profile
+        err: Whether to print to stderr
+    """
+    kind = "CPU profile" if mode == "cpu" else "Sampled profile"
+    table = Table(title=f"{kind}: top {len(entries)} functions ({processes} processes)")
+    table.add_column("Function", style="cyan", overflow="fold")
+    table.add_column("Calls", justify="right")
+    table.add_column("Self s", justify="right", style="green")
+    table.add_column("Total s", justify="right")
+
+    for entry in entries:
+        table.add_row(
+            entry.function,
+            "-" if entry.calls is None else str(entry.calls),
+            f"{entry.self_seconds:.3f}",
+            f"{entry.total_seconds:.3f}",
+        )
+
+    (Console(stderr=True) if err else console).print(table)
+
+
 def display_results(results: list[dict]) -> None:
     """Display processing results in a table."""
     table = Table(title="Processing Results")
@@ -116,11 +576,25 @@ def display_results(results: list[dict]) -> None:
     table.add_column("Avg Size", justify="right")
 
     total_chunks = 0
+    total_duplicates = 0
+    total_boilerplate = 0
+    cached_files = 0
     for result in results:
-        chunks = result["chunks"]
-        avg_size = sum(len(c.content) for c in chunks) // len(chunks) if chunks else 0
+        total_size = result.get("total_size")
+        if total_size is None:
+            total_size = sum(len(c.content) for c in result["chunks"])
+        avg_size = total_size // result["count"] if result["count"] else 0
         table.add_row(result["file"], str(result["count"]), str(avg_size))
         total_chunks += result["count"]
+        total_duplicates += result.get("duplicates", 0)
+        total_boilerplate += result.get("boilerplate", 0)
+        cached_files += result.get("cached", False)
 
     console.print(table)
     console.print(f"\nTotal chunks: {total_chunks}")
+    if total_duplicates:
+        console.print(f"Duplicate chunks: {total_duplicates}")
+    if total_boilerplate:
+        console.print(f"Boilerplate blocks stripped: {total_boilerplate}")
+    if cached_files:
+        console.print(f"Files loaded from cache: {cached_files}")
@@ -38,7 +38,41 @@ class Settings(BaseModel):
         default=True, description="Respect markdown structure boundaries"
     )
     chunk_max_tokens: int | None = Field(
-        default=None, ge=1, description="Maximum tokens per chunk"
+        default=None,
+        ge=1,
+        description="Maximum tokens per chunk for the token strategy "
+        "(defaults to a quarter of the chunk size)",
+    )
+    chunk_tokenizer: str = Field(
+        default="regex",
+        description="Tokenizer for the token strategy: regex, wordpiece or "
+        "tiktoken[:encoding]",
+    )
+    chunk_tokenizer_vocab: Path | None = Field(
+        default=None, description="Vocabulary file for the wordpiece tokenizer"
+    )
+    chunk_parent_level: int = Field(
+        default=2,
+        ge=1,
+        le=6,
+        description="Deepest header level that starts a parent chunk "
+        "(hierarchical strategy)",
+    )
+    chunk_semantic_mode: str = Field(
+        default="heuristic",
+        description="Semantic chunker boundary detection: heuristic or tfidf",
+    )
+    chunk_packing: str = Field(
+        default="greedy",
+        description="How units are packed into chunks: greedy or optimal "
+        "(fewest chunks; structure and paragraph strategies)",
+    )
+    chunk_packing_tolerance: float = Field(
+        default=1.2,
+        ge=1.0,
+        le=1.5,
+        description="Multiple of chunk size a chunk may reach in optimal packing "
+        "when that saves a chunk",
     )
 
     # Processing Configuration (prefixed with process_)
@@ -57,6 +91,57 @@ class Settings(BaseModel):
     process_include_path_metadata: bool = Field(
         default=True, description="Include file path information"
     )
+    process_streaming: bool = Field(
+        default=False,
+        description="Stream files above the in-memory size limit instead of "
+        "rejecting them",
+    )
+    process_dedup: str = Field(
+        default="off",
+        description="Duplicate chunk handling: off, skip, or link to the "
+        "canonical chunk",
+    )
+    process_dedup_distance: int = Field(
+        default=6,
+        ge=0,
+        le=7,
+        description="Largest SimHash bit distance treated as a near-duplicate",
+    )
+    process_dedup_index: Path | None = Field(
+        default=None,
+        description="SQLite file keeping the dedup index across runs",
+    )
+    process_strip_boilerplate: bool = Field(
+        default=False,
+        description="Drop paragraphs and list items repeated across many "
+        "documents of a batch before chunking",
+    )
+    process_boilerplate_min_docs: int = Field(
+        default=3,
+        ge=2,
+        description="Fewest documents a block must appear in to be boilerplate",
+    )
+    process_boilerplate_ratio: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description="Smallest share of the batch's documents a block must "
+        "appear in to be boilerplate",
+    )
+    process_cache_dir: Path | None = Field(
+        default=None,
+        description="Directory caching chunks by content and chunking settings",
+    )
+    process_cache_max_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        ge=0,
+        description="Size bound of the chunk cache directory in bytes",
+    )
+    process_track_memory: bool = Field(
+        default=False,
+        description="Record each document's peak allocated memory with "
+        "tracemalloc while documents are processed, which slows processing down",
+    )
 
     # Logging Configuration (prefixed with log_)
     log_level: str = Field(default="INFO", description="Default logging level")
@@ -92,6 +177,53 @@ class Settings(BaseModel):
             raise ValueError("Overlap must be less than chunk size")
         return v
 
+    @field_validator("chunk_semantic_mode")
+    @classmethod
+    def validate_semantic_mode(cls, v: str) -> str:
+        """Ensure the semantic boundary detection mode is known."""
+        mode = v.strip().lower()
+        if mode not in ("heuristic", "tfidf"):
+            raise ValueError(
+                f"Invalid semantic mode: '{v}'. Must be 'heuristic' or 'tfidf'."
+            )
+        return mode
+
+    @field_validator("chunk_tokenizer")
+    @classmethod
+    def validate_tokenizer(cls, v: str) -> str:
+        """Ensure the tokenizer name is known; options after ':' pass through."""
+        spec = v.strip()
+        name, sep, option = spec.partition(":")
+        name = name.lower()
+        if name not in ("regex", "wordpiece", "tiktoken"):
+            raise ValueError(
+                f"Invalid tokenizer: '{v}'. Must be 'regex', 'wordpiece' or "
+                "'tiktoken[:encoding]'."
+            )
+        return f"{name}{sep}{option}"
+
+    @field_validator("chunk_packing")
+    @classmethod
+    def validate_packing(cls, v: str) -> str:
+        """Ensure the chunk packing mode is known."""
+        mode = v.strip().lower()
+        if mode not in ("greedy", "optimal"):
+            raise ValueError(
+                f"Invalid packing mode: '{v}'. Must be 'greedy' or 'optimal'."
+            )
+        return mode
+
+    @field_validator("process_dedup")
+    @classmethod
+    def validate_dedup(cls, v: str) -> str:
+        """Ensure the dedup mode is known."""
+        mode = v.strip().lower()
+        if mode not in ("off", "skip", "link"):
+            raise ValueError(
+                f"Invalid dedup mode: '{v}'. Must be 'off', 'skip' or 'link'."
+            )
+        return mode
+
     @field_validator("chroma_host")
     @classmethod
     def validate_host(cls, v: str) -> str:
@@ -1,8 +1,13 @@
 """Core processing components for shard-markdown."""
 
-from .models import DocumentChunk, MarkdownAST, ProcessingResult
-from .parser import MarkdownParser
-from .processor import DocumentProcessor
+import importlib
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from .models import DocumentChunk, MarkdownAST, ProcessingResult
+    from .parser import MarkdownParser
+    from .processor import DocumentProcessor
 
 
 __all__ = [
@@ -12,3 +17,21 @@ __all__ = [
     "DocumentProcessor",
     "MarkdownParser",
 ]
+
+# Models pull in pydantic and the parser pulls in markdown extensions, so
+# they are imported on first attribute access
+_LAZY_ATTRIBUTES = {
+    "DocumentChunk": ".models",
+    "MarkdownAST": ".models",
+    "ProcessingResult": ".models",
+    "MarkdownParser": ".parser",
+    "DocumentProcessor": ".processor",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import core components on demand."""
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
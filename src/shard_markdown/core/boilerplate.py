@@ -0,0 +1,176 @@
+"""Detection and removal of boilerplate repeated across documents."""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+from ..config.settings import Settings
+from ..utils.logging import get_logger
+from .models import MarkdownAST, MarkdownElement
+
+
+logger = get_logger(__name__)
+
+# Headers and table rows carry document structure and code blocks are real
+# content even when copied between pages, so none is treated as boilerplate
+PROTECTED_TYPES = frozenset({"header", "code_block", "table_row"})
+
+# The parser merges consecutive paragraphs into one element, so paragraphs
+# are compared block by block
+_BLOCK_SEPARATOR = re.compile(r"\n\s*\n")
+
+
+def element_blocks(element: MarkdownElement) -> list[str]:
+    """Split an element into the blocks compared across documents.
+
+    Args:
+        element: Markdown element
+
+    Returns:
+        Blank-line separated blocks for paragraphs, else the element text
+    """
+    if element.type == "paragraph":
+        return [block for block in _BLOCK_SEPARATOR.split(element.text) if block]
+    return [element.text] if element.text else []
+
+
+def block_digest(element_type: str, text: str) -> str:
+    """Hash a block with its element type, ignoring whitespace differences.
+
+    Args:
+        element_type: Type of the element holding the block
+        text: Block text
+
+    Returns:
+        Hex digest identifying the block's content
+    """
+    text = " ".join(text.split())
+    return hashlib.blake2b(
+        f"{element_type}\0{text}".encode(), digest_size=16
+    ).hexdigest()
+
+
+class BoilerplateFilter:
+    """Drop blocks that repeat across many documents of a batch.
+
+    Navigation blocks, banners and footers copied into every page end up in
+    every chunk and add nothing to retrieval. The filter first learns how
+    many documents contain each block (an element, or a paragraph of a
+    merged paragraph element) by content hash, counted once per document,
+    then strips blocks found in at least ``min_documents`` documents and
+    ``min_ratio`` of all documents seen, before chunking.
+    """
+
+    def __init__(self, min_documents: int = 3, min_ratio: float = 0.5) -> None:
+        """Initialize filter.
+
+        Args:
+            min_documents: Fewest documents a block must appear in
+            min_ratio: Smallest share of documents a block must appear in
+        """
+        self.min_documents = min_documents
+        self.min_ratio = min_ratio
+        self.documents = 0
+        self.removed_blocks = 0
+        self._frequency: Counter[str] = Counter()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "BoilerplateFilter | None":
+        """Create a filter from ``process_boilerplate*`` settings.
+
+        Args:
+            settings: Configuration settings
+
+        Returns:
+            Filter, or None when boilerplate stripping is off
+        """
+        if settings.process_strip_boilerplate is not True:
+            return None
+        return cls(
+            settings.process_boilerplate_min_docs, settings.process_boilerplate_ratio
+        )
+
+    def learn(self, elements: Iterable[MarkdownElement]) -> None:
+        """Count the blocks of one document.
+
+        Args:
+            elements: Elements of a parsed document
+        """
+        self.documents += 1
+        self._frequency.update(
+            {
+                block_digest(element.type, block)
+                for element in elements
+                if element.type not in PROTECTED_TYPES
+                for block in element_blocks(element)
+            }
+        )
+
+    @property
+    def threshold(self) -> int:
+        """Get the number of documents that makes a block boilerplate."""
+        return max(self.min_documents, math.ceil(self.min_ratio * self.documents))
+
+    @property
+    def boilerplate_count(self) -> int:
+        """Get the number of distinct blocks currently treated as boilerplate."""
+        threshold = self.threshold
+        return sum(1 for count in self._frequency.values() if count >= threshold)
+
+    def is_boilerplate(self, element_type: str, text: str) -> bool:
+        """Check whether a block repeats across enough documents.
+
+        Args:
+            element_type: Type of the element holding the block
+            text: Block text
+
+        Returns:
+            True if the block should be dropped
+        """
+        if not self._frequency or element_type in PROTECTED_TYPES:
+            return False
+        return self._frequency[block_digest(element_type, text)] >= self.threshold
+
+    def filter_elements(
+        self, elements: Iterable[MarkdownElement]
+    ) -> Iterator[MarkdownElement]:
+        """Yield elements with their boilerplate blocks removed.
+
+        Args:
+            elements: Elements of a document, possibly streamed
+
+        Yields:
+            Elements to keep, trimmed to their remaining blocks
+        """
+        for element in elements:
+            if not self._frequency or element.type in PROTECTED_TYPES:
+                yield element
+                continue
+
+            blocks = element_blocks(element)
+            kept = [b for b in blocks if not self.is_boilerplate(element.type, b)]
+            self.removed_blocks += len(blocks) - len(kept)
+            if len(kept) == len(blocks):
+                yield element
+            elif kept:
+                yield element.model_copy(update={"text": "\n\n".join(kept)})
+
+    def strip(self, ast: MarkdownAST) -> MarkdownAST:
+        """Remove boilerplate blocks from a parsed document.
+
+        Args:
+            ast: Parsed markdown AST
+
+        Returns:
+            The same AST if nothing was removed, otherwise a copy without
+            the boilerplate blocks
+        """
+        removed = self.removed_blocks
+        elements = list(self.filter_elements(ast.elements))
+        if self.removed_blocks == removed:
+            return ast
+        return MarkdownAST(
+            elements=elements, frontmatter=ast.frontmatter, metadata=ast.metadata
+        )
@@ -0,0 +1,246 @@
+"""Content-addressed on-disk cache of chunking results."""
+
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any
+
+from .. import __version__
+from ..config.settings import Settings
+from ..utils.errors import FileSystemError
+from ..utils.logging import get_logger
+from .models import DocumentChunk
+
+
+logger = get_logger(__name__)
+
+# Entries start with a format marker, so files from an incompatible layout
+# are treated as misses rather than misread
+CACHE_FORMAT = b"SMC1"
+CACHE_SUFFIX = ".chunks"
+
+# After eviction the cache is trimmed to this share of its size bound, so
+# eviction does not run again on the very next write
+EVICTION_LOW_WATER = 0.8
+
+
+def settings_fingerprint(settings: Settings) -> str:
+    """Hash the settings that change chunking output.
+
+    Args:
+        settings: Configuration settings
+
+    Returns:
+        Hex digest of the ``chunk_*`` settings and chunker plugins
+    """
+    fields = {
+        name: getattr(settings, name)
+        for name in sorted(type(settings).model_fields)
+        if name.startswith("chunk_") or name == "plugins"
+    }
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChunkCache:
+    """Cache of chunks and document metadata keyed by content and settings.
+
+    Keys combine the SHA-256 of the document text, a fingerprint of the
+    chunking settings and the library version, so an unchanged document is
+    found again after a move or rename, and any settings or version change
+    misses. Entries are zlib-compressed JSON, one file per key, fanned out
+    into subdirectories by key prefix.
+
+    Writes go to a temporary file renamed into place, so concurrent workers
+    sharing a directory never see partial entries; unreadable entries are
+    treated as misses. Hits refresh the entry's modification time, and once
+    the directory exceeds ``max_bytes`` the least recently used entries are
+    deleted.
+    """
+
+    def __init__(
+        self, directory: Path, settings: Settings, max_bytes: int = 512 * 1024**2
+    ) -> None:
+        """Open or create the cache.
+
+        Args:
+            directory: Cache directory, shared between runs and workers
+            settings: Settings the cached chunks are produced with
+            max_bytes: Size bound of the cache directory
+
+        Raises:
+            FileSystemError: If the directory cannot be created
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fingerprint = settings_fingerprint(settings)
+        self.hits = 0
+        self.misses = 0
+        # Estimated directory size, measured on the first write
+        self._size: int | None = None
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise FileSystemError(
+                f"Cannot create chunk cache directory: {directory}",
+                error_code=1207,
+                context={"cache_dir": str(directory)},
+                cause=e,
+            ) from e
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ChunkCache | None":
+        """Create a cache from ``process_cache*`` settings.
+
+        Args:
+            settings: Configuration settings
+
+        Returns:
+            Cache, or None when no cache directory is configured
+        """
+        if not isinstance(settings.process_cache_dir, Path):
+            return None
+        return cls(
+            settings.process_cache_dir, settings, settings.process_cache_max_bytes
+        )
+
+    def key(self, content: str) -> str:
+        """Compute the cache key of a document.
+
+        Args:
+            content: Document text
+
+        Returns:
+            Hex key
+        """
+        digest = hashlib.sha256(content.encode("utf-8")).digest()
+        return hashlib.sha256(
+            f"{__version__}\0{self.fingerprint}\0".encode() + digest
+        ).hexdigest()
+
+    def get(self, key: str) -> tuple[list[DocumentChunk], dict[str, Any]] | None:
+        """Load a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            ``(chunks, document_metadata)``, or None on a miss. Chunk IDs
+            depend on the document's path, not its content, so chunks come
+            without IDs for the caller to assign.
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            if not data.startswith(CACHE_FORMAT):
+                raise ValueError("unknown cache entry format")
+            entry = json.loads(zlib.decompress(data[len(CACHE_FORMAT) :]))
+            chunks = [DocumentChunk(**chunk) for chunk in entry["chunks"]]
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError, zlib.error) as e:
+            logger.debug("Ignoring unreadable cache entry %s: %s", path, e)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted by another worker since it was read
+        self.hits += 1
+        return chunks, entry["document"]
+
+    def put(
+        self, key: str, chunks: list[DocumentChunk], document: dict[str, Any]
+    ) -> None:
+        """Store a result, evicting old entries if the cache is full.
+
+        Results that cannot be serialized or written are skipped; the cache
+        never fails processing.
+
+        Args:
+            key: Cache key
+            chunks: Chunks produced for the document
+            document: Document metadata
+        """
+        try:
+            payload = json.dumps(
+                {
+                    "chunks": [chunk.model_dump(exclude={"id"}) for chunk in chunks],
+                    "document": document,
+                },
+                separators=(",", ":"),
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug("Not caching result with unserializable metadata: %s", e)
+            return
+
+        data = CACHE_FORMAT + zlib.compress(payload.encode("utf-8"))
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp, path)
+            except BaseException:
+                os.unlink(temp)
+                raise
+        except OSError as e:
+            logger.warning("Cannot write chunk cache entry %s: %s", path, e)
+            return
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits its bound.
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * EVICTION_LOW_WATER
+        deleted = 0
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+                deleted += 1
+            except FileNotFoundError:
+                pass  # Already evicted by another worker
+            except OSError as e:
+                logger.debug("Cannot evict cache entry %s: %s", path, e)
+                continue
+            size -= entry_size
+
+        self._size = size
+        if deleted:
+            logger.debug("Evicted %d chunk cache entries", deleted)
+        return deleted
+
+    def _path(self, key: str) -> Path:
+        """Get the file holding an entry."""
+        return self.directory / key[:2] / f"{key}{CACHE_SUFFIX}"
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        """List ``(path, size, mtime)`` of every entry."""
+        entries = []
+        for path in self.directory.glob(f"*/*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
@@ -1,9 +1,15 @@
 """Document chunking engines."""
 
-from .base import BaseChunker
-from .engine import ChunkingEngine
-from .fixed import FixedSizeChunker
-from .structure import StructureAwareChunker
+import importlib
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from .base import BaseChunker
+    from .engine import ChunkingEngine
+    from .fixed import FixedSizeChunker
+    from .registry import ENTRY_POINT_GROUP, StrategyRegistry
+    from .structure import StructureAwareChunker
 
 
 __all__ = [
@@ -11,4 +17,24 @@ __all__ = [
     "StructureAwareChunker",
     "FixedSizeChunker",
     "ChunkingEngine",
+    "StrategyRegistry",
+    "ENTRY_POINT_GROUP",
 ]
+
+# Chunkers and the engine are imported on first attribute access
+_LAZY_ATTRIBUTES = {
+    "BaseChunker": ".base",
+    "ChunkingEngine": ".engine",
+    "ENTRY_POINT_GROUP": ".registry",
+    "FixedSizeChunker": ".fixed",
+    "StrategyRegistry": ".registry",
+    "StructureAwareChunker": ".structure",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import chunking classes on demand."""
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
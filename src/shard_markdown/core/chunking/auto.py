@@ -0,0 +1,143 @@
+"""Automatic strategy selection from a document profile."""
+
+import time
+
+from ...config.settings import Settings
+from ...utils.logging import get_logger
+from ..models import DocumentChunk, DocumentProfile, MarkdownAST
+from .base import BaseChunker
+from .registry import StrategyRegistry
+
+
+logger = get_logger(__name__)
+
+# Documents with at least this share of code are references: headers and
+# fences carry the meaning, so structure-aware chunking keeps them intact
+CODE_HEAVY_SHARE = 0.3
+
+# Prose is mostly paragraphs of at least this length
+PROSE_SHARE = 0.7
+LONG_PARAGRAPH_CHARS = 200
+
+# Headerless documents with this share of list items are flat notes
+LIST_HEAVY_SHARE = 0.5
+
+
+def profile_document(ast: MarkdownAST) -> DocumentProfile:
+    """Compute structural statistics in one pass over the elements.
+
+    The profile is cached on the AST, so strategies evaluated on the same
+    document share it.
+
+    Args:
+        ast: Parsed markdown AST
+
+    Returns:
+        Document profile
+    """
+
+    def build() -> DocumentProfile:
+        chars = {"paragraph": 0, "code_block": 0, "list": 0}
+        total = header_count = paragraph_count = 0
+        for element in ast.elements:
+            size = len(element.text)
+            total += size
+            if element.type == "header":
+                header_count += 1
+            elif element.type == "paragraph":
+                # The parser merges consecutive paragraphs into one element
+                paragraph_count += element.text.count("\n\n") + 1
+                chars["paragraph"] += size
+            elif element.type == "code_block":
+                chars["code_block"] += size
+            elif element.type in ("list_item", "table_row"):
+                chars["list"] += size
+
+        shares = {kind: n / total if total else 0.0 for kind, n in chars.items()}
+        return DocumentProfile(
+            element_count=len(ast.elements),
+            char_count=total,
+            header_count=header_count,
+            paragraph_count=paragraph_count,
+            paragraph_share=shares["paragraph"],
+            code_share=shares["code_block"],
+            list_share=shares["list"],
+        )
+
+    return ast.cached("profile", build)
+
+
+def choose_strategy(profile: DocumentProfile, chunk_size: int) -> tuple[str, str]:
+    """Pick the strategy suited to a document profile.
+
+    Args:
+        profile: Document profile
+        chunk_size: Configured chunk size
+
+    Returns:
+        ``(strategy, reason)``
+    """
+    if profile.char_count <= chunk_size:
+        return "fixed", "fits in one chunk"
+    if profile.code_share >= CODE_HEAVY_SHARE:
+        return "structure", "code-heavy"
+    if profile.header_count == 0 and (
+        profile.list_share >= LIST_HEAVY_SHARE
+        or profile.average_paragraph_chars < LONG_PARAGRAPH_CHARS
+    ):
+        return "fixed", "flat notes"
+    if (
+        profile.paragraph_share >= PROSE_SHARE
+        and profile.average_paragraph_chars >= LONG_PARAGRAPH_CHARS
+    ):
+        return "paragraph", "prose"
+    return "structure", "structured"
+
+
+class AutoChunker(BaseChunker):
+    """Choose a strategy per document from a cheap structural profile.
+
+    Code-heavy references go to ``structure``, long-form prose to
+    ``paragraph``, and flat notes and documents that fit in one chunk to the
+    fast ``fixed`` chunker; anything else gets ``structure``. Chunks record
+    the chosen strategy in ``chunk_method``, the reason, and the profiling
+    and chunking times in milliseconds.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        """Initialize auto chunker.
+
+        Args:
+            settings: Configuration settings
+        """
+        super().__init__(settings)
+        self.strategies = StrategyRegistry(settings)
+
+    def chunk_document(self, ast: MarkdownAST) -> list[DocumentChunk]:
+        """Profile the document and chunk it with the chosen strategy.
+
+        Args:
+            ast: Parsed markdown AST
+
+        Returns:
+            List of document chunks
+        """
+        start = time.perf_counter()
+        profile = profile_document(ast)
+        strategy, reason = choose_strategy(profile, self.settings.chunk_size)
+        profiled = time.perf_counter()
+
+        chunks = self.strategies[strategy].chunk_document(ast)
+        finished = time.perf_counter()
+
+        logger.debug("Auto strategy chose '%s' (%s)", strategy, reason)
+        for chunk in chunks:
+            chunk.metadata.update(
+                {
+                    "chunk_method": strategy,
+                    "auto_reason": reason,
+                    "auto_profile_ms": round((profiled - start) * 1000, 3),
+                    "auto_chunk_ms": round((finished - profiled) * 1000, 3),
+                }
+            )
+        return chunks
@@ -1,14 +1,19 @@
 """Base chunker interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 
 from ...config.settings import Settings
-from ..models import DocumentChunk, MarkdownAST
+from ..models import DocumentChunk, MarkdownAST, MarkdownElement
+from .boundaries import BoundaryIndex
 
 
 class BaseChunker(ABC):
     """Base class for document chunkers."""
 
+    # Whether iter_chunks works with a bounded window instead of a full AST
+    supports_streaming = False
+
     def __init__(self, settings: Settings) -> None:
         """Initialize chunker with configuration.
 
@@ -29,6 +34,22 @@ class BaseChunker(ABC):
         """
         pass
 
+    def iter_chunks(
+        self, elements: Iterable[MarkdownElement]
+    ) -> Iterator[DocumentChunk]:
+        """Yield chunks for a stream of elements.
+
+        The default implementation collects all elements first; chunkers that
+        can work with a bounded window override this to stream.
+
+        Args:
+            elements: Markdown elements in document order
+
+        Yields:
+            Document chunks
+        """
+        yield from self.chunk_document(MarkdownAST(elements=list(elements)))
+
     def _create_chunk(
         self, content: str, start: int, end: int, metadata: dict | None = None
     ) -> DocumentChunk:
@@ -66,18 +87,32 @@ class BaseChunker(ABC):
         Returns:
             Overlap content for next chunk
         """
+        if self.settings.chunk_overlap <= 0:
+            return ""
         if len(content) <= self.settings.chunk_overlap:
             return content
 
-        # Try to find sentence boundary for natural overlap
+        # Start the overlap at the first sentence boundary inside the window
         overlap_start = len(content) - self.settings.chunk_overlap
-
-        # Look for sentence endings
-        for i in range(overlap_start, len(content)):
-            if content[i] in ".!?":
-                next_char_idx = i + 1
-                if next_char_idx < len(content) and content[next_char_idx] in " \n":
-                    return content[next_char_idx:].lstrip()
+        window = BoundaryIndex(content, start=overlap_start)
+        sentence_start = window.ceil("sentence", overlap_start)
+        if sentence_start is not None:
+            return content[sentence_start:].lstrip()
 
         # Fallback to character-based overlap
         return content[-self.settings.chunk_overlap :]
+
+    def _boundary_index(self, ast: MarkdownAST, mode: str = "text") -> BoundaryIndex:
+        """Get the boundary index for a document rendering.
+
+        The index is cached on the AST next to the rendering it describes, so
+        every chunker working on the same document shares it.
+
+        Args:
+            ast: Parsed markdown AST
+            mode: Rendering mode the index refers to
+
+        Returns:
+            BoundaryIndex over ``ast.render(mode)``
+        """
+        return ast.cached(("boundaries", mode), lambda: BoundaryIndex(ast.render(mode)))
@@ -0,0 +1,152 @@
+"""Precomputed sentence, word, line and paragraph boundaries."""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Sequence
+
+
+# Each pattern's match end is the offset where a new unit starts
+_BOUNDARY_PATTERNS = {
+    "sentence": re.compile(r"[.!?]+\s+"),
+    "word": re.compile(r"\s+"),
+    "line": re.compile(r"\n"),
+    "paragraph": re.compile(r"\n[ \t]*\n\s*"),
+}
+
+# In reversed text a word start is a non-space character followed by a space
+_REVERSED_WORD_START = re.compile(r"\S\s")
+
+# Characters scanned by the first backward probe for a word start
+_PROBE_CHARS = 64
+
+
+def floor_word_start(text: str, pos: int, lo: int = -1) -> int | None:
+    """Find the last word start at or before ``pos`` and after ``lo``.
+
+    Gives the same result as ``BoundaryIndex(text).floor("word", pos, lo)``
+    without indexing the whole text: the text before ``pos`` is reversed in
+    growing windows and searched for the nearest word start, so the cost
+    depends on the distance to the boundary rather than on the text length.
+    Use it when only a few cuts are needed per stretch of text.
+
+    Args:
+        text: Text to search
+        pos: Upper bound (inclusive)
+        lo: Lower bound (exclusive)
+
+    Returns:
+        Boundary offset or None if there is none in range
+    """
+    pos = min(pos, len(text) - 1)
+    low = max(lo + 1, 1)
+    if pos < low:
+        return None
+
+    reach = _PROBE_CHARS
+    while True:
+        window_start = max(low, pos - reach)
+        match = _REVERSED_WORD_START.search(text[window_start - 1 : pos + 1][::-1])
+        if match is not None:
+            return pos - match.start()
+        if window_start == low:
+            return None
+        reach *= 8
+
+
+class BoundaryIndex:
+    """Sorted offsets of unit boundaries in a text, queried with bisect.
+
+    A boundary is the offset at which a sentence, word, line or paragraph
+    starts. Offsets for each kind are computed with a single regex pass the
+    first time that kind is queried and kept in a compact ``array``, so every
+    later split or overlap lookup is O(log n).
+    """
+
+    KINDS = tuple(_BOUNDARY_PATTERNS)
+
+    def __init__(self, text: str, start: int = 0, end: int | None = None) -> None:
+        """Initialize index over ``text[start:end]``.
+
+        Args:
+            text: Text to index
+            start: First offset to index
+            end: Offset to stop indexing at (defaults to end of text)
+        """
+        self.text = text
+        self.start = start
+        self.end = len(text) if end is None else end
+        self._offsets: dict[str, Sequence[int]] = {}
+
+    def offsets(self, kind: str) -> Sequence[int]:
+        """Get sorted boundary offsets of the given kind.
+
+        Args:
+            kind: One of ``sentence``, ``word``, ``line`` or ``paragraph``
+
+        Returns:
+            Sorted array of absolute offsets
+        """
+        offsets = self._offsets.get(kind)
+        if offsets is None:
+            pattern = _BOUNDARY_PATTERNS[kind]
+            offsets = array(
+                "q",
+                (
+                    match.end()
+                    for match in pattern.finditer(self.text, self.start, self.end)
+                    if match.end() < self.end
+                ),
+            )
+            self._offsets[kind] = offsets
+        return offsets
+
+    def floor(self, kind: str, pos: int, lo: int = -1) -> int | None:
+        """Find the last boundary at or before ``pos`` and after ``lo``.
+
+        Args:
+            kind: Boundary kind
+            pos: Upper bound (inclusive)
+            lo: Lower bound (exclusive)
+
+        Returns:
+            Boundary offset or None if there is none in range
+        """
+        offsets = self.offsets(kind)
+        i = bisect_right(offsets, pos) - 1
+        if i >= 0 and offsets[i] > lo:
+            return offsets[i]
+        return None
+
+    def ceil(self, kind: str, pos: int, hi: int | None = None) -> int | None:
+        """Find the first boundary at or after ``pos`` and before ``hi``.
+
+        Args:
+            kind: Boundary kind
+            pos: Lower bound (inclusive)
+            hi: Upper bound (exclusive, defaults to no bound)
+
+        Returns:
+            Boundary offset or None if there is none in range
+        """
+        offsets = self.offsets(kind)
+        i = bisect_left(offsets, pos)
+        if i < len(offsets) and (hi is None or offsets[i] < hi):
+            return offsets[i]
+        return None
+
+    def spans(self, kind: str) -> Iterator[tuple[int, int]]:
+        """Iterate over consecutive units of the given kind.
+
+        Args:
+            kind: Boundary kind
+
+        Yields:
+            ``(start, end)`` offsets covering the indexed range
+        """
+        previous = self.start
+        for offset in self.offsets(kind):
+            yield previous, offset
+            previous = offset
+        if previous < self.end:
+            yield previous, self.end
@@ -1,21 +1,37 @@
 """Main chunking engine that selects appropriate strategy."""
 
+import time
+from collections.abc import Iterable, Iterator
+
 from ...config.settings import Settings
 from ...utils.errors import ProcessingError
 from ...utils.logging import get_logger
-from ..models import DocumentChunk, MarkdownAST
-from .fixed import FixedSizeChunker
-from .paragraph import ParagraphChunker
-from .section import SectionChunker
-from .semantic import SemanticChunker
-from .sentence import SentenceChunker
-from .structure import StructureAwareChunker
-from .token import TokenChunker
+from ..models import DocumentChunk, MarkdownAST, MarkdownElement, StrategyEvaluation
+from .registry import StrategyRegistry
 
 
 logger = get_logger(__name__)
 
 
+def is_parent_chunk(chunk: DocumentChunk) -> bool:
+    """Check whether a chunk is a parent section from hierarchical chunking."""
+    return chunk.metadata.get("chunk_level") == "parent"
+
+
+def link_parent_ids(chunks: list[DocumentChunk]) -> None:
+    """Resolve ``parent_chunk_index`` metadata into the parent's ``parent_id``.
+
+    Call after chunk IDs are assigned.
+
+    Args:
+        chunks: Chunks of one document, in chunker output order
+    """
+    for chunk in chunks:
+        parent_index = chunk.metadata.get("parent_chunk_index")
+        if parent_index is not None and 0 <= parent_index < len(chunks):
+            chunk.add_metadata("parent_id", chunks[parent_index].id)
+
+
 class ChunkingEngine:
     """Main chunking engine with strategy selection."""
 
@@ -26,15 +42,9 @@ class ChunkingEngine:
             settings: Configuration settings
         """
         self.settings = settings
-        self.strategies = {
-            "structure": StructureAwareChunker(settings),
-            "fixed": FixedSizeChunker(settings),
-            "token": TokenChunker(settings),
-            "sentence": SentenceChunker(settings),
-            "paragraph": ParagraphChunker(settings),
-            "section": SectionChunker(settings),
-            "semantic": SemanticChunker(settings),
-        }
+        # Chunkers are imported and built on first lookup; plugins are
+        # discovered only when a name outside the built-ins is requested
+        self.strategies = StrategyRegistry(settings)
 
     def chunk_document(self, ast: MarkdownAST) -> list[DocumentChunk]:
         """Chunk document using configured strategy.
@@ -45,6 +55,59 @@ class ChunkingEngine:
         Returns:
             List of document chunks
 
+        Raises:
+            ProcessingError: If chunking fails
+        """
+        return self._chunk_with_strategy(ast, self.settings.chunk_method)
+
+    def evaluate_strategies(
+        self, ast: MarkdownAST, strategy_names: Iterable[str]
+    ) -> dict[str, StrategyEvaluation]:
+        """Run several strategies over one parsed document.
+
+        The AST and its cached renderings are shared by every strategy, so
+        the document is parsed once no matter how many strategies are compared.
+
+        Args:
+            ast: Parsed markdown AST
+            strategy_names: Strategies to run
+
+        Returns:
+            Evaluation per strategy name
+
+        Raises:
+            ProcessingError: If a strategy name is unknown
+        """
+        evaluations = {}
+
+        for strategy_name in strategy_names:
+            evaluation = StrategyEvaluation(strategy=strategy_name, documents=1)
+            start_time = time.perf_counter()
+            try:
+                chunks = self._chunk_with_strategy(ast, strategy_name)
+                evaluation.chunk_sizes = [chunk.size for chunk in chunks]
+            except ProcessingError as e:
+                if e.error_code == 1310:
+                    raise
+                logger.warning("Strategy '%s' failed: %s", strategy_name, e)
+                evaluation.failures = 1
+            evaluation.processing_time = time.perf_counter() - start_time
+            evaluations[strategy_name] = evaluation
+
+        return evaluations
+
+    def _chunk_with_strategy(
+        self, ast: MarkdownAST, strategy_name: str
+    ) -> list[DocumentChunk]:
+        """Chunk document with a named strategy.
+
+        Args:
+            ast: Parsed markdown AST
+            strategy_name: Strategy to use
+
+        Returns:
+            List of document chunks
+
         Raises:
             ProcessingError: If chunking fails
         """
@@ -52,7 +115,6 @@ class ChunkingEngine:
             logger.warning("No elements in AST to chunk")
             return []
 
-        strategy_name = self.settings.chunk_method
         if strategy_name not in self.strategies:
             raise ProcessingError(
                 f"Unknown chunking strategy: {strategy_name}",
@@ -75,6 +137,7 @@ class ChunkingEngine:
                 chunk.id = f"chunk_{i:04d}"
                 chunk.add_metadata("chunk_index", i)
                 chunk.add_metadata("total_chunks", len(chunks))
+            link_parent_ids(chunks)
 
             logger.info("Successfully chunked document into %s chunks", len(chunks))
             return chunks
@@ -90,6 +153,65 @@ class ChunkingEngine:
                 cause=e,
             ) from e
 
+    def iter_chunks(
+        self, elements: Iterable[MarkdownElement]
+    ) -> Iterator[DocumentChunk]:
+        """Chunk a stream of elements, yielding chunks as they are finalized.
+
+        The total number of chunks is unknown while streaming, so chunks carry
+        ``chunk_index`` but not ``total_chunks``. Strategies that need the whole
+        document fall back to structure-aware chunking to keep memory bounded.
+
+        Args:
+            elements: Markdown elements in document order
+
+        Yields:
+            Validated document chunks
+
+        Raises:
+            ProcessingError: If the strategy is unknown or a chunk is invalid
+        """
+        strategy_name = self.settings.chunk_method
+        if strategy_name not in self.strategies:
+            raise ProcessingError(
+                f"Unknown chunking strategy: {strategy_name}",
+                error_code=1310,
+                context={
+                    "strategy": strategy_name,
+                    "available_strategies": list(self.strategies.keys()),
+                },
+            )
+
+        chunker = self.strategies[strategy_name]
+        if not chunker.supports_streaming:
+            logger.warning(
+                "Strategy '%s' cannot stream; using 'structure' instead", strategy_name
+            )
+            chunker = self.strategies["structure"]
+
+        max_allowed_size = self.settings.chunk_size * 1.5
+        for i, chunk in enumerate(chunker.iter_chunks(elements)):
+            if not chunk.content.strip():
+                raise ProcessingError(
+                    f"Generated empty chunk at position: {i}",
+                    error_code=1312,
+                    context={"empty_chunk_indices": [i]},
+                )
+            if len(chunk.content) > max_allowed_size and not is_parent_chunk(chunk):
+                raise ProcessingError(
+                    f"Generated chunk exceeds size limits at position: {i}",
+                    error_code=1313,
+                    context={
+                        "oversized_chunk_indices": [i],
+                        "max_allowed_size": max_allowed_size,
+                        "configured_size": self.settings.chunk_size,
+                    },
+                )
+
+            chunk.id = f"chunk_{i:04d}"
+            chunk.add_metadata("chunk_index", i)
+            yield chunk
+
     def _validate_chunks(self, chunks: list[DocumentChunk]) -> None:
         """Validate generated chunks.
 
@@ -113,10 +235,13 @@ class ChunkingEngine:
                 context={"empty_chunk_indices": empty_chunks},
             )
 
-        # Check for oversized chunks (allow some tolerance)
+        # Check for oversized chunks (allow some tolerance); parent chunks
+        # hold whole sections for context and are exempt
         max_allowed_size = self.settings.chunk_size * 1.5
         oversized_chunks = [
-            i for i, chunk in enumerate(chunks) if len(chunk.content) > max_allowed_size
+            i
+            for i, chunk in enumerate(chunks)
+            if len(chunk.content) > max_allowed_size and not is_parent_chunk(chunk)
         ]
 
         if oversized_chunks:
@@ -3,6 +3,7 @@
 from ...utils.logging import get_logger
 from ..models import DocumentChunk, MarkdownAST
 from .base import BaseChunker
+from .boundaries import floor_word_start
 
 
 logger = get_logger(__name__)
@@ -23,40 +24,37 @@ class FixedSizeChunker(BaseChunker):
         if not ast.elements:
             return []
 
-        # Convert AST back to text
+        # Rendering is cached on the AST and shared with other consumers;
+        # chunks are slices of this one buffer
         full_text = self._ast_to_text(ast)
+        text_length = len(full_text)
+        chunk_size = self.settings.chunk_size
 
-        if not full_text.strip():
-            return []
-
-        chunks = []
+        chunks: list[DocumentChunk] = []
         start = 0
 
-        while start < len(full_text):
+        while start < text_length:
             # Calculate end position
-            end = min(start + self.settings.chunk_size, len(full_text))
-
-            # Try to find a good break point (word boundary)
-            if end < len(full_text) and self.settings.chunk_respect_boundaries:
-                # Look backwards for word boundary
-                for i in range(
-                    end, max(start + self.settings.chunk_size // 2, start), -1
-                ):
-                    if full_text[i] in " \n\t.!?":
-                        end = i + 1
-                        break
-
-            # Extract chunk content
-            chunk_content = full_text[start:end]
-
-            if chunk_content.strip():
-                chunk = self._create_chunk(
-                    chunk_content, start, end, {"chunk_method": "fixed_size"}
+            end = min(start + chunk_size, text_length)
+
+            # Cut at the last word boundary in the second half of the window
+            if end < text_length and self.settings.chunk_respect_boundaries:
+                boundary = floor_word_start(full_text, end, lo=start + chunk_size // 2)
+                if boundary is not None:
+                    end = boundary
+
+            # Slice once; stripping returns the slice itself when there is
+            # no surrounding whitespace
+            chunk_content = full_text[start:end].strip()
+            if chunk_content:
+                chunks.append(
+                    self._create_chunk(
+                        chunk_content, start, end, {"chunk_method": "fixed_size"}
+                    )
                 )
-                chunks.append(chunk)
 
             # Move start position with overlap
-            if start + self.settings.chunk_size >= len(full_text):
+            if start + chunk_size >= text_length:
                 break
 
             start = end - self.settings.chunk_overlap
@@ -77,27 +75,7 @@ class FixedSizeChunker(BaseChunker):
         Returns:
             Plain text representation
         """
-        text_parts = []
-
-        for element in ast.elements:
-            if element.type == "header":
-                level_prefix = "#" * (element.level or 1)
-                text_parts.append(f"{level_prefix} {element.text}")
-            elif element.type == "paragraph":
-                text_parts.append(element.text)
-            elif element.type == "code_block":
-                lang = element.language or ""
-                text_parts.append(f"```{lang}\n{element.text}\n```")
-            elif element.type == "list":
-                if element.items:
-                    items = "\n".join(f"- {item}" for item in element.items)
-                    text_parts.append(items)
-                else:
-                    text_parts.append(element.text)
-            else:
-                text_parts.append(element.text)
-
-        return "\n\n".join(text_parts)
+        return ast.render("markdown")
 
     def get_chunker_info(self) -> dict:
         """Get information about the fixed-size chunker configuration.
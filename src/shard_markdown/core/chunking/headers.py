@@ -0,0 +1,135 @@
+"""Header offsets, levels and titles for section-based chunking."""
+
+import re
+from array import array
+from collections.abc import Iterable, Iterator
+
+from ..models import MarkdownAST, MarkdownElement
+
+
+_HEADER_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
+
+# Separator used by the plain text rendering between elements
+_ELEMENT_SEPARATOR_LENGTH = 2
+
+
+class HeaderIndex:
+    """Headers of a document with their offsets in its text rendering.
+
+    Built in one pass, either from parser elements or, when the document has
+    no header elements, from a single regex scan over the text. Section spans
+    run from one header offset to the next, so splitting a document into
+    sections is linear in the number of headers.
+    """
+
+    def __init__(
+        self,
+        length: int,
+        offsets: Iterable[int] = (),
+        levels: Iterable[int] = (),
+        titles: Iterable[str] = (),
+    ) -> None:
+        """Initialize index.
+
+        Args:
+            length: Length of the indexed text
+            offsets: Sorted offsets at which each header starts
+            levels: Header levels (1-6)
+            titles: Header titles
+        """
+        self.length = length
+        self.offsets = array("q", offsets)
+        self.levels = array("b", levels)
+        self.titles = list(titles)
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[MarkdownElement]) -> "HeaderIndex":
+        """Index header elements by their offset in the text rendering.
+
+        Args:
+            elements: Parsed markdown elements
+
+        Returns:
+            Header index over ``MarkdownAST.render("text")``
+        """
+        offsets, levels, titles = [], [], []
+        position = -_ELEMENT_SEPARATOR_LENGTH
+
+        for element in elements:
+            if not element.text:
+                continue
+            position += _ELEMENT_SEPARATOR_LENGTH
+            if element.type == "header":
+                offsets.append(position)
+                levels.append(element.level or 1)
+                titles.append(element.text.strip())
+            position += len(element.text)
+
+        return cls(max(position, 0), offsets, levels, titles)
+
+    @classmethod
+    def from_text(cls, text: str) -> "HeaderIndex":
+        """Index ``#``-style header lines in raw markdown text.
+
+        Args:
+            text: Markdown text
+
+        Returns:
+            Header index over ``text``
+        """
+        offsets, levels, titles = [], [], []
+        for match in _HEADER_PATTERN.finditer(text):
+            offsets.append(match.start())
+            levels.append(len(match.group(1)))
+            titles.append(match.group(2).strip())
+        return cls(len(text), offsets, levels, titles)
+
+    @classmethod
+    def from_ast(cls, ast: MarkdownAST) -> "HeaderIndex":
+        """Index a parsed document, sharing the index through the AST cache.
+
+        Header elements are used when present; otherwise the text rendering
+        is scanned for ``#`` header lines.
+
+        Args:
+            ast: Parsed markdown AST
+
+        Returns:
+            Header index over ``ast.content``
+        """
+
+        def build() -> HeaderIndex:
+            index = cls.from_elements(ast.elements)
+            return index if len(index) else cls.from_text(ast.content)
+
+        return ast.cached(("headers",), build)
+
+    def __len__(self) -> int:
+        """Number of headers."""
+        return len(self.offsets)
+
+    def section_end(self, i: int) -> int:
+        """Get the offset at which the section of header ``i`` ends.
+
+        Args:
+            i: Header position in the index
+
+        Returns:
+            Offset of the next header, or the text length for the last one
+        """
+        return self.offsets[i + 1] if i + 1 < len(self.offsets) else self.length
+
+    def sections(self) -> Iterator[tuple[int, int, int, str]]:
+        """Iterate over section spans in document order.
+
+        Content before the first header is yielded as a level-0 section with
+        an empty title.
+
+        Yields:
+            ``(start, end, level, title)`` for each section
+        """
+        if not self.offsets or self.offsets[0] > 0:
+            first = self.offsets[0] if self.offsets else self.length
+            yield 0, first, 0, ""
+        for i, start in enumerate(self.offsets):
+            yield start, self.section_end(i), self.levels[i], self.titles[i]
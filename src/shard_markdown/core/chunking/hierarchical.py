@@ -0,0 +1,125 @@
+"""Hierarchical chunking that emits parent sections and their child chunks."""
+
+from collections.abc import Iterable, Iterator
+
+from ...utils.logging import get_logger
+from ..models import DocumentChunk, MarkdownAST, MarkdownElement
+from .structure import StructureAwareChunker
+
+
+logger = get_logger(__name__)
+
+
+class HierarchicalChunker(StructureAwareChunker):
+    """Emit section-sized parent chunks and structure-aware child chunks.
+
+    Headers at or above ``chunk_parent_level`` start a new parent section.
+    Each element is rendered once; its text goes both into the parent being
+    built and into the child chunks packed by the structure-aware loop, which
+    keeps the header context across sections. Parents come before their
+    children, and children point at them with ``parent_chunk_index``.
+    """
+
+    # A parent buffers its whole section, which has no size bound
+    supports_streaming = False
+
+    def chunk_document(self, ast: MarkdownAST) -> list[DocumentChunk]:
+        """Chunk document into parent sections and child chunks.
+
+        Args:
+            ast: Parsed markdown AST
+
+        Returns:
+            Parents followed by their children, in document order
+        """
+        if not ast.elements:
+            return []
+
+        chunks = list(self.iter_chunks(ast.elements))
+
+        logger.info("Created %s chunks using hierarchical method", len(chunks))
+        return chunks
+
+    def iter_chunks(
+        self, elements: Iterable[MarkdownElement]
+    ) -> Iterator[DocumentChunk]:
+        """Yield each parent section followed by its children.
+
+        Args:
+            elements: Markdown elements in document order
+
+        Yields:
+            Document chunks
+        """
+        context: list[str] = []
+        section: list[tuple[MarkdownElement, str]] = []
+        section_start = 0
+        emitted = 0
+
+        for element in elements:
+            if self._starts_parent(element) and section:
+                for chunk in self._emit_section(
+                    section, context, section_start, emitted
+                ):
+                    emitted += 1
+                    yield chunk
+                section_start += sum(len(text) for _, text in section)
+                section = []
+            section.append((element, self._element_to_text(element)))
+
+        if section:
+            yield from self._emit_section(section, context, section_start, emitted)
+
+    def _starts_parent(self, element: MarkdownElement) -> bool:
+        """Check whether an element opens a new parent section."""
+        return (
+            element.type == "header"
+            and (element.level or 1) <= self.settings.chunk_parent_level
+        )
+
+    def _emit_section(
+        self,
+        section: list[tuple[MarkdownElement, str]],
+        context: list[str],
+        start: int,
+        parent_index: int,
+    ) -> Iterator[DocumentChunk]:
+        """Create the parent chunk for a section, then its children.
+
+        Args:
+            section: Elements of the section paired with their text
+            context: Header context, updated in place
+            start: Offset of the section in the document
+            parent_index: Position the parent chunk will have in the output
+
+        Yields:
+            Parent chunk followed by child chunks
+        """
+        parent_content = "".join(text for _, text in section)
+        if not parent_content.strip():
+            return
+
+        first = section[0][0]
+        parent_context = list(context)
+        if first.type == "header":
+            self._update_context(parent_context, first)
+
+        children = list(self._iter_structured(section, context, start))
+
+        yield self._create_chunk(
+            parent_content,
+            start,
+            start + len(parent_content),
+            {
+                "chunk_level": "parent",
+                "structural_context": " > ".join(parent_context),
+                "section_title": first.text if first.type == "header" else "",
+                "section_level": (first.level or 1) if first.type == "header" else 0,
+                "child_count": len(children),
+            },
+        )
+
+        for child in children:
+            child.add_metadata("chunk_level", "child")
+            child.add_metadata("parent_chunk_index", parent_index)
+            yield child
@@ -0,0 +1,76 @@
+"""Optimal packing of text units into as few chunks as possible."""
+
+from collections.abc import Sequence
+
+
+def pack_units(
+    sizes: Sequence[int],
+    budget: int,
+    limit: int | None = None,
+    separator: int = 0,
+    first_slack: int = 0,
+    penalties: Sequence[int] | None = None,
+    overflow_penalty: int = 1,
+) -> list[tuple[int, int]]:
+    """Split a run of units into the fewest chunks that fit a size limit.
+
+    Finds, by dynamic programming over chunk end positions, a split with the
+    minimum number of chunks and, among those, the lowest total penalty.
+    Chunks may grow past ``budget`` up to ``limit``, at ``overflow_penalty``
+    each, so the extra room is only used where it saves a chunk or avoids a
+    costlier cut. A unit larger than the limit becomes a chunk by itself.
+
+    Runs in ``O(n * w)`` time, where ``w`` is the number of units that fit in
+    one chunk.
+
+    Args:
+        sizes: Length of each unit
+        budget: Preferred maximum length of a chunk
+        limit: Hard maximum length of a chunk, ``budget`` if not given
+        separator: Length added between two units in the same chunk
+        first_slack: Extra room in the first chunk, e.g. because it carries
+            less overlap than the others reserve
+        penalties: Cost of cutting before each unit; index 0 is ignored
+        overflow_penalty: Cost of a chunk longer than ``budget``
+
+    Returns:
+        ``(start, end)`` unit ranges of each chunk, in order
+    """
+    n = len(sizes)
+    if n == 0:
+        return []
+    if limit is None:
+        limit = budget
+
+    # best[j] is (chunk count, penalty) for the first j units; start[j] is
+    # where the last chunk of that solution begins
+    best: list[tuple[int, int]] = [(0, 0)] + [(n + 1, 0)] * n
+    start = [0] * (n + 1)
+
+    for end in range(1, n + 1):
+        width = -separator
+        for i in range(end - 1, -1, -1):
+            width += sizes[i] + separator
+            slack = first_slack if i == 0 else 0
+            if width > limit + slack and i < end - 1:
+                if width > limit + first_slack:
+                    break
+                continue
+
+            count, penalty = best[i]
+            if i and penalties is not None:
+                penalty += penalties[i]
+            if width > budget + slack:
+                penalty += overflow_penalty
+            candidate = (count + 1, penalty)
+            if candidate < best[end]:
+                best[end] = candidate
+                start[end] = i
+
+    ranges = []
+    end = n
+    while end > 0:
+        ranges.append((start[end], end))
+        end = start[end]
+    ranges.reverse()
+    return ranges
@@ -2,6 +2,7 @@
 
 from ..models import DocumentChunk, MarkdownAST
 from .base import BaseChunker
+from .packing import pack_units
 
 
 class ParagraphChunker(BaseChunker):
@@ -24,6 +25,8 @@ class ParagraphChunker(BaseChunker):
         paragraphs = self._split_paragraphs(content)
         if not paragraphs:
             return []
+        if self.settings.chunk_packing == "optimal":
+            return self._chunk_packed(paragraphs)
 
         chunks = []
         current_chunk: list[str] = []
@@ -83,6 +86,50 @@ class ParagraphChunker(BaseChunker):
 
         return chunks
 
+    def _chunk_packed(self, paragraphs: list[str]) -> list[DocumentChunk]:
+        """Pack paragraphs into the fewest chunks within the size tolerance.
+
+        Args:
+            paragraphs: Paragraphs in document order
+
+        Returns:
+            List of document chunks
+        """
+        # Overlap paragraphs are joined to the chunk with one more separator
+        reserve = self.settings.chunk_overlap
+        if reserve > 0:
+            reserve += len("\n\n")
+        size = self.settings.chunk_size
+        ranges = pack_units(
+            [len(paragraph) for paragraph in paragraphs],
+            size - reserve,
+            limit=int(size * self.settings.chunk_packing_tolerance) - reserve,
+            separator=len("\n\n"),
+            first_slack=reserve,
+        )
+
+        chunks = []
+        chunk_start = 0
+        overlap_paras: list[str] = []
+        for first, last in ranges:
+            group = overlap_paras + paragraphs[first:last]
+            chunk_content = "\n\n".join(group)
+            chunk_end = chunk_start + len(chunk_content)
+            chunks.append(
+                self._create_chunk(
+                    content=chunk_content,
+                    start=chunk_start,
+                    end=chunk_end,
+                    metadata={"chunk_type": "paragraph"},
+                )
+            )
+
+            if self.settings.chunk_overlap > 0:
+                overlap_paras = self._get_overlap_paragraphs(group)
+            chunk_start = chunk_end - sum(len(p) + len("\n\n") for p in overlap_paras)
+
+        return chunks
+
     def _split_paragraphs(self, text: str) -> list[str]:
         """Split text into paragraphs.
 
@@ -0,0 +1,204 @@
+"""Lazy registry of chunking strategies."""
+
+import importlib
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any
+
+from ...config.settings import Settings
+from ...utils.errors import ProcessingError
+from ...utils.logging import get_logger
+from .base import BaseChunker
+from .strategies import BUILTIN_STRATEGIES
+
+
+logger = get_logger(__name__)
+
+ENTRY_POINT_GROUP = "shard_markdown.chunkers"
+
+ChunkerFactory = Callable[[Settings], BaseChunker]
+
+
+def load_object(spec: str) -> Any:
+    """Import the object named by a ``module:attribute`` spec.
+
+    Args:
+        spec: Import spec such as ``package.module:ClassName``
+
+    Returns:
+        Imported object
+    """
+    module_name, _, attribute = spec.partition(":")
+    obj: Any = importlib.import_module(module_name)
+    for part in filter(None, attribute.split(".")):
+        obj = getattr(obj, part)
+    return obj
+
+
+def parse_plugin_spec(spec: str) -> EntryPoint:
+    """Parse a ``Settings.plugins`` entry into an entry point.
+
+    Entries use entry point syntax, ``name = module:Class``. When the name is
+    omitted the lowercased attribute name is used.
+
+    Args:
+        spec: Plugin specification
+
+    Returns:
+        Entry point in the chunker group
+
+    Raises:
+        ProcessingError: If the specification is malformed
+    """
+    name, sep, value = spec.partition("=")
+    if not sep:
+        name, value = spec.rpartition(":")[2].lower(), spec
+    name, value = name.strip(), value.strip()
+    if not name or ":" not in value:
+        raise ProcessingError(
+            f"Invalid chunker plugin specification: {spec}",
+            error_code=1314,
+            context={"plugin": spec, "expected": "name = module:Class"},
+        )
+    return EntryPoint(name=name, value=value, group=ENTRY_POINT_GROUP)
+
+
+class StrategyRegistry(Mapping[str, BaseChunker]):
+    """Mapping of strategy names to chunkers, instantiated on first use.
+
+    Built-in strategies are known by name up front and only imported when
+    looked up. Third-party chunkers are discovered from the
+    ``shard_markdown.chunkers`` entry point group and from ``Settings.plugins``
+    the first time a name outside the built-ins is requested or the registry
+    is enumerated. Built-in names cannot be overridden by plugins.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        """Initialize registry.
+
+        Args:
+            settings: Configuration passed to each chunker on construction
+        """
+        self.settings = settings
+        self._factories: dict[str, str | EntryPoint | ChunkerFactory] = dict(
+            BUILTIN_STRATEGIES
+        )
+        self._instances: dict[str, BaseChunker] = {}
+        self._discovered = False
+
+    def register(self, name: str, factory: str | ChunkerFactory) -> None:
+        """Register a strategy.
+
+        Args:
+            name: Strategy name
+            factory: ``module:Class`` spec or callable taking settings
+        """
+        self._factories[name] = factory
+        self._instances.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a strategy has been instantiated.
+
+        Args:
+            name: Strategy name
+
+        Returns:
+            True if the chunker exists already
+        """
+        return name in self._instances
+
+    def __getitem__(self, name: str) -> BaseChunker:
+        """Get the chunker for a strategy, creating it on first access."""
+        chunker = self._instances.get(name)
+        if chunker is not None:
+            return chunker
+
+        if name not in self._factories:
+            self._discover()
+        if name not in self._factories:
+            raise KeyError(name)
+
+        chunker = self._create(name, self._factories[name])
+        self._instances[name] = chunker
+        return chunker
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether a strategy is known without instantiating it."""
+        if name in self._factories:
+            return True
+        self._discover()
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all known strategy names."""
+        self._discover()
+        return iter(list(self._factories))
+
+    def __len__(self) -> int:
+        """Count all known strategies."""
+        self._discover()
+        return len(self._factories)
+
+    def _create(
+        self, name: str, factory: str | EntryPoint | ChunkerFactory
+    ) -> BaseChunker:
+        """Import and instantiate a chunker.
+
+        Raises:
+            ProcessingError: If the plugin cannot be loaded or is not a chunker
+        """
+        try:
+            create: ChunkerFactory
+            if isinstance(factory, EntryPoint):
+                create = factory.load()
+            elif isinstance(factory, str):
+                create = load_object(factory)
+            else:
+                create = factory
+            chunker = create(self.settings)
+        except (ImportError, AttributeError, TypeError) as e:
+            raise ProcessingError(
+                f"Failed to load chunking strategy '{name}': {str(e)}",
+                error_code=1314,
+                context={"strategy": name},
+                cause=e,
+            ) from e
+
+        if not isinstance(chunker, BaseChunker):
+            raise ProcessingError(
+                f"Chunking strategy '{name}' is not a BaseChunker",
+                error_code=1314,
+                context={"strategy": name, "type": type(chunker).__name__},
+            )
+
+        logger.debug("Loaded chunking strategy '%s'", name)
+        return chunker
+
+    def _discover(self) -> None:
+        """Add strategies from entry points and configured plugins once."""
+        if self._discovered:
+            return
+        self._discovered = True
+
+        plugins: list[EntryPoint] = list(entry_points(group=ENTRY_POINT_GROUP))
+        plugins.extend(self._configured_plugins(self.settings.plugins))
+
+        for entry_point in plugins:
+            if entry_point.name in BUILTIN_STRATEGIES:
+                logger.warning(
+                    "Ignoring plugin '%s': built-in strategy names are reserved",
+                    entry_point.value,
+                )
+                continue
+            self._factories.setdefault(entry_point.name, entry_point)
+
+    @staticmethod
+    def _configured_plugins(specs: Iterable[str]) -> list[EntryPoint]:
+        """Parse configured plugins, skipping malformed entries."""
+        plugins = []
+        for spec in specs:
+            try:
+                plugins.append(parse_plugin_spec(spec))
+            except ProcessingError as e:
+                logger.warning("%s", e.message)
+        return plugins
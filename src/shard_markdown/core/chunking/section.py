@@ -1,9 +1,9 @@
 """Section-based chunking strategy."""
 
-import re
-
 from ..models import DocumentChunk, MarkdownAST
 from .base import BaseChunker
+from .boundaries import BoundaryIndex
+from .headers import HeaderIndex
 
 
 class SectionChunker(BaseChunker):
@@ -23,7 +23,8 @@ class SectionChunker(BaseChunker):
             return []
 
         # Find all headers and their positions
-        sections = self._extract_sections(content)
+        headers = HeaderIndex.from_ast(ast)
+        sections = self._extract_sections(content, headers) if len(headers) else []
         if not sections:
             # If no sections found, treat entire content as one section
             return [
@@ -71,79 +72,37 @@ class SectionChunker(BaseChunker):
 
         return chunks
 
-    def _extract_sections(self, content: str) -> list[dict]:
+    def _extract_sections(self, content: str, headers: HeaderIndex) -> list[dict]:
         """Extract sections from markdown content.
 
         Args:
-            content: Markdown content
+            content: Document content
+            headers: Header index over ``content``
 
         Returns:
             List of section dictionaries
         """
-        # Match markdown headers (# to ######)
-        header_pattern = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
-
         sections = []
-        last_pos = 0
-
-        for match in header_pattern.finditer(content):
-            header_level = len(match.group(1))
-            header_title = match.group(2).strip()
-            header_start = match.start()
-
-            # If there was content before this header, add it as a section
-            if header_start > last_pos:
-                pre_content = content[last_pos:header_start].strip()
-                if pre_content:
-                    sections.append(
-                        {
-                            "content": pre_content,
-                            "start": last_pos,
-                            "end": header_start,
-                            "title": "Introduction" if last_pos == 0 else "",
-                            "level": 0,
-                        }
-                    )
-
-            # Start new section with this header
-            section_start = header_start
-            last_pos = match.end()
 
-            # Find the end of this section (next header or end of content)
-            next_header = header_pattern.search(content, match.end())
-            if next_header:
-                section_end = next_header.start()
-            else:
-                section_end = len(content)
+        for start, end, level, title in headers.sections():
+            section_content = content[start:end].strip()
+            if not section_content:
+                continue
 
-            section_content = content[section_start:section_end].strip()
+            # Content before the first header
+            if level == 0:
+                title = "Introduction" if start == 0 else ""
 
             sections.append(
                 {
                     "content": section_content,
-                    "start": section_start,
-                    "end": section_end,
-                    "title": header_title,
-                    "level": header_level,
+                    "start": start,
+                    "end": end,
+                    "title": title,
+                    "level": level,
                 }
             )
 
-            last_pos = section_end
-
-        # Add any remaining content
-        if last_pos < len(content):
-            remaining = content[last_pos:].strip()
-            if remaining:
-                sections.append(
-                    {
-                        "content": remaining,
-                        "start": last_pos,
-                        "end": len(content),
-                        "title": "",
-                        "level": 0,
-                    }
-                )
-
         return sections
 
     def _split_large_section(self, section: dict) -> list[DocumentChunk]:
@@ -156,23 +115,20 @@ class SectionChunker(BaseChunker):
             List of chunks
         """
         content = section["content"]
+        index = BoundaryIndex(content)
         chunks = []
         current_pos = 0
 
         while current_pos < len(content):
             chunk_end = min(current_pos + self.settings.chunk_size, len(content))
 
-            # Try to break at paragraph boundary
+            # Try to break at paragraph boundary, then at a line boundary
             if chunk_end < len(content):
-                # Look for double newline
-                last_para = content.rfind("\n\n", current_pos, chunk_end)
-                if last_para > current_pos:
-                    chunk_end = last_para
-                else:
-                    # Look for single newline
-                    last_newline = content.rfind("\n", current_pos, chunk_end)
-                    if last_newline > current_pos:
-                        chunk_end = last_newline
+                boundary = index.floor("paragraph", chunk_end, lo=current_pos)
+                if boundary is None:
+                    boundary = index.floor("line", chunk_end, lo=current_pos)
+                if boundary is not None:
+                    chunk_end = boundary
 
             chunk_content = content[current_pos:chunk_end].strip()
 
@@ -194,7 +150,10 @@ class SectionChunker(BaseChunker):
             # Add overlap for next chunk
             if self.settings.chunk_overlap > 0 and chunk_end < len(content):
                 overlap_start = max(0, chunk_end - self.settings.chunk_overlap)
-                current_pos = overlap_start
+                # Never move backwards, or short pieces would repeat forever
+                current_pos = (
+                    overlap_start if overlap_start > current_pos else chunk_end
+                )
             else:
                 current_pos = chunk_end
 
@@ -4,11 +4,17 @@ import re
 
 from ..models import DocumentChunk, MarkdownAST
 from .base import BaseChunker
+from .boundaries import BoundaryIndex
+from .headers import HeaderIndex
+from .tfidf import TermMatrix, similarity_threshold
 
 
 class SemanticChunker(BaseChunker):
     """Chunk documents based on semantic coherence."""
 
+    # Similarity this many standard deviations below the mean is a topic shift
+    BOUNDARY_STD_FACTOR = 1.0
+
     def chunk_document(self, ast: MarkdownAST) -> list[DocumentChunk]:
         """Chunk document based on semantic boundaries.
 
@@ -25,11 +31,21 @@ class SemanticChunker(BaseChunker):
         if not content:
             return []
 
+        # TF-IDF mode decides itself which paragraphs belong together
+        use_tfidf = self.settings.chunk_semantic_mode == "tfidf"
+
         # Extract semantic units (combination of structure and content analysis)
-        semantic_units = self._extract_semantic_units(content)
+        semantic_units = self._extract_semantic_units(
+            content, HeaderIndex.from_ast(ast), group_paragraphs=not use_tfidf
+        )
         if not semantic_units:
             return []
 
+        if use_tfidf:
+            return self._chunk_by_similarity(
+                self._split_oversized_units(semantic_units)
+            )
+
         chunks = []
         current_chunk: list[dict] = []
         current_size = 0
@@ -89,11 +105,132 @@ class SemanticChunker(BaseChunker):
 
         return chunks
 
-    def _extract_semantic_units(self, content: str) -> list[dict]:
+    def _chunk_by_similarity(self, units: list[dict]) -> list[DocumentChunk]:
+        """Group units using TF-IDF similarity between neighbouring units.
+
+        Each unit is tokenized once into a sparse term matrix. A chunk ends
+        where adjacent similarity drops below the curve's mean minus
+        ``BOUNDARY_STD_FACTOR`` standard deviations (once the chunk is at
+        least a quarter of the target size), or where the size limit is hit.
+        After a cut for size alone, the last unit is repeated as overlap if it
+        fits into the next chunk together with the unit that follows.
+
+        Args:
+            units: Semantic units in document order, none above ``chunk_size``
+
+        Returns:
+            List of document chunks
+        """
+        matrix = TermMatrix(unit["content"] for unit in units)
+        similarities = matrix.adjacent_similarity()
+        threshold = similarity_threshold(similarities, self.BOUNDARY_STD_FACTOR)
+        min_size = self.settings.chunk_size // 4
+
+        # First pass: decide unit ranges, so topics are ranked in one batch
+        groups = []
+        first = 0
+        current_size = 0
+
+        chunk_size = self.settings.chunk_size
+        separator = len("\n\n")
+        for i, unit in enumerate(units):
+            unit_size = len(unit["content"])
+            if i > first:
+                related = similarities[i - 1] >= threshold
+                topic_shift = not related and current_size >= min_size
+                if topic_shift or current_size + separator + unit_size > chunk_size:
+                    groups.append((first, i))
+                    # Carry the last unit over when the split was only for size
+                    carried = len(units[i - 1]["content"])
+                    if (
+                        self.settings.chunk_overlap > 0
+                        and related
+                        and carried + separator + unit_size <= chunk_size
+                    ):
+                        first = i - 1
+                        current_size = carried + separator
+                    else:
+                        first = i
+                        current_size = 0
+                else:
+                    current_size += separator
+            current_size += unit_size
+        groups.append((first, len(units)))
+
+        chunks = []
+        chunk_start = 0
+        previous_end = 0
+        for (first, end), terms in zip(
+            groups, matrix.top_terms_for(groups, 5), strict=True
+        ):
+            if first < previous_end:
+                chunk_start -= len(units[first]["content"])
+
+            group = units[first:end]
+            chunk_content = "\n\n".join(u["content"] for u in group)
+            titles = [u["title"] for u in group if u.get("title")]
+            topics = list(dict.fromkeys(titles + terms))
+
+            chunks.append(
+                self._create_chunk(
+                    content=chunk_content,
+                    start=chunk_start,
+                    end=chunk_start + len(chunk_content),
+                    metadata={"chunk_type": "semantic", "topics": topics[:10]},
+                )
+            )
+            chunk_start += len(chunk_content)
+            previous_end = end
+
+        return chunks
+
+    def _split_oversized_units(self, units: list[dict]) -> list[dict]:
+        """Split units longer than ``chunk_size`` into pieces that fit.
+
+        Pieces end at the last sentence boundary within the size, or at the
+        last word boundary if the sentence is longer, and keep the unit's
+        type, level and title.
+
+        Args:
+            units: Semantic units in document order
+
+        Returns:
+            Units of at most ``chunk_size`` characters
+        """
+        limit = self.settings.chunk_size
+        result = []
+        for unit in units:
+            text = unit["content"]
+            if len(text) <= limit:
+                result.append(unit)
+                continue
+
+            index = BoundaryIndex(text)
+            pos = 0
+            while pos < len(text):
+                end = pos + limit
+                if end < len(text):
+                    boundary = index.floor("sentence", end, lo=pos)
+                    if boundary is None:
+                        boundary = index.floor("word", end, lo=pos)
+                    if boundary is not None:
+                        end = boundary
+                piece = text[pos:end].strip()
+                if piece:
+                    result.append({**unit, "content": piece})
+                pos = end
+        return result
+
+    def _extract_semantic_units(
+        self, content: str, headers: HeaderIndex, group_paragraphs: bool = True
+    ) -> list[dict]:
         """Extract semantic units from content.
 
         Args:
             content: Document content
+            headers: Header index over ``content``
+            group_paragraphs: Merge adjacent prose paragraphs of large sections
+                into one unit; otherwise every paragraph is its own unit
 
         Returns:
             List of semantic unit dictionaries
@@ -101,52 +238,31 @@ class SemanticChunker(BaseChunker):
         units = []
 
         # First, split by headers to get major topic boundaries
-        header_pattern = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
-
         sections = []
-        last_pos = 0
-
-        for match in header_pattern.finditer(content):
-            if match.start() > last_pos:
-                # Add content before header
-                pre_content = content[last_pos : match.start()].strip()
-                if pre_content:
-                    sections.append(
-                        {"content": pre_content, "type": "content", "level": 0}
-                    )
-
-            # Add header and its content
-            header_level = len(match.group(1))
-            header_title = match.group(2).strip()
-
-            # Find next header or end
-            next_match = header_pattern.search(content, match.end())
-            section_end = next_match.start() if next_match else len(content)
-
-            section_content = content[match.start() : section_end].strip()
+        for start, end, level, title in headers.sections():
+            section_content = content[start:end].strip()
+            if not section_content:
+                continue
             sections.append(
                 {
                     "content": section_content,
-                    "type": "section",
-                    "level": header_level,
-                    "title": header_title,
+                    "type": "section" if level else "content",
+                    "level": level,
+                    "title": title,
                 }
             )
 
-            last_pos = section_end
-
-        # Add any remaining content
-        if last_pos < len(content):
-            remaining = content[last_pos:].strip()
-            if remaining:
-                sections.append({"content": remaining, "type": "content", "level": 0})
-
         # Now break sections into semantic units based on content patterns
         for section in sections:
             # Split large sections into paragraphs/lists
             content_str = str(section["content"])
             if len(content_str) > self.settings.chunk_size // 2:
-                sub_units = self._split_into_semantic_paragraphs(content_str)
+                if group_paragraphs:
+                    sub_units = self._split_into_semantic_paragraphs(content_str)
+                else:
+                    sub_units = [
+                        p.strip() for p in content_str.split("\n\n") if p.strip()
+                    ]
                 for sub_unit in sub_units:
                     units.append(
                         {
@@ -1,9 +1,8 @@
 """Sentence-based chunking strategy."""
 
-import re
-
 from ..models import DocumentChunk, MarkdownAST
 from .base import BaseChunker
+from .boundaries import BoundaryIndex
 
 
 class SentenceChunker(BaseChunker):
@@ -23,7 +22,7 @@ class SentenceChunker(BaseChunker):
             return []
 
         # Split into sentences
-        sentences = self._split_sentences(content)
+        sentences = self._split_sentences(content, self._boundary_index(ast))
         if not sentences:
             return []
 
@@ -82,23 +81,22 @@ class SentenceChunker(BaseChunker):
 
         return chunks
 
-    def _split_sentences(self, text: str) -> list[str]:
+    def _split_sentences(
+        self, text: str, index: BoundaryIndex | None = None
+    ) -> list[str]:
         """Split text into sentences.
 
         Args:
             text: Text to split
+            index: Precomputed boundary index over ``text``
 
         Returns:
             List of sentences
         """
-        # Simple sentence splitting - can be improved with NLP libraries
-        sentence_endings = r"[.!?]+[\s\n]+"
-        sentences = re.split(sentence_endings, text)
-
-        # Clean and filter sentences
-        sentences = [s.strip() for s in sentences if s.strip()]
-
-        return sentences
+        if index is None:
+            index = BoundaryIndex(text)
+        sentences = (text[start:end].strip() for start, end in index.spans("sentence"))
+        return [sentence for sentence in sentences if sentence]
 
     def _get_overlap_sentences(self, sentences: list[str]) -> list[str]:
         """Get sentences for overlap.
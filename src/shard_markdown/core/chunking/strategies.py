@@ -0,0 +1,18 @@
+"""Names of the built-in chunking strategies.
+
+Kept free of heavy imports so the CLI can list strategies without loading
+any chunker.
+"""
+
+# Built-in strategies as "module:attribute" specs, imported on first use
+BUILTIN_STRATEGIES: dict[str, str] = {
+    "structure": "shard_markdown.core.chunking.structure:StructureAwareChunker",
+    "fixed": "shard_markdown.core.chunking.fixed:FixedSizeChunker",
+    "token": "shard_markdown.core.chunking.token:TokenChunker",
+    "sentence": "shard_markdown.core.chunking.sentence:SentenceChunker",
+    "paragraph": "shard_markdown.core.chunking.paragraph:ParagraphChunker",
+    "section": "shard_markdown.core.chunking.section:SectionChunker",
+    "semantic": "shard_markdown.core.chunking.semantic:SemanticChunker",
+    "hierarchical": "shard_markdown.core.chunking.hierarchical:HierarchicalChunker",
+    "auto": "shard_markdown.core.chunking.auto:AutoChunker",
+}
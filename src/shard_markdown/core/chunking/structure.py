@@ -1,8 +1,12 @@
 """Structure-aware chunking that respects markdown hierarchy."""
 
+from collections.abc import Iterable, Iterator
+
 from ...utils.logging import get_logger
 from ..models import DocumentChunk, MarkdownAST, MarkdownElement
 from .base import BaseChunker
+from .boundaries import BoundaryIndex
+from .packing import pack_units
 
 
 logger = get_logger(__name__)
@@ -11,6 +15,20 @@ logger = get_logger(__name__)
 class StructureAwareChunker(BaseChunker):
     """Intelligent chunking that respects markdown structure."""
 
+    supports_streaming = True
+
+    # Optimal packing buffers about this many chunks' worth of elements and
+    # packs them at the next header, keeping memory bounded when streaming
+    PACKING_WINDOW = 32
+
+    # Without a header, the buffer is packed once it reaches this many windows
+    PACKING_WINDOW_CAP = 2
+
+    # Cost of cutting before a header, mid-section, and right after a header
+    HEADER_CUT_PENALTY = 0
+    SECTION_CUT_PENALTY = 1
+    ORPHAN_HEADER_PENALTY = 3
+
     def chunk_document(self, ast: MarkdownAST) -> list[DocumentChunk]:
         """Chunk document while respecting structure boundaries.
 
@@ -23,14 +41,59 @@ class StructureAwareChunker(BaseChunker):
         if not ast.elements:
             return []
 
-        chunks = []
-        current_chunk = ""
-        current_start = 0
-        current_context: list[str] = []
+        chunks = list(self.iter_chunks(ast.elements))
+
+        logger.info("Created %s chunks using structure-aware method", len(chunks))
+        return chunks
+
+    def iter_chunks(
+        self, elements: Iterable[MarkdownElement]
+    ) -> Iterator[DocumentChunk]:
+        """Yield chunks as soon as they are finalized.
+
+        Only the chunk under construction (at most ``chunk_size`` plus overlap)
+        is held in memory, so elements may come from a streaming parser.
+
+        Args:
+            elements: Markdown elements in document order
+
+        Yields:
+            Document chunks
+        """
+        rendered = ((element, self._element_to_text(element)) for element in elements)
+        yield from self._iter_structured(rendered, [], 0)
 
-        for element in ast.elements:
-            element_text = self._element_to_text(element)
+    def _iter_structured(
+        self,
+        rendered: Iterable[tuple[MarkdownElement, str]],
+        current_context: list[str],
+        current_start: int,
+    ) -> Iterator[DocumentChunk]:
+        """Pack rendered elements into chunks, tracking header context.
 
+        Args:
+            rendered: Elements paired with their text from ``_element_to_text``
+            current_context: Header context, updated in place as headers pass
+            current_start: Offset of the first element in the document
+
+        Yields:
+            Document chunks
+        """
+        if self.settings.chunk_packing == "optimal":
+            yield from self._iter_packed(rendered, current_context, current_start)
+        else:
+            yield from self._iter_greedy(rendered, current_context, current_start)
+
+    def _iter_greedy(
+        self,
+        rendered: Iterable[tuple[MarkdownElement, str]],
+        current_context: list[str],
+        current_start: int,
+    ) -> Iterator[DocumentChunk]:
+        """Pack elements greedily, closing a chunk when the next one overflows."""
+        current_chunk = ""
+
+        for element, element_text in rendered:
             # For very large elements that exceed chunk size on their own,
             # we may need to split them
             if len(element_text) > self.settings.chunk_size * 1.2:
@@ -42,7 +105,7 @@ class StructureAwareChunker(BaseChunker):
                         current_start + len(current_chunk),
                         {"structural_context": " > ".join(current_context)},
                     )
-                    chunks.append(chunk)
+                    yield chunk
                     current_start = chunk.end_position
                     current_chunk = ""
 
@@ -60,7 +123,7 @@ class StructureAwareChunker(BaseChunker):
                             "split_total": len(element_chunks),
                         },
                     )
-                    chunks.append(chunk)
+                    yield chunk
                     current_start = chunk.end_position
 
                 # Continue with empty current_chunk
@@ -80,7 +143,7 @@ class StructureAwareChunker(BaseChunker):
                         current_start + len(current_chunk),
                         {"structural_context": " > ".join(current_context)},
                     )
-                    chunks.append(chunk)
+                    yield chunk
 
                     # Start new chunk with overlap
                     overlap_content = self._get_overlap_content(current_chunk)
@@ -101,7 +164,7 @@ class StructureAwareChunker(BaseChunker):
                     current_start + len(current_chunk),
                     {"structural_context": " > ".join(current_context)},
                 )
-                chunks.append(chunk)
+                yield chunk
 
                 # Start new chunk with overlap
                 overlap_content = self._get_overlap_content(current_chunk)
@@ -122,11 +185,131 @@ class StructureAwareChunker(BaseChunker):
                 current_start + len(current_chunk),
                 {"structural_context": " > ".join(current_context)},
             )
-            chunks.append(chunk)
+            yield chunk
+
+    def _iter_packed(
+        self,
+        rendered: Iterable[tuple[MarkdownElement, str]],
+        current_context: list[str],
+        current_start: int,
+    ) -> Iterator[DocumentChunk]:
+        """Pack elements into the fewest chunks within the size tolerance.
+
+        Elements are buffered up to a header once about ``PACKING_WINDOW``
+        chunks' worth has accumulated, or regardless of headers once
+        ``PACKING_WINDOW_CAP`` windows have, then split by ``pack_units``,
+        which prefers cuts before headers over cuts inside sections. Elements
+        too large for any chunk are split as in greedy packing.
+        """
+        window = self.settings.chunk_size * self.PACKING_WINDOW
+        cap = window * self.PACKING_WINDOW_CAP
+        pending: list[tuple[MarkdownElement, str]] = []
+        pending_size = 0
+        overlap = ""
+
+        for element, element_text in rendered:
+            oversized = len(element_text) > self.settings.chunk_size * 1.2
+            boundary = pending_size >= cap or (
+                element.type == "header" and pending_size >= window
+            )
+            if pending and (oversized or boundary):
+                chunks = self._pack_pending(
+                    pending, current_context, current_start, overlap
+                )
+                yield from chunks
+                if chunks:
+                    overlap = self._get_overlap_content(chunks[-1].content)
+                    current_start = chunks[-1].end_position - len(overlap)
+                pending, pending_size = [], 0
+
+            if not oversized:
+                pending.append((element, element_text))
+                pending_size += len(element_text)
+                continue
+
+            # Large elements become their own chunks, without overlap
+            current_start += len(overlap)
+            overlap = ""
+            element_chunks = self._split_large_element(element_text)
+            for i, elem_chunk in enumerate(element_chunks):
+                chunk = self._create_chunk(
+                    elem_chunk,
+                    current_start,
+                    current_start + len(elem_chunk),
+                    {
+                        "structural_context": " > ".join(current_context),
+                        "split_element": True,
+                        "split_part": i + 1,
+                        "split_total": len(element_chunks),
+                    },
+                )
+                yield chunk
+                current_start = chunk.end_position
+            if element.type == "header":
+                self._update_context(current_context, element)
+
+        if pending:
+            yield from self._pack_pending(
+                pending, current_context, current_start, overlap
+            )
 
-        logger.info("Created %s chunks using structure-aware method", len(chunks))
+    def _pack_pending(
+        self,
+        pending: list[tuple[MarkdownElement, str]],
+        context: list[str],
+        start: int,
+        overlap: str,
+    ) -> list[DocumentChunk]:
+        """Split buffered elements into chunks with ``pack_units``.
+
+        Args:
+            pending: Buffered elements paired with their text
+            context: Header context, updated in place
+            start: Offset of the first chunk, including ``overlap``
+            overlap: Text carried over from the previous chunk
+
+        Returns:
+            Packed chunks
+        """
+        size = self.settings.chunk_size
+        reserve = self.settings.chunk_overlap
+        ranges = pack_units(
+            [len(text) for _, text in pending],
+            size - reserve,
+            limit=int(size * self.settings.chunk_packing_tolerance) - reserve,
+            first_slack=reserve - len(overlap),
+            penalties=[
+                self._cut_penalty(pending[i - 1][0], pending[i][0]) if i else 0
+                for i in range(len(pending))
+            ],
+        )
+
+        chunks = []
+        for first, last in ranges:
+            content = overlap + "".join(text for _, text in pending[first:last])
+            for element, _ in pending[first:last]:
+                if element.type == "header":
+                    self._update_context(context, element)
+            chunk = self._create_chunk(
+                content,
+                start,
+                start + len(content),
+                {"structural_context": " > ".join(context)},
+            )
+            if chunk.content:
+                chunks.append(chunk)
+            overlap = self._get_overlap_content(chunk.content)
+            start = chunk.end_position - len(overlap)
         return chunks
 
+    def _cut_penalty(self, previous: MarkdownElement, element: MarkdownElement) -> int:
+        """Get the cost of ending a chunk between two elements."""
+        if element.type == "header":
+            return self.HEADER_CUT_PENALTY
+        if previous.type == "header":
+            return self.ORPHAN_HEADER_PENALTY
+        return self.SECTION_CUT_PENALTY
+
     def _element_to_text(self, element: MarkdownElement) -> str:
         """Convert AST element to text representation.
 
@@ -228,21 +411,15 @@ class StructureAwareChunker(BaseChunker):
         if len(text) <= target_size:
             return text
 
-        # Try to find last sentence boundary
-        overlap_text = text[-target_size:]
+        # Start at the first sentence, line or word boundary in the window
+        overlap_start = len(text) - target_size
+        window = BoundaryIndex(text, start=overlap_start)
+        for kind in ("sentence", "line", "word"):
+            boundary = window.ceil(kind, overlap_start)
+            if boundary is not None:
+                return text[boundary:]
 
-        # Look for sentence boundary
-        for delimiter in [". ", "! ", "? ", "\n"]:
-            idx = overlap_text.find(delimiter)
-            if idx != -1:
-                return overlap_text[idx + len(delimiter) :]
-
-        # Fall back to word boundary
-        space_idx = overlap_text.find(" ")
-        if space_idx != -1:
-            return overlap_text[space_idx + 1 :]
-
-        return overlap_text
+        return text[overlap_start:]
 
     def _split_long_line(
         self, line: str, chunk_size: int, overlap_size: int
@@ -258,41 +435,34 @@ class StructureAwareChunker(BaseChunker):
             List of line chunks
         """
         chunks = []
-
-        # Try to split by sentences first
-        sentence_delimiters = [". ", "! ", "? ", "; "]
-
-        while len(line) > chunk_size:
-            # Find best split point
-            split_point = chunk_size
-
-            # Look for sentence boundary
-            for delimiter in sentence_delimiters:
-                idx = line[:chunk_size].rfind(delimiter)
-                if idx != -1:
-                    split_point = idx + len(delimiter)
-                    break
-            else:
-                # No sentence boundary, try word boundary
-                space_idx = line[:chunk_size].rfind(" ")
-                if space_idx != -1:
-                    split_point = space_idx
-
-            chunks.append(line[:split_point])
-
-            # Add overlap for next chunk
-            if overlap_size > 0 and split_point > overlap_size:
-                overlap_start = max(0, split_point - overlap_size)
-                # Try to start overlap at word boundary
-                space_idx = line[overlap_start:split_point].find(" ")
-                if space_idx != -1:
-                    overlap_start = overlap_start + space_idx + 1
-                line = line[overlap_start:]
+        index = BoundaryIndex(line)
+        pos = 0
+
+        while len(line) - pos > chunk_size:
+            limit = pos + chunk_size
+
+            # Prefer the last sentence boundary, then the last word boundary
+            split_point = index.floor("sentence", limit, lo=pos)
+            if split_point is None:
+                split_point = index.floor("word", limit, lo=pos)
+            if split_point is None:
+                split_point = limit
+
+            chunks.append(line[pos:split_point])
+
+            # Add overlap for next chunk, starting at a word boundary
+            if overlap_size > 0 and split_point - pos > overlap_size:
+                overlap_start = split_point - overlap_size
+                word_start = index.ceil("word", overlap_start, hi=split_point)
+                pos = word_start if word_start is not None else overlap_start
+            elif split_point < len(line) and line[split_point].isspace():
+                # Skip the whitespace run to the start of the next word
+                pos = index.ceil("word", split_point + 1) or len(line)
             else:
-                line = line[split_point:].lstrip()
+                pos = split_point
 
-        if line:
-            chunks.append(line)
+        if pos < len(line):
+            chunks.append(line[pos:])
 
         return chunks
 
@@ -0,0 +1,359 @@
+"""Sparse TF-IDF term matrix for semantic boundary detection."""
+
+import math
+import string
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Punctuation becomes whitespace so terms are found with a plain split()
+_PUNCTUATION_TABLE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+# Separates units in the vectorized scan; split() keeps it as its own token
+_UNIT_SEPARATOR = "\x00"
+
+STOPWORDS = frozenset(
+    """
+    about above after again all also an and any are as at be because been
+    before being below between both but by can could did do does doing down
+    during each few for from further had has have having he her here hers
+    him his how if in into is it its itself just me more most my no nor not
+    now of off on once only or other our ours out over own same she should
+    so some such than that the their them then there these they this those
+    through to too under until up very was we were what when where which
+    while who whom why will with would you your yours
+    """.split()
+)
+
+
+def _split_terms(text: str) -> list[str]:
+    """Lowercase text and split it on whitespace and punctuation."""
+    return text.lower().translate(_PUNCTUATION_TABLE).split()
+
+
+def _is_term(word: str) -> bool:
+    """Check whether a split word is kept as a term."""
+    return len(word) > 1 and word not in STOPWORDS
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, dropping stopwords and single characters.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in document order
+    """
+    return [word for word in _split_terms(text) if _is_term(word)]
+
+
+class TermMatrix:
+    """TF-IDF weighted term matrix with one sparse row per text unit.
+
+    Rows are stored in CSR form (``indptr``, ``indices``, ``counts``) so each
+    unit is tokenized exactly once. Weights use sublinear term frequency and
+    smoothed inverse document frequency. With NumPy installed, the units are
+    tokenized in one scan and counting, weighting, adjacent-row
+    similarity and top terms are all vectorized; otherwise the same results
+    are computed row by row in pure Python.
+    """
+
+    def __init__(self, texts: Iterable[str]) -> None:
+        """Tokenize texts and build the matrix.
+
+        Args:
+            texts: Text units in document order
+        """
+        texts = list(texts)
+        self.vocabulary: dict[str, int] = {}
+        # ndarrays when built with NumPy, otherwise array.array
+        self.indptr: Any
+        self.indices: Any
+        self.counts: Any
+
+        joined = f" {_UNIT_SEPARATOR} ".join(texts)
+        if NUMPY_AVAILABLE and joined.count(_UNIT_SEPARATOR) == len(texts) - 1:
+            self._build_vectorized(joined, len(texts))
+        else:
+            self._build_rows(texts)
+
+        self.terms = list(self.vocabulary)
+        self.weights: Any = self._compute_weights()
+
+    @property
+    def rows(self) -> int:
+        """Number of text units."""
+        return len(self.indptr) - 1
+
+    def adjacent_similarity(self) -> list[float]:
+        """Compute cosine similarity between each pair of consecutive rows.
+
+        Returns:
+            ``rows - 1`` similarities; entry ``i`` compares rows ``i`` and
+            ``i + 1``. Rows without terms have similarity 0 to any row.
+        """
+        if self.rows < 2:
+            return []
+        if NUMPY_AVAILABLE:
+            return self._adjacent_similarity_numpy()
+        return self._adjacent_similarity_python()
+
+    def top_terms(self, start: int, end: int, limit: int) -> list[str]:
+        """Get the highest weighted terms across a range of rows.
+
+        Args:
+            start: First row
+            end: Row to stop at (exclusive)
+            limit: Maximum number of terms
+
+        Returns:
+            Terms ordered by descending total weight
+        """
+        return self.top_terms_for([(start, end)], limit)[0]
+
+    def top_terms_for(
+        self, ranges: Sequence[tuple[int, int]], limit: int
+    ) -> list[list[str]]:
+        """Get the highest weighted terms for several row ranges at once.
+
+        Args:
+            ranges: ``(start, end)`` row ranges, which may overlap
+            limit: Maximum number of terms per range
+
+        Returns:
+            Terms per range, ordered by descending total weight
+        """
+        if not ranges:
+            return []
+        if NUMPY_AVAILABLE:
+            return self._top_terms_numpy(ranges, limit)
+
+        results = []
+        for start, end in ranges:
+            sums: dict[int, float] = {}
+            for j in range(self.indptr[start], self.indptr[end]):
+                term = self.indices[j]
+                sums[term] = sums.get(term, 0.0) + self.weights[j]
+            ranked = sorted(sums, key=lambda t: -sums[t])
+            results.append([self.terms[term] for term in ranked[:limit]])
+        return results
+
+    def _build_rows(self, texts: list[str]) -> None:
+        """Build the CSR arrays one row at a time."""
+        indptr = [0]
+        indices: list[int] = []
+        counts: list[int] = []
+
+        # Count terms as strings and map only distinct terms to ids
+        term_id = self.vocabulary.get
+        for text in texts:
+            row = Counter(_split_terms(text))
+            for word in [word for word in row if not _is_term(word)]:
+                del row[word]
+            indices += [
+                self._add_term(term) if i is None else i
+                for term, i in zip(row, map(term_id, row), strict=True)
+            ]
+            counts += row.values()
+            indptr.append(len(indices))
+
+        self.indptr = array("q", indptr)
+        self.indices = array("q", indices)
+        self.counts = array("d", counts)
+
+    def _build_vectorized(self, joined: str, n_rows: int) -> None:
+        """Build the CSR arrays from one scan over all units.
+
+        Units are joined with a separator that splits out as a token of its
+        own, so a running count of separators gives each token's row.
+        Term ids come from C-level dict operations, and per-row counts from
+        a single ``np.unique`` over ``row * vocabulary_size + term`` keys.
+        """
+        tokens = _split_terms(joined)
+
+        distinct = sorted(set(tokens))
+        terms = (word for word in distinct if _is_term(word))
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+
+        # -1 marks a unit separator, -2 a dropped word
+        lookup = dict.fromkeys(distinct, -2)
+        lookup.update(self.vocabulary)
+        lookup[_UNIT_SEPARATOR] = -1
+        ids = np.fromiter(map(lookup.__getitem__, tokens), np.int64, len(tokens))
+
+        n_terms = max(len(self.vocabulary), 1)
+        row_ids = np.cumsum(ids == -1)
+        keep = ids >= 0
+        keys, counts = np.unique(
+            row_ids[keep] * n_terms + ids[keep], return_counts=True
+        )
+
+        self.indptr = np.searchsorted(keys // n_terms, np.arange(n_rows + 1))
+        self.indices = keys % n_terms
+        self.counts = counts.astype(np.float64)
+
+    def _add_term(self, term: str) -> int:
+        """Assign the next id to a new term."""
+        term_id = self.vocabulary[term] = len(self.vocabulary)
+        return term_id
+
+    def _compute_weights(self) -> Any:
+        """Weight each stored count by sublinear TF and smoothed IDF."""
+        n_rows = self.rows
+        if NUMPY_AVAILABLE:
+            indices = np.asarray(self.indices, dtype=np.int64)
+            counts = np.asarray(self.counts, dtype=np.float64)
+            df = np.bincount(indices, minlength=len(self.terms))
+            idf = np.log((1 + n_rows) / (1 + df)) + 1.0
+            return (1.0 + np.log(counts)) * idf[indices]
+
+        df_counts = Counter(self.indices)
+        idf_list = [
+            math.log((1 + n_rows) / (1 + df_counts[term])) + 1.0
+            for term in range(len(self.terms))
+        ]
+        return array(
+            "d",
+            (
+                (1.0 + math.log(count)) * idf_list[term]
+                for term, count in zip(self.indices, self.counts, strict=True)
+            ),
+        )
+
+    def _row_ids(self) -> Any:
+        """Row number of every stored entry."""
+        indptr = np.asarray(self.indptr, dtype=np.int64)
+        return np.repeat(np.arange(self.rows, dtype=np.int64), np.diff(indptr))
+
+    def _adjacent_similarity_numpy(self) -> list[float]:
+        """Vectorized adjacent cosine similarity.
+
+        Every stored entry gets the key ``row * vocabulary_size + term``.
+        Shifting keys back by one row and intersecting finds the terms shared
+        by consecutive rows; their weight products summed per row are the dot
+        products.
+        """
+        n_rows = self.rows
+        n_terms = max(len(self.terms), 1)
+        indices = np.asarray(self.indices, dtype=np.int64)
+        weights = self.weights
+
+        row_ids = self._row_ids()
+        norms = np.sqrt(np.bincount(row_ids, weights * weights, minlength=n_rows))
+
+        keys = row_ids * n_terms + indices
+        _, current, following = np.intersect1d(
+            keys, keys - n_terms, assume_unique=True, return_indices=True
+        )
+        dots = np.bincount(
+            row_ids[current],
+            weights[current] * weights[following],
+            minlength=n_rows,
+        )[:-1]
+
+        denominator = norms[:-1] * norms[1:]
+        similarity = np.divide(
+            dots, denominator, out=np.zeros_like(dots), where=denominator > 0
+        )
+        result: list[float] = similarity.tolist()
+        return result
+
+    def _adjacent_similarity_python(self) -> list[float]:
+        """Pure-Python adjacent cosine similarity used without NumPy."""
+        similarities = []
+        previous: dict[int, float] = {}
+        previous_norm = 0.0
+
+        for row in range(self.rows):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            current = {self.indices[j]: self.weights[j] for j in range(start, end)}
+            norm = math.sqrt(sum(w * w for w in current.values()))
+            if row > 0:
+                if norm and previous_norm:
+                    smaller, larger = sorted((previous, current), key=len)
+                    dot = sum(
+                        w * larger[term]
+                        for term, w in smaller.items()
+                        if term in larger
+                    )
+                    similarities.append(dot / (norm * previous_norm))
+                else:
+                    similarities.append(0.0)
+            previous, previous_norm = current, norm
+
+        return similarities
+
+    def _top_terms_numpy(
+        self, ranges: Sequence[tuple[int, int]], limit: int
+    ) -> list[list[str]]:
+        """Rank terms for all ranges with one ``np.unique`` over entry keys."""
+        n_terms = max(len(self.terms), 1)
+        indptr = np.asarray(self.indptr, dtype=np.int64)
+        bounds = np.asarray(ranges, dtype=np.int64)
+        lo, hi = indptr[bounds[:, 0]], indptr[bounds[:, 1]]
+        lengths = hi - lo
+
+        # Stored-entry positions for every range, concatenated
+        group_ids = np.repeat(np.arange(len(ranges), dtype=np.int64), lengths)
+        group_starts = np.cumsum(lengths) - lengths
+        entries = np.arange(lengths.sum(), dtype=np.int64) + np.repeat(
+            lo - group_starts, lengths
+        )
+
+        indices = np.asarray(self.indices, dtype=np.int64)
+        keys, inverse = np.unique(
+            group_ids * n_terms + indices[entries], return_inverse=True
+        )
+        totals = np.bincount(inverse, self.weights[entries])
+        key_groups = keys // n_terms
+
+        # Sort by group, then by descending weight, and keep the first few.
+        # Weights are positive, so ``group - total / (max + 1)`` stays within
+        # ``(group - 1, group)`` and one float argsort orders both keys.
+        if not len(totals):
+            return [[] for _ in ranges]
+        order = np.argsort(key_groups - totals / (totals.max() + 1.0))
+        group_sizes = np.bincount(key_groups, minlength=len(ranges))
+        first_in_group = np.repeat(np.cumsum(group_sizes) - group_sizes, group_sizes)
+        ranks = np.arange(len(order)) - first_in_group
+        kept = order[ranks < limit]
+
+        results: list[list[str]] = [[] for _ in ranges]
+        terms = self.terms
+        for group, term in zip(
+            key_groups[kept].tolist(), (keys[kept] % n_terms).tolist(), strict=True
+        ):
+            results[group].append(terms[term])
+        return results
+
+
+def similarity_threshold(similarities: Sequence[float], std_factor: float) -> float:
+    """Get the similarity below which consecutive units start a new topic.
+
+    Args:
+        similarities: Adjacent-unit similarity curve
+        std_factor: Number of standard deviations below the mean
+
+    Returns:
+        Threshold value (``-inf`` when there are no similarities)
+    """
+    if not similarities:
+        return float("-inf")
+    if NUMPY_AVAILABLE:
+        values = np.asarray(similarities)
+        return float(values.mean() - std_factor * values.std())
+
+    mean = sum(similarities) / len(similarities)
+    variance = sum((s - mean) ** 2 for s in similarities) / len(similarities)
+    return mean - std_factor * math.sqrt(variance)
@@ -1,14 +1,33 @@
 """Token-based chunking strategy."""
 
 import re
+from collections.abc import Iterator
 
 from ...config.settings import Settings
 from ..models import DocumentChunk, MarkdownAST
 from .base import BaseChunker
+from .tokenizers import Tokenizer, get_tokenizer
+
+
+_WORD = re.compile(r"\S+")
+
+# A unit is a span of the document text and its token count
+Unit = tuple[int, int, int]
 
 
 class TokenChunker(BaseChunker):
-    """Chunk documents based on token count."""
+    """Chunk documents so every chunk fits a token budget.
+
+    Elements are measured once with the configured tokenizer and packed whole
+    while they fit; elements that do not fit on their own are packed word by
+    word. A chunk's token count is the running sum of its units and the gaps
+    between them, so nothing is re-tokenized as a chunk grows. Chunks also
+    stay within ``chunk_size`` characters.
+
+    For tokenizers that split on whitespace (``regex``, ``wordpiece``) the
+    counts are exact. For byte-pair encodings, tokens are counted per unit,
+    which can only overestimate, so the budget still holds.
+    """
 
     def __init__(self, settings: Settings) -> None:
         """Initialize token chunker.
@@ -19,6 +38,12 @@ class TokenChunker(BaseChunker):
         super().__init__(settings)
         # Rough approximation: 1 token ≈ 4 characters (for English text)
         self.chars_per_token = 4
+        self.max_tokens = settings.chunk_max_tokens or max(
+            1, settings.chunk_size // self.chars_per_token
+        )
+        self.tokenizer: Tokenizer = get_tokenizer(
+            settings.chunk_tokenizer, settings.chunk_tokenizer_vocab
+        )
 
     def chunk_document(self, ast: MarkdownAST) -> list[DocumentChunk]:
         """Chunk document based on token count.
@@ -33,91 +58,162 @@ class TokenChunker(BaseChunker):
         if not content:
             return []
 
+        counts: dict[str, int] = {}
         chunks = []
-        current_pos = 0
-        overlap_content = ""
-
-        while current_pos < len(content):
-            # Use chunk_size directly as character count
-            # (settings.chunk_size is already in characters, not tokens)
-            chunk_size_chars = self.settings.chunk_size
+        current: list[Unit] = []
+        tokens = 0
+
+        for unit in self._iter_units(ast, counts):
+            start, end, unit_tokens = unit
+            if current:
+                gap = self._count(content[current[-1][1] : start], counts)
+                if (
+                    tokens + gap + unit_tokens > self.max_tokens
+                    or end - current[0][0] > self.settings.chunk_size
+                ):
+                    chunks.append(self._make_chunk(content, current, tokens))
+                    current = self._overlap_units(content, current, counts, unit)
+                    tokens = self._span_tokens(content, current, counts)
+                    gap = (
+                        self._count(content[current[-1][1] : start], counts)
+                        if current
+                        else 0
+                    )
+                tokens += gap
+            current.append(unit)
+            tokens += unit_tokens
+
+        if current:
+            chunks.append(self._make_chunk(content, current, tokens))
 
-            # Get chunk content without overlap considerations first
-            chunk_content = content[current_pos : current_pos + chunk_size_chars]
-
-            if not chunk_content.strip():
-                break
-
-            # Try to break at word boundary
-            if current_pos + chunk_size_chars < len(content):
-                # Look for last space before limit
-                last_space = chunk_content.rfind(" ")
-                if last_space > 0:
-                    chunk_content = chunk_content[:last_space]
-
-            # Calculate actual positions
-            chunk_start = current_pos
-            chunk_end = current_pos + len(chunk_content)
-
-            # Add overlap from previous chunk if available
-            if overlap_content:
-                chunk_content = overlap_content + chunk_content
-                chunk_start = current_pos - len(overlap_content)
-
-            chunks.append(
-                self._create_chunk(
-                    content=chunk_content,
-                    start=chunk_start,
-                    end=chunk_end,
-                    metadata={"chunk_type": "token"},
-                )
-            )
+        return chunks
 
-            # Prepare overlap for next chunk
-            overlap_content = self._get_overlap_content(chunk_content)
-            current_pos = chunk_end
+    def _iter_units(self, ast: MarkdownAST, counts: dict[str, int]) -> Iterator[Unit]:
+        """Yield elements that fit a chunk, or the words of those that do not.
 
-        return chunks
+        Args:
+            ast: Parsed markdown AST
+            counts: Token counts memoized by text
 
-    def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count for text using improved heuristics.
+        Yields:
+            ``(start, end, tokens)`` spans of ``ast.content``
+        """
+        position = 0
+        for element in ast.elements:
+            text = element.text
+            if not text:
+                continue
+
+            tokens = self._count(text, counts)
+            if tokens <= self.max_tokens and len(text) <= self.settings.chunk_size:
+                yield position, position + len(text), tokens
+            else:
+                for match in _WORD.finditer(text):
+                    yield from self._word_units(
+                        match.group(), position + match.start(), counts
+                    )
+            position += len(text) + len("\n\n")
+
+    def _word_units(self, word: str, start: int, counts: dict[str, int]) -> list[Unit]:
+        """Measure a word, cutting it into pieces if it exceeds a chunk.
 
         Args:
-            text: Text to estimate tokens for
+            word: Word text
+            start: Offset of the word in the document
+            counts: Token counts memoized by text
 
         Returns:
-            Estimated token count
+            Spans covering the word
+        """
+        tokens = self._count(word, counts)
+        if tokens <= self.max_tokens and len(word) <= self.settings.chunk_size:
+            return [(start, start + len(word), tokens)]
+
+        units = []
+        offset = 0
+        while offset < len(word):
+            # Longest prefix within both limits, found by bisection
+            lo, hi = 1, min(len(word) - offset, self.settings.chunk_size)
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if self.tokenizer.count(word[offset : offset + mid]) <= self.max_tokens:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            piece = word[offset : offset + lo]
+            units.append(
+                (start + offset, start + offset + lo, self.tokenizer.count(piece))
+            )
+            offset += lo
+        return units
+
+    def _overlap_units(
+        self,
+        content: str,
+        previous: list[Unit],
+        counts: dict[str, int],
+        following: Unit,
+    ) -> list[Unit]:
+        """Pick trailing units of the last chunk to repeat in the next one.
+
+        Units are carried over while they stay within ``chunk_overlap``
+        characters and half the token budget, and only if the next unit
+        still fits after them.
         """
-        if not text:
-            return 0
-
-        # Improved estimation based on GPT tokenization patterns:
-        # 1. Split on whitespace and punctuation
-        # 2. Count contractions as 2 tokens (e.g., "don't" = "do" + "n't")
-        # 3. Count numbers and special characters more accurately
-
-        # Count basic words
-        words = re.findall(r"\b\w+\b", text)
-        token_count = len(words)
-
-        # Add tokens for punctuation (each punctuation is typically a token)
-        punctuation = re.findall(r"[^\w\s]", text)
-        token_count += len(punctuation)
-
-        # Adjust for contractions (add extra token for each)
-        contractions = re.findall(r"\b\w+'\w+\b", text)
-        token_count += len(contractions)
-
-        # Adjust for numbers (multi-digit numbers often split)
-        numbers = re.findall(r"\b\d{4,}\b", text)
-        for num in numbers:
-            # Long numbers typically split every 3-4 digits
-            token_count += len(num) // 3
-
-        # Adjust for code patterns (if present)
-        code_patterns = re.findall(r"[A-Z][a-z]+|[a-z]+_[a-z]+|::|->|=>", text)
-        token_count += (
-            len(code_patterns) // 2
-        )  # These often tokenize as multiple tokens
-
-        return token_count
+        overlap = self.settings.chunk_overlap
+        if overlap <= 0 or len(previous) < 2:
+            return []
+
+        carried: list[Unit] = []
+        tokens = 0
+        for unit in reversed(previous[1:]):
+            if previous[-1][1] - unit[0] > overlap:
+                break
+            added = unit[2]
+            if carried:
+                added += self._count(content[unit[1] : carried[0][0]], counts)
+            if tokens + added > self.max_tokens // 2:
+                break
+            carried.insert(0, unit)
+            tokens += added
+
+        if carried:
+            gap = self._count(content[carried[-1][1] : following[0]], counts)
+            if (
+                following[1] - carried[0][0] > self.settings.chunk_size
+                or tokens + gap + following[2] > self.max_tokens
+            ):
+                return []
+        return carried
+
+    def _span_tokens(
+        self, content: str, units: list[Unit], counts: dict[str, int]
+    ) -> int:
+        """Sum unit tokens and the tokens of the gaps between them."""
+        total = sum(unit[2] for unit in units)
+        for previous, current in zip(units, units[1:], strict=False):
+            total += self._count(content[previous[1] : current[0]], counts)
+        return total
+
+    def _count(self, text: str, counts: dict[str, int]) -> int:
+        """Count tokens, memoized by text for repeated words and gaps."""
+        tokens = counts.get(text)
+        if tokens is None:
+            tokens = counts[text] = self.tokenizer.count(text)
+        return tokens
+
+    def _make_chunk(
+        self, content: str, units: list[Unit], tokens: int
+    ) -> DocumentChunk:
+        """Create a chunk spanning the given units."""
+        start, end = units[0][0], units[-1][1]
+        return self._create_chunk(
+            content=content[start:end],
+            start=start,
+            end=end,
+            metadata={
+                "chunk_type": "token",
+                "token_count": tokens,
+                "tokenizer": self.tokenizer.name,
+            },
+        )
@@ -0,0 +1,208 @@
+"""Tokenizers used to measure chunks in model tokens."""
+
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+
+from ...utils.errors import ProcessingError
+
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Runs of word characters and single punctuation marks
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+TOKENIZERS = ("regex", "wordpiece", "tiktoken")
+
+
+class Tokenizer(ABC):
+    """Count the tokens a model would see for a piece of text."""
+
+    name: str = ""
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Count tokens in text.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Number of tokens
+        """
+        pass
+
+
+class RegexTokenizer(Tokenizer):
+    """Treat each word and each punctuation mark as one token.
+
+    Needs no vocabulary and tracks word-level tokenizers closely for prose.
+    """
+
+    name = "regex"
+
+    def count(self, text: str) -> int:
+        """Count words and punctuation marks in text."""
+        return len(_WORD_PATTERN.findall(text))
+
+
+class WordPieceTokenizer(Tokenizer):
+    """BERT-style WordPiece tokenizer over a local ``vocab.txt``.
+
+    Text is split into words and punctuation, then each word is matched
+    greedily against the vocabulary, longest piece first, with ``##`` marking
+    pieces that continue a word. Words that cannot be matched count as a
+    single unknown token. Word counts are cached, since prose repeats words.
+    """
+
+    name = "wordpiece"
+
+    def __init__(
+        self,
+        vocab_path: Path,
+        lowercase: bool = True,
+        max_word_length: int = 100,
+    ) -> None:
+        """Initialize tokenizer.
+
+        Args:
+            vocab_path: Vocabulary file with one token per line
+            lowercase: Lowercase and strip accents before matching
+            max_word_length: Longer words count as one unknown token
+
+        Raises:
+            ProcessingError: If the vocabulary cannot be read
+        """
+        try:
+            with open(vocab_path, encoding="utf-8") as f:
+                self.vocab = frozenset(line.rstrip("\n") for line in f if line.strip())
+        except OSError as e:
+            raise ProcessingError(
+                f"Cannot read WordPiece vocabulary: {vocab_path}",
+                error_code=1315,
+                context={"tokenizer": self.name, "vocab": str(vocab_path)},
+                cause=e,
+            ) from e
+
+        self.lowercase = lowercase
+        self.max_word_length = max_word_length
+        self._count_word = lru_cache(maxsize=65536)(self._wordpiece_count)
+
+    def count(self, text: str) -> int:
+        """Count WordPiece tokens in text."""
+        if self.lowercase:
+            text = _strip_accents(text.lower())
+        return sum(self._count_word(word) for word in _WORD_PATTERN.findall(text))
+
+    def _wordpiece_count(self, word: str) -> int:
+        """Count the pieces of one word, longest match first."""
+        if len(word) > self.max_word_length:
+            return 1
+
+        pieces = 0
+        start = 0
+        while start < len(word):
+            end = len(word)
+            while end > start:
+                piece = word[start:end] if start == 0 else "##" + word[start:end]
+                if piece in self.vocab:
+                    break
+                end -= 1
+            if end == start:
+                return 1
+            pieces += 1
+            start = end
+        return pieces
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Byte-pair encoding from ``tiktoken``.
+
+    Encodings are loaded from the local tiktoken cache
+    (``TIKTOKEN_CACHE_DIR``) when present.
+    """
+
+    name = "tiktoken"
+
+    def __init__(self, encoding: str = "cl100k_base") -> None:
+        """Initialize tokenizer.
+
+        Args:
+            encoding: tiktoken encoding name
+
+        Raises:
+            ProcessingError: If tiktoken or the encoding is unavailable
+        """
+        if not TIKTOKEN_AVAILABLE:
+            raise ProcessingError(
+                "The tiktoken tokenizer requires the tiktoken package",
+                error_code=1315,
+                context={"tokenizer": self.name, "install": "shard-markdown[tiktoken]"},
+            )
+        try:
+            self.encoding = tiktoken.get_encoding(encoding)
+        except (ValueError, OSError) as e:
+            raise ProcessingError(
+                f"Cannot load tiktoken encoding: {encoding}",
+                error_code=1315,
+                context={"tokenizer": self.name, "encoding": encoding},
+                cause=e,
+            ) from e
+
+    def count(self, text: str) -> int:
+        """Count BPE tokens in text."""
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(spec: str = "regex", vocab_path: Path | None = None) -> Tokenizer:
+    """Create a tokenizer, reusing instances across chunkers.
+
+    Args:
+        spec: ``regex``, ``wordpiece`` or ``tiktoken[:encoding]``
+        vocab_path: Vocabulary file, required by ``wordpiece``
+
+    Returns:
+        Tokenizer instance
+
+    Raises:
+        ProcessingError: If the tokenizer is unknown or cannot be created
+    """
+    name, _, option = spec.partition(":")
+    if name == "regex":
+        return RegexTokenizer()
+    if name == "wordpiece":
+        if vocab_path is None:
+            raise ProcessingError(
+                "The wordpiece tokenizer requires a vocabulary file",
+                error_code=1315,
+                context={"tokenizer": name, "setting": "chunk_tokenizer_vocab"},
+            )
+        return WordPieceTokenizer(vocab_path)
+    if name == "tiktoken":
+        return TiktokenTokenizer(option or "cl100k_base")
+
+    raise ProcessingError(
+        f"Unknown tokenizer: {spec}",
+        error_code=1315,
+        context={"tokenizer": spec, "available": list(TOKENIZERS)},
+    )
+
+
+def _strip_accents(text: str) -> str:
+    """Remove combining marks, as BERT's uncased tokenizer does."""
+    if text.isascii():
+        return text
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFD", text)
+        if unicodedata.category(char) != "Mn"
+    )
@@ -0,0 +1,446 @@
+"""Exact and near-duplicate chunk detection across documents."""
+
+import hashlib
+import re
+import sqlite3
+from collections import defaultdict
+from collections.abc import Iterable
+from itertools import combinations
+from pathlib import Path
+
+from ..config.settings import Settings
+from ..utils.errors import ProcessingError
+from ..utils.logging import get_logger
+from .models import DocumentChunk
+
+
+logger = get_logger(__name__)
+
+FINGERPRINT_BITS = 64
+
+# Width of an LSH band; four 16-bit bands keep buckets small at corpus scale
+BAND_BITS = 16
+
+# Chunks with fewer words only take part in exact matching; their
+# fingerprints are too coarse to compare
+MIN_NEAR_DUPLICATE_WORDS = 8
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def content_digest(text: str) -> str:
+    """Hash text for exact matching, ignoring whitespace differences.
+
+    Args:
+        text: Chunk content
+
+    Returns:
+        Hex SHA-256 digest of the whitespace-normalized text
+    """
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def simhash(text: str) -> int | None:
+    """Compute a 64-bit SimHash over words and word pairs.
+
+    Texts that differ in a few words get fingerprints that differ in a few
+    bits, so near-duplicates are found by Hamming distance. Single words keep
+    short chunks stable under small edits; word pairs keep unrelated text
+    with a shared vocabulary apart.
+
+    Args:
+        text: Chunk content
+
+    Returns:
+        Fingerprint, or None if the text is too short to fingerprint
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < MIN_NEAR_DUPLICATE_WORDS:
+        return None
+
+    shingles = set(words)
+    shingles.update(f"{a} {b}" for a, b in zip(words, words[1:], strict=False))
+    bits = [
+        format(
+            int.from_bytes(
+                hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(),
+                "big",
+            ),
+            "064b",
+        )
+        for shingle in shingles
+    ]
+    # Each fingerprint bit is set when most shingle hashes have it set
+    majority = len(bits) / 2
+    columns = zip(*bits, strict=True)
+    return int(
+        "".join("1" if column.count("1") > majority else "0" for column in columns),
+        2,
+    )
+
+
+class DedupIndex:
+    """In-memory index of canonical chunks for one batch.
+
+    Exact duplicates are looked up by content digest. Near-duplicates use
+    banded locality-sensitive hashing with multi-probe lookup: the
+    fingerprint is cut into four 16-bit bands, and a fingerprint within
+    ``max_distance`` bits differs in at most ``max_distance // 4`` bits in
+    one of them. Lookups probe every band value within that radius, and
+    only chunks sharing a probed band are compared bit by bit.
+    """
+
+    def __init__(self, max_distance: int = 6) -> None:
+        """Initialize index.
+
+        Args:
+            max_distance: Largest Hamming distance treated as a near-duplicate
+        """
+        self.max_distance = max_distance
+        self.band_bits = BAND_BITS
+        self.bands = FINGERPRINT_BITS // self.band_bits
+        radius = max_distance // self.bands
+        self._probe_masks = [
+            sum(1 << bit for bit in flipped)
+            for distance in range(radius + 1)
+            for flipped in combinations(range(self.band_bits), distance)
+        ]
+        self._exact: dict[str, tuple[str, str]] = {}
+        self._buckets: dict[tuple[int, int], list[tuple[int, str, str]]] = defaultdict(
+            list
+        )
+        self._entries: dict[str, tuple[str, int | None]] = {}
+
+    def band_keys(self, fingerprint: int) -> list[tuple[int, int]]:
+        """Split a fingerprint into ``(band, value)`` bucket keys."""
+        mask = (1 << self.band_bits) - 1
+        return [
+            (band, (fingerprint >> (band * self.band_bits)) & mask)
+            for band in range(self.bands)
+        ]
+
+    def probe_keys(self, fingerprint: int) -> list[tuple[int, int]]:
+        """Get the bucket keys a near-duplicate lookup has to visit."""
+        return [
+            (band, value ^ mask)
+            for band, value in self.band_keys(fingerprint)
+            for mask in self._probe_masks
+        ]
+
+    def find_exact(self, digest: str) -> tuple[str, str] | None:
+        """Find the canonical chunk with the same content digest.
+
+        Returns:
+            ``(chunk_id, source)`` of the canonical chunk, if any
+        """
+        return self._exact.get(digest)
+
+    def find_near(self, fingerprint: int, exclude: str = "") -> tuple[str, str] | None:
+        """Find a canonical chunk within ``max_distance`` bits.
+
+        Args:
+            fingerprint: SimHash to look up
+            exclude: Chunk ID to ignore, so a chunk never matches itself
+
+        Returns:
+            ``(chunk_id, source)`` of the canonical chunk, if any
+        """
+        for key in self.probe_keys(fingerprint):
+            for other, chunk_id, source in self._bucket(key):
+                if chunk_id == exclude:
+                    continue
+                if (fingerprint ^ other).bit_count() <= self.max_distance:
+                    return chunk_id, source
+        return None
+
+    def add(
+        self, chunk_id: str, source: str, digest: str, fingerprint: int | None
+    ) -> None:
+        """Record a canonical chunk, replacing an earlier entry with its ID.
+
+        Args:
+            chunk_id: Chunk identifier
+            source: Source file of the chunk
+            digest: Content digest
+            fingerprint: SimHash, or None for short chunks
+        """
+        if chunk_id:
+            self._remove(chunk_id)
+            self._entries[chunk_id] = (digest, fingerprint)
+        self._exact.setdefault(digest, (chunk_id, source))
+        if fingerprint is not None:
+            for key in self.band_keys(fingerprint):
+                self._buckets[key].append((fingerprint, chunk_id, source))
+
+    def flush(self) -> None:
+        """Persist pending entries (no-op for the in-memory index)."""
+
+    def close(self) -> None:
+        """Release resources held by the index."""
+
+    def _bucket(self, key: tuple[int, int]) -> Iterable[tuple[int, str, str]]:
+        """Get entries sharing a band value."""
+        return self._buckets.get(key, ())
+
+    def _remove(self, chunk_id: str) -> None:
+        """Drop the entry recorded for a chunk ID, if any."""
+        entry = self._entries.pop(chunk_id, None)
+        if entry is None:
+            return
+        digest, fingerprint = entry
+        if self._exact.get(digest, ("",))[0] == chunk_id:
+            del self._exact[digest]
+        if fingerprint is not None:
+            for key in self.band_keys(fingerprint):
+                self._buckets[key] = [
+                    item for item in self._buckets[key] if item[1] != chunk_id
+                ]
+
+
+class SQLiteDedupIndex(DedupIndex):
+    """Dedup index stored in SQLite so canonical chunks persist across runs.
+
+    Lookups go to the database; writes are committed on ``flush``.
+    """
+
+    def __init__(self, path: Path, max_distance: int = 6) -> None:
+        """Open or create the index.
+
+        Args:
+            path: Database file
+            max_distance: Largest Hamming distance treated as a near-duplicate
+
+        Raises:
+            ProcessingError: If the database cannot be opened or was built
+                with a different band layout
+        """
+        super().__init__(max_distance)
+        self.path = path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path))
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS exact (
+                    digest TEXT PRIMARY KEY, chunk_id TEXT, source TEXT
+                );
+                CREATE TABLE IF NOT EXISTS bands (
+                    band INTEGER, value INTEGER, fingerprint INTEGER,
+                    chunk_id TEXT, source TEXT
+                );
+                CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, value);
+                CREATE INDEX IF NOT EXISTS exact_chunk ON exact (chunk_id);
+                CREATE INDEX IF NOT EXISTS bands_chunk ON bands (chunk_id);
+                """
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('bands', ?)", (str(self.bands),)
+            )
+            (stored,) = self._db.execute(
+                "SELECT value FROM meta WHERE key = 'bands'"
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            raise ProcessingError(
+                f"Cannot open dedup index: {path}",
+                error_code=1316,
+                context={"index": str(path)},
+                cause=e,
+            ) from e
+
+        if int(stored) != self.bands:
+            self._db.close()
+            raise ProcessingError(
+                f"Dedup index {path} was built with a different band layout",
+                error_code=1316,
+                context={
+                    "index": str(path),
+                    "index_bands": int(stored),
+                    "configured_bands": self.bands,
+                },
+            )
+
+    def find_exact(self, digest: str) -> tuple[str, str] | None:
+        """Find the canonical chunk with the same content digest."""
+        row = self._db.execute(
+            "SELECT chunk_id, source FROM exact WHERE digest = ?", (digest,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def add(
+        self, chunk_id: str, source: str, digest: str, fingerprint: int | None
+    ) -> None:
+        """Record a canonical chunk, replacing an earlier entry with its ID."""
+        if chunk_id:
+            self._remove(chunk_id)
+        self._db.execute(
+            "INSERT OR IGNORE INTO exact VALUES (?, ?, ?)", (digest, chunk_id, source)
+        )
+        if fingerprint is not None:
+            self._db.executemany(
+                "INSERT INTO bands VALUES (?, ?, ?, ?, ?)",
+                [
+                    (band, value, _to_signed(fingerprint), chunk_id, source)
+                    for band, value in self.band_keys(fingerprint)
+                ],
+            )
+
+    def flush(self) -> None:
+        """Commit pending entries."""
+        self._db.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._db.commit()
+        self._db.close()
+
+    def _bucket(self, key: tuple[int, int]) -> Iterable[tuple[int, str, str]]:
+        """Get entries sharing a band value."""
+        rows = self._db.execute(
+            "SELECT fingerprint, chunk_id, source FROM bands "
+            "WHERE band = ? AND value = ?",
+            key,
+        )
+        mask = (1 << FINGERPRINT_BITS) - 1
+        return ((fp & mask, cid, src) for fp, cid, src in rows)
+
+    def _remove(self, chunk_id: str) -> None:
+        """Drop the rows recorded for a chunk ID."""
+        self._db.execute("DELETE FROM exact WHERE chunk_id = ?", (chunk_id,))
+        self._db.execute("DELETE FROM bands WHERE chunk_id = ?", (chunk_id,))
+
+
+class ChunkDeduplicator:
+    """Skip or link chunks whose content was already seen.
+
+    The first chunk with given content becomes canonical. Later exact or
+    near duplicates are dropped (``skip``) or kept with ``duplicate_of``
+    pointing at the canonical chunk ID (``link``). The index lives as long
+    as the deduplicator, so duplicates are found across a whole batch, and
+    across runs with a persistent index.
+    """
+
+    def __init__(self, mode: str = "skip", index: DedupIndex | None = None) -> None:
+        """Initialize deduplicator.
+
+        Args:
+            mode: ``skip`` or ``link``
+            index: Index of canonical chunks, in-memory by default
+        """
+        self.mode = mode
+        self.index = index or DedupIndex()
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ChunkDeduplicator | None":
+        """Create a deduplicator from ``process_dedup*`` settings.
+
+        Args:
+            settings: Configuration settings
+
+        Returns:
+            Deduplicator, or None when deduplication is off
+        """
+        if settings.process_dedup not in ("skip", "link"):
+            return None
+
+        max_distance = settings.process_dedup_distance
+        index = (
+            SQLiteDedupIndex(settings.process_dedup_index, max_distance)
+            if settings.process_dedup_index
+            else DedupIndex(max_distance)
+        )
+        return cls(settings.process_dedup, index)
+
+    def check(self, chunk: DocumentChunk) -> tuple[str, str, str] | None:
+        """Look a chunk up, recording it as canonical if it is new.
+
+        Args:
+            chunk: Chunk with its final ID
+
+        Returns:
+            ``(kind, chunk_id, source)`` of the canonical chunk for duplicates,
+            where kind is ``exact`` or ``near``; None for new content
+        """
+        # A re-run of a file finds its own chunks in a persistent index; those
+        # are refreshed rather than reported as duplicates of themselves
+        chunk_id = chunk.id or ""
+        digest = content_digest(chunk.content)
+        match = self.index.find_exact(digest)
+        if match is not None and not (chunk_id and match[0] == chunk_id):
+            self.exact_duplicates += 1
+            return "exact", *match
+
+        fingerprint = simhash(chunk.content)
+        if fingerprint is not None:
+            match = self.index.find_near(fingerprint, exclude=chunk_id)
+            if match is not None:
+                self.near_duplicates += 1
+                return "near", *match
+
+        source = chunk.metadata.get("source_file") or chunk.metadata.get(
+            "file_path", ""
+        )
+        self.index.add(chunk_id, str(source), digest, fingerprint)
+        return None
+
+    def apply(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        """Drop or link the duplicates in a document's chunks.
+
+        Args:
+            chunks: Chunks with their final IDs, in document order
+
+        Returns:
+            Chunks to keep
+        """
+        kept = []
+        replaced: dict[str, str] = {}
+        for chunk in chunks:
+            parent_id = chunk.metadata.get("parent_id")
+            if parent_id in replaced:
+                chunk.add_metadata("parent_id", replaced[parent_id])
+
+            if not self.mark(chunk):
+                kept.append(chunk)
+            elif chunk.id:
+                replaced[chunk.id] = chunk.metadata["duplicate_of"]
+        return kept
+
+    def mark(self, chunk: DocumentChunk) -> bool:
+        """Check one chunk, adding duplicate metadata to it.
+
+        Args:
+            chunk: Chunk with its final ID
+
+        Returns:
+            True if the chunk should be dropped
+        """
+        match = self.check(chunk)
+        if match is None:
+            return False
+
+        kind, canonical_id, source = match
+        chunk.add_metadata("duplicate_of", canonical_id)
+        chunk.add_metadata("duplicate_kind", kind)
+        if source:
+            chunk.add_metadata("duplicate_source", source)
+        return self.mode == "skip"
+
+    @property
+    def duplicates(self) -> int:
+        """Get the number of duplicates found so far."""
+        return self.exact_duplicates + self.near_duplicates
+
+    def flush(self) -> None:
+        """Persist the index, if it is stored on disk."""
+        self.index.flush()
+
+    def close(self) -> None:
+        """Persist and close the index."""
+        self.index.close()
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed integers."""
+    return value - (1 << FINGERPRINT_BITS) if value >> (FINGERPRINT_BITS - 1) else value
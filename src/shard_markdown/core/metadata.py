@@ -118,8 +118,7 @@ class MetadataExtractor:
             metadata["code_languages"] = languages
 
         # Calculate estimated reading time (assuming 200 words per minute)
-        total_text = " ".join(e.text for e in ast.elements if e.text)
-        word_count = len(total_text.split())
+        word_count = len(ast.content.split())
         metadata["word_count"] = word_count
         metadata["estimated_reading_time_minutes"] = max(1, round(word_count / 200))
 
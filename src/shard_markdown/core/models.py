@@ -1,10 +1,14 @@
 """Data models for document processing."""
 
+from collections.abc import Callable, Sequence
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+T = TypeVar("T")
 
 
 class MarkdownElement(BaseModel):
@@ -20,6 +24,36 @@ class MarkdownElement(BaseModel):
     )
 
 
+def _render_text(elements: list[MarkdownElement]) -> str:
+    """Join element texts into plain document content."""
+    return "\n\n".join(elem.text for elem in elements if elem.text)
+
+
+def _render_markdown(elements: list[MarkdownElement]) -> str:
+    """Render elements back into markdown with header and fence markers."""
+    text_parts = []
+
+    for element in elements:
+        if element.type == "header":
+            level_prefix = "#" * (element.level or 1)
+            text_parts.append(f"{level_prefix} {element.text}")
+        elif element.type == "code_block":
+            lang = element.language or ""
+            text_parts.append(f"```{lang}\n{element.text}\n```")
+        elif element.type == "list" and element.items:
+            text_parts.append("\n".join(f"- {item}" for item in element.items))
+        else:
+            text_parts.append(element.text)
+
+    return "\n\n".join(text_parts)
+
+
+RENDERERS: dict[str, Callable[[list[MarkdownElement]], str]] = {
+    "text": _render_text,
+    "markdown": _render_markdown,
+}
+
+
 class MarkdownAST(BaseModel):
     """Abstract Syntax Tree representation of a markdown document."""
 
@@ -31,12 +65,62 @@ class MarkdownAST(BaseModel):
         default_factory=dict, description="Document metadata"
     )
 
+    # Values derived from elements: key -> (elements, element count, value)
+    _cache: dict[Any, tuple[list[MarkdownElement], int, Any]] = PrivateAttr(
+        default_factory=dict
+    )
+
     @property
     def content(self) -> str:
         """Get the full text content of the document."""
-        if not self.elements:
-            return ""
-        return "\n\n".join(elem.text for elem in self.elements if elem.text)
+        return self.render("text")
+
+    def render(self, mode: str = "text") -> str:
+        """Render the document to a single string, computing it only once.
+
+        Args:
+            mode: ``text`` joins element texts, ``markdown`` restores header
+                and code fence markers
+
+        Returns:
+            Rendered document shared by every caller using the same mode
+
+        Raises:
+            ValueError: If the rendering mode is unknown
+        """
+        renderer = RENDERERS.get(mode)
+        if renderer is None:
+            raise ValueError(f"Unknown rendering mode: {mode}")
+        return self.cached(("render", mode), lambda: renderer(self.elements))
+
+    def cached(self, key: Any, factory: Callable[[], T]) -> T:
+        """Get a value derived from the elements, computing it on first use.
+
+        Entries are dropped when ``elements`` is reassigned or changes length.
+        Call ``invalidate_cache`` after editing elements in place.
+
+        Args:
+            key: Cache key, e.g. ``("render", "text")``
+            factory: Callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        entry = self._cache.get(key)
+        if (
+            entry is not None
+            and entry[0] is self.elements
+            and entry[1] == len(self.elements)
+        ):
+            return entry[2]  # type: ignore[no-any-return]
+
+        value = factory()
+        self._cache[key] = (self.elements, len(self.elements), value)
+        return value
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached renderings and derived values."""
+        self._cache.clear()
 
     @property
     def headers(self) -> list[MarkdownElement]:
@@ -82,9 +166,32 @@ class ProcessingResult(BaseModel):
     file_path: Path = Field(description="Path to processed file")
     success: bool = Field(description="Whether processing succeeded")
     chunks_created: int = Field(default=0, description="Number of chunks created")
+    duplicate_chunks: int = Field(
+        default=0, description="Chunks skipped or linked as duplicates"
+    )
+    boilerplate_blocks: int = Field(
+        default=0, description="Repeated boilerplate blocks dropped"
+    )
+    from_cache: bool = Field(
+        default=False, description="Whether chunks were loaded from the chunk cache"
+    )
     processing_time: float = Field(
         default=0.0, description="Processing time in seconds"
     )
+    stage_timings: dict[str, int] = Field(
+        default_factory=dict,
+        description="Monotonic nanoseconds spent in each processing stage",
+    )
+    peak_memory: int | None = Field(
+        default=None,
+        description="Most bytes allocated at once while processing, when "
+        "memory tracking is on",
+    )
+    element_count: int | None = Field(
+        default=None,
+        description="Markdown elements parsed, when memory tracking is on and "
+        "chunks did not come from the cache",
+    )
     collection_name: str | None = Field(
         default=None, description="Target collection name"
     )
@@ -101,6 +208,56 @@ class ProcessingResult(BaseModel):
         return 0.0
 
 
+class StageTimingSummary(BaseModel):
+    """Time spent in one processing stage across a batch of files."""
+
+    stage: str = Field(description="Stage name")
+    files: int = Field(default=0, description="Files that went through the stage")
+    total_ns: int = Field(default=0, description="Total nanoseconds in the stage")
+    p50_ns: int = Field(default=0, description="Median nanoseconds per file")
+    p95_ns: int = Field(default=0, description="95th percentile per file")
+    max_ns: int = Field(default=0, description="Slowest file in nanoseconds")
+
+    @classmethod
+    def from_samples(cls, stage: str, samples: Sequence[int]) -> "StageTimingSummary":
+        """Summarize the per-file durations of a stage.
+
+        Args:
+            stage: Stage name
+            samples: Nanoseconds each file spent in the stage
+
+        Returns:
+            Totals and nearest-rank percentiles
+        """
+        if not samples:
+            return cls(stage=stage)
+        ordered = sorted(samples)
+
+        def percentile(p: float) -> int:
+            return ordered[round(p / 100 * (len(ordered) - 1))]
+
+        return cls(
+            stage=stage,
+            files=len(ordered),
+            total_ns=sum(ordered),
+            p50_ns=percentile(50),
+            p95_ns=percentile(95),
+            max_ns=ordered[-1],
+        )
+
+    @property
+    def total_seconds(self) -> float:
+        """Get the total stage time in seconds."""
+        return self.total_ns / 1e9
+
+    @property
+    def mean_ns(self) -> float:
+        """Calculate mean nanoseconds per file."""
+        if self.files:
+            return self.total_ns / self.files
+        return 0.0
+
+
 class BatchResult(BaseModel):
     """Result of processing multiple documents in batch."""
 
@@ -109,7 +266,20 @@ class BatchResult(BaseModel):
     successful_files: int = Field(description="Number of successfully processed files")
     failed_files: int = Field(description="Number of failed files")
     total_chunks: int = Field(description="Total chunks created")
+    total_duplicate_chunks: int = Field(
+        default=0, description="Chunks skipped or linked as duplicates"
+    )
+    total_boilerplate_blocks: int = Field(
+        default=0, description="Repeated boilerplate blocks dropped"
+    )
+    cached_files: int = Field(
+        default=0, description="Files whose chunks came from the chunk cache"
+    )
     total_processing_time: float = Field(description="Total processing time")
+    stage_timings: dict[str, StageTimingSummary] = Field(
+        default_factory=dict,
+        description="Time per processing stage across files, in pipeline order",
+    )
     collection_name: str = Field(description="Target collection name")
 
     @property
@@ -134,6 +304,92 @@ class BatchResult(BaseModel):
         return 0.0
 
 
+class DocumentProfile(BaseModel):
+    """Cheap structural statistics of a parsed document."""
+
+    element_count: int = Field(default=0, description="Number of elements")
+    char_count: int = Field(default=0, description="Characters of element text")
+    header_count: int = Field(default=0, description="Number of headers")
+    paragraph_count: int = Field(
+        default=0, description="Number of blank-line separated paragraphs"
+    )
+    paragraph_share: float = Field(
+        default=0.0, description="Share of characters in paragraphs"
+    )
+    code_share: float = Field(
+        default=0.0, description="Share of characters in code blocks"
+    )
+    list_share: float = Field(
+        default=0.0, description="Share of characters in list items and tables"
+    )
+
+    @property
+    def average_paragraph_chars(self) -> float:
+        """Calculate mean paragraph length."""
+        if self.paragraph_count:
+            return self.paragraph_share * self.char_count / self.paragraph_count
+        return 0.0
+
+
+class StrategyEvaluation(BaseModel):
+    """Chunking statistics for one strategy, accumulated over documents."""
+
+    strategy: str = Field(description="Chunking strategy name")
+    documents: int = Field(default=0, description="Number of documents chunked")
+    failures: int = Field(default=0, description="Number of documents that failed")
+    chunk_sizes: list[int] = Field(
+        default_factory=list, description="Size of every chunk in characters"
+    )
+    processing_time: float = Field(
+        default=0.0, description="Total chunking time in seconds"
+    )
+
+    @property
+    def chunk_count(self) -> int:
+        """Get total number of chunks produced."""
+        return len(self.chunk_sizes)
+
+    @property
+    def average_size(self) -> float:
+        """Calculate mean chunk size."""
+        if self.chunk_sizes:
+            return sum(self.chunk_sizes) / len(self.chunk_sizes)
+        return 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Calculate chunking throughput."""
+        if self.processing_time > 0:
+            return self.chunk_count / self.processing_time
+        return 0.0
+
+    def size_percentile(self, percentile: float) -> int:
+        """Get chunk size at the given percentile (nearest rank).
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Chunk size, or 0 if there are no chunks
+        """
+        if not self.chunk_sizes:
+            return 0
+        ordered = sorted(self.chunk_sizes)
+        rank = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+    def merge(self, other: "StrategyEvaluation") -> None:
+        """Add another evaluation of the same strategy into this one.
+
+        Args:
+            other: Evaluation to merge
+        """
+        self.documents += other.documents
+        self.failures += other.failures
+        self.chunk_sizes.extend(other.chunk_sizes)
+        self.processing_time += other.processing_time
+
+
 class InsertResult(BaseModel):
     """Result of inserting chunks into ChromaDB."""
 
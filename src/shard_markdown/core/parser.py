@@ -1,6 +1,9 @@
 """Markdown document parser for AST generation."""
 
+import itertools
 import re
+from collections.abc import Iterable, Iterator
+from time import perf_counter_ns
 from typing import Any
 
 import frontmatter
@@ -9,6 +12,7 @@ import yaml
 
 from ..utils.logging import get_logger
 from .models import MarkdownAST, MarkdownElement
+from .timing import StageTimer
 
 
 logger = get_logger(__name__)
@@ -17,6 +21,9 @@ logger = get_logger(__name__)
 class MarkdownParser:
     """Markdown document parser with AST generation."""
 
+    # Upper bound on lines scanned for a closing frontmatter delimiter
+    MAX_FRONTMATTER_LINES = 1000
+
     def __init__(self) -> None:
         """Initialize parser with markdown processor."""
         self.md = markdown.Markdown(
@@ -27,11 +34,12 @@ class MarkdownParser:
             },
         )
 
-    def parse(self, content: str) -> MarkdownAST:
+    def parse(self, content: str, timer: StageTimer | None = None) -> MarkdownAST:
         """Parse markdown content and return AST.
 
         Args:
             content: Raw markdown content
+            timer: Records the frontmatter, render and elements stages
 
         Returns:
             Parsed markdown AST with hierarchical structure
@@ -40,6 +48,7 @@ class MarkdownParser:
             ValueError: If content cannot be parsed
         """
         try:
+            start = perf_counter_ns()
             # Parse frontmatter if present
             try:
                 post = frontmatter.loads(content)
@@ -52,12 +61,18 @@ class MarkdownParser:
                 )
                 markdown_content = content
                 frontmatter_metadata = {}
+            if timer is not None:
+                start = timer.record("frontmatter", start)
 
             # Convert to HTML to extract structure
             html = self.md.convert(markdown_content)
+            if timer is not None:
+                start = timer.record("render", start)
 
             # Extract structural elements
             elements = self._extract_elements(markdown_content)
+            if timer is not None:
+                timer.record("elements", start)
 
             return MarkdownAST(
                 elements=elements,
@@ -68,7 +83,52 @@ class MarkdownParser:
         except (AttributeError, TypeError, UnicodeDecodeError) as e:
             raise ValueError(f"Failed to parse markdown: {e}") from e
 
-    def _extract_elements(self, content: str) -> list[MarkdownElement]:  # noqa: C901
+    def parse_stream(
+        self, lines: Iterable[str], max_element_chars: int | None = None
+    ) -> tuple[dict[str, Any], Iterator[MarkdownElement]]:
+        """Parse markdown incrementally from an iterable of lines.
+
+        Only the frontmatter block is read eagerly; elements are produced lazily
+        so that arbitrarily large documents can be processed with bounded memory.
+        HTML rendering and the table of contents are not available in this mode.
+
+        Args:
+            lines: Lines of the document (trailing newlines are stripped)
+            max_element_chars: Flush paragraphs and code blocks once their
+                accumulated text exceeds this many characters
+
+        Returns:
+            Tuple of frontmatter metadata and a lazy iterator of elements
+        """
+        line_iter = (line.rstrip("\n") for line in lines)
+        first_line = next(line_iter, None)
+        if first_line is None:
+            return {}, iter(())
+
+        head = [first_line]
+        frontmatter_metadata: dict[str, Any] = {}
+        if first_line.strip() == "---":
+            for line in line_iter:
+                head.append(line)
+                if line.strip() == "---":
+                    try:
+                        post = frontmatter.loads("\n".join(head))
+                        frontmatter_metadata = dict(post.metadata)
+                        head = post.content.split("\n") if post.content else []
+                    except Exception:
+                        logger.debug(
+                            "Failed to parse frontmatter, treating it as markdown"
+                        )
+                    break
+                if len(head) > self.MAX_FRONTMATTER_LINES:
+                    break
+
+        elements = self.iter_elements(
+            itertools.chain(head, line_iter), max_element_chars=max_element_chars
+        )
+        return frontmatter_metadata, elements
+
+    def _extract_elements(self, content: str) -> list[MarkdownElement]:
         """Extract structural elements from markdown content.
 
         Args:
@@ -77,10 +137,25 @@ class MarkdownParser:
         Returns:
             List of markdown elements in document order
         """
+        return list(self.iter_elements(content.split("\n")))
+
+    def iter_elements(  # noqa: C901
+        self, lines: Iterable[str], max_element_chars: int | None = None
+    ) -> Iterator[MarkdownElement]:
+        """Extract structural elements from lines of markdown as they are read.
+
+        Args:
+            lines: Lines of markdown content without trailing newlines
+            max_element_chars: Flush paragraphs and code blocks once their
+                accumulated text exceeds this many characters
+
+        Yields:
+            Markdown elements in document order
+        """
         elements: list[MarkdownElement] = []
-        lines = content.split("\n")
         state: dict[str, Any] = {
             "current_text": [],
+            "current_size": 0,
             "in_code_block": False,
             "line_offset": 0,
         }
@@ -91,22 +166,37 @@ class MarkdownParser:
         }
 
         for line_num, line in enumerate(lines, 1):
+            if elements:
+                yield from elements
+                elements.clear()
+
             # Handle code blocks
             if patterns["code_fence"].match(line):
                 if not state["in_code_block"]:
                     self._save_accumulated_text(elements, state)
                     state["in_code_block"] = True
                     state["current_text"] = [line]
+                    state["current_size"] = len(line)
                     state["line_offset"] = line_num
                 else:
                     state["current_text"].append(line)
                     self._create_code_block(elements, state)
                     state["current_text"] = []
+                    state["current_size"] = 0
                     state["in_code_block"] = False
                 continue
 
             if state["in_code_block"]:
                 state["current_text"].append(line)
+                state["current_size"] += len(line) + 1
+                if max_element_chars and state["current_size"] > max_element_chars:
+                    # Emit the block so far and reopen it with the same fence
+                    fence = state["current_text"][0]
+                    self._create_code_block(elements, state)
+                    elements[-1].metadata["partial"] = True
+                    state["current_text"] = [fence]
+                    state["current_size"] = len(fence)
+                    state["line_offset"] = line_num + 1
                 continue
 
             # Handle headers
@@ -159,10 +249,13 @@ class MarkdownParser:
             if not state["current_text"]:
                 state["line_offset"] = line_num
             state["current_text"].append(line)
+            state["current_size"] += len(line) + 1
+            if max_element_chars and state["current_size"] > max_element_chars:
+                self._save_accumulated_text(elements, state)
 
         # Add any remaining text
         self._save_accumulated_text(elements, state)
-        return elements
+        yield from elements
 
     def _save_accumulated_text(
         self, elements: list[MarkdownElement], state: dict[str, Any]
@@ -180,6 +273,7 @@ class MarkdownParser:
                     )
                 )
             state["current_text"] = []
+            state["current_size"] = 0
 
     def _create_code_block(
         self, elements: list[MarkdownElement], state: dict[str, Any]
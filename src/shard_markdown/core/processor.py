@@ -1,21 +1,49 @@
 """Main document processing coordinator."""
 
+import codecs
 import hashlib
 import time
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from ..config.settings import Settings
 from ..utils.errors import FileSystemError, ProcessingError
 from ..utils.logging import get_logger
-from .chunking.engine import ChunkingEngine
+from .boilerplate import BoilerplateFilter
+from .cache import ChunkCache
+from .chunking.engine import ChunkingEngine, link_parent_ids
+from .dedup import ChunkDeduplicator
 from .metadata import MetadataExtractor
 from .models import BatchResult, DocumentChunk, ProcessingResult
 from .parser import MarkdownParser
+from .timing import PeakMemory, StageTimer, TimingAggregator, memory_tracking
 
 
 logger = get_logger(__name__)
 
+# Files above this size are rejected unless streaming is enabled
+MAX_IN_MEMORY_FILE_SIZE = 100 * 1024 * 1024
+
+# Read buffer and maximum line length used when streaming large files
+STREAM_BUFFER_SIZE = 1024 * 1024
+STREAM_MAX_LINE_CHARS = 1024 * 1024
+
+
+def generate_chunk_id(file_path: Path, chunk_index: int) -> str:
+    """Generate a chunk identifier unique across documents.
+
+    Args:
+        file_path: Source file path
+        chunk_index: Index of chunk in document
+
+    Returns:
+        Unique chunk ID
+    """
+    # Create hash from file path for uniqueness
+    path_hash = hashlib.sha256(str(file_path).encode()).hexdigest()[:16]
+    return f"{path_hash}_{chunk_index:04d}"
+
 
 class DocumentProcessor:
     """Main document processing coordinator."""
@@ -30,6 +58,12 @@ class DocumentProcessor:
         self.parser = MarkdownParser()
         self.chunker = ChunkingEngine(settings)
         self.metadata_extractor = MetadataExtractor()
+        # Shared by every document this processor handles, so duplicates are
+        # found across a whole batch
+        self.deduplicator = ChunkDeduplicator.from_settings(settings)
+        # Learned from a whole batch before any document is chunked
+        self.boilerplate = BoilerplateFilter.from_settings(settings)
+        self.cache = ChunkCache.from_settings(settings)
 
     def process_document(
         self, file_path: Path, collection_name: str | None = None
@@ -41,15 +75,57 @@ class DocumentProcessor:
             collection_name: Target collection name
 
         Returns:
-            ProcessingResult with details
+            ProcessingResult with details, including the time spent in each
+            stage and, while memory is tracked, the peak memory allocated
         """
+        with (
+            memory_tracking(self.settings.process_track_memory),
+            PeakMemory() as memory,
+        ):
+            result = self._process_document(file_path, collection_name)
+        result.peak_memory = memory.peak
+        return result
+
+    def _process_document(
+        self, file_path: Path, collection_name: str | None
+    ) -> ProcessingResult:
+        """Process single document, measured by ``process_document``."""
         start_time = time.time()
+        timer = StageTimer()
+        start = time.perf_counter_ns()
 
         try:
             logger.info("Processing document: %s", file_path)
 
+            duplicates_before = self._duplicates_found()
+            stripped_before = self._boilerplate_removed()
+            if self._should_stream(file_path):
+                chunks_created = sum(1 for _ in self.stream_document(file_path))
+                timer.record("stream", start)
+                processing_time = max(0.001, time.time() - start_time)
+                logger.info(
+                    "Streamed %s: %d chunks in %.2fs",
+                    file_path,
+                    chunks_created,
+                    processing_time,
+                )
+                return ProcessingResult(
+                    file_path=file_path,
+                    success=chunks_created > 0,
+                    chunks_created=chunks_created,
+                    duplicate_chunks=self._duplicates_found() - duplicates_before,
+                    boilerplate_blocks=self._boilerplate_removed() - stripped_before,
+                    processing_time=processing_time,
+                    stage_timings=timer.timings,
+                    collection_name=collection_name,
+                    error=None
+                    if chunks_created
+                    else "No chunks generated from document",
+                )
+
             # Read and validate file
             content = self._read_file(file_path)
+            start = timer.record("read", start)
 
             # Handle empty content gracefully
             if not content:
@@ -59,18 +135,59 @@ class DocumentProcessor:
                     success=True,  # Consider empty files as successfully processed
                     chunks_created=0,
                     processing_time=max(0.001, time.time() - start_time),
+                    stage_timings=timer.timings,
                     collection_name=collection_name,
                 )
 
-            # Parse markdown
-            ast = self.parser.parse(content)
-
-            # Extract metadata
+            # Reuse the chunks of identical content chunked with these settings
+            cache_key = self._cache_key(content)
+            cached = (
+                self.cache.get(cache_key)
+                if self.cache is not None and cache_key is not None
+                else None
+            )
+            if self.cache is not None:
+                start = timer.record("cache", start)
+            element_count = None
+            if cached is not None:
+                chunks, doc_metadata = cached
+            else:
+                # Parse markdown
+                ast = self.parser.parse(content, timer)
+                if self.settings.process_track_memory:
+                    element_count = len(ast.elements)
+                start = time.perf_counter_ns()
+                doc_metadata = self.metadata_extractor.extract_document_metadata(ast)
+                start = timer.record("metadata", start)
+
+                # Drop repeated boilerplate, keeping document metadata intact
+                if self.boilerplate is not None:
+                    ast = self.boilerplate.strip(ast)
+                    start = timer.record("boilerplate", start)
+
+                # Chunk document
+                chunks = self.chunker.chunk_document(ast)
+                start = timer.record("chunk", start)
+                if self.cache is not None and cache_key is not None and chunks:
+                    self.cache.put(cache_key, chunks, doc_metadata)
+                    start = timer.record("cache", start)
+
+            stripped = self._boilerplate_removed() - stripped_before
             file_metadata = self.metadata_extractor.extract_file_metadata(file_path)
-            doc_metadata = self.metadata_extractor.extract_document_metadata(ast)
+            start = timer.record("metadata", start)
 
-            # Chunk document
-            chunks = self.chunker.chunk_document(ast)
+            if not chunks and stripped:
+                logger.info("Only boilerplate found in %s", file_path)
+                return ProcessingResult(
+                    file_path=file_path,
+                    success=True,
+                    chunks_created=0,
+                    boilerplate_blocks=stripped,
+                    processing_time=max(0.001, time.time() - start_time),
+                    stage_timings=timer.timings,
+                    element_count=element_count,
+                    collection_name=collection_name,
+                )
 
             if not chunks:
                 logger.warning("No chunks generated for %s", file_path)
@@ -79,12 +196,19 @@ class DocumentProcessor:
                     success=False,
                     error="No chunks generated from document",
                     processing_time=max(0.001, time.time() - start_time),
+                    stage_timings=timer.timings,
+                    element_count=element_count,
                 )
 
             # Enhance chunks with metadata
             enhanced_chunks = self._enhance_chunks(
                 chunks, file_metadata, doc_metadata, file_path
             )
+            start = timer.record("metadata", start)
+            if self.deduplicator is not None:
+                enhanced_chunks = self.deduplicator.apply(enhanced_chunks)
+                self.deduplicator.flush()
+                timer.record("dedup", start)
 
             processing_time = max(
                 0.001, time.time() - start_time
@@ -99,7 +223,12 @@ class DocumentProcessor:
                 file_path=file_path,
                 success=True,
                 chunks_created=len(enhanced_chunks),
+                duplicate_chunks=self._duplicates_found() - duplicates_before,
+                boilerplate_blocks=stripped,
+                from_cache=cached is not None,
                 processing_time=processing_time,
+                stage_timings=timer.timings,
+                element_count=element_count,
                 collection_name=collection_name,
             )
 
@@ -123,8 +252,177 @@ class DocumentProcessor:
                 success=False,
                 error=error_msg,
                 processing_time=processing_time,
+                stage_timings=timer.timings,
             )
 
+    def stream_document(self, file_path: Path) -> Iterator[DocumentChunk]:
+        """Process a document incrementally, yielding chunks as they are made.
+
+        The file is read through a buffered reader and fed element by element
+        into the chunker, so memory use is independent of file size. Metadata
+        that needs the whole document (headers, word counts) is not collected.
+        Duplicate chunks are skipped or linked as set by ``process_dedup``,
+        and learned boilerplate elements are dropped before chunking.
+
+        Args:
+            file_path: Path to markdown file
+
+        Yields:
+            Document chunks with file metadata and unique IDs
+
+        Raises:
+            FileSystemError: If the file cannot be opened
+            ProcessingError: If chunking fails
+        """
+        encoding = self._detect_encoding(file_path)
+        file_metadata = self.metadata_extractor.extract_file_metadata(file_path)
+
+        try:
+            stream = open(
+                file_path,
+                encoding=encoding,
+                errors="replace",
+                buffering=STREAM_BUFFER_SIZE,
+            )
+        except OSError as e:
+            raise FileSystemError(
+                f"Error reading file: {file_path}",
+                error_code=1206,
+                context={"file_path": str(file_path)},
+                cause=e,
+            ) from e
+
+        with stream:
+            frontmatter, elements = self.parser.parse_stream(
+                self._iter_lines(stream), max_element_chars=self.settings.chunk_size
+            )
+            if self.boilerplate is not None:
+                elements = self.boilerplate.filter_elements(elements)
+            for i, chunk in enumerate(self.chunker.iter_chunks(elements)):
+                metadata = {
+                    **file_metadata,
+                    **frontmatter,
+                    **chunk.metadata,
+                    "chunk_index": i,
+                    "streamed": True,
+                }
+                structural_context = chunk.metadata.get("structural_context")
+                if structural_context:
+                    metadata["context_depth"] = len(structural_context.split(" > "))
+
+                document_chunk = DocumentChunk(
+                    id=self._generate_chunk_id(file_path, i),
+                    content=chunk.content,
+                    metadata=metadata,
+                    start_position=chunk.start_position,
+                    end_position=chunk.end_position,
+                )
+                if self.deduplicator is not None and self.deduplicator.mark(
+                    document_chunk
+                ):
+                    continue
+                yield document_chunk
+
+            if self.deduplicator is not None:
+                self.deduplicator.flush()
+
+    def _duplicates_found(self) -> int:
+        """Get the number of duplicate chunks found by this processor."""
+        return self.deduplicator.duplicates if self.deduplicator is not None else 0
+
+    def _cache_key(self, content: str) -> str | None:
+        """Get the chunk cache key of a document's content.
+
+        Returns:
+            Key, or None when there is no cache or output depends on other
+            documents of the batch through boilerplate stripping
+        """
+        if self.cache is None or self.boilerplate is not None:
+            return None
+        return self.cache.key(content)
+
+    def _boilerplate_removed(self) -> int:
+        """Get the number of boilerplate elements dropped by this processor."""
+        return self.boilerplate.removed_blocks if self.boilerplate is not None else 0
+
+    def learn_boilerplate(self, file_paths: list[Path]) -> None:
+        """Count element frequencies across a batch before processing it.
+
+        Files that cannot be read are skipped here and reported when they
+        are processed. Files above the in-memory limit are not parsed.
+
+        Args:
+            file_paths: Files of the batch
+        """
+        if self.boilerplate is None:
+            return
+
+        for path in file_paths:
+            if self._should_stream(path):
+                continue
+            try:
+                content = self._read_file(path)
+            except (FileSystemError, ProcessingError) as e:
+                logger.debug("Skipping %s while learning boilerplate: %s", path, e)
+                continue
+            if content:
+                self.boilerplate.learn(self.parser.parse(content).elements)
+
+        logger.info(
+            "Learned %d boilerplate blocks from %d documents",
+            self.boilerplate.boilerplate_count,
+            self.boilerplate.documents,
+        )
+
+    def _should_stream(self, file_path: Path) -> bool:
+        """Check whether a file should be processed in streaming mode."""
+        if not self.settings.process_streaming:
+            return False
+        try:
+            return (
+                file_path.is_file()
+                and file_path.stat().st_size > MAX_IN_MEMORY_FILE_SIZE
+            )
+        except OSError:
+            return False
+
+    def _detect_encoding(self, file_path: Path) -> str:
+        """Pick the first supported encoding that decodes the start of a file.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            Encoding name
+
+        Raises:
+            FileSystemError: If the file cannot be read
+        """
+        try:
+            with open(file_path, "rb") as f:
+                sample = f.read(64 * 1024)
+        except OSError as e:
+            raise FileSystemError(
+                f"Error reading file: {file_path}",
+                error_code=1206,
+                context={"file_path": str(file_path)},
+                cause=e,
+            ) from e
+
+        for encoding in ["utf-8", "utf-8-sig", "cp1252"]:
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        return "latin-1"
+
+    @staticmethod
+    def _iter_lines(stream: IO[str]) -> Iterator[str]:
+        """Iterate over lines, wrapping lines longer than the streaming limit."""
+        while line := stream.readline(STREAM_MAX_LINE_CHARS):
+            yield line
+
     def process_batch(
         self, file_paths: list[Path], collection_name: str
     ) -> BatchResult:
@@ -140,8 +438,12 @@ class DocumentProcessor:
         start_time = time.time()
         logger.info("Processing %d files", len(file_paths))
 
-        # Process files sequentially and collect results
-        results = self._execute_sequential_processing(file_paths, collection_name)
+        self.learn_boilerplate(file_paths)
+
+        # Process files sequentially and collect results, tracing allocations
+        # once for the whole batch if memory is tracked
+        with memory_tracking(self.settings.process_track_memory):
+            results = self._execute_sequential_processing(file_paths, collection_name)
 
         # Build batch result with statistics
         batch_stats = self._calculate_batch_statistics(
@@ -193,6 +495,9 @@ class DocumentProcessor:
             ),  # Ensure minimum time for Windows precision
         }
         total_chunks = sum(r.chunks_created for r in processing_stats["successful"])
+        timings = TimingAggregator()
+        for result in results:
+            timings.add(result.stage_timings)
 
         return BatchResult(
             results=results,
@@ -200,7 +505,11 @@ class DocumentProcessor:
             successful_files=len(processing_stats["successful"]),
             failed_files=len(processing_stats["failed"]),
             total_chunks=total_chunks,
+            total_duplicate_chunks=sum(r.duplicate_chunks for r in results),
+            total_boilerplate_blocks=sum(r.boilerplate_blocks for r in results),
+            cached_files=sum(r.from_cache for r in results),
             total_processing_time=processing_stats["total_time"],
+            stage_timings=timings.summary(),
             collection_name=collection_name,
         )
 
@@ -243,7 +552,7 @@ class DocumentProcessor:
                 logger.info(f"Empty file: {file_path}")
                 return ""
 
-            if file_size > 100 * 1024 * 1024:
+            if file_size > MAX_IN_MEMORY_FILE_SIZE:
                 raise FileSystemError(
                     f"File too large: {file_path} ({file_size} bytes)",
                     error_code=1202,
@@ -364,6 +673,7 @@ class DocumentProcessor:
 
             enhanced_chunks.append(enhanced_chunk)
 
+        link_parent_ids(enhanced_chunks)
         return enhanced_chunks
 
     def _generate_chunk_id(self, file_path: Path, chunk_index: int) -> str:
@@ -376,6 +686,4 @@ class DocumentProcessor:
         Returns:
             Unique chunk ID
         """
-        # Create hash from file path for uniqueness
-        path_hash = hashlib.sha256(str(file_path).encode()).hexdigest()[:16]
-        return f"{path_hash}_{chunk_index:04d}"
+        return generate_chunk_id(file_path, chunk_index)
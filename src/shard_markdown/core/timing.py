@@ -0,0 +1,276 @@
+"""Per-stage timing and memory use of document processing."""
+
+import heapq
+import itertools
+import tracemalloc
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter_ns
+from types import TracebackType
+from typing import NamedTuple
+
+from ..utils import tracing
+from .models import StageTimingSummary
+
+
+# Stages in pipeline order, as reports list them
+STAGES = (
+    "read",
+    "cache",
+    "frontmatter",
+    "render",
+    "elements",
+    "boilerplate",
+    "chunk",
+    "stream",
+    "metadata",
+    "dedup",
+    "sanitize",
+    "insert",
+)
+
+
+class StageTimer:
+    """Collect the time one document spends in each processing stage.
+
+    Durations are monotonic ``perf_counter_ns`` nanoseconds, summed when a
+    stage runs more than once, and each stage is also recorded as a trace
+    span while tracing is on. Stages are timed by their start only, so
+    consecutive stages chain without extra clock reads::
+
+        start = perf_counter_ns()
+        content = read()
+        start = timer.record("read", start)
+        chunks = chunk(content)
+        timer.record("chunk", start)
+    """
+
+    __slots__ = ("timings",)
+
+    def __init__(self, timings: dict[str, int] | None = None) -> None:
+        """Initialize timer.
+
+        Args:
+            timings: Durations to add to, e.g. those recorded by a worker
+        """
+        self.timings = timings if timings is not None else {}
+
+    def record(self, stage: str, start_ns: int) -> int:
+        """Add the time since ``start_ns`` to a stage.
+
+        Args:
+            stage: Stage name
+            start_ns: ``perf_counter_ns`` at the start of the stage
+
+        Returns:
+            The current ``perf_counter_ns``, to start the next stage
+        """
+        now = perf_counter_ns()
+        self.timings[stage] = self.timings.get(stage, 0) + now - start_ns
+        tracing.add_span(stage, start_ns, now)
+        return now
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time a block as one stage.
+
+        Args:
+            stage: Stage name
+        """
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, start)
+
+
+class TimingAggregator:
+    """Accumulate the stage timings of many files for totals and percentiles.
+
+    Samples are kept in compact arrays of eight bytes per file and stage,
+    so a run over millions of files stays small.
+    """
+
+    def __init__(self) -> None:
+        """Initialize aggregator."""
+        self.files = 0
+        self._samples: dict[str, array[int]] = {}
+
+    def add(self, timings: dict[str, int]) -> None:
+        """Add one file's stage timings.
+
+        Args:
+            timings: Nanoseconds per stage
+        """
+        self.files += 1
+        for stage, duration in timings.items():
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = array("q")
+            samples.append(duration)
+
+    def summary(self) -> dict[str, StageTimingSummary]:
+        """Summarize every stage seen.
+
+        Returns:
+            Summaries by stage, in pipeline order
+        """
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        stages = sorted(self._samples, key=lambda s: (order.get(s, len(order)), s))
+        return {
+            stage: StageTimingSummary.from_samples(stage, self._samples[stage])
+            for stage in stages
+        }
+
+
+def start_memory_tracking() -> None:
+    """Start tracing allocations, so :class:`PeakMemory` measures files.
+
+    Tracing slows processing down considerably, so it is opt-in.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_memory_tracking() -> None:
+    """Stop tracing allocations and free the traces."""
+    tracemalloc.stop()
+
+
+@contextmanager
+def memory_tracking(enabled: bool = True) -> Iterator[None]:
+    """Trace allocations while a block runs, unless they are traced already.
+
+    Tracing that was on before the block stays on after it.
+
+    Args:
+        enabled: Whether to trace at all
+    """
+    started = enabled and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+class PeakMemory:
+    """Measure the most memory allocated at once while a block runs.
+
+    Peaks are counted from what was allocated when the block started, so
+    they describe the document being processed rather than earlier state.
+    Only measured while allocations are traced (see :func:`memory_tracking`
+    and :func:`start_memory_tracking`); otherwise ``peak`` stays None and
+    the block costs one check. The peak is process-wide, so only one block
+    per process should be measured at a time::
+
+        with PeakMemory() as memory:
+            chunks = chunk(read())
+        result["peak_memory"] = memory.peak
+    """
+
+    __slots__ = ("peak", "_baseline")
+
+    def __init__(self) -> None:
+        """Initialize measurement."""
+        self.peak: int | None = None
+        self._baseline: int | None = None
+
+    def __enter__(self) -> "PeakMemory":
+        """Start measuring."""
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Record the peak, in bytes."""
+        if self._baseline is not None and tracemalloc.is_tracing():
+            self.peak = max(0, tracemalloc.get_traced_memory()[1] - self._baseline)
+
+
+class FileCost(NamedTuple):
+    """Time and memory one file took."""
+
+    path: str
+    total_ns: int
+    slowest_stage: str | None
+    slowest_ns: int
+    peak_memory: int | None
+    elements: int | None
+    chunks: int
+
+
+class SlowFileReport:
+    """Keep the slowest and the most memory-hungry files of a run.
+
+    Only the top ``limit`` files of each kind are kept, in heaps, however
+    many files a run has.
+    """
+
+    def __init__(self, limit: int = 10) -> None:
+        """Initialize report.
+
+        Args:
+            limit: Files listed per kind
+        """
+        self.limit = limit
+        self._order = itertools.count()
+        self._slowest: list[tuple[int, int, FileCost]] = []
+        self._hungriest: list[tuple[int, int, FileCost]] = []
+
+    def add(
+        self,
+        path: str,
+        timings: dict[str, int],
+        chunks: int,
+        peak_memory: int | None = None,
+        elements: int | None = None,
+    ) -> None:
+        """Add one processed file.
+
+        Args:
+            path: File path
+            timings: Nanoseconds per stage
+            chunks: Chunks produced
+            peak_memory: Peak bytes allocated, if tracked
+            elements: Markdown elements parsed, if known
+        """
+        slowest = max(timings.items(), key=lambda item: item[1], default=(None, 0))
+        cost = FileCost(
+            path,
+            sum(timings.values()),
+            slowest[0],
+            slowest[1],
+            peak_memory,
+            elements,
+            chunks,
+        )
+        order = next(self._order)
+        self._keep(self._slowest, (cost.total_ns, -order, cost))
+        if peak_memory is not None:
+            self._keep(self._hungriest, (peak_memory, -order, cost))
+
+    def _keep(
+        self, heap: list[tuple[int, int, FileCost]], entry: tuple[int, int, FileCost]
+    ) -> None:
+        if len(heap) < self.limit:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heappushpop(heap, entry)
+
+    def slowest(self) -> list[FileCost]:
+        """Get the slowest files, slowest first."""
+        return [cost for *_, cost in sorted(self._slowest, reverse=True)]
+
+    def hungriest(self) -> list[FileCost]:
+        """Get the files with the highest peak memory, highest first."""
+        return [cost for *_, cost in sorted(self._hungriest, reverse=True)]
@@ -0,0 +1,25 @@
+"""Daemon serving chunk and ingest requests from a warm process."""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .protocol import DaemonClient, default_socket_path
+
+
+if TYPE_CHECKING:
+    from .server import DaemonServer
+
+__all__ = ["DaemonClient", "DaemonServer", "default_socket_path"]
+
+# The server imports the processing stack; clients only need the protocol
+_LAZY_ATTRIBUTES = {"DaemonServer": ".server"}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the server on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
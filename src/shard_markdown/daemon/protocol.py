@@ -0,0 +1,268 @@
+"""JSON-lines protocol and client of the shard-md daemon.
+
+Each request and response is one JSON object on its own line. Requests carry
+an ``op`` and an optional ``id``, which the response echoes, so a client can
+pipeline several requests on one connection and match responses as they
+complete. This module only uses the standard library, so the CLI can talk to
+a running daemon without importing the processing stack.
+"""
+
+import getpass
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from ..utils.errors import NetworkError
+
+
+SOCKET_ENV_VAR = "SHARD_MD_SOCKET"
+
+# Responses are never larger than the chunks of one document, but a line
+# limit keeps a confused peer from exhausting memory
+MAX_LINE_BYTES = 256 * 1024 * 1024
+
+
+def default_socket_path() -> Path:
+    """Get the socket the daemon listens on unless told otherwise.
+
+    Returns:
+        ``$SHARD_MD_SOCKET`` if set, else a per-user socket in
+        ``$XDG_RUNTIME_DIR`` or in :func:`private_socket_dir`
+    """
+    configured = os.environ.get(SOCKET_ENV_VAR)
+    if configured:
+        return Path(configured)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / f"shard-md-{_user()}.sock"
+    return private_socket_dir() / "daemon.sock"
+
+
+def private_socket_dir() -> Path:
+    """Get the per-user directory of the socket without ``$XDG_RUNTIME_DIR``.
+
+    Anyone can create files in the temporary directory, so the socket lives
+    in a directory that the daemon makes accessible to its owner only.
+
+    Returns:
+        Directory in the temporary directory
+    """
+    return Path(tempfile.gettempdir()) / f"shard-md-{_user()}"
+
+
+def is_owned_by_user(path: Path) -> bool:
+    """Check that a path belongs to the user running this process.
+
+    Args:
+        path: Existing path
+
+    Returns:
+        True if this user owns it, or where ownership is not known
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    return path.stat().st_uid == os.getuid()
+
+
+def _user() -> str:
+    """Name the user in socket paths."""
+    return str(os.getuid()) if hasattr(os, "getuid") else getpass.getuser()
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    """Serialize a message as one protocol line.
+
+    Args:
+        message: Request or response
+
+    Returns:
+        UTF-8 JSON terminated by a newline
+    """
+    return json.dumps(message, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+def decode_message(line: bytes) -> dict[str, Any]:
+    """Parse one protocol line.
+
+    Args:
+        line: Received line
+
+    Returns:
+        Decoded message
+
+    Raises:
+        ValueError: If the line is not a JSON object
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("message must be a JSON object")
+    return message
+
+
+class DaemonClient:
+    """Connection to a running daemon."""
+
+    def __init__(
+        self, socket_path: Path | None = None, timeout: float | None = 300.0
+    ) -> None:
+        """Connect to the daemon.
+
+        Args:
+            socket_path: Daemon socket, defaults to :func:`default_socket_path`
+            timeout: Seconds to wait for any single response
+
+        Raises:
+            NetworkError: If no daemon accepts the connection
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self._next_id = 0
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(str(self.socket_path))
+        except OSError as e:
+            self._socket.close()
+            raise NetworkError(
+                f"Cannot connect to shard-md daemon at {self.socket_path}",
+                error_code=1610,
+                context={"socket_path": str(self.socket_path)},
+                cause=e,
+            ) from e
+        self._reader = self._socket.makefile("rb")
+
+    @classmethod
+    def connect_if_running(
+        cls, socket_path: Path | None = None
+    ) -> "DaemonClient | None":
+        """Connect to the daemon if one is listening.
+
+        Args:
+            socket_path: Daemon socket, defaults to :func:`default_socket_path`
+
+        Returns:
+            Client, or None when no daemon is running
+
+        Raises:
+            NetworkError: If the socket belongs to another user, who would
+                receive every forwarded document
+        """
+        socket_path = socket_path or default_socket_path()
+        if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+            return None
+        if not is_owned_by_user(socket_path):
+            raise NetworkError(
+                f"shard-md daemon socket {socket_path} belongs to another user",
+                error_code=1613,
+                context={"socket_path": str(socket_path)},
+            )
+        try:
+            return cls(socket_path)
+        except NetworkError:
+            return None
+
+    def request(self, op: str, **params: Any) -> dict[str, Any]:
+        """Send one request and wait for its response.
+
+        Args:
+            op: Operation name
+            **params: Operation parameters
+
+        Returns:
+            Response, with ``ok`` false and an ``error`` if the request failed
+        """
+        return self.request_many([{"op": op, **params}])[0]
+
+    def request_many(
+        self, requests: list[dict[str, Any]], window: int = 64
+    ) -> list[dict[str, Any]]:
+        """Pipeline requests, keeping up to ``window`` of them in flight.
+
+        The daemon works on in-flight requests concurrently and answers in
+        completion order.
+
+        Args:
+            requests: Requests, each with an ``op``
+            window: Most requests sent ahead of their responses
+
+        Returns:
+            Responses in the order of ``requests``
+
+        Raises:
+            NetworkError: If the connection fails or the daemon misbehaves
+        """
+        pending: dict[int, int] = {}
+        responses: list[dict[str, Any]] = [{} for _ in requests]
+        sent = 0
+        while sent < len(requests) or pending:
+            if sent < len(requests) and len(pending) < window:
+                self._next_id += 1
+                pending[self._next_id] = sent
+                self._send({**requests[sent], "id": self._next_id})
+                sent += 1
+                continue
+
+            response = self._receive()
+            response_id = response.get("id")
+            index = pending.pop(response_id) if response_id in pending else None
+            if index is None:
+                raise NetworkError(
+                    "Unexpected response from shard-md daemon",
+                    error_code=1611,
+                    context={"response_id": response.get("id")},
+                )
+            responses[index] = response
+        return responses
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> "DaemonClient":
+        """Use the client as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the connection on exit."""
+        self.close()
+
+    def _send(self, message: dict[str, Any]) -> None:
+        """Write one request."""
+        try:
+            self._socket.sendall(encode_message(message))
+        except OSError as e:
+            raise NetworkError(
+                "Lost connection to shard-md daemon",
+                error_code=1610,
+                context={"socket_path": str(self.socket_path)},
+                cause=e,
+            ) from e
+
+    def _receive(self) -> dict[str, Any]:
+        """Read one response."""
+        try:
+            line = self._reader.readline(MAX_LINE_BYTES)
+        except OSError as e:
+            raise NetworkError(
+                "Lost connection to shard-md daemon",
+                error_code=1610,
+                context={"socket_path": str(self.socket_path)},
+                cause=e,
+            ) from e
+        if not line:
+            raise NetworkError(
+                "shard-md daemon closed the connection",
+                error_code=1610,
+                context={"socket_path": str(self.socket_path)},
+            )
+        try:
+            return decode_message(line)
+        except ValueError as e:
+            raise NetworkError(
+                "Malformed response from shard-md daemon",
+                error_code=1611,
+                cause=e,
+            ) from e
@@ -0,0 +1,402 @@
+"""Long-running daemon serving chunk and ingest requests over a local socket."""
+
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .. import __version__
+from ..cli.processor import assign_chunk_ids, chunk_content
+from ..config.settings import Settings
+from ..core.cache import settings_fingerprint
+from ..core.processor import DocumentProcessor
+from ..storage.vectordb import VectorDBStorage
+from ..utils import metrics
+from ..utils.errors import (
+    ChromaDBConnectionError,
+    InputValidationError,
+    NetworkError,
+    ShardMarkdownError,
+)
+from ..utils.logging import get_logger
+from .protocol import (
+    MAX_LINE_BYTES,
+    DaemonClient,
+    decode_message,
+    encode_message,
+    is_owned_by_user,
+    private_socket_dir,
+)
+
+
+logger = get_logger(__name__)
+
+# Per-request settings a client may override
+REQUEST_OPTIONS = frozenset({"chunk_size", "chunk_overlap", "chunk_method"})
+
+# Latencies kept per operation for the ``stats`` percentiles
+LATENCY_WINDOW = 1024
+
+
+class DaemonServer:
+    """Serve chunk and ingest requests from a warm processing stack.
+
+    Requests arrive as JSON lines on a Unix domain socket; see
+    :mod:`shard_markdown.daemon.protocol`. Every request is handed to a
+    bounded worker pool, so requests pipelined on one connection or sent on
+    several connections are processed concurrently and answered as they
+    complete.
+
+    Each worker thread keeps a :class:`DocumentProcessor` per distinct set
+    of chunking options, so parsers and chunkers are built once and never
+    shared between threads. The vector database connection is opened on the
+    first ingest and kept for the daemon's lifetime.
+
+    Operations:
+        ``ping``: Daemon version and available strategies
+        ``chunk``: Chunk ``path`` (or ``content`` labelled by ``path``)
+        ``ingest``: Chunk and store into ``collection``
+        ``stats``: Request counts and latency percentiles per operation
+    """
+
+    def __init__(self, settings: Settings, socket_path: Path, workers: int = 4) -> None:
+        """Initialize server.
+
+        Args:
+            settings: Base settings; requests may override chunking options
+            socket_path: Unix socket to listen on
+            workers: Size of the worker pool
+        """
+        # Batch-wide state would leak between unrelated requests
+        self.settings = settings.model_copy(
+            update={"process_dedup": "off", "process_strip_boilerplate": False}
+        )
+        self.socket_path = socket_path
+        self.workers = workers
+        self.started = time.time()
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="shard-md")
+        self._local = threading.local()
+        self._storage: VectorDBStorage | None = None
+        self._storage_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self._errors: dict[str, int] = {}
+        self._server: socketserver.UnixStreamServer | None = None
+        self._operations: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "ping": self._ping,
+            "chunk": self._chunk,
+            "ingest": self._ingest,
+            "stats": self._stats,
+        }
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until :meth:`shutdown` is called.
+
+        Raises:
+            InputValidationError: If another daemon is using the socket
+            NetworkError: If the socket or its directory belongs to another
+                user
+        """
+        self._claim_socket()
+        server = _UnixServer(str(self.socket_path), _RequestHandler)
+        server.daemon = self
+        self._server = server
+        os.chmod(self.socket_path, 0o600)
+        logger.info(
+            "Daemon listening on %s with %d workers", self.socket_path, self.workers
+        )
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop serving; safe to call from any thread but the serving one."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def submit(self, line: bytes) -> "Future[bytes]":
+        """Queue one request line for the worker pool.
+
+        Args:
+            line: Encoded request
+
+        Returns:
+            Future of the encoded response
+        """
+        return self.executor.submit(self._handle_line, line)
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Execute one request.
+
+        Args:
+            request: Decoded request
+
+        Returns:
+            Response with ``ok``, the echoed ``id`` and ``latency_ms``
+        """
+        start = time.perf_counter()
+        op = str(request.get("op"))
+        try:
+            handler = self._operations.get(op)
+            if handler is None:
+                raise InputValidationError(
+                    f"Unknown daemon operation: {op}",
+                    error_code=1030,
+                    context={"op": op},
+                )
+            response: dict[str, Any] = {"ok": True, "result": handler(request)}
+        except ShardMarkdownError as e:
+            metrics.observe_error(e)
+            response = {"ok": False, "error": e.message, "error_code": e.error_code}
+        except Exception as e:
+            metrics.observe_error(e)
+            response = {"ok": False, "error": str(e)}
+
+        latency = (time.perf_counter() - start) * 1000
+        self._record(op, latency, response["ok"])
+        # Unknown operations share a label, so clients cannot add series
+        metrics.DAEMON_REQUEST_SECONDS.observe(
+            latency / 1000, op=op if op in self._operations else "unknown"
+        )
+        logger.debug("%s %s in %.1f ms", op, request.get("path", ""), latency)
+        response.update(id=request.get("id"), latency_ms=round(latency, 3))
+        return response
+
+    def _handle_line(self, line: bytes) -> bytes:
+        """Decode, execute and encode one request."""
+        try:
+            request = decode_message(line)
+        except ValueError as e:
+            return encode_message({"ok": False, "error": f"Malformed request: {e}"})
+        return encode_message(self.handle(request))
+
+    def _ping(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Report the daemon version, chunking strategies and settings.
+
+        The settings fingerprint covers every chunking setting, with the
+        request's ``options`` applied, so clients can tell whether the
+        daemon chunks as they would.
+        """
+        processor = self._processor(request.get("options") or {})
+        return {
+            "version": __version__,
+            "pid": os.getpid(),
+            "workers": self.workers,
+            "uptime": round(time.time() - self.started, 3),
+            "strategies": list(processor.chunker.strategies),
+            "settings_fingerprint": settings_fingerprint(processor.settings),
+        }
+
+    def _chunk(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Chunk a document, returning chunks unless asked not to."""
+        result = self._chunk_document(request)
+        if request.get("include_chunks", True):
+            result["chunks"] = [
+                {"id": c.id, "content": c.content, "metadata": c.metadata}
+                for c in result["chunks"]
+            ]
+        else:
+            del result["chunks"]
+        return result
+
+    def _ingest(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Chunk a document and store its chunks in a collection."""
+        collection = request.get("collection")
+        if not collection:
+            raise InputValidationError(
+                "Ingest requests need a collection", error_code=1030
+            )
+        result = self._chunk_document(request)
+        chunks = result.pop("chunks")
+        if chunks:
+            self._vector_storage().store(
+                [
+                    {"id": c.id, "content": c.content, "metadata": c.metadata}
+                    for c in chunks
+                ],
+                str(collection),
+            )
+        result["stored"] = len(chunks)
+        return result
+
+    def _stats(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Report request counts and latency percentiles per operation."""
+        with self._stats_lock:
+            latencies = {op: sorted(values) for op, values in self._latencies.items()}
+            errors = dict(self._errors)
+        return {
+            op: {
+                "requests": len(values),
+                "errors": errors.get(op, 0),
+                "p50_ms": round(values[len(values) // 2], 3),
+                "p95_ms": round(values[int(len(values) * 0.95)], 3),
+                "max_ms": round(values[-1], 3),
+            }
+            for op, values in latencies.items()
+        }
+
+    def _chunk_document(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Chunk the document a request names, like a local CLI run."""
+        path = request.get("path")
+        if not path:
+            raise InputValidationError("Requests need a document path", error_code=1030)
+        file_path = Path(str(path))
+        processor = self._processor(request.get("options") or {})
+        content = request.get("content")
+        if content is None:
+            content = file_path.read_text(encoding="utf-8")
+
+        result = None
+        if str(content).strip():
+            result = chunk_content(
+                str(content),
+                file_path,
+                processor.parser,
+                processor.chunker,
+                processor.metadata_extractor,
+                bool(request.get("metadata")),
+                cache=processor.cache,
+            )
+        if result is None:
+            return {"file": file_path.name, "chunks": [], "count": 0}
+
+        # Label chunks with the path the client used, not the resolved one
+        source = request.get("source")
+        if source:
+            assign_chunk_ids(result["chunks"], Path(str(source)))
+            for chunk in result["chunks"]:
+                chunk.metadata["source_file"] = str(source)
+        result["total_size"] = sum(len(c.content) for c in result["chunks"])
+        metrics.observe_file(result)
+        return result
+
+    def _processor(self, options: dict[str, Any]) -> DocumentProcessor:
+        """Get this thread's processor for a set of chunking options."""
+        unknown = set(options) - REQUEST_OPTIONS
+        if unknown:
+            raise InputValidationError(
+                f"Unsupported request options: {', '.join(sorted(unknown))}",
+                error_code=1030,
+                context={"options": sorted(unknown)},
+            )
+        processors = getattr(self._local, "processors", None)
+        if processors is None:
+            processors = self._local.processors = {}
+
+        key = tuple(sorted(options.items()))
+        processor = processors.get(key)
+        if processor is None:
+            processor = DocumentProcessor(self.settings.model_copy(update=options))
+            if options.get("chunk_method") not in (None, *processor.chunker.strategies):
+                raise InputValidationError(
+                    f"Unknown chunking strategy: {options['chunk_method']}",
+                    error_code=1030,
+                    context={"strategy": options["chunk_method"]},
+                )
+            processors[key] = processor
+        return processor
+
+    def _vector_storage(self) -> VectorDBStorage:
+        """Get the shared vector database connection, opening it once."""
+        with self._storage_lock:
+            if self._storage is None:
+                storage = VectorDBStorage(
+                    self.settings.chroma_host, self.settings.chroma_port
+                )
+                if not storage.is_available():
+                    raise ChromaDBConnectionError(
+                        "Vector database not available",
+                        context={
+                            "host": self.settings.chroma_host,
+                            "port": self.settings.chroma_port,
+                        },
+                    )
+                self._storage = storage
+            return self._storage
+
+    def _record(self, op: str, latency: float, ok: bool) -> None:
+        """Add a request to the statistics."""
+        with self._stats_lock:
+            self._latencies.setdefault(op, deque(maxlen=LATENCY_WINDOW)).append(latency)
+            if not ok:
+                self._errors[op] = self._errors.get(op, 0) + 1
+
+    def _claim_socket(self) -> None:
+        """Remove a stale socket, refusing to replace a live daemon.
+
+        The default directory in the shared temporary directory is created
+        for this user only, and refused if someone else made it first.
+        """
+        directory = self.socket_path.parent
+        if directory == private_socket_dir():
+            directory.mkdir(mode=0o700, exist_ok=True)
+            if not is_owned_by_user(directory):
+                raise NetworkError(
+                    f"Socket directory {directory} belongs to another user",
+                    error_code=1613,
+                    context={"socket_path": str(self.socket_path)},
+                )
+            os.chmod(directory, 0o700)
+        if not self.socket_path.exists():
+            return
+        client = DaemonClient.connect_if_running(self.socket_path)
+        if client is not None:
+            client.close()
+            raise InputValidationError(
+                f"A shard-md daemon is already listening on {self.socket_path}",
+                error_code=1031,
+                context={"socket_path": str(self.socket_path)},
+            )
+        self.socket_path.unlink()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Socket server with one lightweight reader thread per connection."""
+
+    daemon_threads = True
+    daemon: DaemonServer
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Read requests from a connection and write responses as they finish."""
+
+    server: _UnixServer
+
+    def handle(self) -> None:
+        """Dispatch every request line to the worker pool."""
+        write_lock = threading.Lock()
+        finished = threading.Condition()
+        outstanding = 0
+
+        def reply(future: "Future[bytes]") -> None:
+            nonlocal outstanding
+            try:
+                if not future.cancelled():
+                    with write_lock:
+                        self.wfile.write(future.result())
+                        self.wfile.flush()
+            except OSError:
+                pass  # Client went away; its other requests still finish
+            finally:
+                with finished:
+                    outstanding -= 1
+                    finished.notify()
+
+        while line := self.rfile.readline(MAX_LINE_BYTES):
+            if not line.strip():
+                continue
+            with finished:
+                outstanding += 1
+            self.server.daemon.submit(line).add_done_callback(reply)
+
+        # Keep the connection open until every response is written
+        with finished:
+            finished.wait_for(lambda: outstanding == 0)
@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 from ..config import Settings
+from ..utils import metrics, tracing
 from .base import StorageBackend
 
 
@@ -32,22 +33,12 @@ class VectorDBStorage(StorageBackend):
             chunks: List of chunk dictionaries to store
             collection: Name of the collection to store in
         """
-        if not self.is_available():
+        if not self.is_available() or self._client is None:
             raise ConnectionError("ChromaDB is not available")
 
         try:
-            from ..chromadb.client import ChromaDBClient
             from ..chromadb.collections import CollectionManager
 
-            # Initialize client if needed
-            if not self._client:
-                # Create settings with our host/port
-                if not self._settings:
-                    self._settings = Settings()
-                    self._settings.chroma_host = self.host
-                    self._settings.chroma_port = self.port
-                self._client = ChromaDBClient(self._settings)
-
             # Get or create collection
             manager = CollectionManager(self._client)
 
@@ -74,10 +65,20 @@ class VectorDBStorage(StorageBackend):
 
                 documents.append(content)
                 metadatas.append(metadata)
-                ids.append(f"{collection}_{i}")
+                chunk_id = getattr(chunk, "id", None) or (
+                    chunk.get("id") if isinstance(chunk, dict) else None
+                )
+                ids.append(chunk_id or f"{collection}_{i}")
 
             # Store in ChromaDB
-            coll.add(documents=documents, metadatas=metadatas, ids=ids)
+            metrics.CHROMADB_BATCH_SIZE.observe(len(ids))
+            with tracing.span(
+                "collection.add",
+                category="chromadb",
+                collection=collection,
+                chunks=len(ids),
+            ):
+                coll.add(documents=documents, metadatas=metadatas, ids=ids)
 
             logger.info(f"Stored {len(chunks)} chunks in collection '{collection}'")
 
@@ -88,9 +89,14 @@ class VectorDBStorage(StorageBackend):
     def is_available(self) -> bool:
         """Check if ChromaDB is available.
 
+        The first successful check keeps its connection for later stores, so
+        a long-lived storage object pays the handshake once.
+
         Returns:
             True if ChromaDB server is accessible
         """
+        if self._client is not None:
+            return True
         try:
             from ..chromadb.client import ChromaDBClient
 
@@ -101,6 +107,11 @@ class VectorDBStorage(StorageBackend):
 
             client = ChromaDBClient(settings)
             # Try to connect - this will return True/False
-            return client.connect()
+            if not client.connect():
+                return False
         except Exception:
             return False
+
+        self._settings = settings
+        self._client = client
+        return True
@@ -1,9 +1,15 @@
 """Utility modules for shard-markdown."""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .errors import InputValidationError, ProcessingError, ShardMarkdownError
 from .filesystem import ensure_directory_exists
-from .logging import get_logger, setup_logging
-from .validation import validate_input_paths
+
+
+if TYPE_CHECKING:
+    from .logging import get_logger, setup_logging
+    from .validation import validate_input_paths
 
 
 __all__ = [
@@ -15,3 +21,20 @@ __all__ = [
     "validate_input_paths",
     "ensure_directory_exists",
 ]
+
+# Logging pulls in rich, which the daemon client and scanner do not need
+_LAZY_ATTRIBUTES = {
+    "get_logger": ".logging",
+    "setup_logging": ".logging",
+    "validate_input_paths": ".validation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import logging and validation helpers on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,576 @@
+"""Prometheus metrics of ingestion runs.
+
+A small registry of counters, gauges and fixed-bucket histograms that
+renders the Prometheus text format (and OpenMetrics, when a scraper asks
+for it). A run writes it to a node-exporter textfile collector path,
+replaced atomically at an interval and once more at the end; the daemon
+can also serve it over HTTP on a local port.
+
+Every metric shard-md records is defined here, on the default registry::
+
+    metrics.CHUNKS_CREATED.inc(len(chunks))
+    metrics.STAGE_SECONDS.observe(0.012, stage="render")
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from .errors import FileSystemError
+
+
+logger = logging.getLogger(__name__)
+
+METRIC_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+# Seconds; spans fast stages of small files up to very large documents
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Chunks per ChromaDB add call
+BATCH_BUCKETS = (1, 10, 25, 50, 100, 250, 500, 1000)
+
+# Seconds between textfile writes during a run
+TEXTFILE_INTERVAL = 15.0
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _format(value: float) -> str:
+    """Format a sample value, integers without a fraction."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric(ABC):
+    """A named family of samples, one per combination of label values."""
+
+    type = "untyped"
+    suffix = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """Initialize metric.
+
+        Args:
+            name: Metric name, without the ``_total`` of counters
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+
+        Raises:
+            ValueError: If the name is not a valid metric name
+        """
+        if not METRIC_NAME.fullmatch(name):
+            raise ValueError(f"Invalid metric name: {name}")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        """Get the label values of a sample, in label name order."""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            )
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"{self.name} has no label {e}") from e
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield the name suffix, rendered labels and value of each sample."""
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Render the family in the text exposition format.
+
+        Args:
+            openmetrics: Whether to follow OpenMetrics rather than the
+                Prometheus text format, which differ in counter naming
+
+        Returns:
+            ``# HELP`` and ``# TYPE`` lines followed by the samples
+        """
+        family = self.name if openmetrics else self.name + self.suffix
+        lines = [
+            f"# HELP {family} {_escape_help(self.documentation)}",
+            f"# TYPE {family} {self.type}",
+        ]
+        lines += [
+            f"{self.name}{suffix}{labels} {_format(value)}"
+            for suffix, labels, value in self.samples()
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """A total that only goes up, e.g. files processed."""
+
+    type = "counter"
+    suffix = "_total"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """Initialize counter.
+
+        Args:
+            name: Metric name, without ``_total``
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Add to the total.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Label values
+
+        Raises:
+            ValueError: If the amount is negative or labels do not match
+        """
+        if amount < 0:
+            raise ValueError(f"{self.name} can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Get the total of one label combination."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield one ``_total`` sample per label combination."""
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield "_total", _labels(self.labelnames, key), value
+
+
+class Gauge(Metric):
+    """A value that goes up and down or is set, e.g. a timestamp."""
+
+    type = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """Initialize gauge.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Add to the value; a negative amount subtracts."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_to_current_time(self, **labels: Any) -> None:
+        """Set the value to the current Unix time."""
+        self.set(time.time(), **labels)
+
+    def value(self, **labels: Any) -> float:
+        """Get the value of one label combination."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield one sample per label combination."""
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield "", _labels(self.labelnames, key), value
+
+
+class Histogram(Metric):
+    """Counts of observations in fixed buckets, e.g. latencies."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            buckets: Increasing upper bounds; ``+Inf`` is added
+            labelnames: Names of the labels every sample carries
+
+        Raises:
+            ValueError: If the buckets are empty or not increasing
+        """
+        super().__init__(name, documentation, labelnames)
+        if not buckets or any(
+            a >= b for a, b in zip(buckets, buckets[1:], strict=False)
+        ):
+            raise ValueError(f"{name} buckets must increase")
+        self.buckets = tuple(float(b) for b in buckets)
+        # Per label combination: a count per bucket and +Inf, then the sum
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Count an observation in its bucket.
+
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        """Get the number of observations of one label combination."""
+        with self._lock:
+            counts = self._values.get(self._key(labels))
+            return int(sum(counts[:-1])) if counts else 0
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield cumulative ``_bucket`` samples, then ``_sum`` and ``_count``."""
+        with self._lock:
+            values = sorted((k, list(v)) for k, v in self._values.items())
+        names = (*self.labelnames, "le")
+        for key, counts in values:
+            cumulative = 0.0
+            bounds = (*self.buckets, float("inf"))
+            for bound, count in zip(bounds, counts[:-1], strict=True):
+                cumulative += count
+                yield "_bucket", _labels(names, (*key, _format(bound))), cumulative
+            labels = _labels(self.labelnames, key)
+            yield "_sum", labels, counts[-1]
+            yield "_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """The metrics one exposition renders."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric.
+
+        Raises:
+            ValueError: If a metric of that name exists
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Create and register a gauge."""
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, buckets, labelnames)
+        self.register(metric)
+        return metric
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Render every metric in the text exposition format.
+
+        Args:
+            openmetrics: Whether to render OpenMetrics, ending in ``# EOF``
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        text = "".join(metric.render(openmetrics) for metric in metrics)
+        return text + "# EOF\n" if openmetrics else text
+
+    def write_textfile(self, path: Path) -> None:
+        """Write the exposition for node-exporter's textfile collector.
+
+        The file is replaced atomically, so the collector never reads a
+        partial write.
+
+        Args:
+            path: Output file, conventionally ending in ``.prom``
+
+        Raises:
+            FileSystemError: If the file cannot be written
+        """
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            temporary.write_text(self.render(), encoding="utf-8")
+            os.replace(temporary, path)
+        except OSError as e:
+            temporary.unlink(missing_ok=True)
+            raise FileSystemError(
+                f"Cannot write metrics file: {path}",
+                error_code=1208,
+                context={"output_file": str(path)},
+                cause=e,
+            ) from e
+
+
+class TextfileExporter:
+    """Write a registry to a textfile at an interval and when closed."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        path: Path,
+        interval: float = TEXTFILE_INTERVAL,
+    ) -> None:
+        """Initialize exporter.
+
+        Args:
+            registry: Metrics to write
+            path: Output file
+            interval: Seconds between writes while running
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Write now, then keep writing in the background.
+
+        Raises:
+            FileSystemError: If the file cannot be written
+        """
+        self.registry.write_textfile(self.path)
+        self._thread = threading.Thread(
+            target=self._run, name="shard-md-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.registry.write_textfile(self.path)
+            except FileSystemError as e:
+                # The final write reports the error
+                logger.warning("Skipped metrics write: %s", e)
+
+    def close(self) -> None:
+        """Stop writing in the background and write the final values.
+
+        Raises:
+            FileSystemError: If the file cannot be written
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.registry.write_textfile(self.path)
+
+
+def serve_metrics(registry: MetricsRegistry, port: int, host: str = "127.0.0.1") -> Any:
+    """Serve a registry over HTTP from a background thread.
+
+    Scrapers that accept OpenMetrics get it; others get the Prometheus
+    text format.
+
+    Args:
+        registry: Metrics to serve
+        port: Port to listen on, 0 for any free port
+        host: Address to bind, local only by default
+
+    Returns:
+        The running ``ThreadingHTTPServer``; call ``shutdown()`` to stop it
+
+    Raises:
+        NetworkError: If the port cannot be bound
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from .errors import NetworkError
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            openmetrics = "application/openmetrics-text" in self.headers.get(
+                "Accept", ""
+            )
+            body = registry.render(openmetrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("metrics %s", format % args)
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        raise NetworkError(
+            f"Cannot serve metrics on {host}:{port}: {e}",
+            error_code=1612,
+            context={"host": host, "port": port},
+            cause=e,
+        ) from e
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="shard-md-metrics", daemon=True
+    ).start()
+    return server
+
+
+REGISTRY = MetricsRegistry()
+
+FILES_PROCESSED = REGISTRY.counter("shard_md_files_processed", "Markdown files chunked")
+CHUNKS_CREATED = REGISTRY.counter("shard_md_chunks_created", "Chunks produced")
+BYTES_READ = REGISTRY.counter(
+    "shard_md_bytes_read", "Bytes of markdown read from chunked files"
+)
+ERRORS = REGISTRY.counter(
+    "shard_md_errors",
+    "Failures by shard-md error code; 'other' for unclassified exceptions",
+    ("error_code",),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "shard_md_stage_duration_seconds",
+    "Time one file spent in a processing stage",
+    LATENCY_BUCKETS,
+    ("stage",),
+)
+CHROMADB_BATCH_SIZE = REGISTRY.histogram(
+    "shard_md_chromadb_batch_size",
+    "Chunks sent in one ChromaDB add call",
+    BATCH_BUCKETS,
+)
+CHROMADB_RETRIES = REGISTRY.counter(
+    "shard_md_chromadb_retries", "ChromaDB calls retried", ("operation",)
+)
+INPUT_FILES = REGISTRY.gauge(
+    "shard_md_input_files", "Markdown files in the run's input"
+)
+RUN_START = REGISTRY.gauge(
+    "shard_md_run_start_timestamp_seconds", "Unix time the run started"
+)
+LAST_SUCCESS = REGISTRY.gauge(
+    "shard_md_last_success_timestamp_seconds", "Unix time the run last succeeded"
+)
+DAEMON_REQUEST_SECONDS = REGISTRY.histogram(
+    "shard_md_daemon_request_duration_seconds",
+    "Time the daemon took to answer a request",
+    LATENCY_BUCKETS,
+    ("op",),
+)
+
+
+def observe_file(result: dict[str, Any]) -> None:
+    """Record a processed file's chunks, bytes and stage durations.
+
+    Args:
+        result: Per-file result with ``count``, and ``bytes`` and
+            ``timings`` when known
+    """
+    FILES_PROCESSED.inc()
+    CHUNKS_CREATED.inc(result.get("count", 0))
+    BYTES_READ.inc(result.get("bytes", 0))
+    for stage, duration_ns in result.get("timings", {}).items():
+        STAGE_SECONDS.observe(duration_ns / 1e9, stage=stage)
+
+
+def observe_error(error: BaseException) -> None:
+    """Count a failure by its error code.
+
+    Args:
+        error: The exception raised
+    """
+    ERRORS.inc(error_code=getattr(error, "error_code", "other"))
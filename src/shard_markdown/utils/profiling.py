@@ -0,0 +1,349 @@
+"""Built-in CPU profiling of a run and its worker processes.
+
+Two modes are offered. ``cpu`` traces every call with :mod:`cProfile` and
+writes a pstats file, for ``python -m pstats``, snakeviz and the like.
+``sample`` reads the stacks of all threads from a background thread every
+few milliseconds, which costs little however many calls there are, and
+writes collapsed stacks (``frame;frame;frame count`` lines) for
+flamegraph.pl, speedscope or inferno.
+
+Worker processes profile themselves and write one file each when they
+exit; the parent merges them into its own profile when it is saved.
+"""
+
+import cProfile
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+from collections import Counter
+from multiprocessing import util as multiprocessing_util
+from pathlib import Path
+from types import FrameType
+from typing import NamedTuple
+
+from .errors import FileSystemError
+
+
+PROFILE_MODES = ("cpu", "sample")
+
+# Written to the working directory unless another path is given
+DEFAULT_OUTPUT = {"cpu": "shard-md.prof", "sample": "shard-md.collapsed"}
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Functions listed by the summary
+TOP_FUNCTIONS = 20
+
+
+class ProfileEntry(NamedTuple):
+    """Time spent in one function, across all profiled processes."""
+
+    function: str
+    calls: int | None
+    self_seconds: float
+    total_seconds: float
+
+
+class StackSampler:
+    """Count the stacks of this process's threads on a background thread."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        """Initialize sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="shard-md-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the last sample."""
+        self._stop.set()
+        # A forked child inherits the object but not the thread
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(own_id)
+
+    def sample(self, skip_thread: int | None = None) -> None:
+        """Count the current stack of every thread once.
+
+        Args:
+            skip_thread: Thread not to sample, e.g. the sampler itself
+        """
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != skip_thread:
+                self.counts[_collapse(frame)] += 1
+
+
+def _collapse(frame: FrameType | None) -> str:
+    """Render a stack root first, one ``module:function`` per frame."""
+    names = []
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def read_collapsed(path: Path) -> Counter[str]:
+    """Read collapsed stacks written by a profile.
+
+    Args:
+        path: Collapsed stack file
+
+    Returns:
+        Sample count per stack
+    """
+    counts: Counter[str] = Counter()
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack and count.isdigit():
+                counts[stack] += int(count)
+    return counts
+
+
+class Profiler:
+    """Profile this process, merging in the profiles of its workers."""
+
+    def __init__(
+        self,
+        mode: str = "cpu",
+        worker_dir: Path | None = None,
+        interval: float = SAMPLE_INTERVAL,
+    ) -> None:
+        """Initialize profiler.
+
+        Args:
+            mode: ``cpu`` for cProfile, ``sample`` for stack sampling
+            worker_dir: Directory where workers leave their profiles
+            interval: Seconds between samples in ``sample`` mode
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.worker_dir = worker_dir
+        self.interval = interval
+        self.processes = 1
+        self._profile = cProfile.Profile() if mode == "cpu" else None
+        self._sampler = StackSampler(interval) if mode == "sample" else None
+        self._stats: pstats.Stats | None = None
+        self._counts: Counter[str] | None = None
+
+    def start(self) -> None:
+        """Start profiling."""
+        if self._profile is not None:
+            self._profile.enable()
+        elif self._sampler is not None:
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        if self._profile is not None:
+            self._profile.disable()
+        elif self._sampler is not None:
+            self._sampler.stop()
+
+    def write(self, path: Path) -> None:
+        """Write this process's profile alone, e.g. from a worker.
+
+        Args:
+            path: Profile file
+        """
+        if self._profile is not None:
+            self._profile.dump_stats(path)
+        elif self._sampler is not None:
+            _write_collapsed(self._sampler.counts, path)
+
+    def save(self, path: Path) -> None:
+        """Merge in worker profiles and write the result.
+
+        Worker profiles are removed once merged.
+
+        Args:
+            path: Profile file
+
+        Raises:
+            FileSystemError: If the profile cannot be written
+        """
+        worker_files = (
+            sorted(self.worker_dir.iterdir()) if self.worker_dir is not None else []
+        )
+        try:
+            if self._profile is not None:
+                self._stats = pstats.Stats(self._profile)
+                for worker_file in worker_files:
+                    self._stats.add(str(worker_file))
+                self._stats.dump_stats(path)
+            elif self._sampler is not None:
+                self._counts = Counter(self._sampler.counts)
+                for worker_file in worker_files:
+                    self._counts.update(read_collapsed(worker_file))
+                _write_collapsed(self._counts, path)
+        except OSError as e:
+            raise FileSystemError(
+                f"Cannot write profile: {path}",
+                error_code=1208,
+                context={"output_file": str(path)},
+                cause=e,
+            ) from e
+        finally:
+            if self.worker_dir is not None:
+                shutil.rmtree(self.worker_dir, ignore_errors=True)
+        self.processes = 1 + len(worker_files)
+
+    def top(self, limit: int = TOP_FUNCTIONS) -> list[ProfileEntry]:
+        """Get the functions with the most time of their own.
+
+        Call after :meth:`save`. Sampled times are estimated from sample
+        counts, and their calls are not known.
+
+        Args:
+            limit: Most functions to return
+
+        Returns:
+            Functions by decreasing self time
+        """
+        if self._stats is not None:
+            entries = [
+                ProfileEntry(_label(key), calls, self_time, total_time)
+                for key, (_, calls, self_time, total_time, _) in (
+                    self._stats.stats.items()  # type: ignore[attr-defined]
+                )
+            ]
+        elif self._counts is not None:
+            entries = _sampled_entries(self._counts, self.interval)
+        else:
+            return []
+        entries.sort(key=lambda e: (-e.self_seconds, -e.total_seconds))
+        return entries[:limit]
+
+
+def _label(key: tuple[str, int, str]) -> str:
+    """Name a pstats function key like ``function (dir/file.py:line)``."""
+    filename, line, function = key
+    if filename == "~":
+        return function
+    path = Path(filename)
+    return f"{function} ({path.parent.name}/{path.name}:{line})"
+
+
+def _sampled_entries(counts: Counter[str], interval: float) -> list[ProfileEntry]:
+    """Sum samples per function, on top of the stack and anywhere in it."""
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in counts.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        # Recursive functions count once per sample
+        for frame in set(frames):
+            total[frame] += count
+    return [
+        ProfileEntry(frame, None, own[frame] * interval, count * interval)
+        for frame, count in total.items()
+    ]
+
+
+def _write_collapsed(counts: Counter[str], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for stack, count in sorted(counts.items()):
+            f.write(f"{stack} {count}\n")
+
+
+_profiler: Profiler | None = None
+
+
+def start(mode: str = "cpu") -> Profiler:
+    """Start profiling this process and any workers it starts.
+
+    Args:
+        mode: ``cpu`` or ``sample``
+
+    Returns:
+        The active profiler
+    """
+    global _profiler
+    worker_dir = Path(tempfile.mkdtemp(prefix="shard-md-profile-"))
+    _profiler = Profiler(mode, worker_dir)
+    _profiler.start()
+    return _profiler
+
+
+def stop() -> Profiler | None:
+    """Stop profiling.
+
+    Returns:
+        The profiler that was active, if any
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def worker_options() -> tuple[str, str] | None:
+    """Get what a worker process needs to profile itself.
+
+    Returns:
+        Mode and profile directory, or None when not profiling
+    """
+    if _profiler is None or _profiler.worker_dir is None:
+        return None
+    return _profiler.mode, str(_profiler.worker_dir)
+
+
+def start_worker(mode: str, directory: str) -> None:
+    """Profile a worker process until it exits.
+
+    Args:
+        mode: ``cpu`` or ``sample``
+        directory: Where to write the profile on exit
+    """
+    global _profiler
+    # A forked worker inherits the parent's profiler, which must not keep
+    # counting here
+    if _profiler is not None:
+        _profiler.stop()
+    _profiler = Profiler(mode)
+    _profiler.start()
+    suffix = Path(DEFAULT_OUTPUT[mode]).suffix
+    # Executor workers leave through multiprocessing's exit handling, which
+    # runs finalizers but not atexit hooks
+    multiprocessing_util.Finalize(
+        None,
+        _finish_worker,
+        args=(_profiler, Path(directory) / f"worker-{os.getpid()}{suffix}"),
+        exitpriority=10,
+    )
+
+
+def _finish_worker(profiler: Profiler, path: Path) -> None:
+    profiler.stop()
+    try:
+        profiler.write(path)
+    except OSError:
+        # The parent may have cleaned up already after a failed run
+        pass
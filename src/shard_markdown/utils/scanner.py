@@ -0,0 +1,380 @@
+"""Fast discovery of markdown files with ignore rules."""
+
+import os
+import re
+import stat as stat_module
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+from .errors import FileSystemError
+
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# Skipped everywhere unless a pattern re-includes them
+DEFAULT_IGNORE_PATTERNS = (".git/", "node_modules/")
+
+IGNORE_FILE = ".gitignore"
+
+# Label of a document read from standard input
+STDIN_PATH = Path("-")
+
+# Listed paths are checked by the thread pool in slices of this many
+STAT_BATCH = 512
+
+
+class ScannedFile(NamedTuple):
+    """A markdown file found by the scanner."""
+
+    path: Path
+    size: int
+
+
+class IgnoreRule(NamedTuple):
+    """One compiled ``.gitignore`` pattern."""
+
+    base: str
+    regex: re.Pattern[str]
+    negate: bool
+    directory_only: bool
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            body = body.replace("\\", "\\\\")
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+def compile_ignore_rule(pattern: str, base: str = "") -> IgnoreRule | None:
+    """Compile a ``.gitignore`` line.
+
+    Args:
+        pattern: Pattern line
+        base: Directory the pattern is relative to, as a ``/``-separated
+            path below the scan root (empty for the root)
+
+    Returns:
+        Compiled rule, or None for blank lines and comments
+    """
+    pattern = pattern.rstrip("\n")
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped
+    pattern = re.sub(r"(?<!\\)\s+$", "", pattern)
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    # Patterns with an inner slash are relative to their file's directory,
+    # others match a name at any depth below it
+    anchored = "/" in pattern
+    body = _translate(pattern.lstrip("/"))
+    regex = re.compile(body if anchored else f"(?:.*/)?{body}", re.DOTALL)
+    return IgnoreRule(base, regex, negate, directory_only)
+
+
+def is_ignored(rules: Sequence[IgnoreRule], path: str, is_dir: bool) -> bool:
+    """Check a path against rules; the last matching rule decides.
+
+    Args:
+        rules: Rules in precedence order, most specific last
+        path: ``/``-separated path below the scan root
+        is_dir: Whether the path is a directory
+
+    Returns:
+        True if the path is ignored
+    """
+    ignored = False
+    for rule in rules:
+        if rule.directory_only and not is_dir:
+            continue
+        if rule.base:
+            if not path.startswith(rule.base + "/"):
+                continue
+            relative = path[len(rule.base) + 1 :]
+        else:
+            relative = path
+        if rule.regex.fullmatch(relative):
+            ignored = not rule.negate
+    return ignored
+
+
+class _Directory(NamedTuple):
+    """A directory queued for scanning."""
+
+    path: str
+    relative: str
+    rules: tuple[IgnoreRule, ...]
+
+
+# Files as (path, size, inode key) and subdirectories with their inode keys
+_Listing = tuple[
+    list[tuple[str, int, tuple[int, int]]], list[tuple[_Directory, tuple[int, int]]]
+]
+
+
+class FileScanner:
+    """Find markdown files below directories with ``os.scandir``.
+
+    Directories are listed concurrently by a small thread pool, since
+    listing is bound by filesystem latency rather than the interpreter.
+    ``.gitignore`` files are honoured per directory along with extra
+    patterns, and ``.git`` and ``node_modules`` are skipped by default.
+    Symbolic links are followed, but every directory and file is visited
+    once by device and inode, so link cycles and hard links are harmless.
+    """
+
+    def __init__(
+        self,
+        recursive: bool = True,
+        ignore_patterns: Iterable[str] = DEFAULT_IGNORE_PATTERNS,
+        use_ignore_files: bool = True,
+        workers: int = 8,
+        suffixes: Sequence[str] = MARKDOWN_SUFFIXES,
+    ) -> None:
+        """Initialize scanner.
+
+        Args:
+            recursive: Whether to descend into subdirectories
+            ignore_patterns: gitignore-style patterns relative to each root
+            use_ignore_files: Whether to read ``.gitignore`` files
+            workers: Threads listing directories concurrently
+            suffixes: File suffixes to collect, compared case-insensitively
+        """
+        self.missing: list[Path] = []
+        self.recursive = recursive
+        self.use_ignore_files = use_ignore_files
+        self.workers = workers
+        self.suffixes = tuple(s.lower() for s in suffixes)
+        self.rules = tuple(
+            rule
+            for rule in (compile_ignore_rule(p) for p in ignore_patterns)
+            if rule is not None
+        )
+
+    def scan(self, root: Path) -> list[ScannedFile]:
+        """Find the markdown files a path names.
+
+        Args:
+            root: Markdown file or directory
+
+        Returns:
+            Files sorted by path
+
+        Raises:
+            FileSystemError: If the root cannot be read
+        """
+        try:
+            if root.is_file():
+                if root.suffix.lower() not in self.suffixes:
+                    return []
+                return [ScannedFile(root, root.stat().st_size)]
+            stat = root.stat()
+        except OSError as e:
+            raise FileSystemError(
+                f"Cannot access path: {root}",
+                error_code=1201,
+                context={"path": str(root)},
+                cause=e,
+            ) from e
+
+        # Directories are listed level by level, each level in parallel and
+        # in path order, so the copy kept of a file or directory reachable
+        # through several links is always the same one
+        seen_dirs = {(stat.st_dev, stat.st_ino)}
+        seen_files: set[tuple[int, int]] = set()
+        found: list[ScannedFile] = []
+        level = [_Directory(str(root), "", self.rules)]
+
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="scan") as pool:
+            while level:
+                next_level = []
+                for files, subdirs in pool.map(self._list, level):
+                    for path, size, key in files:
+                        if key not in seen_files:
+                            seen_files.add(key)
+                            found.append(ScannedFile(Path(path), size))
+                    for subdir, key in subdirs:
+                        if key not in seen_dirs:
+                            seen_dirs.add(key)
+                            next_level.append(subdir)
+                level = next_level
+
+        found.sort(key=lambda f: f.path)
+        return found
+
+    def scan_paths(self, paths: Iterable[Path]) -> list[ScannedFile]:
+        """Check a list of markdown files, e.g. one read by :func:`read_file_list`.
+
+        Paths are checked concurrently, as :meth:`scan` lists directories.
+        Ignore rules do not apply to listed paths, but entries that are not
+        regular files with a markdown suffix are skipped. Paths that do not
+        exist are collected in :attr:`missing` rather than failing the list.
+
+        Args:
+            paths: Files to check
+
+        Returns:
+            Files in list order, each file once
+        """
+        paths = list(paths)
+        slices = [paths[i : i + STAT_BATCH] for i in range(0, len(paths), STAT_BATCH)]
+        seen: set[tuple[int, int]] = set()
+        found: list[ScannedFile] = []
+        self.missing = []
+
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="scan") as pool:
+            for checked in pool.map(self._stat_all, slices):
+                for path, stat in checked:
+                    if stat is None:
+                        self.missing.append(path)
+                        continue
+                    key = (stat.st_dev, stat.st_ino)
+                    if (
+                        stat_module.S_ISREG(stat.st_mode)
+                        and path.suffix.lower() in self.suffixes
+                        and key not in seen
+                    ):
+                        seen.add(key)
+                        found.append(ScannedFile(path, stat.st_size))
+        return found
+
+    @staticmethod
+    def _stat_all(paths: list[Path]) -> list[tuple[Path, os.stat_result | None]]:
+        """Stat a slice of listed paths, None for those that do not exist."""
+        checked: list[tuple[Path, os.stat_result | None]] = []
+        for path in paths:
+            try:
+                checked.append((path, os.stat(path)))
+            except OSError:
+                checked.append((path, None))
+        return checked
+
+    def _list(self, directory: _Directory) -> _Listing:
+        """List one directory's matching files and subdirectories to scan."""
+        rules = directory.rules
+        if self.use_ignore_files:
+            rules += self._read_ignore_file(directory)
+
+        files = []
+        subdirs = []
+        try:
+            entries = sorted(os.scandir(directory.path), key=lambda e: e.name)
+        except OSError:
+            return [], []  # Unreadable or vanished; skip like find does
+
+        for entry in entries:
+            relative = (
+                f"{directory.relative}/{entry.name}"
+                if directory.relative
+                else entry.name
+            )
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    continue
+                if is_ignored(rules, relative, is_dir):
+                    continue
+                if is_dir:
+                    if self.recursive:
+                        stat = entry.stat()
+                        subdirs.append(
+                            (
+                                _Directory(entry.path, relative, rules),
+                                (stat.st_dev, stat.st_ino),
+                            )
+                        )
+                elif os.path.splitext(entry.name)[1].lower() in self.suffixes:
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, (stat.st_dev, stat.st_ino)))
+            except OSError:
+                continue  # Broken symlink or permission problem
+        return files, subdirs
+
+    @staticmethod
+    def _read_ignore_file(directory: _Directory) -> tuple[IgnoreRule, ...]:
+        """Compile the ``.gitignore`` of a directory, if it has one."""
+        try:
+            with open(os.path.join(directory.path, IGNORE_FILE), encoding="utf-8") as f:
+                lines = f.readlines()
+        except (OSError, UnicodeDecodeError):
+            return ()
+        return tuple(
+            rule
+            for rule in (
+                compile_ignore_rule(line, directory.relative) for line in lines
+            )
+            if rule is not None
+        )
+
+
+def largest_first(files: Iterable[ScannedFile]) -> list[ScannedFile]:
+    """Order files for longest-processing-time-first scheduling.
+
+    Starting the biggest files first keeps one large file from running
+    alone at the end of a parallel run.
+
+    Args:
+        files: Scanned files
+
+    Returns:
+        Files by decreasing size, ties by path
+    """
+    return sorted(files, key=lambda f: (-f.size, f.path))
+
+
+def read_file_list(stream: BinaryIO) -> list[Path]:
+    """Read a list of paths, one per line or NUL-separated.
+
+    Lists containing a NUL byte, as written by ``find -print0`` or
+    ``git ls-files -z``, are split on NUL bytes, so names may contain
+    newlines; other lists are split into lines. Blank entries are skipped.
+
+    Args:
+        stream: Binary stream of the list
+
+    Returns:
+        Listed paths in order
+    """
+    data = stream.read()
+    if b"\0" in data:
+        entries = data.split(b"\0")
+    else:
+        entries = [line.rstrip(b"\r") for line in data.split(b"\n")]
+    return [Path(os.fsdecode(entry)) for entry in entries if entry.strip()]
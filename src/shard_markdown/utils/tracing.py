@@ -0,0 +1,252 @@
+"""Chrome trace-event recording of processing spans.
+
+While tracing is on, spans are kept in memory and written as Chrome
+trace-event JSON, which Perfetto and ``chrome://tracing`` open as a timeline
+per process and thread. Timestamps come from ``perf_counter_ns``, a
+system-wide monotonic clock on Linux and macOS, so spans recorded by worker
+processes line up with those of the parent. While tracing is off, recording
+a span costs a single check.
+"""
+
+import itertools
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any
+
+from .errors import FileSystemError
+
+
+class TraceRecorder:
+    """Collect the trace events of one process."""
+
+    def __init__(self, process_name: str = "shard-md") -> None:
+        """Initialize recorder.
+
+        Args:
+            process_name: Name of this process in the timeline
+        """
+        self.pid = os.getpid()
+        self.events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": 0,
+                "args": {"name": process_name},
+            }
+        ]
+        self._named_threads: set[int] = set()
+        self._async_ids = itertools.count(1)
+
+    def add(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        category: str = "stage",
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        """Add a completed span on the current thread.
+
+        Args:
+            name: Span name
+            start_ns: ``perf_counter_ns`` at the start
+            end_ns: ``perf_counter_ns`` at the end
+            category: Trace category, for filtering in the viewer
+            args: Details shown with the span
+        """
+        tid = self._thread_id()
+        event: dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def add_async(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        category: str = "async",
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        """Add a span that may overlap others of its thread, e.g. an await.
+
+        Args:
+            name: Span name
+            start_ns: ``perf_counter_ns`` at the start
+            end_ns: ``perf_counter_ns`` at the end
+            category: Trace category
+            args: Details shown with the span
+        """
+        event: dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "id": next(self._async_ids),
+            "pid": self.pid,
+            "tid": self._thread_id(),
+        }
+        begin = {**event, "ph": "b", "ts": start_ns / 1000}
+        if args:
+            begin["args"] = args
+        self.events += [begin, {**event, "ph": "e", "ts": end_ns / 1000}]
+
+    def _thread_id(self) -> int:
+        """Get the current thread's ID, naming the thread on first use."""
+        tid = threading.get_native_id()
+        if tid not in self._named_threads:
+            self._named_threads.add(tid)
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                }
+            )
+        return tid
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Take the events recorded so far, e.g. to send them to the parent.
+
+        Returns:
+            Events, removed from this recorder
+        """
+        events, self.events = self.events, []
+        return events
+
+    def write(self, path: Path) -> None:
+        """Write the events as a Chrome trace-event JSON file.
+
+        Args:
+            path: Output file
+
+        Raises:
+            FileSystemError: If the file cannot be written
+        """
+        trace = {"traceEvents": self.events, "displayTimeUnit": "ms"}
+        try:
+            with path.open("w", encoding="utf-8") as f:
+                json.dump(trace, f, separators=(",", ":"), default=str)
+        except OSError as e:
+            raise FileSystemError(
+                f"Cannot write trace file: {path}",
+                error_code=1208,
+                context={"output_file": str(path)},
+                cause=e,
+            ) from e
+
+
+_recorder: TraceRecorder | None = None
+
+
+def start(process_name: str = "shard-md") -> TraceRecorder:
+    """Start recording spans in this process.
+
+    Args:
+        process_name: Name of this process in the timeline
+
+    Returns:
+        The active recorder
+    """
+    global _recorder
+    _recorder = TraceRecorder(process_name)
+    return _recorder
+
+
+def stop() -> TraceRecorder | None:
+    """Stop recording spans.
+
+    Returns:
+        The recorder that was active, if any
+    """
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def active() -> TraceRecorder | None:
+    """Get the active recorder, or None when tracing is off."""
+    return _recorder
+
+
+def add_span(
+    name: str,
+    start_ns: int,
+    end_ns: int | None = None,
+    category: str = "stage",
+    **args: Any,
+) -> None:
+    """Record a span if tracing is on.
+
+    Args:
+        name: Span name
+        start_ns: ``perf_counter_ns`` at the start
+        end_ns: ``perf_counter_ns`` at the end, by default now
+        category: Trace category
+        **args: Details shown with the span
+    """
+    if _recorder is None:
+        return
+    _recorder.add(
+        name,
+        start_ns,
+        end_ns if end_ns is not None else perf_counter_ns(),
+        category,
+        args,
+    )
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **args: Any) -> Iterator[None]:
+    """Record a block as a span if tracing is on.
+
+    Args:
+        name: Span name
+        category: Trace category
+        **args: Details shown with the span
+    """
+    if _recorder is None:
+        yield
+        return
+    start_ns = perf_counter_ns()
+    try:
+        yield
+    finally:
+        add_span(name, start_ns, category=category, **args)
+
+
+@contextmanager
+def async_span(name: str, category: str = "async", **args: Any) -> Iterator[None]:
+    """Record a block that awaits as an async span if tracing is on.
+
+    Async spans may overlap on one thread, as concurrent coroutines do.
+
+    Args:
+        name: Span name
+        category: Trace category
+        **args: Details shown with the span
+    """
+    if _recorder is None:
+        yield
+        return
+    start_ns = perf_counter_ns()
+    try:
+        yield
+    finally:
+        recorder = _recorder
+        if recorder is not None:
+            recorder.add_async(name, start_ns, perf_counter_ns(), category, args)
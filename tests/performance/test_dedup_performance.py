@@ -0,0 +1,69 @@
+"""Performance tests for near-duplicate lookup in the dedup index."""
+
+import random
+import statistics
+
+import pytest
+
+from shard_markdown.core.dedup import FINGERPRINT_BITS, DedupIndex
+
+
+@pytest.mark.performance
+class TestDedupIndexPerformance:
+    """Check LSH buckets stay small as the index grows."""
+
+    CORPUS_SIZE = 100_000
+    LOOKUPS = 1_000
+
+    @pytest.fixture
+    def fingerprints(self) -> list[int]:
+        """Generate fingerprints with SimHash's evenly balanced bits."""
+        rng = random.Random(42)  # noqa: S311
+        return [rng.getrandbits(FINGERPRINT_BITS) for _ in range(self.CORPUS_SIZE)]
+
+    @staticmethod
+    def _flip_bits(fingerprint: int, count: int, rng: random.Random) -> int:
+        """Flip ``count`` distinct bits of a fingerprint."""
+        for bit in rng.sample(range(FINGERPRINT_BITS), count):
+            fingerprint ^= 1 << bit
+        return fingerprint
+
+    def test_bucket_sizes_at_corpus_scale(self, fingerprints: list[int]) -> None:
+        """Test lookups compare a small, bounded share of the corpus."""
+        index = DedupIndex(max_distance=6)
+        for i, fingerprint in enumerate(fingerprints):
+            index.add(f"c{i}", "a.md", str(i), fingerprint)
+
+        sizes = [len(bucket) for bucket in index._buckets.values()]
+        rng = random.Random(7)  # noqa: S311
+        candidates = [
+            sum(
+                len(index._buckets.get(key, ()))
+                for key in index.probe_keys(rng.getrandbits(FINGERPRINT_BITS))
+            )
+            for _ in range(self.LOOKUPS)
+        ]
+        # Single-value 9-bit bands: one bucket per band, 512 values each
+        narrow_candidates = 7 * self.CORPUS_SIZE / 512
+
+        print(
+            f"\n{self.CORPUS_SIZE} chunks: {len(sizes)} buckets, "
+            f"mean size {statistics.mean(sizes):.2f}, max {max(sizes)}; "
+            f"{statistics.mean(candidates):.0f} candidates per lookup "
+            f"(narrow bands: {narrow_candidates:.0f})"
+        )
+        assert max(sizes) <= 20
+        assert statistics.mean(candidates) < self.CORPUS_SIZE / 500
+        assert statistics.mean(candidates) * 8 < narrow_candidates
+
+    def test_probes_find_every_near_duplicate(self, fingerprints: list[int]) -> None:
+        """Test multi-probe lookup keeps full recall at the distance limit."""
+        index = DedupIndex(max_distance=7)
+        sample = fingerprints[: self.LOOKUPS]
+        for i, fingerprint in enumerate(sample):
+            index.add(f"c{i}", "a.md", str(i), fingerprint)
+
+        rng = random.Random(7)  # noqa: S311
+        for i, fingerprint in enumerate(sample):
+            near = self._flip_bits(fingerprint, 7, rng)
+            assert index.find_near(near) is not None, i
@@ -0,0 +1,49 @@
+"""Throughput tests for fixed-size chunking on large documents."""
+
+import random
+import time
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.fixed import FixedSizeChunker
+from shard_markdown.core.models import MarkdownAST, MarkdownElement
+
+
+@pytest.mark.performance
+class TestFixedThroughput:
+    """Fixed-size chunking should be linear and close to copy speed."""
+
+    @staticmethod
+    def _document(chars: int) -> MarkdownAST:
+        """Build an AST of prose paragraphs totalling about ``chars``."""
+        rng = random.Random(5)  # noqa: S311
+        words = [f"word{i}" for i in range(1_000)]
+        elements = []
+        size = 0
+        while size < chars:
+            text = " ".join(rng.choices(words, k=rng.randint(20, 200)))
+            elements.append(MarkdownElement(type="paragraph", text=text))
+            size += len(text)
+        return MarkdownAST(elements=elements)
+
+    @staticmethod
+    def _time_chunking(ast: MarkdownAST) -> float:
+        """Return the fastest of three chunking runs after rendering."""
+        chunker = FixedSizeChunker(Settings(chunk_size=1000, chunk_overlap=100))
+        ast.render("markdown")
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            chunker.chunk_document(ast)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_linear_in_document_size(self) -> None:
+        """Test 8x the text costs roughly 8x the time."""
+        small = self._time_chunking(self._document(2_500_000))
+        large = self._time_chunking(self._document(20_000_000))
+
+        print(f"\n2.5 MB: {small:.3f}s, 20 MB: {large:.3f}s ({20 / large:.0f} MB/s)")
+        assert large < small * 16
+        assert large < 5.0
@@ -0,0 +1,63 @@
+"""Benchmarks comparing greedy and optimal chunk packing."""
+
+import random
+import time
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.engine import ChunkingEngine
+from shard_markdown.core.parser import MarkdownParser
+
+
+@pytest.mark.performance
+class TestPackingPerformance:
+    """Report chunk-count reduction of optimal packing over greedy."""
+
+    SECTION_COUNT = 2_000
+
+    @pytest.fixture(scope="class")
+    def ast(self):
+        """Parse a document of sections with paragraphs of varying length."""
+        rng = random.Random(11)  # noqa: S311
+        words = [f"term{i}" for i in range(500)]
+        sections = []
+        for i in range(self.SECTION_COUNT):
+            paragraphs = [
+                " ".join(rng.choices(words, k=rng.randint(5, 60)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            sections.append(f"## Section {i}\n\n" + "\n\n".join(paragraphs))
+        return MarkdownParser().parse("# Report\n\n" + "\n\n".join(sections))
+
+    @pytest.mark.parametrize("strategy", ["structure", "paragraph"])
+    @pytest.mark.parametrize("overlap", [0, 100])
+    def test_optimal_reduces_chunk_count(
+        self, ast, strategy: str, overlap: int
+    ) -> None:
+        """Test optimal packing needs fewer chunks at a modest time cost."""
+        results = {}
+        for packing in ("greedy", "optimal"):
+            settings = Settings(
+                chunk_size=1000,
+                chunk_overlap=overlap,
+                chunk_method=strategy,
+                chunk_packing=packing,
+            )
+            engine = ChunkingEngine(settings)
+            start = time.perf_counter()
+            chunks = engine.chunk_document(ast)
+            results[packing] = (len(chunks), time.perf_counter() - start)
+
+        (greedy, greedy_time), (optimal, optimal_time) = (
+            results["greedy"],
+            results["optimal"],
+        )
+        reduction = 1 - optimal / greedy
+        print(
+            f"\n{strategy} overlap={overlap}: greedy {greedy} chunks "
+            f"({greedy_time:.3f}s), optimal {optimal} chunks "
+            f"({optimal_time:.3f}s), {reduction:.1%} fewer"
+        )
+        assert optimal < greedy
+        assert optimal_time < greedy_time * 5 + 0.5
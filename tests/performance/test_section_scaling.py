@@ -0,0 +1,47 @@
+"""Performance tests for section extraction on header-heavy documents."""
+
+import time
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.section import SectionChunker
+from shard_markdown.core.models import MarkdownAST, MarkdownElement
+
+
+@pytest.mark.performance
+class TestSectionScaling:
+    """Section extraction should scale linearly with the number of headers."""
+
+    @staticmethod
+    def _document(headers: int) -> MarkdownAST:
+        """Build an AST with one short paragraph per header."""
+        elements = []
+        for i in range(headers):
+            elements.append(
+                MarkdownElement(type="header", text=f"Heading {i}", level=i % 3 + 1)
+            )
+            elements.append(
+                MarkdownElement(type="paragraph", text=f"Body of section {i}.")
+            )
+        return MarkdownAST(elements=elements)
+
+    @staticmethod
+    def _time_chunking(ast: MarkdownAST) -> float:
+        """Return the fastest of three chunking runs on a fresh cache."""
+        chunker = SectionChunker(Settings(chunk_overlap=0))
+        best = float("inf")
+        for _ in range(3):
+            ast.invalidate_cache()
+            start = time.perf_counter()
+            chunker.chunk_document(ast)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_linear_in_header_count(self) -> None:
+        """Test 8x the headers costs roughly 8x the time, not 64x."""
+        small = self._time_chunking(self._document(5_000))
+        large = self._time_chunking(self._document(40_000))
+
+        print(f"\n5k headers: {small:.3f}s, 40k headers: {large:.3f}s")
+        assert large < small * 16
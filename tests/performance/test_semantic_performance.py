@@ -0,0 +1,69 @@
+"""Performance tests for TF-IDF semantic boundary detection."""
+
+import random
+import time
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.semantic import SemanticChunker
+from shard_markdown.core.chunking.tfidf import TermMatrix, similarity_threshold
+
+
+@pytest.mark.performance
+class TestSemanticPerformance:
+    """Compare TF-IDF boundary detection against the keyword heuristics."""
+
+    UNIT_COUNT = 10_000
+
+    @pytest.fixture
+    def units(self) -> list[dict]:
+        """Generate semantic units with alternating levels."""
+        rng = random.Random(42)  # noqa: S311
+        vocabulary = [f"term{i}" for i in range(3000)] + ["Python", "Data Model"]
+        return [
+            {
+                "content": " ".join(rng.choices(vocabulary, k=60)),
+                "type": "content",
+                "level": i % 2,
+            }
+            for i in range(self.UNIT_COUNT)
+        ]
+
+    @staticmethod
+    def _best_of(runs: int, func) -> float:
+        """Return the fastest of several timed runs."""
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_tfidf_faster_than_heuristics(self, units: list[dict]) -> None:
+        """Test one vectorized pass beats per-boundary set building."""
+        pytest.importorskip("numpy")
+        chunker = SemanticChunker(Settings())
+
+        def heuristic() -> None:
+            for previous, current in zip(units, units[1:], strict=False):
+                chunker._are_related(previous, current)
+            for i in range(0, len(units), 3):
+                chunker._extract_topics(units[i : i + 3])
+
+        def tfidf() -> None:
+            matrix = TermMatrix(unit["content"] for unit in units)
+            similarities = matrix.adjacent_similarity()
+            similarity_threshold(similarities, SemanticChunker.BOUNDARY_STD_FACTOR)
+            matrix.top_terms_for(
+                [(i, min(i + 3, len(units))) for i in range(0, len(units), 3)], 5
+            )
+
+        heuristic_time = self._best_of(5, heuristic)
+        tfidf_time = self._best_of(5, tfidf)
+
+        print(
+            f"\n{self.UNIT_COUNT} units: heuristics {heuristic_time:.3f}s, "
+            f"tfidf {tfidf_time:.3f}s"
+        )
+        assert tfidf_time < heuristic_time
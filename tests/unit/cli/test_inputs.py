@@ -0,0 +1,100 @@
+"""Unit tests for file lists and standard input."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+def _sources(output: str) -> list[str]:
+    return sorted(
+        {json.loads(line)["metadata"]["source_file"] for line in output.splitlines()}
+    )
+
+
+class TestFilesFrom:
+    """Test --files-from lists."""
+
+    @pytest.mark.parametrize("separator", ["\n", "\0"])
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_listed_files_are_processed(
+        self, tmp_path: Path, separator: str, jobs: str
+    ) -> None:
+        """Test every listed markdown file is chunked once, in any mode."""
+        paths = [tmp_path / "a.md", tmp_path / "b c.md", tmp_path / "notes.txt"]
+        for path in paths:
+            path.write_text(DOCUMENT)
+        listing = separator.join(str(p) for p in [*paths, paths[0]]) + separator
+
+        result = CliRunner().invoke(
+            shard_md,
+            ["--files-from", "-", "-j", jobs, "--output", "jsonl", "--no-daemon"],
+            input=listing,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert _sources(result.stdout) == [str(paths[0]), str(paths[1])]
+
+    def test_list_file_and_missing_entries(self, tmp_path: Path) -> None:
+        """Test lists are read from files and missing paths are skipped."""
+        (tmp_path / "a.md").write_text(DOCUMENT)
+        listing = tmp_path / "changed.txt"
+        listing.write_text(f"{tmp_path / 'a.md'}\n\n{tmp_path / 'gone.md'}\n")
+
+        result = CliRunner().invoke(
+            shard_md,
+            ["--files-from", str(listing), "--output", "jsonl", "--no-daemon"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert _sources(result.stdout) == [str(tmp_path / "a.md")]
+        assert "skipped 1 listed paths" in result.stderr
+
+    @pytest.mark.parametrize("args", [[], ["README.md", "--files-from", "-"]])
+    def test_input_or_list_required(self, args: list[str]) -> None:
+        """Test exactly one of INPUT and --files-from is accepted."""
+        result = CliRunner().invoke(shard_md, args, input="")
+
+        assert result.exit_code == 2
+        assert "INPUT path or --files-from" in result.output
+
+
+class TestStdinInput:
+    """Test documents piped to standard input."""
+
+    def test_stdin_document(self) -> None:
+        """Test - chunks the piped document, labelled -."""
+        result = CliRunner().invoke(
+            shard_md,
+            ["-", "--metadata", "--output", "jsonl", "--no-daemon"],
+            input=DOCUMENT,
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert records
+        assert {r["metadata"]["source_file"] for r in records} == {"-"}
+        assert records[0]["metadata"]["title"] == "Guide"
+        assert "file_path" not in records[0]["metadata"]
+
+    def test_stdin_table(self) -> None:
+        """Test piped documents are reported like files."""
+        result = CliRunner().invoke(shard_md, ["-", "--no-daemon"], input=DOCUMENT)
+
+        assert result.exit_code == 0, result.output
+        assert "Total chunks" in result.output
+
+    def test_stdin_cannot_stream(self) -> None:
+        """Test streaming needs a real file."""
+        result = CliRunner().invoke(
+            shard_md, ["-", "--stream", "--no-daemon"], input=DOCUMENT
+        )
+
+        assert result.exit_code == 1
+        assert "--stream needs a file" in result.output
@@ -107,6 +107,29 @@ This document demonstrates real chunking behavior without mocks."""
         assert "chunk" in result.output.lower()
 
     @pytest.mark.unit
+    @pytest.mark.unit
+    def test_compare_strategies(self, cli_runner, temp_markdown_file):
+        """Test comparing several strategies in one run."""
+        result = cli_runner.invoke(
+            shard_md,
+            [str(temp_markdown_file), "--compare", "structure,fixed", "--size", "200"],
+        )
+
+        assert result.exit_code == 0
+        assert "Strategy Comparison" in result.output
+        assert "structure" in result.output
+        assert "fixed" in result.output
+
+    @pytest.mark.unit
+    def test_compare_unknown_strategy(self, cli_runner, temp_markdown_file):
+        """Test unknown strategies in --compare are rejected."""
+        result = cli_runner.invoke(
+            shard_md, [str(temp_markdown_file), "--compare", "structure,bogus"]
+        )
+
+        assert result.exit_code != 0
+        assert "bogus" in result.output
+
     def test_output_format(self, cli_runner, temp_markdown_file):
         """Test output format with real components."""
         result = cli_runner.invoke(shard_md, [str(temp_markdown_file)])
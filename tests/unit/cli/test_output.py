@@ -0,0 +1,128 @@
+"""Unit tests for streaming JSON-lines chunk output."""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.cli.output import ZSTD_AVAILABLE, ChunkWriter, compression_for
+from shard_markdown.core.models import DocumentChunk
+from shard_markdown.utils.errors import ConfigurationError
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+def _chunk(i: int) -> DocumentChunk:
+    return DocumentChunk(
+        id=f"c{i}",
+        content=f"chunk {i} ✓",
+        metadata={"source_file": "a.md"},
+        start_position=i * 10,
+        end_position=i * 10 + 9,
+    )
+
+
+class TestChunkWriter:
+    """Test JSON-lines encoding, buffering and compression."""
+
+    def test_writes_one_line_per_chunk(self, tmp_path: Path) -> None:
+        """Test chunks are written with content, metadata and offsets."""
+        path = tmp_path / "chunks.jsonl"
+        with ChunkWriter(path, buffer_size=64) as writer:
+            writer.write_all([_chunk(i) for i in range(5)])
+            # Small buffers are written out as they fill
+            assert path.stat().st_size > 0
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == writer.chunks_written == 5
+        assert json.loads(lines[1]) == {
+            "id": "c1",
+            "content": "chunk 1 ✓",
+            "metadata": {"source_file": "a.md"},
+            "start_position": 10,
+            "end_position": 19,
+        }
+
+    def test_gzip_from_suffix(self, tmp_path: Path) -> None:
+        """Test .gz output is compressed."""
+        path = tmp_path / "chunks.jsonl.gz"
+        with ChunkWriter(path) as writer:
+            writer.write(_chunk(0))
+
+        assert writer.compression == "gzip"
+        assert json.loads(gzip.decompress(path.read_bytes()))["id"] == "c0"
+
+    def test_compression_inference(self) -> None:
+        """Test compressions are inferred from file suffixes only."""
+        assert compression_for(Path("a.jsonl.zst")) == "zstd"
+        assert compression_for(Path("a.jsonl")) is None
+        assert compression_for(None) is None
+
+    def test_unavailable_compression(self, tmp_path: Path) -> None:
+        """Test unknown compressions and missing zstandard are reported."""
+        with pytest.raises(ConfigurationError):
+            ChunkWriter(tmp_path / "a.jsonl", compression="lz4")
+        if not ZSTD_AVAILABLE:
+            with pytest.raises(ConfigurationError, match="zstandard"):
+                ChunkWriter(tmp_path / "a.jsonl.zst")
+
+
+class TestJsonlOutput:
+    """Test --output jsonl in the CLI."""
+
+    def test_chunks_go_to_stdout(self, tmp_path: Path) -> None:
+        """Test stdout holds only JSON lines and the summary goes to stderr."""
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+
+        result = CliRunner().invoke(
+            shard_md, [str(path), "--output", "jsonl", "--size", "100", "--no-daemon"]
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert records
+        assert all(r["metadata"]["source_file"] == str(path) for r in records)
+        assert "Wrote" in result.stderr
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_output_file(self, tmp_path: Path, stream: bool) -> None:
+        """Test chunks of every file are written, also when streaming."""
+        for i in range(3):
+            (tmp_path / f"doc{i}.md").write_text(DOCUMENT)
+        output = tmp_path / "out" / "chunks.jsonl.gz"
+        output.parent.mkdir()
+
+        args = [str(tmp_path), "--output-file", str(output), "-q", "--no-daemon"]
+        result = CliRunner().invoke(shard_md, args + (["--stream"] if stream else []))
+
+        assert result.exit_code == 0, result.output
+        assert "Processing Results" not in result.output
+        lines = gzip.decompress(output.read_bytes()).decode().splitlines()
+        sources = {json.loads(line)["metadata"]["source_file"] for line in lines}
+        assert len(sources) == 3
+
+    @pytest.mark.parametrize("mode", [["-j", "1"], ["-j", "2"], ["--stream"]])
+    def test_ids_unique_across_files(self, tmp_path: Path, mode: list[str]) -> None:
+        """Test chunk IDs can key the output of many identical files."""
+        for name in ("a.md", "b.md", "c.md"):
+            (tmp_path / name).write_text(DOCUMENT * 5)
+        listing = tmp_path / "files.txt"
+        listing.write_text(
+            "".join(f"{tmp_path / n}\n" for n in ("a.md", "b.md", "c.md"))
+        )
+
+        result = CliRunner().invoke(
+            shard_md,
+            ["--files-from", str(listing), "--output", "jsonl", "--size", "100"]
+            + ["--overlap", "0", "--no-daemon", *mode],
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert len({r["metadata"]["source_file"] for r in records}) == 3
+        assert len({r["id"] for r in records}) == len(records)
@@ -0,0 +1,58 @@
+"""Startup cost regression tests for the CLI entry point."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Cumulative import time allowed for the CLI module, in microseconds. Click
+# itself accounts for most of it.
+STARTUP_BUDGET_US = 100_000
+
+# Modules that only processing, display or storage need
+HEAVY_MODULES = ("pydantic", "rich", "markdown", "frontmatter", "yaml", "chromadb")
+
+
+def _import_times(code: str) -> dict[str, int]:
+    """Run code under ``-X importtime`` and map modules to cumulative time."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Test the CLI starts without loading processing dependencies."""
+
+    def test_cli_import_skips_heavy_modules(self) -> None:
+        """Test importing the CLI leaves processing modules unloaded."""
+        times = _import_times("import shard_markdown.cli.main")
+
+        assert "shard_markdown.cli.main" in times
+        loaded = {name.split(".")[0] for name in times}
+        assert not loaded.intersection(HEAVY_MODULES)
+        assert "shard_markdown.core.processor" not in times
+
+    @pytest.mark.performance
+    def test_cli_import_within_budget(self) -> None:
+        """Test importing the CLI stays within the startup budget."""
+        # Best of three, so a busy machine does not fail the check
+        elapsed = min(
+            _import_times("import shard_markdown.cli.main")["shard_markdown.cli.main"]
+            for _ in range(3)
+        )
+
+        assert elapsed < STARTUP_BUDGET_US
@@ -0,0 +1,125 @@
+"""Unit tests for repeated boilerplate stripping."""
+
+from pathlib import Path
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.boilerplate import BoilerplateFilter, block_digest
+from shard_markdown.core.models import MarkdownElement
+from shard_markdown.core.parser import MarkdownParser
+from shard_markdown.core.processor import DocumentProcessor
+
+
+NAVIGATION = "- [Home](/)\n- [Guides](/guides)\n- [API](/api)"
+FOOTER = "Copyright 2024 Example Corp. All rights reserved."
+
+
+def _page(title: str, body: str) -> str:
+    return f"{NAVIGATION}\n\n# {title}\n\n{body}\n\n{FOOTER}\n"
+
+
+def _elements(text: str) -> list[MarkdownElement]:
+    return MarkdownParser().parse(text).elements
+
+
+class TestBoilerplateFilter:
+    """Test learning and dropping repeated elements."""
+
+    def test_digest_ignores_whitespace_but_not_type(self) -> None:
+        """Test reflowed text matches and element types are kept apart."""
+        digest = block_digest("paragraph", "a  b\nc")
+        assert digest == block_digest("paragraph", "a b c")
+        assert digest != block_digest("list_item", "a b c")
+
+    def test_strips_elements_repeated_across_documents(self) -> None:
+        """Test navigation and footers are dropped and page content kept."""
+        pages = [_page(f"Page {i}", f"Unique body text {i}.") for i in range(4)]
+        boilerplate = BoilerplateFilter(min_documents=3, min_ratio=0.5)
+        for page in pages:
+            boilerplate.learn(_elements(page))
+
+        ast = boilerplate.strip(MarkdownParser().parse(pages[0]))
+
+        # The footer is cut from the paragraph the parser merged it into
+        assert [e.text for e in ast.elements] == ["Page 0", "Unique body text 0."]
+        assert boilerplate.removed_blocks == 4
+        assert boilerplate.boilerplate_count == 4
+
+    def test_thresholds(self) -> None:
+        """Test elements below either threshold are kept."""
+        boilerplate = BoilerplateFilter(min_documents=3, min_ratio=0.5)
+        footer = MarkdownElement(type="paragraph", text=FOOTER)
+        for i in range(8):
+            other = MarkdownElement(type="paragraph", text=f"Body {i}")
+            boilerplate.learn([footer, other] if i < 3 else [other])
+
+        # Three of eight documents is below half of the batch
+        assert boilerplate.threshold == 4
+        assert not boilerplate.is_boilerplate("paragraph", FOOTER)
+
+    def test_structure_and_code_are_never_stripped(self) -> None:
+        """Test shared headers, table rows and code blocks survive."""
+        text = (
+            "## Installation\n\n| Option | Description |\n\n"
+            "```bash\npip install example\n```\n"
+        )
+        boilerplate = BoilerplateFilter(min_documents=2, min_ratio=0.1)
+        for _ in range(5):
+            boilerplate.learn(_elements(text))
+
+        ast = MarkdownParser().parse(text)
+        assert boilerplate.strip(ast) is ast
+
+    def test_from_settings(self) -> None:
+        """Test stripping is off unless configured."""
+        assert BoilerplateFilter.from_settings(Settings()) is None
+
+        boilerplate = BoilerplateFilter.from_settings(
+            Settings(process_strip_boilerplate=True, process_boilerplate_ratio=0.8)
+        )
+        assert boilerplate is not None
+        assert boilerplate.min_ratio == 0.8
+
+        with pytest.raises(ValueError):
+            Settings(process_boilerplate_min_docs=1)
+
+
+class TestProcessorBoilerplate:
+    """Test the boilerplate stage in document processing."""
+
+    def test_batch_learns_before_chunking(self, tmp_path: Path) -> None:
+        """Test every file of a batch is stripped, including the first."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"page{i}.md"
+            path.write_text(_page(f"Page {i}", f"Body of page {i}."))
+            paths.append(path)
+
+        settings = Settings(
+            chunk_size=1000, chunk_overlap=0, process_strip_boilerplate=True
+        )
+        processor = DocumentProcessor(settings)
+        result = processor.process_batch(paths, "docs")
+
+        assert result.total_boilerplate_blocks == 12
+        assert [r.boilerplate_blocks for r in result.results] == [4, 4, 4]
+        assert result.successful_files == 3
+        assert result.total_chunks == 3
+
+    def test_stream_drops_boilerplate(self, tmp_path: Path) -> None:
+        """Test streamed documents use boilerplate learned from the batch."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"page{i}.md"
+            path.write_text(_page(f"Page {i}", f"Body of page {i}."))
+            paths.append(path)
+
+        processor = DocumentProcessor(
+            Settings(chunk_size=1000, chunk_overlap=0, process_strip_boilerplate=True)
+        )
+        processor.learn_boilerplate(paths)
+        chunks = list(processor.stream_document(paths[0]))
+
+        assert "Copyright" not in "".join(c.content for c in chunks)
+        assert "Body of page 0." in chunks[0].content
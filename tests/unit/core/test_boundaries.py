@@ -0,0 +1,80 @@
+"""Unit tests for the shared boundary index."""
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.boundaries import BoundaryIndex, floor_word_start
+from shard_markdown.core.chunking.sentence import SentenceChunker
+from shard_markdown.core.chunking.structure import StructureAwareChunker
+
+
+class TestBoundaryIndex:
+    """Test boundary offsets and bisect queries."""
+
+    def test_offsets_mark_unit_starts(self) -> None:
+        """Test each boundary is the offset where a new unit begins."""
+        text = "One two. Three!\n\nFour"
+        index = BoundaryIndex(text)
+
+        assert list(index.offsets("sentence")) == [9, 17]
+        assert list(index.offsets("word")) == [4, 9, 17]
+        assert list(index.offsets("paragraph")) == [17]
+        assert text[index.offsets("paragraph")[0] :] == "Four"
+
+    def test_floor_and_ceil_respect_bounds(self) -> None:
+        """Test floor/ceil lookups stay inside the requested range."""
+        index = BoundaryIndex("a b c d e f")
+
+        assert index.floor("word", 7) == 6
+        assert index.floor("word", 7, lo=6) is None
+        assert index.ceil("word", 3) == 4
+        assert index.ceil("word", 3, hi=4) is None
+
+    def test_window_only_indexes_range(self) -> None:
+        """Test a windowed index ignores boundaries outside the window."""
+        text = "First. Second. Third."
+        index = BoundaryIndex(text, start=8)
+
+        assert list(index.offsets("sentence")) == [15]
+
+    def test_spans_cover_text(self) -> None:
+        """Test spans are contiguous and cover the indexed range."""
+        text = "A. B. C."
+        spans = list(BoundaryIndex(text).spans("sentence"))
+
+        assert spans[0][0] == 0
+        assert spans[-1][1] == len(text)
+        assert "".join(text[a:b] for a, b in spans) == text
+
+    def test_floor_word_start_matches_index(self) -> None:
+        """Test the index-free lookup agrees with the word index everywhere."""
+        text = (
+            "  alpha beta\n\n  gamma\tdelta   epsilon\u00a0zeta " + "x" * 200 + " y  "
+        )
+        index = BoundaryIndex(text)
+
+        for pos in range(len(text) + 2):
+            for lo in (-1, 0, 5, pos - 3, pos - 100):
+                assert floor_word_start(text, pos, lo) == index.floor("word", pos, lo)
+
+
+class TestChunkersUseBoundaries:
+    """Test chunkers split at indexed boundaries."""
+
+    def test_sentence_split_keeps_punctuation(self) -> None:
+        """Test sentences are split at boundaries without losing text."""
+        chunker = SentenceChunker(Settings(chunk_size=100, chunk_overlap=10))
+
+        sentences = chunker._split_sentences("Hello world. How are you? Fine!")
+
+        assert sentences == ["Hello world.", "How are you?", "Fine!"]
+
+    def test_split_long_line_cuts_at_sentence_or_word(self) -> None:
+        """Test long lines are split at boundaries within the size limit."""
+        chunker = StructureAwareChunker(Settings(chunk_size=100, chunk_overlap=10))
+        line = " ".join(f"word{i}" for i in range(200))
+
+        pieces = chunker._split_long_line(line, 100, 20)
+
+        assert len(pieces) > 1
+        assert all(len(piece) <= 100 for piece in pieces)
+        assert all(not piece.startswith(" ") for piece in pieces)
+        assert pieces[-1].endswith("word199")
@@ -0,0 +1,145 @@
+"""Unit tests for the on-disk chunk cache."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.cache import ChunkCache, settings_fingerprint
+from shard_markdown.core.models import DocumentChunk
+from shard_markdown.core.processor import DocumentProcessor
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+SECTIONS = "# Guide\n\n" + "\n\n".join(
+    f"## Part {i}\n\n" + "Body text of this part. " * 12 for i in range(3)
+)
+
+
+def _chunks(count: int = 2) -> list[DocumentChunk]:
+    return [
+        DocumentChunk(
+            id=f"id{i}",
+            content=f"chunk {i}",
+            metadata={"chunk_method": "structure", "structural_context": "Guide"},
+            start_position=i * 10,
+            end_position=i * 10 + 7,
+        )
+        for i in range(count)
+    ]
+
+
+class TestChunkCache:
+    """Test cache keys, storage and eviction."""
+
+    def test_key_tracks_content_settings_and_version(self, tmp_path: Path) -> None:
+        """Test only chunking-relevant changes produce a new key."""
+        cache = ChunkCache(tmp_path, Settings())
+        key = cache.key(DOCUMENT)
+
+        assert ChunkCache(tmp_path, Settings(log_level="DEBUG")).key(DOCUMENT) == key
+        assert ChunkCache(tmp_path, Settings(chunk_size=500)).key(DOCUMENT) != key
+        assert cache.key(DOCUMENT + "More.\n") != key
+        with patch("shard_markdown.core.cache.__version__", "9.9.9"):
+            assert cache.key(DOCUMENT) != key
+
+    def test_fingerprint_ignores_other_settings(self) -> None:
+        """Test processing and storage settings do not invalidate entries."""
+        assert settings_fingerprint(Settings()) == settings_fingerprint(
+            Settings(process_dedup="skip", chroma_port=9000)
+        )
+        assert settings_fingerprint(Settings()) != settings_fingerprint(
+            Settings(plugins=["custom = example.chunkers:Custom"])
+        )
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test chunks and document metadata come back unchanged, without IDs."""
+        cache = ChunkCache(tmp_path, Settings())
+        key = cache.key(DOCUMENT)
+        assert cache.get(key) is None
+
+        cache.put(key, _chunks(), {"title": "Guide", "word_count": 9})
+        chunks, document = cache.get(key) or ([], {})
+
+        assert [c.content for c in chunks] == ["chunk 0", "chunk 1"]
+        assert chunks[1].start_position == 10
+        assert chunks[0].metadata["structural_context"] == "Guide"
+        assert chunks[0].id is None
+        assert document == {"title": "Guide", "word_count": 9}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Test unreadable entries are ignored."""
+        cache = ChunkCache(tmp_path, Settings())
+        key = cache.key(DOCUMENT)
+        cache.put(key, _chunks(), {})
+        path = next(tmp_path.glob("*/*.chunks"))
+        path.write_bytes(b"SMC1 truncated")
+
+        assert cache.get(key) is None
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Test the oldest entries go once the size bound is exceeded."""
+        cache = ChunkCache(tmp_path, Settings(), max_bytes=10**6)
+        keys = [cache.key(f"document {i}") for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.put(key, _chunks(), {})
+            path = next(tmp_path.glob(f"*/{key}.chunks"))
+            os.utime(path, (1000 + i, 1000 + i))
+        entry_size = path.stat().st_size
+
+        # A hit refreshes the first entry, so the second is now the oldest
+        assert cache.get(keys[0]) is not None
+        cache.max_bytes = entry_size * 3
+        cache.put(cache.key("document 4"), _chunks(), {})
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert len(list(tmp_path.glob("*/*.chunks"))) <= 3
+
+
+class TestProcessorCache:
+    """Test the cache in document processing."""
+
+    def test_renamed_file_is_served_from_cache(self, tmp_path: Path) -> None:
+        """Test identical content elsewhere reuses chunks with fresh IDs."""
+        first = tmp_path / "a" / "guide.md"
+        second = tmp_path / "b" / "renamed.md"
+        for path in (first, second):
+            path.parent.mkdir()
+            path.write_text(DOCUMENT)
+
+        settings = Settings(
+            chunk_size=200, chunk_overlap=0, process_cache_dir=tmp_path / "cache"
+        )
+        processor = DocumentProcessor(settings)
+        miss = processor.process_document(first)
+
+        processor = DocumentProcessor(settings)
+        with patch.object(processor.chunker, "chunk_document") as chunk_document:
+            hit = processor.process_document(second)
+
+        chunk_document.assert_not_called()
+        assert not miss.from_cache and hit.from_cache
+        assert hit.chunks_created == miss.chunks_created
+
+    @pytest.mark.parametrize("strategy", ["structure", "hierarchical"])
+    def test_cli_hits_match_misses(self, tmp_path: Path, strategy: str) -> None:
+        """Test cached chunks are written with the IDs and links of a miss."""
+        (tmp_path / "guide.md").write_text(SECTIONS)
+        args = [str(tmp_path / "guide.md"), "--strategy", strategy, "--size", "200"]
+        args += ["--overlap", "0", "--cache-dir", str(tmp_path / "cache")]
+        args += ["--output", "jsonl", "--no-daemon"]
+
+        miss = CliRunner().invoke(shard_md, args)
+        hit = CliRunner().invoke(shard_md, args)
+
+        assert miss.exit_code == 0 and hit.exit_code == 0, hit.output
+        assert hit.stdout == miss.stdout
+        assert '"id":null' not in hit.stdout
+        if strategy == "hierarchical":
+            assert '"parent_id"' in hit.stdout
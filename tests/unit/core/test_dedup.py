@@ -0,0 +1,246 @@
+"""Unit tests for duplicate chunk detection."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.dedup import (
+    ChunkDeduplicator,
+    DedupIndex,
+    SQLiteDedupIndex,
+    content_digest,
+    simhash,
+)
+from shard_markdown.core.models import DocumentChunk
+from shard_markdown.core.processor import DocumentProcessor
+from shard_markdown.utils.errors import ProcessingError
+
+
+FOOTER = (
+    "Getting help: open an issue on the project tracker or ask in the "
+    "community forum, and include your version, platform and a minimal "
+    "example that reproduces the problem so maintainers can investigate."
+)
+FOOTER_EDITED = FOOTER.replace("maintainers", "developers")
+UNRELATED = (
+    "Sourdough bread needs a ripe starter, strong flour, water and salt, and "
+    "the dough should rise slowly overnight in a cool kitchen before baking "
+    "in a very hot oven."
+)
+
+
+def _chunk(chunk_id: str, content: str, source: str = "a.md") -> DocumentChunk:
+    return DocumentChunk(id=chunk_id, content=content, metadata={"source_file": source})
+
+
+class TestFingerprints:
+    """Test content digests and SimHash fingerprints."""
+
+    def test_digest_ignores_whitespace(self) -> None:
+        """Test reflowed text has the same digest."""
+        assert content_digest("a  b\nc") == content_digest("a b c")
+        assert content_digest("a b c") != content_digest("a b d")
+
+    def test_simhash_distance_tracks_similarity(self) -> None:
+        """Test small edits flip few bits and different text flips many."""
+        base, edited, other = (
+            simhash(FOOTER),
+            simhash(FOOTER_EDITED),
+            simhash(UNRELATED),
+        )
+        assert base is not None and edited is not None and other is not None
+
+        assert (base ^ edited).bit_count() <= 6
+        assert (base ^ other).bit_count() > 12
+
+    def test_short_text_has_no_fingerprint(self) -> None:
+        """Test short chunks are left to exact matching."""
+        assert simhash("Installation") is None
+
+
+class TestChunkDeduplicator:
+    """Test skipping and linking duplicates."""
+
+    def test_skip_drops_exact_and_near_duplicates(self) -> None:
+        """Test only the first copy of repeated content is kept."""
+        deduplicator = ChunkDeduplicator("skip")
+
+        first = deduplicator.apply([_chunk("a1", FOOTER), _chunk("a2", UNRELATED)])
+        second = deduplicator.apply(
+            [_chunk("b1", FOOTER, "b.md"), _chunk("b2", FOOTER_EDITED, "b.md")]
+        )
+
+        assert [c.id for c in first] == ["a1", "a2"]
+        assert second == []
+        assert deduplicator.exact_duplicates == 1
+        assert deduplicator.near_duplicates == 1
+
+    def test_link_keeps_duplicates_with_canonical_id(self) -> None:
+        """Test linked duplicates point at the canonical chunk."""
+        deduplicator = ChunkDeduplicator("link")
+        deduplicator.apply([_chunk("a1", FOOTER)])
+
+        kept = deduplicator.apply([_chunk("b1", FOOTER_EDITED, "b.md")])
+
+        assert kept[0].metadata["duplicate_of"] == "a1"
+        assert kept[0].metadata["duplicate_kind"] == "near"
+        assert kept[0].metadata["duplicate_source"] == "a.md"
+
+    def test_skipped_parent_is_replaced_by_canonical(self) -> None:
+        """Test children of a dropped parent point at the kept copy."""
+        deduplicator = ChunkDeduplicator("skip")
+        deduplicator.apply([_chunk("a1", FOOTER)])
+        child = _chunk("b2", UNRELATED, "b.md")
+        child.metadata["parent_id"] = "b1"
+
+        kept = deduplicator.apply([_chunk("b1", FOOTER, "b.md"), child])
+
+        assert kept == [child]
+        assert child.metadata["parent_id"] == "a1"
+
+    def test_from_settings(self) -> None:
+        """Test deduplication is off unless configured."""
+        assert ChunkDeduplicator.from_settings(Settings()) is None
+
+        deduplicator = ChunkDeduplicator.from_settings(
+            Settings(process_dedup="LINK", process_dedup_distance=3)
+        )
+        assert deduplicator is not None
+        assert deduplicator.mode == "link"
+        assert isinstance(deduplicator.index, DedupIndex)
+        assert deduplicator.index.bands == 4
+
+        with pytest.raises(ValueError, match="Invalid dedup mode"):
+            Settings(process_dedup="merge")
+
+
+class TestSQLiteDedupIndex:
+    """Test the persistent index."""
+
+    def test_index_persists_across_runs(self, tmp_path: Path) -> None:
+        """Test canonical chunks recorded in one run are found in the next."""
+        path = tmp_path / "dedup" / "index.sqlite"
+        first_run = ChunkDeduplicator("skip", SQLiteDedupIndex(path))
+        first_run.apply([_chunk("a1", FOOTER)])
+        first_run.close()
+
+        second_run = ChunkDeduplicator("link", SQLiteDedupIndex(path))
+        kept = second_run.apply(
+            [_chunk("b1", FOOTER, "b.md"), _chunk("b2", FOOTER_EDITED, "b.md")]
+        )
+        second_run.close()
+
+        assert [c.metadata["duplicate_kind"] for c in kept] == ["exact", "near"]
+        assert {c.metadata["duplicate_of"] for c in kept} == {"a1"}
+
+    @pytest.mark.parametrize("mode", ["skip", "link"])
+    def test_rerun_does_not_match_itself(self, tmp_path: Path, mode: str) -> None:
+        """Test re-processing a file keeps its chunks and refreshes the index."""
+        path = tmp_path / "index.sqlite"
+        first_run = ChunkDeduplicator(mode, SQLiteDedupIndex(path))
+        first_run.apply([_chunk("a1", FOOTER), _chunk("a2", UNRELATED)])
+        first_run.close()
+
+        second_run = ChunkDeduplicator(mode, SQLiteDedupIndex(path))
+        chunks = [_chunk("a1", FOOTER_EDITED), _chunk("a2", UNRELATED)]
+        kept = second_run.apply(chunks)
+        second_run.close()
+
+        assert kept == chunks
+        assert not any("duplicate_of" in c.metadata for c in kept)
+        assert second_run.exact_duplicates == second_run.near_duplicates == 0
+
+        # The edited chunk replaced the stale entry instead of adding a second
+        third_run = ChunkDeduplicator("link", SQLiteDedupIndex(path))
+        rows = third_run.index._db.execute(
+            "SELECT COUNT(*) FROM exact WHERE chunk_id = 'a1'"
+        ).fetchone()
+        duplicate = third_run.apply([_chunk("b1", FOOTER_EDITED, "b.md")])
+        third_run.close()
+
+        assert rows == (1,)
+        assert duplicate[0].metadata["duplicate_kind"] == "exact"
+        assert duplicate[0].metadata["duplicate_of"] == "a1"
+
+    def test_distance_change_keeps_index(self, tmp_path: Path) -> None:
+        """Test the band layout does not depend on the distance threshold."""
+        path = tmp_path / "index.sqlite"
+        first_run = ChunkDeduplicator("skip", SQLiteDedupIndex(path, max_distance=3))
+        first_run.apply([_chunk("a1", FOOTER)])
+        first_run.close()
+
+        second_run = ChunkDeduplicator("link", SQLiteDedupIndex(path, max_distance=7))
+        kept = second_run.apply([_chunk("b1", FOOTER_EDITED, "b.md")])
+        second_run.close()
+
+        assert kept[0].metadata["duplicate_of"] == "a1"
+
+    def test_band_layout_mismatch(self, tmp_path: Path) -> None:
+        """Test an index built with another band layout is rejected."""
+        path = tmp_path / "index.sqlite"
+        index = SQLiteDedupIndex(path)
+        index._db.execute("UPDATE meta SET value = '7' WHERE key = 'bands'")
+        index.close()
+
+        with pytest.raises(ProcessingError) as exc_info:
+            SQLiteDedupIndex(path)
+        assert exc_info.value.error_code == 1316
+
+
+class TestProcessorDedup:
+    """Test the dedup stage in document processing."""
+
+    def test_batch_skips_repeated_footers(self, tmp_path: Path) -> None:
+        """Test sections repeated across files are kept once."""
+        bodies = {
+            "install": "Run the installer and pick a target directory.",
+            "usage": "Call the tool with a file name to split it.",
+            "config": "Settings live in a YAML file next to the project.",
+        }
+        paths = []
+        for name, body in bodies.items():
+            path = tmp_path / f"{name}.md"
+            path.write_text(f"# {name.title()}\n\n{body}\n\n## Help\n\n{FOOTER}\n")
+            paths.append(path)
+
+        settings = Settings(
+            chunk_size=200,
+            chunk_overlap=0,
+            chunk_method="section",
+            process_dedup="skip",
+        )
+        result = DocumentProcessor(settings).process_batch(paths, "docs")
+
+        # The "Help" header and the footer repeat in the second and third file
+        assert result.total_duplicate_chunks == 4
+        assert [r.duplicate_chunks for r in result.results] == [0, 2, 2]
+        assert result.total_chunks == 5
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_cli_links_to_written_chunks(self, tmp_path: Path, jobs: str) -> None:
+        """Test linked duplicates point at a chunk of another file by its ID."""
+        for name in ("install", "usage", "config"):
+            (tmp_path / f"{name}.md").write_text(
+                f"# {name.title()}\n\nAbout {name}.\n\n## Help\n\n{FOOTER}\n"
+            )
+
+        result = CliRunner().invoke(
+            shard_md,
+            [str(tmp_path), "-j", jobs, "--strategy", "section", "--size", "200"]
+            + ["--overlap", "0", "--dedup", "link", "--output", "jsonl"]
+            + ["--no-daemon"],
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        ids = {r["id"]: r["metadata"]["source_file"] for r in records}
+        assert len(ids) == len(records)
+        links = [r for r in records if "duplicate_of" in r["metadata"]]
+        assert links
+        for record in links:
+            canonical = record["metadata"]["duplicate_of"]
+            assert ids[canonical] != record["metadata"]["source_file"]
@@ -0,0 +1,89 @@
+"""Unit tests for the shared header index."""
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.headers import HeaderIndex
+from shard_markdown.core.chunking.section import SectionChunker
+from shard_markdown.core.chunking.semantic import SemanticChunker
+from shard_markdown.core.models import MarkdownAST, MarkdownElement
+from shard_markdown.core.parser import MarkdownParser
+
+
+MARKDOWN = """Preamble text.
+
+# Guide
+
+Intro paragraph.
+
+## Install
+
+Run the installer.
+
+## Usage
+
+Call the tool.
+"""
+
+
+class TestHeaderIndex:
+    """Test header offsets and section spans."""
+
+    def test_offsets_point_into_text_rendering(self) -> None:
+        """Test header offsets from elements match the text rendering."""
+        ast = MarkdownParser().parse(MARKDOWN)
+        index = HeaderIndex.from_ast(ast)
+        content = ast.content
+
+        assert index.titles == ["Guide", "Install", "Usage"]
+        assert list(index.levels) == [1, 2, 2]
+        for offset, title in zip(index.offsets, index.titles, strict=True):
+            assert content.startswith(title, offset)
+
+    def test_sections_cover_document(self) -> None:
+        """Test sections are contiguous and include the preamble."""
+        ast = MarkdownParser().parse(MARKDOWN)
+        sections = list(HeaderIndex.from_ast(ast).sections())
+
+        assert sections[0][:3] == (0, sections[1][0], 0)
+        assert [s[3] for s in sections] == ["", "Guide", "Install", "Usage"]
+        for previous, current in zip(sections, sections[1:], strict=False):
+            assert previous[1] == current[0]
+        assert sections[-1][1] == len(ast.content)
+
+    def test_index_is_cached_on_ast(self) -> None:
+        """Test chunkers working on one AST share a single index."""
+        ast = MarkdownParser().parse(MARKDOWN)
+
+        assert HeaderIndex.from_ast(ast) is HeaderIndex.from_ast(ast)
+
+    def test_falls_back_to_text_headers(self) -> None:
+        """Test documents without header elements are scanned as text."""
+        ast = MarkdownAST(
+            elements=[MarkdownElement(type="paragraph", text="# One\nbody\n## Two")]
+        )
+        index = HeaderIndex.from_ast(ast)
+
+        assert index.titles == ["One", "Two"]
+        assert list(index.offsets) == [0, 11]
+
+
+class TestSectionExtraction:
+    """Test chunkers split on parser headers."""
+
+    def test_section_chunker_uses_parsed_headers(self) -> None:
+        """Test each parsed header starts its own section chunk."""
+        ast = MarkdownParser().parse(MARKDOWN)
+        chunks = SectionChunker(Settings(chunk_overlap=0)).chunk_document(ast)
+
+        titles = [chunk.metadata["section_title"] for chunk in chunks]
+        assert titles == ["Introduction", "Guide", "Install", "Usage"]
+        assert chunks[2].content == "Install\n\nRun the installer."
+
+    def test_semantic_units_follow_sections(self) -> None:
+        """Test semantic units carry the titles of their sections."""
+        ast = MarkdownParser().parse(MARKDOWN)
+        chunker = SemanticChunker(Settings())
+
+        units = chunker._extract_semantic_units(ast.content, HeaderIndex.from_ast(ast))
+
+        assert [unit["title"] for unit in units] == ["", "Guide", "Install", "Usage"]
+        assert [unit["type"] for unit in units][:2] == ["content", "section"]
@@ -0,0 +1,139 @@
+"""Unit tests for optimal chunk packing."""
+
+import itertools
+import random
+from collections.abc import Iterator
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.packing import pack_units
+from shard_markdown.core.chunking.paragraph import ParagraphChunker
+from shard_markdown.core.chunking.structure import StructureAwareChunker
+from shard_markdown.core.models import MarkdownElement
+from shard_markdown.core.parser import MarkdownParser
+
+
+def _fewest_chunks(sizes: list[int], limit: int) -> int:
+    """Find the minimum chunk count by trying every set of cuts."""
+    n = len(sizes)
+    for count in range(1, n + 1):
+        for cuts in itertools.combinations(range(1, n), count - 1):
+            bounds = [0, *cuts, n]
+            if all(
+                sum(sizes[a:b]) <= limit or b - a == 1
+                for a, b in itertools.pairwise(bounds)
+            ):
+                return count
+    return n
+
+
+class TestPackUnits:
+    """Test the dynamic programming packer."""
+
+    def test_matches_exhaustive_search(self) -> None:
+        """Test the packer finds the minimum chunk count."""
+        rng = random.Random(7)  # noqa: S311
+        for _ in range(200):
+            sizes = [rng.randint(1, 12) for _ in range(rng.randint(1, 9))]
+            ranges = pack_units(sizes, 15)
+
+            assert len(ranges) == _fewest_chunks(sizes, 15)
+            assert ranges[0][0] == 0 and ranges[-1][1] == len(sizes)
+            for (_, end), (start, _) in itertools.pairwise(ranges):
+                assert end == start
+
+    def test_overflow_only_used_to_save_a_chunk(self) -> None:
+        """Test chunks exceed the budget only when that removes a chunk."""
+        assert pack_units([6, 5], 10, limit=12) == [(0, 2)]
+        assert pack_units([6, 3, 6], 10, limit=12) == [(0, 2), (2, 3)]
+
+    def test_cuts_prefer_low_penalty_boundaries(self) -> None:
+        """Test equal-count splits are chosen by cut penalty."""
+        sizes = [4, 4, 4, 4]
+
+        assert pack_units(sizes, 12, penalties=[0, 1, 0, 1]) == [(0, 2), (2, 4)]
+        assert pack_units(sizes, 12, penalties=[0, 1, 1, 0]) == [(0, 3), (3, 4)]
+
+    def test_separator_and_first_slack(self) -> None:
+        """Test separators count toward width and the first chunk has room."""
+        assert pack_units([5, 5], 11, separator=2) == [(0, 1), (1, 2)]
+        assert pack_units([5, 5, 5, 5], 10, separator=2, first_slack=2) == [
+            (0, 2),
+            (2, 3),
+            (3, 4),
+        ]
+
+    def test_oversized_unit_stands_alone(self) -> None:
+        """Test a unit larger than the limit becomes its own chunk."""
+        assert pack_units([3, 40, 3], 10) == [(0, 1), (1, 2), (2, 3)]
+
+
+class TestOptimalPacking:
+    """Test chunkers in optimal packing mode."""
+
+    @pytest.fixture
+    def markdown(self) -> str:
+        """Generate sections of short paragraphs."""
+        rng = random.Random(3)  # noqa: S311
+        sections = []
+        for i in range(30):
+            paragraphs = [
+                " ".join(f"word{rng.randint(0, 99)}" for _ in range(rng.randint(3, 30)))
+                for _ in range(rng.randint(1, 5))
+            ]
+            sections.append(f"## Section {i}\n\n" + "\n\n".join(paragraphs))
+        return "\n\n".join(sections)
+
+    @pytest.mark.parametrize("chunker_class", [StructureAwareChunker, ParagraphChunker])
+    @pytest.mark.parametrize("overlap", [0, 50])
+    def test_fewer_chunks_within_tolerance(
+        self, markdown: str, chunker_class: type, overlap: int
+    ) -> None:
+        """Test optimal packing never needs more chunks than greedy."""
+        ast = MarkdownParser().parse(markdown)
+        greedy = chunker_class(
+            Settings(chunk_size=400, chunk_overlap=overlap)
+        ).chunk_document(ast)
+        optimal = chunker_class(
+            Settings(chunk_size=400, chunk_overlap=overlap, chunk_packing="optimal")
+        ).chunk_document(ast)
+
+        assert len(optimal) < len(greedy)
+        assert all(len(chunk.content) <= 400 * 1.5 for chunk in optimal)
+
+    def test_structure_keeps_all_content(self, markdown: str) -> None:
+        """Test every element appears in a packed chunk with its context."""
+        ast = MarkdownParser().parse(markdown)
+        chunks = StructureAwareChunker(
+            Settings(chunk_size=400, chunk_overlap=0, chunk_packing="optimal")
+        ).chunk_document(ast)
+
+        packed = "".join("".join(chunk.content.split()) for chunk in chunks)
+        for element in ast.elements:
+            assert "".join(element.text.split()) in packed
+        assert chunks[-1].metadata["structural_context"].endswith("Section 29")
+
+    def test_streaming_without_headers_is_bounded(self) -> None:
+        """Test a header-less stream is packed before it is fully read."""
+        settings = Settings(chunk_size=100, chunk_overlap=0, chunk_packing="optimal")
+        chunker = StructureAwareChunker(settings)
+        cap = settings.chunk_size * chunker.PACKING_WINDOW * chunker.PACKING_WINDOW_CAP
+        consumed = 0
+
+        def elements() -> Iterator[MarkdownElement]:
+            nonlocal consumed
+            for i in range(5_000):
+                consumed += 1
+                yield MarkdownElement(type="paragraph", text=f"Log entry {i:05d}.")
+
+        chunks = chunker.iter_chunks(elements())
+        next(chunks)
+
+        assert consumed * len("Log entry 00000.") <= cap * 1.1
+        assert sum(1 for _ in chunks) > 1
+
+    def test_invalid_packing_mode(self) -> None:
+        """Test unknown packing modes are rejected."""
+        with pytest.raises(ValueError, match="Invalid packing mode"):
+            Settings(chunk_packing="first-fit")
@@ -215,6 +215,88 @@ class TestDocumentProcessor:
             assert result.success is False
             assert result.error and "too large" in result.error.lower()
 
+    @pytest.mark.unit
+    def test_stream_document_yields_chunks_incrementally(
+        self, chunking_config: Settings, temp_dir: Path
+    ) -> None:
+        """Test streaming mode chunks a file without building a full AST."""
+        doc = temp_dir / "stream.md"
+        sections = [
+            f"## Section {i}\n\n" + "Streaming paragraph text. " * 30 for i in range(20)
+        ]
+        doc.write_text("# Big Export\n\n" + "\n\n".join(sections))
+
+        processor = DocumentProcessor(chunking_config)
+        stream = processor.stream_document(doc)
+
+        first = next(stream)
+        assert first.id and first.metadata["streamed"] is True
+        assert first.metadata["chunk_index"] == 0
+
+        rest = list(stream)
+        assert rest
+        assert all(c.size <= chunking_config.chunk_size * 1.5 for c in rest)
+        assert len({c.id for c in [first, *rest]}) == len(rest) + 1
+
+    @pytest.mark.unit
+    def test_process_document_streams_large_file_when_enabled(
+        self, temp_dir: Path
+    ) -> None:
+        """Test files above the in-memory limit are streamed when enabled."""
+        settings = Settings(chunk_size=500, chunk_overlap=50, process_streaming=True)
+        processor = DocumentProcessor(settings)
+        doc = temp_dir / "huge.md"
+        doc.write_text("# Huge\n\n" + "Some content here. " * 200)
+
+        with patch("shard_markdown.core.processor.MAX_IN_MEMORY_FILE_SIZE", 100):
+            result = processor.process_document(doc, "test-collection")
+
+        assert result.success is True
+        assert result.chunks_created > 1
+
+    @pytest.mark.unit
+    def test_hierarchical_children_link_to_parent_ids(self, temp_dir: Path) -> None:
+        """Test child chunks carry the stored ID of their parent."""
+        settings = Settings(
+            chunk_size=200, chunk_overlap=0, chunk_method="hierarchical"
+        )
+        doc = temp_dir / "guide.md"
+        doc.write_text(
+            "# Guide\n\n"
+            + "\n\n".join(f"## Part {i}\n\n" + "Body text. " * 15 for i in range(3))
+        )
+
+        processor = DocumentProcessor(settings)
+        chunks = processor._enhance_chunks(
+            processor.chunker.chunk_document(processor.parser.parse(doc.read_text())),
+            {},
+            {},
+            doc,
+        )
+
+        ids = {chunk.id for chunk in chunks}
+        children = [c for c in chunks if c.metadata.get("chunk_level") == "child"]
+        assert children
+        for child in children:
+            parent_id = child.metadata["parent_id"]
+            assert parent_id in ids
+            assert parent_id.startswith(child.id.rsplit("_", 1)[0])
+
+    @pytest.mark.unit
+    def test_stream_hierarchical_falls_back_to_structure(self, temp_dir: Path) -> None:
+        """Test streaming never builds an unbounded hierarchical parent."""
+        settings = Settings(
+            chunk_size=200, chunk_overlap=0, chunk_method="hierarchical"
+        )
+        doc = temp_dir / "export.log.md"
+        doc.write_text("\n\n".join(f"Log line {i} " * 5 for i in range(200)))
+
+        chunks = list(DocumentProcessor(settings).stream_document(doc))
+
+        assert len(chunks) > 1
+        assert all(c.metadata.get("chunk_level") != "parent" for c in chunks)
+        assert all(c.size <= settings.chunk_size * 1.5 for c in chunks)
+
     @pytest.mark.unit
     def test_process_document_no_chunks_generated(
         self,
@@ -0,0 +1,112 @@
+"""Unit tests for TF-IDF semantic boundary detection."""
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking import tfidf
+from shard_markdown.core.chunking.engine import ChunkingEngine
+from shard_markdown.core.chunking.semantic import SemanticChunker
+from shard_markdown.core.chunking.tfidf import TermMatrix, similarity_threshold
+from shard_markdown.core.models import MarkdownAST, MarkdownElement
+
+
+UNITS = [
+    "Python packaging uses wheels and source distributions.",
+    "Wheels make Python packaging installs fast.",
+    "Sourdough bread needs a ripe starter and flour.",
+    "Bake the sourdough bread in a hot oven.",
+    "",
+]
+
+
+class TestTermMatrix:
+    """Test sparse term matrix construction and similarity."""
+
+    def test_tokenize_drops_stopwords_and_short_terms(self) -> None:
+        """Test tokenization lowercases and filters noise terms."""
+        assert tfidf.tokenize("The Cache is an LRU-cache, x") == [
+            "cache",
+            "lru",
+            "cache",
+        ]
+
+    def test_adjacent_similarity_tracks_topic(self) -> None:
+        """Test consecutive units on one topic are more similar."""
+        similarities = TermMatrix(UNITS).adjacent_similarity()
+
+        assert len(similarities) == len(UNITS) - 1
+        assert similarities[0] > similarities[1]
+        assert similarities[2] > similarities[1]
+        # A unit without terms is unrelated to its neighbour
+        assert similarities[3] == 0.0
+
+    def test_python_fallback_matches_numpy(self, monkeypatch) -> None:
+        """Test the pure-Python path gives the same curve as NumPy."""
+        pytest.importorskip("numpy")
+        expected = TermMatrix(UNITS).adjacent_similarity()
+
+        monkeypatch.setattr(tfidf, "NUMPY_AVAILABLE", False)
+        actual = TermMatrix(UNITS).adjacent_similarity()
+
+        assert actual == pytest.approx(expected)
+        assert similarity_threshold(actual, 1.0) == pytest.approx(
+            similarity_threshold(expected, 1.0)
+        )
+
+    def test_top_terms(self) -> None:
+        """Test top terms come from the requested rows only."""
+        matrix = TermMatrix(UNITS)
+
+        assert "sourdough" in matrix.top_terms(2, 4, 3)
+        assert "sourdough" not in matrix.top_terms(0, 2, 3)
+
+
+class TestSemanticTfidfMode:
+    """Test SemanticChunker with TF-IDF boundary detection."""
+
+    def test_chunks_split_on_topic_shift(self) -> None:
+        """Test chunks end where the vocabulary changes."""
+        paragraphs = [UNITS[0], UNITS[1]] * 3 + [UNITS[2], UNITS[3]] * 3
+        ast = MarkdownAST(
+            elements=[MarkdownElement(type="paragraph", text="\n\n".join(paragraphs))]
+        )
+        settings = Settings(
+            chunk_size=400, chunk_overlap=0, chunk_semantic_mode="tfidf"
+        )
+
+        chunks = SemanticChunker(settings).chunk_document(ast)
+
+        assert len(chunks) >= 2
+        assert "sourdough" not in chunks[0].content.lower()
+        assert "sourdough" in chunks[1].metadata["topics"]
+
+    @pytest.mark.parametrize("overlap", [0, 200])
+    def test_chunks_stay_within_size(self, overlap: int) -> None:
+        """Test large paragraphs never produce chunks over the size bound."""
+        paragraphs = [
+            " ".join(f"Paragraph {i} sentence {j} about caching." for j in range(20))
+            for i in range(10)
+        ]
+        paragraphs.insert(5, "word " * 700)  # longer than a chunk, no sentences
+        ast = MarkdownAST(
+            elements=[
+                MarkdownElement(type="paragraph", text=paragraph)
+                for paragraph in paragraphs
+            ]
+        )
+        settings = Settings(
+            chunk_size=1000,
+            chunk_overlap=overlap,
+            chunk_method="semantic",
+            chunk_semantic_mode="tfidf",
+        )
+
+        chunks = ChunkingEngine(settings).chunk_document(ast)
+
+        assert chunks
+        assert all(len(chunk.content) <= settings.chunk_size for chunk in chunks)
+
+    def test_invalid_mode_rejected(self) -> None:
+        """Test unknown semantic modes fail validation."""
+        with pytest.raises(ValueError, match="Invalid semantic mode"):
+            Settings(chunk_semantic_mode="embeddings")
@@ -0,0 +1,196 @@
+"""Unit tests for per-stage timing."""
+
+import json
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter_ns
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.models import StageTimingSummary
+from shard_markdown.core.processor import DocumentProcessor
+from shard_markdown.core.timing import (
+    STAGES,
+    PeakMemory,
+    SlowFileReport,
+    StageTimer,
+    TimingAggregator,
+    start_memory_tracking,
+)
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+class TestStageTimer:
+    """Test recording stage durations."""
+
+    def test_record_chains_and_sums(self) -> None:
+        """Test each record starts the next stage and repeats add up."""
+        timer = StageTimer()
+        start = perf_counter_ns()
+        start = timer.record("read", start)
+        end = timer.record("chunk", start)
+        timer.record("read", end)
+
+        assert set(timer.timings) == {"read", "chunk"}
+        assert all(duration >= 0 for duration in timer.timings.values())
+
+    def test_stage_block_and_shared_timings(self) -> None:
+        """Test blocks are timed into timings passed in."""
+        timings = {"read": 5}
+        with StageTimer(timings).stage("read"):
+            pass
+
+        assert timings["read"] >= 5
+
+
+class TestAggregation:
+    """Test totals and percentiles across files."""
+
+    def test_summary_from_samples(self) -> None:
+        """Test nearest-rank percentiles and totals."""
+        summary = StageTimingSummary.from_samples("chunk", list(range(1, 101)))
+
+        assert summary.files == 100
+        assert summary.total_ns == 5050
+        assert summary.p50_ns == 51
+        assert summary.p95_ns == 95
+        assert summary.max_ns == 100
+        assert summary.mean_ns == 50.5
+        assert StageTimingSummary.from_samples("chunk", []).files == 0
+
+    def test_aggregator_orders_stages(self) -> None:
+        """Test stages are reported in pipeline order, unknown ones last."""
+        aggregator = TimingAggregator()
+        aggregator.add({"insert": 3, "read": 1, "custom": 7})
+        aggregator.add({"read": 2})
+
+        summary = aggregator.summary()
+
+        assert list(summary) == ["read", "insert", "custom"]
+        assert summary["read"].files == 2
+        assert summary["read"].total_ns == 3
+        assert aggregator.files == 2
+
+
+class TestPipelineTimings:
+    """Test stages recorded by the processor and CLI."""
+
+    def test_process_document_and_batch(self, tmp_path: Path) -> None:
+        """Test results carry stage timings that the batch summarizes."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"doc{i}.md"
+            path.write_text(DOCUMENT)
+            paths.append(path)
+
+        batch = DocumentProcessor(Settings()).process_batch(paths, "docs")
+
+        expected = {"read", "frontmatter", "render", "elements", "chunk", "metadata"}
+        for result in batch.results:
+            assert expected <= set(result.stage_timings)
+        assert set(batch.stage_timings) == expected
+        assert list(batch.stage_timings) == [s for s in STAGES if s in expected]
+        assert batch.stage_timings["chunk"].files == 3
+
+    def test_cli_timings(self, tmp_path: Path) -> None:
+        """Test --timings prints the breakdown, away from JSON lines."""
+        (tmp_path / "guide.md").write_text(DOCUMENT)
+
+        result = CliRunner().invoke(
+            shard_md,
+            [str(tmp_path), "--timings", "--output", "jsonl", "--no-daemon"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert all(json.loads(line) for line in result.stdout.splitlines())
+        assert "Stage Timings (1 files)" in result.stderr
+        assert "render" in result.stderr
+
+
+@pytest.fixture
+def _memory_tracking() -> Iterator[None]:
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+@pytest.mark.usefixtures("_memory_tracking")
+class TestMemoryTracking:
+    """Test per-file peak memory and the slow-file report."""
+
+    def test_peak_memory(self) -> None:
+        """Test peaks are measured only while tracing, from the block start."""
+        with PeakMemory() as memory:
+            pass
+        assert memory.peak is None
+
+        start_memory_tracking()
+        ballast = bytearray(4 * 2**20)
+        with PeakMemory() as memory:
+            block = bytearray(2**20)
+            del block
+
+        assert 2**20 <= memory.peak < 2 * 2**20
+        del ballast
+
+    def test_report_keeps_top_files(self) -> None:
+        """Test only the slowest and hungriest files are kept, in order."""
+        report = SlowFileReport(limit=2)
+        report.add("a.md", {"read": 1, "render": 5}, 1, peak_memory=300)
+        report.add("b.md", {"read": 9}, 2, peak_memory=100, elements=4)
+        report.add("c.md", {"chunk": 7}, 3)
+        report.add("d.md", {}, 0, peak_memory=200)
+
+        assert [c.path for c in report.slowest()] == ["b.md", "c.md"]
+        assert [c.path for c in report.hungriest()] == ["a.md", "d.md"]
+        slowest = report.slowest()[0]
+        assert (slowest.slowest_stage, slowest.slowest_ns) == ("read", 9)
+        assert slowest.elements == 4
+
+    def test_processing_result(self, tmp_path: Path) -> None:
+        """Test results carry peak memory and element counts when tracking."""
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+
+        result = DocumentProcessor(Settings()).process_document(path)
+        assert result.peak_memory is None
+        assert result.element_count is None
+
+        tracked = DocumentProcessor(Settings(process_track_memory=True))
+        assert not tracemalloc.is_tracing()
+        result = tracked.process_document(path)
+        assert result.peak_memory
+        assert result.element_count == 4
+        assert not tracemalloc.is_tracing()
+
+        batch = tracked.process_batch([path, path], "docs")
+        assert all(r.peak_memory for r in batch.results)
+        assert not tracemalloc.is_tracing()
+
+        start_memory_tracking()
+        tracked.process_document(path)
+        assert tracemalloc.is_tracing()
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_cli_file_report(self, tmp_path: Path, jobs: str) -> None:
+        """Test --file-report lists files with memory, elements and time."""
+        for i in range(3):
+            (tmp_path / f"doc{i}.md").write_text(DOCUMENT * (i + 1))
+
+        result = CliRunner().invoke(
+            shard_md,
+            [str(tmp_path), "-j", jobs, "--file-report=2", "-q", "--no-daemon"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Slowest Files" in result.stdout
+        assert "Most Memory-Hungry Files" in result.stdout
+        assert "12" in result.stdout  # elements of the largest file
+        assert "doc0.md" not in result.stdout.split("Most Memory")[0]
+        assert not tracemalloc.is_tracing()
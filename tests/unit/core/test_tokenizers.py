@@ -0,0 +1,133 @@
+"""Unit tests for tokenizers and the token chunker."""
+
+from pathlib import Path
+
+import pytest
+
+from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking import tokenizers
+from shard_markdown.core.chunking.token import TokenChunker
+from shard_markdown.core.chunking.tokenizers import (
+    RegexTokenizer,
+    Tokenizer,
+    WordPieceTokenizer,
+    get_tokenizer,
+)
+from shard_markdown.core.parser import MarkdownParser
+from shard_markdown.utils.errors import ProcessingError
+
+
+VOCAB = ["[UNK]", "the", "un", "##aff", "##able", "cafe", ".", "token"]
+
+
+@pytest.fixture
+def vocab_file(tmp_path: Path) -> Path:
+    """Write a small WordPiece vocabulary."""
+    path = tmp_path / "vocab.txt"
+    path.write_text("\n".join(VOCAB) + "\n", encoding="utf-8")
+    return path
+
+
+class CountingTokenizer(RegexTokenizer):
+    """Regex tokenizer that records how much text it was asked to count."""
+
+    def __init__(self) -> None:
+        """Initialize call counter."""
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        """Count tokens and record the call."""
+        self.calls += 1
+        return super().count(text)
+
+
+class TestTokenizers:
+    """Test tokenizer implementations."""
+
+    def test_regex_counts_words_and_punctuation(self) -> None:
+        """Test each word and punctuation mark is one token."""
+        assert RegexTokenizer().count("Hello, world! It's 2024.") == 9
+
+    def test_wordpiece_matches_longest_pieces(self, vocab_file: Path) -> None:
+        """Test words split into vocabulary pieces, unknown words count once."""
+        tokenizer = WordPieceTokenizer(vocab_file)
+
+        assert tokenizer.count("unaffable") == 3
+        assert tokenizer.count("The Café.") == 3
+        assert tokenizer.count("xyzzy token") == 2
+
+    def test_wordpiece_requires_vocabulary(self, tmp_path: Path) -> None:
+        """Test missing vocabularies raise processing errors."""
+        with pytest.raises(ProcessingError) as exc_info:
+            get_tokenizer("wordpiece")
+        assert exc_info.value.error_code == 1315
+
+        with pytest.raises(ProcessingError):
+            WordPieceTokenizer(tmp_path / "missing.txt")
+
+    def test_tiktoken_requires_package(self, monkeypatch) -> None:
+        """Test the tiktoken tokenizer reports the missing dependency."""
+        monkeypatch.setattr(tokenizers, "TIKTOKEN_AVAILABLE", False)
+
+        with pytest.raises(ProcessingError, match="tiktoken"):
+            tokenizers.TiktokenTokenizer()
+
+    def test_settings_validate_tokenizer(self) -> None:
+        """Test tokenizer names are normalized and checked."""
+        assert Settings(chunk_tokenizer="TikToken:o200k_base").chunk_tokenizer == (
+            "tiktoken:o200k_base"
+        )
+        with pytest.raises(ValueError, match="Invalid tokenizer"):
+            Settings(chunk_tokenizer="sentencepiece")
+
+
+class TestTokenChunker:
+    """Test token budgets are enforced."""
+
+    MARKDOWN = "\n\n".join(
+        f"## Part {i}\n\n" + "Tokens, counted exactly; never estimated. " * (i + 1)
+        for i in range(12)
+    )
+
+    @pytest.mark.parametrize("overlap", [0, 120])
+    def test_chunks_fit_token_and_size_limits(self, overlap: int) -> None:
+        """Test every chunk fits the token budget and the character limit."""
+        settings = Settings(chunk_size=400, chunk_overlap=overlap, chunk_max_tokens=40)
+        ast = MarkdownParser().parse(self.MARKDOWN)
+        chunks = TokenChunker(settings).chunk_document(ast)
+        tokenizer = RegexTokenizer()
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert tokenizer.count(chunk.content) == chunk.metadata["token_count"]
+            assert chunk.metadata["token_count"] <= 40
+            assert len(chunk.content) <= 400
+
+    def test_elements_are_counted_once(self) -> None:
+        """Test growing a chunk never re-tokenizes its content."""
+        ast = MarkdownParser().parse(self.MARKDOWN)
+        chunker = TokenChunker(Settings(chunk_overlap=0, chunk_max_tokens=100))
+        counting = CountingTokenizer()
+        chunker.tokenizer = counting
+
+        chunker.chunk_document(ast)
+
+        # One count per element, per distinct word of split elements and
+        # per distinct gap between units
+        assert counting.calls <= len(ast.elements) + 12
+
+    def test_wordpiece_budget(self, vocab_file: Path) -> None:
+        """Test the configured vocabulary drives the budget."""
+        settings = Settings(
+            chunk_overlap=0,
+            chunk_max_tokens=5,
+            chunk_tokenizer="wordpiece",
+            chunk_tokenizer_vocab=vocab_file,
+        )
+        ast = MarkdownParser().parse("unaffable token the token unaffable")
+        chunker = TokenChunker(settings)
+        chunks = chunker.chunk_document(ast)
+
+        assert isinstance(chunker.tokenizer, Tokenizer)
+        assert [c.metadata["token_count"] for c in chunks] == [5, 4]
+        assert chunks[0].metadata["tokenizer"] == "wordpiece"
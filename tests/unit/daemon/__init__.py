@@ -0,0 +1 @@
+"""Daemon module unit tests."""
@@ -0,0 +1,235 @@
+"""Unit tests for the shard-md daemon and its client."""
+
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.config.settings import Settings
+from shard_markdown.daemon import DaemonClient, DaemonServer
+from shard_markdown.daemon.protocol import default_socket_path
+from shard_markdown.utils.errors import InputValidationError, NetworkError
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+@pytest.fixture
+def daemon(tmp_path: Path) -> Iterator[DaemonServer]:
+    """Run a daemon on a temporary socket."""
+    server = DaemonServer(
+        Settings(chunk_size=200, chunk_overlap=0), tmp_path / "d.sock", workers=2
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while DaemonClient.connect_if_running(server.socket_path) is None:
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+class TestDaemonServer:
+    """Test requests served over the socket."""
+
+    def test_chunk_request(self, daemon: DaemonServer, tmp_path: Path) -> None:
+        """Test a document is chunked and the latency reported."""
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+
+        with DaemonClient(daemon.socket_path) as client:
+            response = client.request("chunk", path=str(path), source="guide.md")
+
+        assert response["ok"], response
+        assert response["latency_ms"] > 0
+        result = response["result"]
+        assert result["count"] == len(result["chunks"]) > 0
+        assert result["chunks"][0]["metadata"]["source_file"] == "guide.md"
+
+    def test_pipelined_requests_keep_order(
+        self, daemon: DaemonServer, tmp_path: Path
+    ) -> None:
+        """Test concurrent responses are matched to their requests."""
+        paths = []
+        for i in range(10):
+            path = tmp_path / f"doc{i}.md"
+            path.write_text(f"# Doc {i}\n\n" + "Sentence here. " * (i * 20 + 1))
+            paths.append(path)
+
+        with DaemonClient(daemon.socket_path) as client:
+            responses = client.request_many(
+                [
+                    {"op": "chunk", "path": str(p), "include_chunks": False}
+                    for p in paths
+                ],
+                window=4,
+            )
+            stats = client.request("stats")["result"]
+
+        assert [r["result"]["file"] for r in responses] == [p.name for p in paths]
+        assert "chunks" not in responses[0]["result"]
+        assert stats["chunk"]["requests"] == 10
+
+    def test_errors_are_responses(self, daemon: DaemonServer, tmp_path: Path) -> None:
+        """Test failing requests answer with an error and keep the daemon up."""
+        with DaemonClient(daemon.socket_path) as client:
+            unknown = client.request("explode")
+            missing = client.request("chunk", path=str(tmp_path / "missing.md"))
+            strategy = client.request(
+                "chunk", content=DOCUMENT, path="x.md", options={"chunk_method": "?"}
+            )
+            ping = client.request("ping")
+
+        assert not unknown["ok"] and unknown["error_code"] == 1030
+        assert not missing["ok"] and "missing.md" in missing["error"]
+        assert not strategy["ok"] and "Unknown chunking strategy" in strategy["error"]
+        assert ping["ok"] and "structure" in ping["result"]["strategies"]
+
+    def test_refuses_second_daemon(self, daemon: DaemonServer) -> None:
+        """Test a live daemon's socket is not taken over."""
+        with pytest.raises(InputValidationError, match="already listening"):
+            DaemonServer(Settings(), daemon.socket_path).serve_forever()
+
+    def test_no_daemon_running(self, tmp_path: Path) -> None:
+        """Test clients only connect to a listening daemon."""
+        stale = tmp_path / "stale.sock"
+        stale.touch()
+
+        assert DaemonClient.connect_if_running(tmp_path / "none.sock") is None
+        assert DaemonClient.connect_if_running(stale) is None
+
+    def test_default_socket_dir_is_private(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the fallback socket lives in a directory only its user can use."""
+        monkeypatch.delenv("SHARD_MD_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        socket_path = default_socket_path()
+        server = DaemonServer(Settings(), socket_path)
+
+        server._claim_socket()
+
+        assert socket_path.parent.parent == tmp_path
+        assert socket_path.parent.stat().st_mode & 0o777 == 0o700
+        server.executor.shutdown()
+
+        # Someone else created the directory of another user's socket
+        other_user = os.getuid() + 1
+        monkeypatch.setattr(os, "getuid", lambda: other_user)
+        default_socket_path().parent.mkdir()
+        server = DaemonServer(Settings(), default_socket_path())
+        with pytest.raises(NetworkError) as exc_info:
+            server._claim_socket()
+        assert exc_info.value.error_code == 1613
+        server.executor.shutdown()
+
+
+class TestDaemonForwarding:
+    """Test the CLI forwarding runs to a daemon."""
+
+    def test_cli_forwards_to_running_daemon(
+        self, daemon: DaemonServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test runs go to the daemon unless --no-daemon is given."""
+        monkeypatch.setenv("SHARD_MD_SOCKET", str(daemon.socket_path))
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+        runner = CliRunner()
+
+        forwarded = runner.invoke(shard_md, [str(path), "--strategy", "structure"])
+        local = runner.invoke(
+            shard_md, [str(path), "--strategy", "structure", "--no-daemon"]
+        )
+
+        assert forwarded.exit_code == 0, forwarded.output
+        assert "Total chunks" in forwarded.output
+        assert forwarded.output == local.output
+        with DaemonClient(daemon.socket_path) as client:
+            assert client.request("stats")["result"]["chunk"]["requests"] == 1
+
+    def test_cli_forwards_stdin(
+        self, daemon: DaemonServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a piped document is sent along with its request."""
+        monkeypatch.setenv("SHARD_MD_SOCKET", str(daemon.socket_path))
+        runner = CliRunner()
+
+        forwarded = runner.invoke(shard_md, ["-"], input=DOCUMENT)
+        local = runner.invoke(shard_md, ["-", "--no-daemon"], input=DOCUMENT)
+
+        assert forwarded.exit_code == 0, forwarded.output
+        assert forwarded.output == local.output
+        with DaemonClient(daemon.socket_path) as client:
+            assert client.request("stats")["result"]["chunk"]["requests"] == 1
+
+    @pytest.mark.parametrize(
+        ("config", "forwards"),
+        [("chunk_size: 300\n", True), ("chunk_packing: optimal\n", False)],
+    )
+    def test_client_config_is_honoured(
+        self,
+        daemon: DaemonServer,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        config: str,
+        forwards: bool,
+    ) -> None:
+        """Test runs chunk as configured locally, forwarded or not."""
+        monkeypatch.setenv("SHARD_MD_SOCKET", str(daemon.socket_path))
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "shard-md.yaml").write_text(config)
+        (tmp_path / "guide.md").write_text(DOCUMENT * 20)
+        runner = CliRunner()
+
+        result = runner.invoke(shard_md, ["guide.md", "--strategy", "structure"])
+        local = runner.invoke(
+            shard_md, ["guide.md", "--strategy", "structure", "--no-daemon"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert result.output == local.output
+        with DaemonClient(daemon.socket_path) as client:
+            stats = client.request("stats")["result"]
+        assert ("chunk" in stats) is forwards
+
+    def test_unknown_strategy_is_rejected(
+        self, daemon: DaemonServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test strategies are checked against the daemon's chunkers."""
+        monkeypatch.setenv("SHARD_MD_SOCKET", str(daemon.socket_path))
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+
+        result = CliRunner().invoke(shard_md, [str(path), "--strategy", "nope"])
+
+        assert result.exit_code == 1
+        assert "Unknown chunking strategy: nope" in result.output
+
+    def test_socket_of_another_user_is_not_used(
+        self, daemon: DaemonServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test runs stay local when someone else owns the socket."""
+        monkeypatch.setenv("SHARD_MD_SOCKET", str(daemon.socket_path))
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+        other_user = os.getuid() + 1
+        monkeypatch.setattr(os, "getuid", lambda: other_user)
+
+        result = CliRunner().invoke(shard_md, [str(path), "--strategy", "structure"])
+
+        assert result.exit_code == 0, result.output
+        assert "belongs to another user; processing locally" in result.stderr
+        assert "Total chunks" in result.stdout
+        monkeypatch.undo()
+        with DaemonClient(daemon.socket_path) as client:
+            assert "chunk" not in client.request("stats")["result"]
@@ -1,10 +1,17 @@
 """Unit tests for chunking engines - using real chunkers with actual markdown."""
 
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
 import pytest
 
 from shard_markdown.config.settings import Settings
+from shard_markdown.core.chunking.auto import profile_document
 from shard_markdown.core.chunking.engine import ChunkingEngine
 from shard_markdown.core.chunking.fixed import FixedSizeChunker
+from shard_markdown.core.chunking.registry import ENTRY_POINT_GROUP
 from shard_markdown.core.chunking.structure import StructureAwareChunker
 from shard_markdown.core.models import MarkdownAST
 from shard_markdown.core.parser import MarkdownParser
@@ -120,6 +127,111 @@ veritatis et quasi architecto beatae vitae dicta sunt explicabo."""
         with pytest.raises(ProcessingError, match="Unknown chunking strategy"):
             engine.chunk_document(ast)
 
+    def test_evaluate_strategies_shares_one_ast(self) -> None:
+        """Test several strategies are evaluated over a single parse."""
+        content = "# Guide\n\n" + "\n\n".join(
+            f"## Part {i}\n\n" + "Sentence about the topic. " * 12 for i in range(8)
+        )
+        ast = MarkdownParser().parse(content)
+        engine = ChunkingEngine(Settings(chunk_size=400, chunk_overlap=40))
+
+        evaluations = engine.evaluate_strategies(ast, ["structure", "fixed", "token"])
+
+        assert list(evaluations) == ["structure", "fixed", "token"]
+        for name, evaluation in evaluations.items():
+            assert evaluation.strategy == name
+            assert evaluation.documents == 1
+            assert evaluation.failures == 0
+            assert evaluation.chunk_count > 1
+            assert evaluation.size_percentile(100) == max(evaluation.chunk_sizes)
+            assert evaluation.processing_time >= 0
+
+    def test_evaluate_strategies_rejects_unknown_strategy(self) -> None:
+        """Test unknown strategy names are reported as errors."""
+        ast = MarkdownParser().parse("# Test\n\nSome content")
+        engine = ChunkingEngine(Settings())
+
+        with pytest.raises(ProcessingError, match="Unknown chunking strategy"):
+            engine.evaluate_strategies(ast, ["structure", "bogus"])
+
+
+class TestStrategyRegistry:
+    """Test lazy strategy lookup and plugin discovery."""
+
+    def test_strategies_are_created_on_first_use(self) -> None:
+        """Test only the strategy actually used is instantiated."""
+        engine = ChunkingEngine(Settings(chunk_method="structure"))
+        assert not engine.strategies.is_loaded("structure")
+
+        engine.chunk_document(MarkdownParser().parse("# Title\n\nSome content"))
+
+        assert engine.strategies.is_loaded("structure")
+        assert not engine.strategies.is_loaded("semantic")
+        assert engine.strategies["structure"] is engine.strategies["structure"]
+
+    def test_engine_import_does_not_load_chunkers(self) -> None:
+        """Test importing the engine leaves chunker modules unimported."""
+        code = (
+            "import sys\n"
+            "from shard_markdown.core.chunking.engine import ChunkingEngine\n"
+            "loaded = [m for m in ('fixed', 'semantic', 'token', 'structure')\n"
+            "          if f'shard_markdown.core.chunking.{m}' in sys.modules]\n"
+            "print(','.join(loaded))"
+        )
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        assert result.stdout.strip() == ""
+
+    def test_configured_plugin_is_loaded(self) -> None:
+        """Test Settings.plugins entries are registered as strategies."""
+        settings = Settings(
+            chunk_method="mine",
+            plugins=["mine = shard_markdown.core.chunking.fixed:FixedSizeChunker"],
+        )
+        engine = ChunkingEngine(settings)
+
+        assert "mine" in engine.strategies
+        assert "mine" in list(engine.strategies)
+        chunks = engine.chunk_document(MarkdownParser().parse("# T\n\nText here"))
+        assert chunks
+        assert isinstance(engine.strategies["mine"], FixedSizeChunker)
+
+    def test_entry_point_plugin_is_discovered(self, mocker) -> None:
+        """Test chunkers advertised through entry points are discovered."""
+        mocker.patch(
+            "shard_markdown.core.chunking.registry.entry_points",
+            return_value=[
+                EntryPoint(
+                    name="fast",
+                    value="shard_markdown.core.chunking.fixed:FixedSizeChunker",
+                    group=ENTRY_POINT_GROUP,
+                ),
+                EntryPoint(
+                    name="structure",
+                    value="shard_markdown.core.chunking.fixed:FixedSizeChunker",
+                    group=ENTRY_POINT_GROUP,
+                ),
+            ],
+        )
+        engine = ChunkingEngine(Settings())
+
+        assert isinstance(engine.strategies["fast"], FixedSizeChunker)
+        # Built-in names cannot be shadowed by plugins
+        assert isinstance(engine.strategies["structure"], StructureAwareChunker)
+
+    def test_invalid_plugin_raises_processing_error(self) -> None:
+        """Test plugins that do not produce a chunker are rejected."""
+        engine = ChunkingEngine(Settings(plugins=["bad = builtins:dict"]))
+
+        with pytest.raises(ProcessingError) as exc_info:
+            engine.strategies["bad"]
+        assert exc_info.value.error_code == 1314
+
 
 class TestStructureAwareChunker:
     """Test StructureAwareChunker with real markdown structures."""
@@ -287,3 +399,141 @@ class TestFixedSizeChunker:
 
         assert len(chunks) >= 5  # Should create many chunks
         assert all(chunk.content.strip() for chunk in chunks)
+
+
+class TestHierarchicalChunker:
+    """Test parent/child chunk emission."""
+
+    MARKDOWN = """# Guide
+
+Welcome to the guide.
+
+## Install
+
+{install}
+
+### From source
+
+Clone the repository and build it.
+
+## Usage
+
+Call the tool with a file.
+"""
+
+    @pytest.fixture
+    def chunks(self) -> list:
+        """Chunk a guide whose install section needs several children."""
+        install = "\n\n".join(
+            f"Step {i}: " + "configure the system. " * 8 for i in range(6)
+        )
+        ast = MarkdownParser().parse(self.MARKDOWN.format(install=install))
+        settings = Settings(
+            chunk_size=300, chunk_overlap=0, chunk_method="hierarchical"
+        )
+        return ChunkingEngine(settings).chunk_document(ast)
+
+    def test_parents_precede_their_children(self, chunks: list) -> None:
+        """Test each parent is followed by the children that point at it."""
+        parents = [
+            i for i, c in enumerate(chunks) if c.metadata["chunk_level"] == "parent"
+        ]
+
+        assert [chunks[i].metadata["section_title"] for i in parents] == [
+            "Guide",
+            "Install",
+            "Usage",
+        ]
+        for chunk in chunks:
+            if chunk.metadata["chunk_level"] == "child":
+                parent_index = chunk.metadata["parent_chunk_index"]
+                assert parent_index in parents
+                assert chunk.start_position >= chunks[parent_index].start_position
+                assert chunk.metadata["parent_id"] == chunks[parent_index].id
+
+    def test_child_counts_match(self, chunks: list) -> None:
+        """Test parents record how many children follow them."""
+        for i, chunk in enumerate(chunks):
+            if chunk.metadata["chunk_level"] == "parent":
+                children = [
+                    c for c in chunks if c.metadata.get("parent_chunk_index") == i
+                ]
+                assert len(children) == chunk.metadata["child_count"] > 0
+
+    def test_large_parent_passes_validation(self, chunks: list) -> None:
+        """Test parents may exceed the chunk size while children may not."""
+        install = next(
+            c for c in chunks if c.metadata.get("section_title") == "Install"
+        )
+
+        assert len(install.content) > 300 * 1.5
+        assert "From source" in install.content
+        assert all(
+            len(c.content) <= 300 * 1.5
+            for c in chunks
+            if c.metadata["chunk_level"] == "child"
+        )
+
+    def test_context_carries_across_sections(self, chunks: list) -> None:
+        """Test child context keeps headers from enclosing sections."""
+        usage = next(c for c in chunks if c.metadata.get("section_title") == "Usage")
+        usage_children = [
+            c
+            for c in chunks
+            if c.metadata.get("parent_chunk_index") == chunks.index(usage)
+        ]
+
+        assert usage.metadata["structural_context"] == "Guide > Usage"
+        assert any(
+            "Guide" in c.metadata.get("structural_context", "") for c in usage_children
+        )
+
+
+class TestAutoChunker:
+    """Test per-document strategy selection."""
+
+    PROSE = "\n\n".join(
+        f"Paragraph {i} explains the design. " + "The system balances load. " * 12
+        for i in range(6)
+    )
+    REFERENCE = "\n\n".join(
+        f"## method_{i}\n\n```python\n" + "result = client.call(value)\n" * 10 + "```"
+        for i in range(6)
+    )
+    NOTES = "\n".join(f"- note {i}: remember to check item {i}" for i in range(60))
+
+    @pytest.mark.parametrize(
+        ("markdown", "strategy", "reason"),
+        [
+            ("# Title\n\n" + PROSE, "paragraph", "prose"),
+            ("# API\n\n" + REFERENCE, "structure", "code-heavy"),
+            (NOTES, "fixed", "flat notes"),
+            ("# Short\n\nOne line.", "fixed", "fits in one chunk"),
+        ],
+    )
+    def test_picks_strategy_from_profile(
+        self, markdown: str, strategy: str, reason: str
+    ) -> None:
+        """Test each kind of document gets its strategy, recorded on chunks."""
+        settings = Settings(chunk_size=500, chunk_overlap=0, chunk_method="auto")
+        chunks = ChunkingEngine(settings).chunk_document(
+            MarkdownParser().parse(markdown)
+        )
+
+        assert chunks
+        assert {c.metadata["chunk_method"] for c in chunks} == {strategy}
+        assert {c.metadata["auto_reason"] for c in chunks} == {reason}
+        assert all(c.metadata["auto_profile_ms"] >= 0 for c in chunks)
+        assert all(c.metadata["auto_chunk_ms"] >= 0 for c in chunks)
+
+    def test_profile(self) -> None:
+        """Test profile shares and paragraph statistics."""
+        ast = MarkdownParser().parse(
+            "# T\n\nFirst paragraph.\n\nSecond one.\n\n```\ncode\n```\n\n- item"
+        )
+        profile = profile_document(ast)
+
+        assert profile.header_count == 1
+        assert profile.paragraph_count == 2
+        assert profile.code_share > 0 and profile.list_share > 0
+        assert profile_document(ast) is profile
@@ -154,6 +154,53 @@ class TestMarkdownAST:
         assert ast.metadata == metadata
         assert ast.metadata["word_count"] == 150
 
+    def test_content_is_cached(self) -> None:
+        """Test repeated content access returns the same joined buffer."""
+        ast = MarkdownAST(
+            elements=[
+                MarkdownElement(type="header", text="Title", level=1),
+                MarkdownElement(type="paragraph", text="Body"),
+            ]
+        )
+
+        assert ast.content == "Title\n\nBody"
+        assert ast.content is ast.content
+
+    def test_render_modes_are_cached_separately(self) -> None:
+        """Test each rendering mode has its own cached buffer."""
+        ast = MarkdownAST(
+            elements=[
+                MarkdownElement(type="header", text="Title", level=2),
+                MarkdownElement(type="code_block", text="x = 1", language="py"),
+            ]
+        )
+
+        assert ast.render("text") == "Title\n\nx = 1"
+        assert ast.render("markdown") == "## Title\n\n```py\nx = 1\n```"
+        assert ast.render("markdown") is ast.render("markdown")
+
+    def test_cache_invalidated_when_elements_change(self) -> None:
+        """Test reassigning or growing elements invalidates cached content."""
+        ast = MarkdownAST(elements=[MarkdownElement(type="paragraph", text="A")])
+        assert ast.content == "A"
+
+        ast.elements.append(MarkdownElement(type="paragraph", text="B"))
+        assert ast.content == "A\n\nB"
+
+        ast.elements = [MarkdownElement(type="paragraph", text="C")]
+        assert ast.content == "C"
+
+        ast.elements[0].text = "D"
+        ast.invalidate_cache()
+        assert ast.content == "D"
+
+    def test_render_unknown_mode(self) -> None:
+        """Test unknown rendering modes are rejected."""
+        ast = MarkdownAST(elements=[])
+
+        with pytest.raises(ValueError, match="Unknown rendering mode"):
+            ast.render("html")
+
 
 class TestDocumentChunk:
     """Test DocumentChunk model - pure data validation."""
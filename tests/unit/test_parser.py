@@ -412,3 +412,50 @@ Processes the input data.
         # Should have frontmatter
         assert ast.frontmatter.get("title") == "Complete Documentation"
         assert ast.frontmatter.get("version") == "1.0.0"
+
+    def test_parse_stream_matches_parse(self) -> None:
+        """Test streaming parse yields the same elements as a full parse."""
+        content = """---
+title: Streamed
+---
+
+# Title
+
+Intro paragraph.
+
+- item one
+- item two
+
+```python
+print("hi")
+```
+
+| a | b |"""
+
+        parser = MarkdownParser()
+        ast = parser.parse(content)
+        frontmatter, elements = parser.parse_stream(
+            line + "\n" for line in content.split("\n")
+        )
+
+        assert frontmatter == {"title": "Streamed"}
+        streamed = list(elements)
+        assert [(e.type, e.text) for e in streamed] == [
+            (e.type, e.text) for e in ast.elements
+        ]
+
+    def test_parse_stream_bounds_element_size(self) -> None:
+        """Test oversized paragraphs and code blocks are flushed in pieces."""
+        lines = ["word " * 20] * 50 + ["```text"] + ["code line"] * 200 + ["```"]
+
+        parser = MarkdownParser()
+        _, elements = parser.parse_stream(lines, max_element_chars=500)
+        elements_list = list(elements)
+
+        paragraphs = [e for e in elements_list if e.type == "paragraph"]
+        code_blocks = [e for e in elements_list if e.type == "code_block"]
+        assert len(paragraphs) > 1
+        assert len(code_blocks) > 1
+        assert all(len(e.text) <= 700 for e in elements_list)
+        assert all(e.language == "text" for e in code_blocks)
+        assert code_blocks[0].metadata.get("partial") is True
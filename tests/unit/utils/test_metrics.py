@@ -0,0 +1,194 @@
+"""Unit tests for the Prometheus metrics registry and exporters."""
+
+import http.client
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.config.settings import Settings
+from shard_markdown.daemon import DaemonServer
+from shard_markdown.utils import metrics
+from shard_markdown.utils.errors import FileSystemError
+from shard_markdown.utils.metrics import MetricsRegistry, TextfileExporter
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+class TestRegistry:
+    """Test metric types and the exposition format."""
+
+    def test_counter_and_gauge(self) -> None:
+        """Test counters end in _total and samples are labelled."""
+        registry = MetricsRegistry()
+        files = registry.counter("files", "Files seen", ("status",))
+        started = registry.gauge("started_seconds", "Start time")
+        files.inc(status="ok")
+        files.inc(2, status="ok")
+        files.inc(status='bad "one"')
+        started.set(12.5)
+
+        assert registry.render() == (
+            "# HELP files_total Files seen\n"
+            "# TYPE files_total counter\n"
+            'files_total{status="bad \\"one\\""} 1\n'
+            'files_total{status="ok"} 3\n'
+            "# HELP started_seconds Start time\n"
+            "# TYPE started_seconds gauge\n"
+            "started_seconds 12.5\n"
+        )
+
+    def test_openmetrics(self) -> None:
+        """Test OpenMetrics names counter families without _total."""
+        registry = MetricsRegistry()
+        registry.counter("files", "Files seen").inc()
+
+        text = registry.render(openmetrics=True)
+
+        assert "# TYPE files counter\nfiles_total 1\n" in text
+        assert text.endswith("# EOF\n")
+
+    def test_histogram(self) -> None:
+        """Test buckets are cumulative and include +Inf, sum and count."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        samples = registry.render().splitlines()[2:]
+
+        assert samples == [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+        ]
+        assert latency.count() == 4
+
+    @pytest.mark.parametrize(
+        "call",
+        [
+            lambda r: r.counter("c", "").inc(-1),
+            lambda r: r.counter("c", "", ("a",)).inc(),
+            lambda r: r.counter("c", "", ("a",)).inc(b="x"),
+            lambda r: r.histogram("h", "", (1.0, 0.5)),
+            lambda r: r.gauge("bad-name", ""),
+            lambda r: (r.gauge("g", ""), r.gauge("g", "")),
+        ],
+    )
+    def test_misuse(self, call: object) -> None:
+        """Test invalid increments, labels, buckets and names raise."""
+        with pytest.raises(ValueError):
+            call(MetricsRegistry())  # type: ignore[operator]
+
+
+class TestExport:
+    """Test textfile and HTTP exposition."""
+
+    def test_write_textfile(self, tmp_path: Path) -> None:
+        """Test the file is replaced without leaving temporary files."""
+        registry = MetricsRegistry()
+        registry.counter("files", "Files seen").inc()
+        path = tmp_path / "shard_md.prom"
+
+        registry.write_textfile(path)
+
+        assert "files_total 1" in path.read_text()
+        assert [p.name for p in tmp_path.iterdir()] == ["shard_md.prom"]
+
+    def test_write_textfile_error(self, tmp_path: Path) -> None:
+        """Test an unwritable path raises."""
+        with pytest.raises(FileSystemError) as exc_info:
+            MetricsRegistry().write_textfile(tmp_path / "missing" / "m.prom")
+        assert exc_info.value.error_code == 1208
+
+    def test_exporter_writes_periodically(self, tmp_path: Path) -> None:
+        """Test values are written while running and once more on close."""
+        registry = MetricsRegistry()
+        files = registry.counter("files", "Files seen")
+        path = tmp_path / "shard_md.prom"
+        exporter = TextfileExporter(registry, path, interval=0.01)
+        exporter.start()
+        try:
+            files.inc()
+            deadline = time.monotonic() + 5
+            while "files_total 1" not in path.read_text():
+                assert time.monotonic() < deadline, "no periodic write"
+                time.sleep(0.01)
+            files.inc()
+        finally:
+            exporter.close()
+
+        assert "files_total 2" in path.read_text()
+
+    def test_serve_metrics(self) -> None:
+        """Test scrapes get Prometheus text, or OpenMetrics when accepted."""
+        registry = MetricsRegistry()
+        registry.counter("files", "Files seen").inc()
+        server = metrics.serve_metrics(registry, 0)
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+        try:
+            connection.request("GET", "/metrics")
+            response = connection.getresponse()
+            assert response.getheader("Content-Type", "").startswith("text/plain")
+            assert "files_total 1" in response.read().decode()
+            connection.request(
+                "GET", "/metrics", headers={"Accept": "application/openmetrics-text"}
+            )
+            assert connection.getresponse().read().decode().endswith("# EOF\n")
+        finally:
+            connection.close()
+            server.shutdown()
+
+
+class TestInstrumentation:
+    """Test what runs record."""
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_cli_metrics_file(self, tmp_path: Path, jobs: str) -> None:
+        """Test a run writes its files, chunks, bytes, stages and errors."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for i in range(3):
+            (docs / f"doc{i}.md").write_text(DOCUMENT)
+        (docs / "broken.md").write_bytes(b"# Title\n\n\xff\xfe\n")
+        path = tmp_path / "shard_md.prom"
+        files = metrics.FILES_PROCESSED.value()
+        chunks = metrics.CHUNKS_CREATED.value()
+        errors = metrics.ERRORS.value(error_code="other")
+
+        result = CliRunner().invoke(
+            shard_md,
+            [str(docs), "-j", jobs, "--metrics-file", str(path), "--no-daemon"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert metrics.FILES_PROCESSED.value() == files + 3
+        assert metrics.CHUNKS_CREATED.value() > chunks
+        assert metrics.ERRORS.value(error_code="other") == errors + 1
+        text = path.read_text()
+        assert "shard_md_input_files 4" in text
+        assert 'shard_md_stage_duration_seconds_count{stage="render"}' in text
+        assert "shard_md_last_success_timestamp_seconds" in text
+
+    def test_daemon_requests(self, tmp_path: Path) -> None:
+        """Test the daemon records requests, files and error codes."""
+        server = DaemonServer(Settings(), tmp_path / "d.sock")
+        path = tmp_path / "guide.md"
+        path.write_text(DOCUMENT)
+        chunk_requests = metrics.DAEMON_REQUEST_SECONDS.count(op="chunk")
+        files = metrics.FILES_PROCESSED.value()
+        errors = metrics.ERRORS.value(error_code=1030)
+
+        assert server.handle({"op": "chunk", "path": str(path)})["ok"]
+        assert not server.handle({"op": "nope"})["ok"]
+
+        assert metrics.DAEMON_REQUEST_SECONDS.count(op="chunk") == chunk_requests + 1
+        assert metrics.DAEMON_REQUEST_SECONDS.count(op="unknown") >= 1
+        assert metrics.FILES_PROCESSED.value() == files + 1
+        assert metrics.ERRORS.value(error_code=1030) == errors + 1
+        server.executor.shutdown()
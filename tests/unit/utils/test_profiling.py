@@ -0,0 +1,131 @@
+"""Unit tests for built-in profiling."""
+
+import pstats
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.utils import profiling
+from shard_markdown.utils.profiling import Profiler, StackSampler, read_collapsed
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class TestSampling:
+    """Test stack sampling and collapsed stacks."""
+
+    def test_sample_collapses_stacks(self) -> None:
+        """Test stacks are root first, one module:function per frame."""
+        sampler = StackSampler()
+        sampler.sample()
+
+        stack = next(s for s in sampler.counts if s.endswith("StackSampler.sample"))
+        assert f"{__name__}:TestSampling.test_sample_collapses_stacks;" in stack
+        assert stack.endswith("shard_markdown.utils.profiling:StackSampler.sample")
+
+    def test_collapsed_round_trip(self, tmp_path: Path) -> None:
+        """Test merged sample counts are written and read back."""
+        profiler = Profiler("sample", tmp_path / "workers")
+        (tmp_path / "workers").mkdir()
+        (tmp_path / "workers" / "worker-1.collapsed").write_text("a;b 3\na;c 1\n")
+        assert profiler._sampler is not None
+        profiler._sampler.counts.update({"a;b": 2})
+
+        profiler.save(tmp_path / "run.collapsed")
+
+        assert read_collapsed(tmp_path / "run.collapsed") == Counter(
+            {"a;b": 5, "a;c": 1}
+        )
+        assert profiler.processes == 2
+        assert not (tmp_path / "workers").exists()
+
+    def test_sampled_entries(self, tmp_path: Path) -> None:
+        """Test self and total time, with recursion counted once."""
+        profiler = Profiler("sample", interval=0.01)
+        assert profiler._sampler is not None
+        profiler._sampler.counts.update({"main;f;f": 3, "main;g": 1})
+        profiler.save(tmp_path / "run.collapsed")
+
+        entries = {e.function: e for e in profiler.top()}
+
+        assert [e.function for e in profiler.top(2)] == ["f", "g"]
+        assert entries["f"].self_seconds == pytest.approx(0.03)
+        assert entries["main"].self_seconds == 0
+        assert entries["main"].total_seconds == pytest.approx(0.04)
+        assert entries["f"].calls is None
+
+
+class TestCpuProfile:
+    """Test cProfile profiles."""
+
+    def test_save_and_top(self, tmp_path: Path) -> None:
+        """Test the pstats file loads and the summary finds hot functions."""
+        profiler = Profiler("cpu")
+        profiler.start()
+        _busy(20_000)
+        profiler.stop()
+
+        profiler.save(tmp_path / "run.prof")
+
+        assert pstats.Stats(str(tmp_path / "run.prof")).total_calls > 0
+        assert any("_busy" in e.function for e in profiler.top(50))
+
+    def test_unknown_mode(self) -> None:
+        """Test only the known modes are accepted."""
+        with pytest.raises(ValueError):
+            Profiler("wall")
+
+
+@pytest.mark.parametrize("mode", ["cpu", "sample"])
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_profile(tmp_path: Path, mode: str, jobs: str) -> None:
+    """Test --profile writes one profile merged across processes."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(3):
+        (docs / f"doc{i}.md").write_text(DOCUMENT * 20)
+    output = tmp_path / "run.out"
+
+    result = CliRunner().invoke(
+        shard_md,
+        [
+            str(docs),
+            "-j",
+            jobs,
+            f"--profile={mode}",
+            "--profile-out",
+            str(output),
+            "--no-daemon",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "top" in result.stderr
+    processes = 1 if jobs == "1" else 3
+    assert f"Wrote profile of {processes} processes" in result.stderr
+    if mode == "cpu":
+        assert pstats.Stats(str(output)).total_calls > 0
+    else:
+        assert output.read_text().strip()
+    assert profiling.stop() is None
+
+
+def test_cli_profile_defaults_to_cpu(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test --profile without a mode uses cProfile and the default file."""
+    (tmp_path / "guide.md").write_text(DOCUMENT)
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(shard_md, ["guide.md", "--no-daemon", "--profile"])
+
+    assert result.exit_code == 0, result.output
+    assert pstats.Stats(str(tmp_path / "shard-md.prof")).total_calls > 0
@@ -0,0 +1,196 @@
+"""Unit tests for the markdown file scanner."""
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.utils.errors import FileSystemError
+from shard_markdown.utils.scanner import (
+    FileScanner,
+    ScannedFile,
+    compile_ignore_rule,
+    is_ignored,
+    largest_first,
+    read_file_list,
+)
+
+
+def _write(root: Path, *paths: str, content: str = "# Title\n\nText.\n") -> None:
+    for path in paths:
+        file_path = root / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+
+
+def _names(root: Path, files: list[ScannedFile]) -> list[str]:
+    return [f.path.relative_to(root).as_posix() for f in files]
+
+
+class TestIgnoreRules:
+    """Test gitignore pattern semantics."""
+
+    @pytest.mark.parametrize(
+        "pattern,path,is_dir,expected",
+        [
+            ("*.md", "a/b/notes.md", False, True),
+            ("build/", "build", True, True),
+            ("build/", "build", False, False),
+            ("/top.md", "top.md", False, True),
+            ("/top.md", "sub/top.md", False, False),
+            ("docs/*.md", "docs/a.md", False, True),
+            ("docs/*.md", "docs/sub/a.md", False, False),
+            ("docs/**/a.md", "docs/x/y/a.md", False, True),
+            ("docs/**/a.md", "docs/a.md", False, True),
+            ("draft?.md", "draft1.md", False, True),
+            ("[!a]*.md", "b.md", False, True),
+            ("[!a]*.md", "a.md", False, False),
+        ],
+    )
+    def test_patterns(
+        self, pattern: str, path: str, is_dir: bool, expected: bool
+    ) -> None:
+        """Test wildcards, anchoring and directory-only patterns."""
+        rule = compile_ignore_rule(pattern)
+        assert rule is not None
+        assert is_ignored([rule], path, is_dir) is expected
+
+    def test_last_match_wins(self) -> None:
+        """Test a later negation re-includes a path."""
+        rules = [compile_ignore_rule("*.md"), compile_ignore_rule("!keep.md")]
+        assert is_ignored([r for r in rules if r], "keep.md", False) is False
+        assert is_ignored([r for r in rules if r], "drop.md", False) is True
+
+    def test_rules_are_relative_to_their_directory(self) -> None:
+        """Test anchored patterns of nested ignore files."""
+        rule = compile_ignore_rule("/local.md", base="sub")
+        assert rule is not None
+        assert is_ignored([rule], "sub/local.md", False)
+        assert not is_ignored([rule], "local.md", False)
+
+    @pytest.mark.parametrize("line", ["", "   ", "# comment", "/"])
+    def test_empty_lines(self, line: str) -> None:
+        """Test lines without a pattern compile to nothing."""
+        assert compile_ignore_rule(line) is None
+
+
+class TestFileScanner:
+    """Test directory traversal."""
+
+    def test_finds_markdown_files(self, tmp_path: Path) -> None:
+        """Test both suffixes are found, sorted, and other files skipped."""
+        _write(tmp_path, "b.md", "a.markdown", "sub/c.MD", "notes.txt")
+        files = FileScanner().scan(tmp_path)
+        assert _names(tmp_path, files) == ["a.markdown", "b.md", "sub/c.MD"]
+        assert all(f.size == f.path.stat().st_size for f in files)
+
+    def test_non_recursive(self, tmp_path: Path) -> None:
+        """Test subdirectories are skipped unless recursive."""
+        _write(tmp_path, "a.md", "sub/b.md")
+        assert _names(tmp_path, FileScanner(recursive=False).scan(tmp_path)) == ["a.md"]
+
+    def test_default_and_extra_ignores(self, tmp_path: Path) -> None:
+        """Test .git and node_modules are skipped along with given patterns."""
+        _write(
+            tmp_path,
+            "a.md",
+            ".git/b.md",
+            "node_modules/pkg/README.md",
+            "_build/c.md",
+        )
+        scanner = FileScanner(ignore_patterns=[".git/", "node_modules/", "_build/"])
+        assert _names(tmp_path, scanner.scan(tmp_path)) == ["a.md"]
+
+    def test_gitignore_files(self, tmp_path: Path) -> None:
+        """Test nested ignore files add to and override their parents."""
+        _write(tmp_path, "a.md", "drafts/x.md", "sub/keep.md", "sub/gen.md")
+        (tmp_path / ".gitignore").write_text("drafts/\ngen.md\n")
+        (tmp_path / "sub" / ".gitignore").write_text("!gen.md\nkeep.md\n")
+
+        assert _names(tmp_path, FileScanner().scan(tmp_path)) == ["a.md", "sub/gen.md"]
+        unfiltered = FileScanner(use_ignore_files=False).scan(tmp_path)
+        assert len(unfiltered) == 4
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+    def test_links_are_visited_once(self, tmp_path: Path) -> None:
+        """Test symlink cycles terminate and hard links are not duplicated."""
+        _write(tmp_path, "docs/a.md")
+        (tmp_path / "docs" / "loop").symlink_to(tmp_path)
+        os.link(tmp_path / "docs" / "a.md", tmp_path / "docs" / "b.md")
+
+        assert _names(tmp_path, FileScanner().scan(tmp_path)) == ["docs/a.md"]
+
+    def test_single_file(self, tmp_path: Path) -> None:
+        """Test a file root is returned as is."""
+        _write(tmp_path, "a.md", "b.txt")
+        assert FileScanner().scan(tmp_path / "a.md")[0].path == tmp_path / "a.md"
+        assert FileScanner().scan(tmp_path / "b.txt") == []
+
+    def test_missing_root(self, tmp_path: Path) -> None:
+        """Test an inaccessible root raises."""
+        with pytest.raises(FileSystemError) as exc_info:
+            FileScanner().scan(tmp_path / "missing")
+        assert exc_info.value.error_code == 1201
+
+
+class TestFileLists:
+    """Test reading and checking explicit file lists."""
+
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            (b"a.md\nsub/b.md\r\n\n", ["a.md", "sub/b.md"]),
+            (b"a.md\0line\nbreak.md\0", ["a.md", "line\nbreak.md"]),
+            (b"", []),
+        ],
+    )
+    def test_read_file_list(self, data: bytes, expected: list[str]) -> None:
+        """Test line and NUL-separated lists."""
+        assert read_file_list(io.BytesIO(data)) == [Path(p) for p in expected]
+
+    def test_scan_paths(self, tmp_path: Path) -> None:
+        """Test list order is kept, duplicates dropped and misses recorded."""
+        _write(tmp_path, "b.md", "a.md", "c.txt", "dir/d.md")
+        paths = [tmp_path / p for p in ("b.md", "missing.md", "a.md", "c.txt")]
+        scanner = FileScanner()
+
+        files = scanner.scan_paths([*paths, tmp_path / "dir", tmp_path / "b.md"])
+
+        assert _names(tmp_path, files) == ["b.md", "a.md"]
+        assert scanner.missing == [tmp_path / "missing.md"]
+
+
+def test_largest_first() -> None:
+    """Test scheduling order is by decreasing size, ties by path."""
+    files = [
+        ScannedFile(Path("b.md"), 10),
+        ScannedFile(Path("a.md"), 10),
+        ScannedFile(Path("c.md"), 50),
+    ]
+    assert [f.path.name for f in largest_first(files)] == ["c.md", "a.md", "b.md"]
+
+
+def test_parallel_run_matches_serial(tmp_path: Path) -> None:
+    """Test worker processes produce the same chunks as a serial run."""
+    docs = tmp_path / "docs"
+    for i in range(6):
+        section = "\n\n".join(
+            f"## Part {j}\n\n" + "Text. " * (i * 20) for j in range(3)
+        )
+        _write(docs, f"doc{i}.md", content=f"# Doc {i}\n\n{section}\n")
+
+    outputs = []
+    for jobs in ("1", "2"):
+        output = tmp_path / f"chunks-{jobs}.jsonl"
+        result = CliRunner().invoke(
+            shard_md,
+            [str(docs), "-j", jobs, "--output-file", str(output), "-q", "--no-daemon"],
+        )
+        assert result.exit_code == 0, result.output
+        outputs.append(sorted(output.read_text(encoding="utf-8").splitlines()))
+
+    assert outputs[0]
+    assert outputs[0] == outputs[1]
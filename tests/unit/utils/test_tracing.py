@@ -0,0 +1,108 @@
+"""Unit tests for Chrome trace-event recording."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter_ns
+
+import pytest
+from click.testing import CliRunner
+
+from shard_markdown.cli.main import shard_md
+from shard_markdown.core.timing import StageTimer
+from shard_markdown.utils import tracing
+from shard_markdown.utils.errors import FileSystemError
+
+
+DOCUMENT = "# Guide\n\nInstall the package.\n\n## Usage\n\nRun the tool on a file.\n"
+
+
+@pytest.fixture(autouse=True)
+def _tracing_off() -> Iterator[None]:
+    tracing.stop()
+    yield
+    tracing.stop()
+
+
+class TestTraceRecorder:
+    """Test recording and writing events."""
+
+    def test_complete_spans(self) -> None:
+        """Test spans are recorded in microseconds on a named thread."""
+        recorder = tracing.start("test")
+        tracing.add_span("read", 1_000, 3_500, path="a.md")
+
+        process, thread, event = recorder.events
+        assert process["ph"] == "M"
+        assert process["args"] == {"name": "test"}
+        assert thread["name"] == "thread_name"
+        assert event["ph"] == "X"
+        assert (event["ts"], event["dur"]) == (1.0, 2.5)
+        assert event["tid"] == thread["tid"]
+        assert event["args"] == {"path": "a.md"}
+
+    def test_async_spans(self) -> None:
+        """Test async spans are begin and end pairs with their own ids."""
+        recorder = tracing.start()
+        with tracing.async_span("collection.add", category="chromadb"):
+            pass
+        with tracing.async_span("collection.add", category="chromadb"):
+            pass
+
+        pairs = [e for e in recorder.events if e["ph"] in "be"]
+        assert [e["ph"] for e in pairs] == ["b", "e", "b", "e"]
+        assert pairs[0]["id"] == pairs[1]["id"] != pairs[2]["id"]
+
+    def test_off_records_nothing(self) -> None:
+        """Test spans are dropped while tracing is off."""
+        with tracing.span("file"):
+            tracing.add_span("read", perf_counter_ns())
+
+        assert tracing.active() is None
+
+    def test_stage_timer_emits_spans(self) -> None:
+        """Test timed stages appear in the trace."""
+        recorder = tracing.start()
+        with StageTimer().stage("chunk"):
+            pass
+
+        assert [e["name"] for e in recorder.events if e["ph"] == "X"] == ["chunk"]
+
+    def test_drain(self) -> None:
+        """Test drained events are removed from the recorder."""
+        recorder = tracing.start()
+        tracing.add_span("read", 0, 1)
+
+        assert len(recorder.drain()) == 3
+        assert recorder.events == []
+
+    def test_write_error(self, tmp_path: Path) -> None:
+        """Test an unwritable trace file raises."""
+        with pytest.raises(FileSystemError) as exc_info:
+            tracing.TraceRecorder().write(tmp_path / "missing" / "trace.json")
+        assert exc_info.value.error_code == 1208
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_trace_out(tmp_path: Path, jobs: str) -> None:
+    """Test --trace-out writes file and stage spans of every process."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(3):
+        (docs / f"doc{i}.md").write_text(DOCUMENT)
+    trace = tmp_path / "trace.json"
+
+    result = CliRunner().invoke(
+        shard_md,
+        [str(docs), "-j", jobs, "--trace-out", str(trace), "--no-daemon"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "trace events" in result.stderr
+    events = json.loads(trace.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert sum(e["name"] == "file" for e in spans) == 3
+    assert {"read", "render", "chunk"} <= {e["name"] for e in spans}
+    processes = {e["pid"] for e in events if e["name"] == "process_name"}
+    assert (len(processes) > 1) is (jobs == "2")
+    assert tracing.active() is None